@@ -6,11 +6,18 @@ This package contains analytical tools for vocabulary processing:
 - Definition similarity calculation
 - Consolidated analytical methods
 - Data processing utilities
+
+Submodules load on first access; each pulls in its own heavy dependencies
+(wordfreq, sentence-transformers) only when used.
 """
 
-from .frequency_analysis_system import FrequencyCollectionManager
-from .domain_classifier import DomainClassifier
-from .definition_similarity_calculator import DefinitionSimilarityCalculator
+from core.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'FrequencyCollectionManager': '.frequency_analysis_system',
+    'DomainClassifier': '.domain_classifier',
+    'DefinitionSimilarityCalculator': '.definition_similarity_calculator',
+})
 
 __all__ = [
     'FrequencyCollectionManager',
@@ -9,10 +9,12 @@ import json
 import logging
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 from tqdm import tqdm
 import time
 
 from core.database_manager import db_manager
+from core.lazy_imports import lazy_import, module_available
 
 try:
     from psycopg.rows import execute_batch
@@ -24,32 +26,37 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+# sentence-transformers, torch and CuPy take seconds to import and probe the GPU,
+# so they load when a calculator is created rather than when this module is
+# imported (e.g. by `maintain_similarity.py --help` or status checks).
+SENTENCE_TRANSFORMERS_AVAILABLE = module_available("sentence_transformers")
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     logger.warning("sentence-transformers not available. Install with: pip install sentence-transformers")
+TORCH_AVAILABLE = module_available("torch")
 
-try:
+cp = lazy_import("cupy")
+
+
+@lru_cache(maxsize=None)
+def torch_cuda_available() -> bool:
+    if not TORCH_AVAILABLE:
+        return False
     import torch
-    TORCH_AVAILABLE = True
-    TORCH_CUDA_AVAILABLE = torch.cuda.is_available()
-except ImportError:
-    TORCH_AVAILABLE = False
-    TORCH_CUDA_AVAILABLE = False
+    return torch.cuda.is_available()
 
-try:
-    import cupy as cp
-    # Test if CuPy can actually perform GPU operations
+
+@lru_cache(maxsize=None)
+def cupy_available() -> bool:
+    """Whether CuPy is installed and can actually perform GPU operations."""
+    if not module_available("cupy"):
+        return False
     try:
         _ = cp.array([1.0])  # Simple GPU allocation test
-        CUPY_AVAILABLE = True
+        return True
     except Exception as e:
         logger.warning(f"CuPy installed but GPU operations failed: {e}")
-        CUPY_AVAILABLE = False
-except ImportError:
-    CUPY_AVAILABLE = False
+        return False
+
 
 @dataclass
 class DefinitionData:
@@ -78,7 +85,7 @@ class DefinitionSimilarityCalculator:
             raise ImportError("sentence-transformers required. Install with: pip install sentence-transformers")
 
         # Determine device for embedding model
-        if TORCH_CUDA_AVAILABLE:
+        if torch_cuda_available():
             device = 'cuda'
             logger.info("🚀 GPU detected - using CUDA for embedding generation")
         else:
@@ -86,11 +93,12 @@ class DefinitionSimilarityCalculator:
             logger.info("Using CPU for embedding generation")
 
         logger.info(f"Loading SentenceTransformer model: {model_name}")
+        from sentence_transformers import SentenceTransformer
         self.model = SentenceTransformer(model_name, device=device)
         logger.info(f"Model loaded successfully on device: {device}")
 
         # GPU detection for similarity calculations
-        if CUPY_AVAILABLE:
+        if cupy_available():
             logger.info("🚀 CuPy detected - using CUDA for similarity calculations")
             self.use_gpu_similarity = True
         else:
@@ -509,7 +517,7 @@ def main():
     
     print("=== Definition Similarity Calculator ===")
     print(f"Model: {calculator.model_name}")
-    print(f"CUDA Available: {CUDA_AVAILABLE}")
+    print(f"CUDA Available: {cupy_available()}")
     print()
     
     # Create tables
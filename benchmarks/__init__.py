@@ -0,0 +1,29 @@
+"""Reproducible performance benchmarks on a synthetic vocabulary corpus.
+
+Usage:
+    # Create a dedicated local database once
+    createdb vocab_bench
+
+    # Load a 20k-word corpus (seeded, identical on every machine)
+    python -m benchmarks generate --words 20000
+
+    # Time every scenario and write temp/benchmarks/<timestamp>-<commit>.json
+    python -m benchmarks run
+
+    # Only some scenarios, or whole groups
+    python -m benchmarks run --scenario search --scenario word.detail
+
+    # Fail (exit 1) when HEAD's median latency regressed against a baseline
+    python -m benchmarks compare temp/benchmarks/base.json temp/benchmarks/head.json
+
+    # Where each entry point's startup time goes (python -X importtime)
+    python -m benchmarks importtime cuda_cli --top 20
+    python -m benchmarks run --scenario startup
+
+The target database comes from ``--dsn`` or ``BENCHMARK_DSN`` (default
+``postgresql://postgres@localhost:5432/vocab_bench``). ``generate`` drops
+and recreates its ``vocab`` schema, so non-local hosts are refused unless
+``--allow-remote`` is given, and an existing ``vocab`` schema that is not
+empty and was not loaded by ``generate`` is refused unless ``--force`` is
+given.
+"""
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Command line entry point: ``python -m benchmarks {generate,run,compare,importtime,list}``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.corpus import (  # noqa: E402
+    CorpusSpec, SchemaInUse, check_schema_replaceable, generate_corpus, load_corpus, loaded_fingerprint,
+)
+from benchmarks.runner import (  # noqa: E402
+    DEFAULT_MIN_DELTA_MS,
+    DEFAULT_THRESHOLD,
+    build_report,
+    compare_results,
+    format_comparison,
+    load_report,
+    write_report,
+)
+
+logger = logging.getLogger("benchmarks")
+
+DEFAULT_DSN = "postgresql://postgres@localhost:5432/vocab_bench"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+EXIT_REGRESSION = 1
+EXIT_CORPUS_MISMATCH = 2
+
+
+# ---------------------------------------------------------------------------
+# Database target
+# ---------------------------------------------------------------------------
+
+
+def resolve_dsn(args: argparse.Namespace) -> Dict[str, str]:
+    """Connection parameters for the benchmark database, refusing remote hosts."""
+    from psycopg.conninfo import conninfo_to_dict
+
+    dsn = args.dsn or os.getenv("BENCHMARK_DSN") or DEFAULT_DSN
+    params = {key: str(value) for key, value in conninfo_to_dict(dsn).items()}
+    params.setdefault("host", "localhost")
+    if params["host"] not in LOCAL_HOSTS and not args.allow_remote:
+        raise SystemExit(
+            f"Refusing to benchmark against {params['host']}: `generate` replaces the vocab schema. "
+            "Use a local database or pass --allow-remote."
+        )
+    return params
+
+
+def point_app_at(params: Dict[str, str]) -> None:
+    """Route ``core`` connections to the benchmark database.
+
+    Must run before anything imports ``core.database_manager``, whose pool is
+    configured from these variables at import time.
+    """
+    os.environ.update(
+        DB_HOST=params["host"],
+        DB_PORT=params.get("port", "5432"),
+        DB_NAME=params.get("dbname", "vocab_bench"),
+        DB_USER=params.get("user", "postgres"),
+        # secure_config ignores the environment unless a password is set; a
+        # trust-authenticated local server does not check it.
+        DB_PASSWORD=params.get("password") or "benchmark",
+        DB_SCHEMA="vocab",
+    )
+    from core.database_manager import db_manager
+
+    if db_manager.config_obj.host != params["host"] or db_manager.config_obj.database != os.environ["DB_NAME"]:
+        raise SystemExit("core.database_manager was configured before the benchmark target; refusing to run")
+
+
+def connect(params: Dict[str, str]):
+    import psycopg
+
+    return psycopg.connect(**params)
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+
+def cmd_generate(args: argparse.Namespace) -> int:
+    params = resolve_dsn(args)
+    spec = CorpusSpec(
+        words=args.words,
+        users=args.users,
+        seed=args.seed,
+        embedding_dim=args.embedding_dim,
+        quiz_answers=args.quiz_answers,
+    )
+    # Checked before the (slow) generation as well as by load_corpus itself
+    try:
+        with connect(params) as conn:
+            check_schema_replaceable(conn, args.force)
+    except SchemaInUse as e:
+        raise SystemExit(f"Refusing to load into {params.get('dbname')}: {e}")
+
+    started = time.perf_counter()
+    corpus = generate_corpus(spec)
+    logger.info(f"Generated corpus {spec.fingerprint} in {time.perf_counter() - started:.1f}s")
+
+    with connect(params) as conn:
+        counts = load_corpus(conn, corpus, force=args.force)
+    for table, count in counts.items():
+        print(f"  {table:<26} {count:>10,}")
+    print(f"Loaded corpus {spec.fingerprint} into {params.get('dbname')} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+def load_target_corpus(params: Dict[str, str]) -> Optional[Dict]:
+    """Spec of the corpus loaded in the benchmark database, if any."""
+    with connect(params) as conn:
+        fingerprint = loaded_fingerprint(conn)
+        if not fingerprint:
+            return None
+        with conn.cursor() as cur:
+            cur.execute("SELECT spec FROM vocab.benchmark_corpus WHERE fingerprint = %s", (fingerprint,))
+            return cur.fetchone()[0]
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    from benchmarks.scenarios import BenchContext, run_scenarios, select_scenarios
+
+    try:
+        selected = select_scenarios(args.scenario)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+
+    # Startup scenarios alone run without a database; the report then has no corpus.
+    spec: Dict = {}
+    if any(item.needs_database for item in selected):
+        params = resolve_dsn(args)
+        spec = load_target_corpus(params)
+        if not spec:
+            print("No benchmark corpus loaded; run `python -m benchmarks generate` first.", file=sys.stderr)
+            return EXIT_CORPUS_MISMATCH
+        point_app_at(params)
+
+    ctx = BenchContext(seed=spec.get("seed", 0))
+    results = run_scenarios(ctx, selected, iterations=args.iterations, budget_seconds=args.budget)
+    report = build_report(spec, results, label=args.label)
+    path = write_report(report, args.output)
+
+    for result in results:
+        if result.status == "ok":
+            print(f"  {result.name:<28} p50 {result.p50_ms:>9.2f} ms  p95 {result.p95_ms:>9.2f} ms  n={result.iterations}")
+        else:
+            print(f"  {result.name:<28} {result.status}: {result.detail}")
+    print(f"Results written to {path}")
+    return 1 if any(result.status == "error" for result in results) else 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    base = load_report(args.base)
+    head = load_report(args.head)
+    base_corpus = base.get("corpus", {}).get("fingerprint")
+    head_corpus = head.get("corpus", {}).get("fingerprint")
+    if base_corpus != head_corpus and not args.force:
+        print(
+            f"Corpus differs ({base_corpus} vs {head_corpus}); timings are not comparable. "
+            "Use --force to compare anyway.",
+            file=sys.stderr,
+        )
+        return EXIT_CORPUS_MISMATCH
+
+    comparisons = compare_results(base, head, threshold=args.threshold, min_delta_ms=args.min_delta_ms)
+    if args.json:
+        print(json.dumps([c.__dict__ for c in comparisons], indent=2))
+    else:
+        print(format_comparison(comparisons))
+    regressions = [c.name for c in comparisons if c.verdict == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return EXIT_REGRESSION
+    return 0
+
+
+def cmd_importtime(args: argparse.Namespace) -> int:
+    from benchmarks.importtime import ENTRY_POINTS, format_profile, profile_imports
+
+    names = args.entry_point or list(ENTRY_POINTS)
+    unknown = [name for name in names if name not in ENTRY_POINTS]
+    if unknown:
+        print(f"unknown entry point(s): {', '.join(unknown)}; choose from {', '.join(ENTRY_POINTS)}", file=sys.stderr)
+        return 2
+
+    profiles = {name: profile_imports(ENTRY_POINTS[name]) for name in names}
+    if args.json:
+        print(json.dumps({name: profile.to_dict(args.top) for name, profile in profiles.items()}, indent=2))
+    else:
+        print("\n\n".join(format_profile(name, profile, args.top) for name, profile in profiles.items()))
+    return 1 if any(profile.returncode != 0 for profile in profiles.values()) else 0
+
+
+def cmd_list(args: argparse.Namespace) -> int:
+    from benchmarks.scenarios import SCENARIOS
+
+    for item in SCENARIOS.values():
+        print(f"{item.name:<28} {item.iterations:>4}x  {item.description}")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Argument parsing
+# ---------------------------------------------------------------------------
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Reproducible benchmarks on a synthetic vocabulary corpus",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log scenario progress")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_target(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--dsn", help=f"Benchmark database (default: $BENCHMARK_DSN or {DEFAULT_DSN})")
+        sub.add_argument("--allow-remote", action="store_true", help="Allow a non-local database host")
+
+    defaults = CorpusSpec()
+    generate = commands.add_parser("generate", help="Generate and load the synthetic corpus")
+    add_target(generate)
+    generate.add_argument("--words", type=int, default=defaults.words, help=f"Words to generate (default: {defaults.words})")
+    generate.add_argument("--users", type=int, default=defaults.users, help=f"Users with quiz history (default: {defaults.users})")
+    generate.add_argument("--seed", type=int, default=defaults.seed, help=f"Random seed (default: {defaults.seed})")
+    generate.add_argument("--embedding-dim", type=int, default=defaults.embedding_dim, help=f"Embedding size (default: {defaults.embedding_dim})")
+    generate.add_argument(
+        "--quiz-answers", type=int, default=defaults.quiz_answers,
+        help=f"Average quiz answers per user (default: {defaults.quiz_answers})",
+    )
+    generate.add_argument(
+        "--force", action="store_true",
+        help="Replace a vocab schema that is not a benchmark corpus (destroys its data)",
+    )
+    generate.set_defaults(handler=cmd_generate)
+
+    run = commands.add_parser("run", help="Run timed scenarios and write a result file")
+    add_target(run)
+    run.add_argument("--scenario", action="append", help="Scenario name or group (repeatable; default: all)")
+    run.add_argument("--iterations", type=int, help="Override every scenario's iteration count")
+    run.add_argument("--budget", type=float, help="Stop a scenario after this many timed seconds")
+    run.add_argument("--label", help="Free-form label stored in the result file")
+    run.add_argument("--output", type=Path, help="Result file (default: temp/benchmarks/<timestamp>-<commit>.json)")
+    run.set_defaults(handler=cmd_run)
+
+    compare = commands.add_parser("compare", help="Compare two result files; exit 1 on regression")
+    compare.add_argument("base", type=Path)
+    compare.add_argument("head", type=Path)
+    compare.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Relative median increase counted as a regression (default: {DEFAULT_THRESHOLD})",
+    )
+    compare.add_argument(
+        "--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+        help=f"Ignore changes smaller than this many milliseconds (default: {DEFAULT_MIN_DELTA_MS})",
+    )
+    compare.add_argument("--force", action="store_true", help="Compare even if the corpora differ")
+    compare.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    compare.set_defaults(handler=cmd_compare)
+
+    importtime = commands.add_parser("importtime", help="Report what each entry point imports at startup")
+    importtime.add_argument("entry_point", nargs="*", help="Entry points to profile (default: all)")
+    importtime.add_argument("--top", type=int, default=15, help="Modules to list per entry point (default: 15)")
+    importtime.add_argument("--json", action="store_true", help="Print the profiles as JSON")
+    importtime.set_defaults(handler=cmd_importtime)
+
+    listing = commands.add_parser("list", help="List available scenarios")
+    listing.set_defaults(handler=cmd_list)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""Deterministic synthetic vocabulary corpus for the benchmark suite.
+
+``generate_corpus(spec)`` builds every row in memory from ``spec.seed`` alone,
+so the same spec always yields the same corpus on every machine.
+``load_corpus`` writes it into an empty benchmark database with ``COPY``.
+
+The shape follows production rather than being uniform. Terms are built from
+syllables, with some phrases and hyphenated forms. About a third of the words
+are missing one or more frequency sources. Embeddings cluster by domain, so
+similarity neighbourhoods look realistic. Quiz history is skewed towards a
+few heavy users.
+
+Timestamps are stored as offsets and anchored at load time, so "last 30
+days" analytics always have data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Bump when generation changes so results from different corpora are not compared.
+CORPUS_VERSION = 1
+
+SCHEMA_PATH = Path(__file__).with_name("schema.sql")
+EMBEDDING_MODEL = "sentence-transformers/all-mpnet-base-v2"
+SIMILARITY_THRESHOLD = 0.4
+BENCHMARK_PASSWORD_HASH = "!"  # never matches a bcrypt check; benchmarks use issued tokens
+
+DOMAINS: Tuple[str, ...] = (
+    "General / Cross-Domain",
+    "Language & Literature",
+    "Arts & Culture",
+    "Life Sciences",
+    "Medicine & Health Sciences",
+    "Physical Sciences & Engineering",
+    "Chemistry & Materials",
+    "Mathematics & Logic",
+    "Technology & Computing",
+    "Business, Economics & Finance",
+    "Law, Government & Civics",
+    "Social & Behavioral Sciences",
+    "Religion, Philosophy & Mythology",
+    "Geography, Earth & Environment",
+    "Maritime & Navigation",
+    "Material Culture & Applied Skills",
+    "Military & Security",
+)
+
+PARTS_OF_SPEECH: Tuple[Tuple[str, float], ...] = (
+    ("noun", 0.52),
+    ("adjective", 0.24),
+    ("verb", 0.17),
+    ("adverb", 0.05),
+    ("phrase", 0.02),
+)
+
+# Onset/nucleus/coda pieces with a rough IPA and ARPAbet rendering each.
+_ONSETS = (
+    ("b", "b", "B"), ("c", "k", "K"), ("d", "d", "D"), ("f", "f", "F"), ("g", "ɡ", "G"),
+    ("h", "h", "HH"), ("l", "l", "L"), ("m", "m", "M"), ("n", "n", "N"), ("p", "p", "P"),
+    ("r", "ɹ", "R"), ("s", "s", "S"), ("t", "t", "T"), ("v", "v", "V"), ("br", "bɹ", "B R"),
+    ("cl", "kl", "K L"), ("st", "st", "S T"), ("tr", "tɹ", "T R"), ("ph", "f", "F"), ("th", "θ", "TH"),
+    ("", "", ""),
+)
+_NUCLEI = (
+    ("a", "æ", "AE"), ("e", "ɛ", "EH"), ("i", "ɪ", "IH"), ("o", "ɒ", "AA"), ("u", "ʌ", "AH"),
+    ("ae", "i", "IY"), ("ou", "aʊ", "AW"), ("y", "aɪ", "AY"), ("io", "ioʊ", "IY OW"),
+)
+_CODAS = (
+    ("", "", ""), ("n", "n", "N"), ("r", "ɹ", "R"), ("s", "s", "S"), ("x", "ks", "K S"),
+    ("nt", "nt", "N T"), ("m", "m", "M"), ("l", "l", "L"), ("ct", "kt", "K T"),
+)
+_SUFFIXES = (
+    ("ism", "ɪzəm", "IH Z AH M"), ("ous", "əs", "AH S"), ("ate", "eɪt", "EY T"),
+    ("ity", "ɪti", "IH T IY"), ("ine", "aɪn", "AY N"), ("al", "əl", "AH L"), ("", "", ""),
+)
+_FILLER = (
+    "relating to", "a kind of", "the practice of", "characterised by", "an instrument for",
+    "the state of being", "a person who studies", "having the quality of", "in the manner of",
+    "a small", "a formal", "an archaic", "a technical", "pertaining to",
+)
+_DEFINITION_WORDS = (
+    "motion", "water", "light", "measure", "speech", "body", "custom", "stone", "law", "trade",
+    "ship", "vessel", "star", "number", "plant", "animal", "fever", "ritual", "weapon", "market",
+    "surface", "grain", "vapour", "song", "cloth", "metal", "boundary", "argument", "spirit", "road",
+)
+_QUESTION_TYPES = ("multiple_choice", "true_false", "matching")
+_DIFFICULTIES = ("easy", "medium", "hard")
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Size and seed of a synthetic corpus; equal specs give equal corpora."""
+
+    words: int = 20000
+    users: int = 25
+    seed: int = 1729
+    embedding_dim: int = 64
+    neighbours: int = 8
+    rhymes: int = 4
+    quiz_answers: int = 400  # per user on average; the distribution is skewed
+    days: int = 120
+
+    @property
+    def fingerprint(self) -> str:
+        payload = json.dumps({"version": CORPUS_VERSION, **asdict(self)}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"version": CORPUS_VERSION, "fingerprint": self.fingerprint, **asdict(self)}
+
+
+@dataclass
+class Corpus:
+    """Rows per table, in column order of ``COLUMNS``."""
+
+    spec: CorpusSpec
+    tables: Dict[str, List[tuple]] = field(default_factory=dict)
+
+    def digest(self) -> str:
+        """Content hash of every row, used to check generation is deterministic."""
+        hasher = hashlib.sha256()
+        for table in COLUMNS:
+            hasher.update(table.encode("utf-8"))
+            for row in self.tables.get(table, ()):
+                hasher.update(repr(row).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def counts(self) -> Dict[str, int]:
+        return {table: len(rows) for table, rows in self.tables.items()}
+
+
+# Columns loaded per table, in dependency order. Values named *_ago are
+# offsets in seconds, turned into timestamps relative to the load time.
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "domains": ("id", "name", "description"),
+    "defined": (
+        "id", "term", "part_of_speech", "definition", "date_added_ago", "frequency",
+        "word_source", "definition_source", "len", "phrase", "hyphenated",
+        "python_wordfreq", "ngram_freq", "commoncrawl_freq", "obsolete_or_archaic",
+    ),
+    "word_domains": ("word_id", "primary_domain", "domain_id"),
+    "word_phonetics": (
+        "word_id", "word", "ipa_transcription", "arpabet_transcription",
+        "syllable_count", "stress_pattern", "transcription_source",
+    ),
+    "pronunciation_files": ("word_id", "term", "filename", "source"),
+    "definition_embeddings": ("word_id", "word", "definition_text", "embedding_json", "embedding_model"),
+    "definition_similarity": ("word1_id", "word2_id", "cosine_similarity", "embedding_model"),
+    "pronunciation_similarity": (
+        "word1_id", "word2_id", "overall_similarity", "phonetic_distance",
+        "stress_similarity", "rhyme_score", "syllable_similarity",
+    ),
+    "users": ("id", "username", "email", "full_name", "password_hash", "role", "created_at_ago"),
+    "quiz_sessions": (
+        "id", "user_id", "started_at_ago", "completed_at_ago", "quiz_type", "difficulty",
+        "total_questions", "correct_answers",
+    ),
+    "user_quiz_results": (
+        "id", "user_id", "word_id", "question_type", "is_correct", "response_time_ms",
+        "answered_at_ago", "difficulty_level", "session_id",
+    ),
+    "user_word_mastery": (
+        "user_id", "word_id", "mastery_level", "total_attempts", "correct_attempts",
+        "last_seen_ago", "next_review_ago", "streak", "ease_factor",
+    ),
+}
+
+# Tables whose identity sequence must be advanced past explicitly loaded ids.
+_IDENTITY_TABLES = ("domains", "defined", "users", "user_quiz_results")
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+
+def _weighted(rng: random.Random, choices: Sequence[Tuple[str, float]]) -> str:
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def _make_word(rng: random.Random) -> Tuple[str, str, str, int]:
+    """Return ``(spelling, ipa, arpabet, syllables)`` for one pseudo-word."""
+    syllables = rng.choices((1, 2, 3, 4), weights=(2, 5, 4, 2))[0]
+    spelling, ipa, arpabet = [], [], []
+    for _ in range(syllables):
+        for table in (_ONSETS, _NUCLEI, _CODAS):
+            s, i, a = rng.choice(table)
+            spelling.append(s)
+            ipa.append(i)
+            if a:
+                arpabet.append(a)
+    s, i, a = rng.choice(_SUFFIXES)
+    spelling.append(s)
+    ipa.append(i)
+    if a:
+        arpabet.append(a)
+    return "".join(spelling), "".join(ipa), " ".join(arpabet), syllables + (1 if s else 0)
+
+
+def _frequencies(rng: random.Random, commonness: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+    """Three frequency sources with the gaps and -999 sentinels seen in production."""
+
+    def source(scale: float, present: float) -> Optional[float]:
+        roll = rng.random()
+        if roll > present:
+            return None if roll > present + (1 - present) / 2 else -999.0
+        return round(commonness * scale + rng.gauss(0, scale * 0.08), 4)
+
+    python_wordfreq = source(7.0, 0.78)
+    ngram_freq = source(1e-6, 0.62)
+    commoncrawl = source(9.0, 0.70)
+    if commoncrawl is not None and commoncrawl != -999.0:
+        commoncrawl = round(max(min(commoncrawl, 9999.0), -9999.0), 3)
+    return python_wordfreq, ngram_freq, commoncrawl
+
+
+def _definition(rng: random.Random, term_words: Sequence[str]) -> str:
+    words = rng.sample(_DEFINITION_WORDS, 3)
+    text = f"{rng.choice(_FILLER)} {words[0]} or {words[1]}, especially {rng.choice(_FILLER)} {words[2]}"
+    if term_words and rng.random() < 0.15:
+        # Cross-references drive definition linking and browse snippets.
+        text += f"; compare {rng.choice(term_words)}"
+    return text[0].upper() + text[1:] + "."
+
+
+def _embeddings(spec: CorpusSpec, domain_index: np.ndarray) -> np.ndarray:
+    rng = np.random.default_rng(spec.seed)
+    centres = rng.normal(size=(len(DOMAINS), spec.embedding_dim))
+    vectors = centres[domain_index] * 0.9 + rng.normal(size=(len(domain_index), spec.embedding_dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def nearest_neighbours(vectors: np.ndarray, k: int, block: int = 2048) -> Tuple[np.ndarray, np.ndarray]:
+    """Top-``k`` cosine neighbours per row of unit ``vectors`` (self excluded)."""
+    count = vectors.shape[0]
+    k = min(k, count - 1)
+    indices = np.empty((count, k), dtype=np.int64)
+    scores = np.empty((count, k), dtype=np.float32)
+    for start in range(0, count, block):
+        sims = vectors[start:start + block] @ vectors.T
+        rows = np.arange(sims.shape[0])
+        sims[rows, rows + start] = -np.inf
+        top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        indices[start:start + block] = np.take_along_axis(top, order, axis=1)
+        scores[start:start + block] = np.take_along_axis(top_scores, order, axis=1)
+    return indices, scores
+
+
+def generate_corpus(spec: CorpusSpec) -> Corpus:
+    """Build every table's rows for ``spec``."""
+    rng = random.Random(spec.seed)
+    corpus = Corpus(spec)
+    tables = corpus.tables
+    day = 86400
+
+    tables["domains"] = [(index + 1, name, f"Synthetic benchmark domain: {name}") for index, name in enumerate(DOMAINS)]
+
+    # -- words ------------------------------------------------------------
+    defined, word_domains, phonetics, audio = [], [], [], []
+    seen = set()
+    terms: List[str] = []
+    rhyme_groups: Dict[str, List[int]] = {}
+    syllable_counts: List[int] = []
+    domain_index = np.empty(spec.words, dtype=np.int64)
+
+    for word_id in range(1, spec.words + 1):
+        spelling, ipa, arpabet, syllables = _make_word(rng)
+        pos = _weighted(rng, PARTS_OF_SPEECH)
+        phrase = hyphenated = 0
+        if pos == "phrase":
+            extra, extra_ipa, extra_arpabet, extra_syllables = _make_word(rng)
+            spelling, ipa, arpabet = f"{spelling} {extra}", f"{ipa} {extra_ipa}", f"{arpabet} {extra_arpabet}"
+            syllables += extra_syllables
+            phrase = 1
+        elif rng.random() < 0.03:
+            extra, extra_ipa, extra_arpabet, extra_syllables = _make_word(rng)
+            spelling, ipa, arpabet = f"{spelling}-{extra}", ipa + extra_ipa, f"{arpabet} {extra_arpabet}"
+            syllables += extra_syllables
+            hyphenated = 1
+        while spelling in seen:
+            spelling += rng.choice("aeiou")
+        seen.add(spelling)
+        terms.append(spelling)
+
+        # Zipf-ish commonness in [0, 1]; rarer words dominate, as in the real list.
+        commonness = 1.0 - min(1.0, (rng.paretovariate(1.3) - 1.0) / 6.0)
+        python_wordfreq, ngram_freq, commoncrawl = _frequencies(rng, commonness)
+        domain = min(int(rng.expovariate(0.25)), len(DOMAINS) - 1)
+        domain_index[word_id - 1] = domain
+
+        defined.append((
+            word_id, spelling, pos, _definition(rng, terms[-50:-1]),
+            rng.randrange(spec.days * 4) * day, round(commonness, 6),
+            "benchmark", "synthetic", len(spelling), phrase, hyphenated,
+            python_wordfreq, ngram_freq, commoncrawl, rng.random() < 0.04,
+        ))
+        word_domains.append((word_id, DOMAINS[domain], domain + 1))
+
+        stress = "".join(rng.choice("012") for _ in range(syllables))
+        phonetics.append((word_id, spelling, f"/{ipa}/", arpabet, syllables, stress, "synthetic"))
+        syllable_counts.append(syllables)
+        rhyme_groups.setdefault(ipa[-3:], []).append(word_id)
+        if rng.random() < 0.6:
+            filename = f"{word_id}_{spelling.replace(' ', '_')}.mp3"
+            audio.append((word_id, spelling, filename, "benchmark"))
+
+    tables["defined"] = defined
+    tables["word_domains"] = word_domains
+    tables["word_phonetics"] = phonetics
+    tables["pronunciation_files"] = audio
+
+    # -- embeddings and similarity -----------------------------------------
+    vectors = _embeddings(spec, domain_index)
+    tables["definition_embeddings"] = [
+        (row[0], row[1], row[3], json.dumps([round(float(v), 5) for v in vectors[index]]), EMBEDDING_MODEL)
+        for index, row in enumerate(defined)
+    ]
+    similarity = []
+    if spec.words > 1:
+        neighbour_index, neighbour_score = nearest_neighbours(vectors, spec.neighbours)
+        for index in range(spec.words):
+            for other, score in zip(neighbour_index[index].tolist(), neighbour_score[index].tolist()):
+                if index < other and score >= SIMILARITY_THRESHOLD:
+                    similarity.append((index + 1, other + 1, round(score, 5), EMBEDDING_MODEL))
+    tables["definition_similarity"] = similarity
+
+    pronunciation = []
+    for members in rhyme_groups.values():
+        for position, word1 in enumerate(members):
+            for word2 in members[position + 1:position + 1 + spec.rhymes]:
+                syllable_gap = abs(syllable_counts[word1 - 1] - syllable_counts[word2 - 1])
+                overall = round(rng.uniform(0.55, 0.98), 5)
+                pronunciation.append((
+                    word1, word2, overall, round(1 - overall, 5), round(rng.uniform(0.3, 1.0), 5),
+                    round(rng.uniform(0.7, 1.0), 5), round(1 / (1 + syllable_gap), 5),
+                ))
+    tables["pronunciation_similarity"] = pronunciation
+
+    # -- users and quiz history --------------------------------------------
+    users = []
+    for user_id in range(1, spec.users + 1):
+        role = "admin" if user_id == 1 else "user"
+        users.append((
+            user_id, f"bench{user_id:04d}", f"bench{user_id:04d}@example.invalid",
+            f"Benchmark User {user_id}", BENCHMARK_PASSWORD_HASH, role, (spec.days + user_id) * day,
+        ))
+    tables["users"] = users
+
+    sessions, results, mastery = [], [], []
+    result_id = 0
+    for user_id in range(1, spec.users + 1):
+        # Heavy-tailed activity: a few users answer most questions.
+        answers = int(spec.quiz_answers * min(rng.paretovariate(1.5), 8.0) / 3.0)
+        known = rng.sample(range(1, spec.words + 1), min(spec.words, max(1, answers // 3)))
+        attempts: Dict[int, List[Tuple[bool, int]]] = {}
+        session_number = 0
+        remaining = answers
+        while remaining > 0:
+            size = min(remaining, rng.choice((5, 10, 10, 20)))
+            remaining -= size
+            session_number += 1
+            session_id = f"bench-{user_id}-{session_number}"
+            started = rng.randrange(spec.days * day)
+            difficulty = rng.choice(_DIFFICULTIES)
+            correct = 0
+            for question in range(size):
+                result_id += 1
+                word_id = rng.choice(known)
+                is_correct = rng.random() < 0.72
+                correct += is_correct
+                answered = max(started - question * rng.randrange(5, 40), 0)
+                attempts.setdefault(word_id, []).append((is_correct, answered))
+                results.append((
+                    result_id, user_id, word_id, rng.choice(_QUESTION_TYPES), is_correct,
+                    int(rng.lognormvariate(8.3, 0.5)), answered, difficulty, session_id,
+                ))
+            sessions.append((
+                session_id, user_id, started, max(started - size * 20, 0), "mixed",
+                difficulty, size, correct,
+            ))
+        for word_id, history in sorted(attempts.items()):
+            right = sum(1 for ok, _ in history if ok)
+            streak = 0
+            for ok, _ in sorted(history, key=lambda item: -item[1]):
+                streak = streak + 1 if ok else 0
+            level = "mastered" if right >= 3 and streak >= 3 else "reviewing" if right else "learning"
+            last_seen = min(answered for _, answered in history)
+            interval = int(day * math.pow(2.5, min(streak, 6)))
+            mastery.append((
+                user_id, word_id, level, len(history), right, last_seen,
+                last_seen - interval, streak, round(1.3 + 1.2 * right / len(history), 2),
+            ))
+    tables["quiz_sessions"] = sessions
+    tables["user_quiz_results"] = results
+    tables["user_word_mastery"] = mastery
+    return corpus
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+
+def _resolve_row(row: tuple, columns: Sequence[str], anchor: datetime) -> tuple:
+    resolved = []
+    for column, value in zip(columns, row):
+        if column.endswith("_ago") and value is not None:
+            value = anchor - timedelta(seconds=value)
+            if column == "date_added_ago":
+                value = value.date()
+        resolved.append(value)
+    return tuple(resolved)
+
+
+def _column_names(columns: Iterable[str]) -> str:
+    return ", ".join(column[:-4] if column.endswith("_ago") else column for column in columns)
+
+
+class SchemaInUse(RuntimeError):
+    """The ``vocab`` schema holds data that is not a benchmark corpus."""
+
+
+def check_schema_replaceable(conn, force: bool = False) -> None:
+    """Refuse to drop a ``vocab`` schema that may hold real data.
+
+    The schema may be replaced when it is absent, empty, or was created by
+    ``load_corpus`` (it has a ``benchmark_corpus`` table). Anything else,
+    such as a local development copy of the real dictionary, raises
+    ``SchemaInUse`` unless ``force`` is set.
+    """
+    if force:
+        return
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT to_regclass('vocab.benchmark_corpus') IS NOT NULL,
+                   (SELECT COUNT(*) FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = 'vocab')
+            """
+        )
+        is_benchmark, relations = cur.fetchone()
+    conn.rollback()
+    if is_benchmark or not relations:
+        return
+    raise SchemaInUse(
+        f"The vocab schema in this database has {relations} relations and no benchmark_corpus table, "
+        "so it does not look like a benchmark corpus; loading would drop it. "
+        "Point --dsn at a dedicated benchmark database, or pass --force to replace it anyway."
+    )
+
+
+def load_corpus(conn, corpus: Corpus, anchor: Optional[datetime] = None, force: bool = False) -> Dict[str, int]:
+    """Replace the ``vocab`` schema on ``conn`` with ``corpus``.
+
+    ``conn`` is a psycopg connection to a dedicated benchmark database; the
+    schema is dropped and recreated. ``check_schema_replaceable`` runs first,
+    so an existing schema that is not a benchmark corpus is only dropped
+    with ``force``.
+    """
+    check_schema_replaceable(conn, force)
+    anchor = anchor or datetime.now().replace(microsecond=0)
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA_PATH.read_text(encoding="utf-8"))
+        for table, columns in COLUMNS.items():
+            rows = corpus.tables.get(table, ())
+            with cur.copy(f"COPY vocab.{table} ({_column_names(columns)}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(_resolve_row(row, columns, anchor))
+            logger.info(f"Loaded {len(rows):,} rows into vocab.{table}")
+
+        for table in _IDENTITY_TABLES:
+            cur.execute(
+                f"SELECT setval(pg_get_serial_sequence('vocab.{table}', 'id'), "
+                f"GREATEST((SELECT MAX(id) FROM vocab.{table}), 1))"
+            )
+        cur.execute("REFRESH MATERIALIZED VIEW vocab.word_rarity_metrics")
+        cur.execute(
+            """
+            UPDATE vocab.defined d
+            SET final_rarity = m.final_rarity
+            FROM vocab.word_rarity_metrics m
+            WHERE m.id = d.id
+            """
+        )
+        cur.execute(
+            "INSERT INTO vocab.benchmark_corpus (fingerprint, spec) VALUES (%s, %s)",
+            (corpus.spec.fingerprint, json.dumps(corpus.spec.to_dict())),
+        )
+    conn.commit()
+
+    # Fresh statistics so the planner sees the corpus as production would.
+    previous = conn.autocommit
+    conn.autocommit = True
+    try:
+        conn.execute("VACUUM ANALYZE")
+    finally:
+        conn.autocommit = previous
+    return corpus.counts()
+
+
+def loaded_fingerprint(conn) -> Optional[str]:
+    """Fingerprint of the corpus currently loaded, if any."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT fingerprint FROM vocab.benchmark_corpus ORDER BY loaded_at DESC LIMIT 1")
+            row = cur.fetchone()
+    except Exception:
+        conn.rollback()
+        return None
+    return row[0] if row else None
+
+
+__all__ = [
+    "CORPUS_VERSION",
+    "Corpus",
+    "CorpusSpec",
+    "DOMAINS",
+    "EMBEDDING_MODEL",
+    "SchemaInUse",
+    "check_schema_replaceable",
+    "generate_corpus",
+    "load_corpus",
+    "loaded_fingerprint",
+    "nearest_neighbours",
+]
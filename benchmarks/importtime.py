@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Cold-start cost of the entry points, from ``python -X importtime``.
+
+Each entry point is started in a fresh interpreter with ``-X importtime``. The
+per-module report it writes to stderr is parsed into ``ImportRecord`` rows.
+``format_profile`` summarises them: the total import time, and the modules
+that cost the most in total (``cumulative``) and on their own (``self``).
+That is usually enough to spot a heavy library that came back at module top
+level.
+
+The ``startup.*`` scenarios time the same commands without ``-X importtime``,
+so cold starts are part of every benchmark run and of ``compare``.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Entry point name -> interpreter arguments. Scripts run with --help so they
+# import everything at module level but do no work.
+ENTRY_POINTS: Dict[str, List[str]] = {
+    "web_app": ["-c", "import web_apps.vocabulary_web_app"],
+    "main_cli": ["main_cli.py", "--help"],
+    "cuda_cli": ["cuda_enhanced_cli.py", "--help"],
+    "maintain_rarity": ["scripts/maintain_rarity.py", "--help"],
+    "maintain_similarity": ["scripts/maintain_similarity.py", "--help"],
+    "maintain_pronunciation": ["scripts/maintain_pronunciation.py", "--help"],
+    "update_missing_definitions": ["scripts/update_missing_definitions.py", "--help"],
+}
+
+STARTUP_TIMEOUT_SECONDS = 120
+
+_LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    argv: List[str]
+    returncode: int
+    wall_seconds: float
+    records: List[ImportRecord] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def total_us(self) -> int:
+        """Time spent importing, counting each top-level import once."""
+        return sum(record.cumulative_us for record in self.records if record.depth == 0)
+
+    def top(self, count: int = 15, by: str = "cumulative") -> List[ImportRecord]:
+        key = (lambda r: r.cumulative_us) if by == "cumulative" else (lambda r: r.self_us)
+        return sorted(self.records, key=key, reverse=True)[:count]
+
+    def to_dict(self, count: int = 15) -> Dict[str, object]:
+        return {
+            "argv": self.argv,
+            "returncode": self.returncode,
+            "wall_ms": round(self.wall_seconds * 1000, 2),
+            "import_ms": round(self.total_us / 1000, 2),
+            "modules": len(self.records),
+            "error": self.error,
+            "top_cumulative": [[r.module, round(r.cumulative_us / 1000, 2)] for r in self.top(count)],
+            "top_self": [[r.module, round(r.self_us / 1000, 2)] for r in self.top(count, by="self")],
+        }
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` lines; anything else on stderr is ignored."""
+    records = []
+    for line in stderr.splitlines():
+        match = _LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            # The first level is indented by one space, each nested level by two more.
+            records.append(ImportRecord(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return records
+
+
+def run_entry_point(argv: Sequence[str], importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + list(argv)
+    return subprocess.run(
+        command,
+        cwd=PROJECT_ROOT,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        timeout=STARTUP_TIMEOUT_SECONDS,
+    )
+
+
+def profile_imports(argv: Sequence[str]) -> ImportProfile:
+    started = time.perf_counter()
+    completed = run_entry_point(argv, importtime=True)
+    profile = ImportProfile(list(argv), completed.returncode, time.perf_counter() - started)
+    profile.records = parse_importtime(completed.stderr)
+    if completed.returncode != 0:
+        errors = [line for line in completed.stderr.splitlines() if not line.startswith("import time:")]
+        profile.error = errors[-1] if errors else f"exit status {completed.returncode}"
+    return profile
+
+
+def format_profile(name: str, profile: ImportProfile, count: int = 15) -> str:
+    lines = [
+        f"{name}: {profile.total_us / 1000:.1f} ms importing {len(profile.records)} modules "
+        f"({profile.wall_seconds * 1000:.0f} ms wall)"
+    ]
+    if profile.error:
+        lines.append(f"  failed: {profile.error}")
+    cumulative, own = profile.top(count), profile.top(count, by="self")
+    lines.append(f"  {'cumulative ms':>13}  {'module':<44}{'self ms':>9}  module")
+    for index in range(max(len(cumulative), len(own))):
+        left = f"{cumulative[index].cumulative_us / 1000:>13.1f}  {cumulative[index].module:<44}" if index < len(cumulative) else " " * 59
+        right = f"{own[index].self_us / 1000:>9.1f}  {own[index].module}" if index < len(own) else ""
+        lines.append(f"  {left}{right}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "ENTRY_POINTS",
+    "ImportProfile",
+    "ImportRecord",
+    "format_profile",
+    "parse_importtime",
+    "profile_imports",
+    "run_entry_point",
+]
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Timing, result files and cross-commit comparison for the benchmark suite.
+
+A result file is one JSON document per run, named ``<timestamp>-<commit>.json``
+under ``temp/benchmarks`` (override with ``BENCHMARK_RESULTS_DIR``). It records:
+
+* the commit, including whether the worktree was dirty;
+* the interpreter and platform;
+* the corpus fingerprint;
+* per scenario, latency statistics in milliseconds.
+
+``compare_results`` checks two runs scenario by scenario on the median. The
+median is used because it moves least with scheduler noise.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+RESULT_FORMAT = 1
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_RESULTS_DIR = PROJECT_ROOT / "temp" / "benchmarks"
+
+# A scenario regresses when its median grows by more than both of these.
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+class ScenarioSkipped(Exception):
+    """Raised by a scenario's setup when it cannot run in this environment."""
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    group: str
+    status: str = "ok"  # ok | skipped | error
+    iterations: int = 0
+    mean_ms: Optional[float] = None
+    p50_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    min_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+    stdev_ms: Optional[float] = None
+    detail: Optional[str] = None
+
+
+@dataclass
+class Comparison:
+    name: str
+    base_ms: Optional[float]
+    head_ms: Optional[float]
+    change: Optional[float]
+    verdict: str  # regression | improvement | unchanged | added | removed | not comparable
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile of ``samples`` (``q`` in [0, 1])."""
+    ordered = sorted(samples)
+    if not ordered:
+        raise ValueError("percentile of no samples")
+    position = (len(ordered) - 1) * q
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(name: str, group: str, samples_seconds: Sequence[float]) -> ScenarioResult:
+    samples = [s * 1000.0 for s in samples_seconds]
+    return ScenarioResult(
+        name=name,
+        group=group,
+        iterations=len(samples),
+        mean_ms=round(statistics.fmean(samples), 4),
+        p50_ms=round(percentile(samples, 0.50), 4),
+        p95_ms=round(percentile(samples, 0.95), 4),
+        min_ms=round(min(samples), 4),
+        max_ms=round(max(samples), 4),
+        stdev_ms=round(statistics.stdev(samples), 4) if len(samples) > 1 else 0.0,
+    )
+
+
+def time_operation(
+    operation: Callable[[int], Any],
+    iterations: int,
+    warmup: int = 1,
+    budget_seconds: Optional[float] = None,
+) -> List[float]:
+    """Call ``operation(i)`` ``warmup + iterations`` times; return timed durations.
+
+    ``i`` counts from 0 across warm-up and timed calls so scenarios can vary
+    their inputs deterministically. Stops early once ``budget_seconds`` of
+    timed calls have been spent, keeping at least three samples.
+    """
+    for index in range(warmup):
+        operation(index)
+    samples: List[float] = []
+    spent = 0.0
+    for index in range(warmup, warmup + iterations):
+        started = time.perf_counter()
+        operation(index)
+        elapsed = time.perf_counter() - started
+        samples.append(elapsed)
+        spent += elapsed
+        if budget_seconds is not None and spent > budget_seconds and len(samples) >= 3:
+            break
+    return samples
+
+
+# ---------------------------------------------------------------------------
+# Result files
+# ---------------------------------------------------------------------------
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() if completed.returncode == 0 else None
+
+
+def environment_info() -> Dict[str, Any]:
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def build_report(corpus: Dict[str, Any], results: Sequence[ScenarioResult], label: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "format": RESULT_FORMAT,
+        "label": label,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment_info(),
+        "corpus": corpus,
+        "scenarios": {result.name: asdict(result) for result in results},
+    }
+
+
+def results_dir() -> Path:
+    return Path(os.getenv("BENCHMARK_RESULTS_DIR", str(DEFAULT_RESULTS_DIR)))
+
+
+def write_report(report: Dict[str, Any], output: Optional[Path | str] = None) -> Path:
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        commit = (report["environment"].get("commit") or "unknown")[:7]
+        output = results_dir() / f"{stamp}-{commit}.json"
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+def load_report(path: Path | str) -> Dict[str, Any]:
+    report = json.loads(Path(path).read_text(encoding="utf-8"))
+    if report.get("format") != RESULT_FORMAT:
+        raise ValueError(f"{path}: unsupported result format {report.get('format')!r}")
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+
+def compare_results(
+    base: Dict[str, Any],
+    head: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> List[Comparison]:
+    """Compare ``head`` against ``base`` scenario by scenario on the median."""
+    comparisons: List[Comparison] = []
+    base_scenarios = base.get("scenarios", {})
+    head_scenarios = head.get("scenarios", {})
+
+    for name in sorted(set(base_scenarios) | set(head_scenarios)):
+        before = base_scenarios.get(name)
+        after = head_scenarios.get(name)
+        if before is None or after is None:
+            verdict = "added" if before is None else "removed"
+            comparisons.append(Comparison(
+                name,
+                before and before.get("p50_ms"),
+                after and after.get("p50_ms"),
+                None,
+                verdict,
+            ))
+            continue
+
+        base_ms, head_ms = before.get("p50_ms"), after.get("p50_ms")
+        if before.get("status") != "ok" or after.get("status") != "ok" or not base_ms or head_ms is None:
+            # A scenario that started failing is a regression in its own right.
+            verdict = "regression" if before.get("status") == "ok" and after.get("status") == "error" else "not comparable"
+            comparisons.append(Comparison(name, base_ms, head_ms, None, verdict))
+            continue
+
+        change = head_ms / base_ms - 1.0
+        delta = head_ms - base_ms
+        if change > threshold and delta > min_delta_ms:
+            verdict = "regression"
+        elif change < -threshold and -delta > min_delta_ms:
+            verdict = "improvement"
+        else:
+            verdict = "unchanged"
+        comparisons.append(Comparison(name, base_ms, head_ms, round(change, 4), verdict))
+    return comparisons
+
+
+def format_comparison(comparisons: Sequence[Comparison]) -> str:
+    def ms(value: Optional[float]) -> str:
+        return f"{value:.2f}" if value is not None else "-"
+
+    width = max([len(c.name) for c in comparisons] + [8])
+    lines = [f"{'scenario':<{width}}  {'base p50':>10}  {'head p50':>10}  {'change':>8}  verdict"]
+    for c in comparisons:
+        change = f"{c.change:+.1%}" if c.change is not None else "-"
+        lines.append(f"{c.name:<{width}}  {ms(c.base_ms):>10}  {ms(c.head_ms):>10}  {change:>8}  {c.verdict}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "Comparison",
+    "DEFAULT_MIN_DELTA_MS",
+    "DEFAULT_THRESHOLD",
+    "ScenarioResult",
+    "ScenarioSkipped",
+    "build_report",
+    "compare_results",
+    "format_comparison",
+    "load_report",
+    "percentile",
+    "summarize",
+    "time_operation",
+    "write_report",
+]
@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""Timed benchmark scenarios.
+
+Each scenario is registered with ``@scenario``. The decorated function runs
+its setup, outside the timing, and returns the operation to time. That
+operation takes the iteration number, so inputs differ between calls and are
+still the same on every run.
+
+HTTP scenarios call the FastAPI app in process through ``TestClient``. The
+timings therefore include routing, dependencies, SQL and template rendering,
+but no network or server worker overhead. They are skipped when the web app
+cannot be imported.
+
+The ``startup.*`` scenarios start each entry point in a fresh interpreter
+and need no database.
+
+The quiz scenarios insert sessions and results. The rarity setup stores
+engine state. Re-run ``python -m benchmarks generate`` to get back to the
+pristine corpus.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .corpus import DOMAINS, EMBEDDING_MODEL, SIMILARITY_THRESHOLD
+from .importtime import ENTRY_POINTS, run_entry_point
+from .runner import ScenarioResult, ScenarioSkipped, summarize, time_operation
+
+logger = logging.getLogger(__name__)
+
+Operation = Callable[[int], Any]
+
+
+@dataclass
+class Scenario:
+    name: str
+    setup: Callable[["BenchContext"], Operation]
+    iterations: int = 30
+    warmup: int = 2
+    description: str = ""
+    needs_database: bool = True
+
+    @property
+    def group(self) -> str:
+        return self.name.split(".", 1)[0]
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str, iterations: int = 30, warmup: int = 2, needs_database: bool = True):
+    """Register ``setup(ctx) -> operation`` under ``name`` (``group.case``)."""
+
+    def register(setup: Callable[["BenchContext"], Operation]):
+        SCENARIOS[name] = Scenario(
+            name, setup, iterations, warmup, (setup.__doc__ or "").strip(), needs_database
+        )
+        return setup
+
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Context
+# ---------------------------------------------------------------------------
+
+
+_SESSION_ID_PATTERN = re.compile(r'const sessionId = "([^"]+)"')
+
+
+class BenchContext:
+    """Shared, lazily built state for scenarios: sample inputs, HTTP client."""
+
+    def __init__(self, seed: int = 0, work_dir: Optional[Path] = None):
+        self.seed = seed
+        self.work_dir = Path(work_dir or tempfile.mkdtemp(prefix="vocab-bench-"))
+        self._sample: Optional[Dict[str, Any]] = None
+        self._client = None
+
+    def rng(self, name: str) -> random.Random:
+        """Per-scenario random stream, independent of which scenarios run."""
+        return random.Random(f"{self.seed}:{name}")
+
+    @property
+    def db(self):
+        from core.database_manager import db_manager
+
+        return db_manager
+
+    @property
+    def sample(self) -> Dict[str, Any]:
+        if self._sample is None:
+            with self.db.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT id, term FROM vocab.defined ORDER BY id")
+                    words = cur.fetchall()
+                    cur.execute(
+                        "SELECT u.id, u.username FROM vocab.users u "
+                        "LEFT JOIN vocab.user_quiz_results r ON r.user_id = u.id "
+                        "GROUP BY u.id, u.username ORDER BY COUNT(r.id) DESC, u.id LIMIT 1"
+                    )
+                    user = cur.fetchone()
+            if not words or not user:
+                raise ScenarioSkipped("benchmark corpus is empty; run `python -m benchmarks generate`")
+            rng = self.rng("sample")
+            picked = rng.sample(words, min(len(words), 500))
+            self._sample = {
+                "word_ids": [row[0] for row in picked],
+                "terms": [row[1] for row in picked],
+                "all_word_ids": [row[0] for row in words],
+                "user_id": user[0],
+                "username": user[1],
+            }
+        return self._sample
+
+    @property
+    def client(self):
+        """``TestClient`` for the web app, signed in as the most active user."""
+        if self._client is None:
+            try:
+                from fastapi.testclient import TestClient
+
+                from core.auth import create_access_token
+                from web_apps.vocabulary_web_app import app
+            except Exception as exc:
+                raise ScenarioSkipped(f"web app unavailable: {exc}") from exc
+            client = TestClient(app)
+            token = create_access_token({"sub": self.sample["username"]})
+            client.cookies.set("access_token", f"Bearer {token}")
+            self._client = client
+        return self._client
+
+    def request(self, method: str, path: str, **kwargs):
+        response = self.client.request(method, path, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method} {path} returned {response.status_code}")
+        return response
+
+    def pick(self, key: str, index: int) -> Any:
+        values = self.sample[key]
+        return values[index % len(values)]
+
+
+# ---------------------------------------------------------------------------
+# Search and browse
+# ---------------------------------------------------------------------------
+
+
+@scenario("search.prefix", iterations=50)
+def search_prefix(ctx: BenchContext) -> Operation:
+    """/api/words with a three-letter query, as typed into the search box."""
+    ctx.client  # build the client in setup so it is not timed
+
+    def run(index: int) -> None:
+        ctx.request("GET", "/api/words", params={"q": ctx.pick("terms", index)[:3], "limit": 50})
+
+    return run
+
+
+@scenario("search.rarity_filter", iterations=30)
+def search_rarity_filter(ctx: BenchContext) -> Operation:
+    """/api/words filtered by rarity and domain, paged."""
+    ctx.client
+
+    def run(index: int) -> None:
+        ctx.request(
+            "GET",
+            "/api/words",
+            params={
+                "min_rarity": 0.7,
+                "domain": DOMAINS[index % len(DOMAINS)],
+                "limit": 50,
+                "offset": (index % 5) * 50,
+            },
+        )
+
+    return run
+
+
+@scenario("browse.letters", iterations=30)
+def browse_letters(ctx: BenchContext) -> Operation:
+    """/browse by two-letter prefix, walking the first pages."""
+    ctx.client
+
+    def run(index: int) -> None:
+        ctx.request(
+            "GET",
+            "/browse",
+            params={"letters": ctx.pick("terms", index)[:2], "page": 1 + index % 3},
+        )
+
+    return run
+
+
+@scenario("browse.domain", iterations=20)
+def browse_domain(ctx: BenchContext) -> Operation:
+    """/browse filtered by domain, deep pages included."""
+    ctx.client
+
+    def run(index: int) -> None:
+        ctx.request(
+            "GET",
+            "/browse",
+            params={"domain": DOMAINS[index % len(DOMAINS)], "page": 1 + (index * 7) % 20},
+        )
+
+    return run
+
+
+@scenario("word.detail", iterations=50)
+def word_detail(ctx: BenchContext) -> Operation:
+    """/word/{id}: definition, phonetics, neighbours and audio lookup."""
+    ctx.client
+
+    def run(index: int) -> None:
+        ctx.request("GET", f"/word/{ctx.pick('word_ids', index)}")
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Connection pool and statements
+# ---------------------------------------------------------------------------
+
+
+_WORD_LOOKUP_SQL = """
+    SELECT d.id, d.term, d.definition, d.part_of_speech, wd.primary_domain,
+           wp.ipa_transcription, wp.syllable_count
+    FROM vocab.defined d
+    LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
+    LEFT JOIN vocab.word_phonetics wp ON d.id = wp.word_id
+    WHERE d.id = %s
+"""
+
+
+@scenario("db.checkout", iterations=200)
+def db_checkout(ctx: BenchContext) -> Operation:
+    """Pool checkout plus SELECT 1: the fixed cost of every request's query."""
+
+    def run(index: int) -> None:
+        with ctx.db.get_cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+    return run
+
+
+@scenario("db.word_lookup", iterations=300)
+def db_word_lookup(ctx: BenchContext) -> Operation:
+    """Word lookup by id as a registered statement (prepared per connection)."""
+    statement = ctx.db.register_statement("bench_word_lookup", _WORD_LOOKUP_SQL)
+
+    def run(index: int) -> None:
+        with ctx.db.get_cursor() as cursor:
+            cursor.execute_statement(statement, (ctx.pick("word_ids", index),))
+            cursor.fetchone()
+
+    return run
+
+
+@scenario("db.word_lookup_text", iterations=300)
+def db_word_lookup_text(ctx: BenchContext) -> Operation:
+    """The db.word_lookup query sent as unprepared text, for comparison."""
+
+    def run(index: int) -> None:
+        with ctx.db.get_cursor() as cursor:
+            cursor.execute(_WORD_LOOKUP_SQL, (ctx.pick("word_ids", index),))
+            cursor.fetchone()
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Quiz and analytics
+# ---------------------------------------------------------------------------
+
+
+@scenario("quiz.start", iterations=20)
+def quiz_start(ctx: BenchContext) -> Operation:
+    """POST /quiz/start for a ten-question mixed quiz."""
+    ctx.client
+
+    def run(index: int) -> None:
+        ctx.request(
+            "POST",
+            "/quiz/start",
+            data={"difficulty": ("easy", "medium", "hard")[index % 3], "quiz_type": "mixed", "num_questions": 10},
+        )
+
+    return run
+
+
+@scenario("quiz.submit", iterations=20)
+def quiz_submit(ctx: BenchContext) -> Operation:
+    """POST /quiz/submit recording ten answers and updating mastery."""
+    scenario_def = SCENARIOS["quiz.submit"]
+    session_ids: List[str] = []
+    for _ in range(scenario_def.iterations + scenario_def.warmup):
+        page = ctx.request("POST", "/quiz/start", data={"difficulty": "medium", "quiz_type": "mixed", "num_questions": 10})
+        match = _SESSION_ID_PATTERN.search(page.text)
+        if not match:
+            raise RuntimeError("could not find the quiz session id in /quiz/start")
+        session_ids.append(match.group(1))
+
+    rng = ctx.rng("quiz.submit")
+
+    def run(index: int) -> None:
+        questions = [
+            {
+                "word_id": ctx.pick("word_ids", index * 10 + offset),
+                "is_correct": rng.random() < 0.7,
+                "response_time_ms": rng.randrange(1500, 9000),
+            }
+            for offset in range(10)
+        ]
+        correct = sum(q["is_correct"] for q in questions)
+        results = {
+            "totalQuestions": 10,
+            "correctCount": correct,
+            "score": correct * 10,
+            "difficulty": "medium",
+            "quizType": "mixed",
+            "questions": questions,
+            "reviewData": [],
+        }
+        ctx.request(
+            "POST",
+            "/quiz/submit",
+            data={"session_id": session_ids[index % len(session_ids)], "results": json.dumps(results)},
+        )
+
+    return run
+
+
+@scenario("analytics.dashboard", iterations=20)
+def analytics_dashboard(ctx: BenchContext) -> Operation:
+    """/analytics for the user with the longest quiz history."""
+    ctx.client
+
+    def run(index: int) -> None:
+        ctx.request("GET", "/analytics")
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Similarity
+# ---------------------------------------------------------------------------
+
+
+@scenario("similarity.graph_load", iterations=3, warmup=0)
+def similarity_graph_load(ctx: BenchContext) -> Operation:
+    """Build the in-memory word graph from the similarity tables."""
+    from core.word_graph import WordGraph
+
+    def run(index: int) -> None:
+        WordGraph.load_from_database(embedding_model=EMBEDDING_MODEL)
+
+    return run
+
+
+@scenario("similarity.k_hop", iterations=200)
+def similarity_k_hop(ctx: BenchContext) -> Operation:
+    """Two-hop semantic neighbourhood, capped at 100 nodes."""
+    from core.word_graph import WordGraph
+
+    graph = WordGraph.load_from_database(embedding_model=EMBEDDING_MODEL)
+
+    def run(index: int) -> None:
+        graph.k_hop(ctx.pick("word_ids", index), hops=2, max_nodes=100)
+
+    return run
+
+
+@scenario("similarity.shortest_path", iterations=100)
+def similarity_shortest_path(ctx: BenchContext) -> Operation:
+    """Semantic shortest path between two sampled words (at most six hops)."""
+    from core.word_graph import WordGraph
+
+    graph = WordGraph.load_from_database(embedding_model=EMBEDDING_MODEL)
+
+    def run(index: int) -> None:
+        graph.shortest_path(ctx.pick("word_ids", index), ctx.pick("word_ids", index + 250), max_hops=6)
+
+    return run
+
+
+def _similarity_calculator():
+    """``DefinitionSimilarityCalculator`` without loading the sentence encoder.
+
+    The pairwise pass only reads stored embeddings, so the model (and
+    sentence-transformers) is not needed. The GPU path is never taken, so
+    results are comparable between machines with and without CUDA.
+    """
+    try:
+        from analysis.definition_similarity_calculator import DefinitionSimilarityCalculator
+    except Exception as exc:
+        raise ScenarioSkipped(f"similarity calculator unavailable: {exc}") from exc
+    calculator = DefinitionSimilarityCalculator.__new__(DefinitionSimilarityCalculator)
+    calculator.model_name = EMBEDDING_MODEL
+    calculator.use_gpu_similarity = False
+    return calculator
+
+
+@scenario("similarity.load_embeddings", iterations=3, warmup=0)
+def similarity_load_embeddings(ctx: BenchContext) -> Operation:
+    """Read and decode every stored definition embedding."""
+    calculator = _similarity_calculator()
+
+    def run(index: int) -> None:
+        calculator.load_embeddings()
+
+    return run
+
+
+@scenario("similarity.cosine_block", iterations=10)
+def similarity_cosine_block(ctx: BenchContext) -> Operation:
+    """One 1000-row block of the all-pairs cosine pass, thresholded."""
+    calculator = _similarity_calculator()
+    embeddings = np.array([d.embedding for d in calculator.load_embeddings()], dtype=np.float64)
+    if embeddings.shape[0] == 0:
+        raise ScenarioSkipped("no stored embeddings")
+    block = 1000
+
+    def run(index: int) -> None:
+        start = (index * block) % max(embeddings.shape[0] - block, 1)
+        similarities = calculator.calculate_cosine_similarity_matrix(embeddings[start:start + block], embeddings)
+        np.nonzero(similarities >= SIMILARITY_THRESHOLD)
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Rarity maintenance
+# ---------------------------------------------------------------------------
+
+
+@scenario("rarity.full_recompute", iterations=3, warmup=1)
+def rarity_full_recompute(ctx: BenchContext) -> Operation:
+    """Re-rank every word's frequencies (dry run: nothing written)."""
+    from core.rarity_engine import RarityEngine
+
+    engine = RarityEngine(state_path=ctx.work_dir / "rarity_full.npz")
+
+    def run(index: int) -> None:
+        with ctx.db.get_connection() as conn:
+            engine.full_recompute(conn, dry_run=True)
+
+    return run
+
+
+@scenario("rarity.incremental", iterations=20)
+def rarity_incremental(ctx: BenchContext) -> Operation:
+    """Incremental update for 200 changed words against saved state (dry run)."""
+    from core.rarity_engine import RarityEngine
+
+    engine = RarityEngine(state_path=ctx.work_dir / "rarity_incremental.npz")
+    with ctx.db.get_connection() as conn:
+        engine.full_recompute(conn)  # saves the state incremental runs start from
+    rng = ctx.rng("rarity.incremental")
+    word_ids = ctx.sample["all_word_ids"]
+
+    def run(index: int) -> None:
+        with ctx.db.get_connection() as conn:
+            engine.incremental_update(conn, word_ids=rng.sample(word_ids, min(200, len(word_ids))), dry_run=True)
+
+    return run
+
+
+@scenario("rarity.refresh_view", iterations=3, warmup=0)
+def rarity_refresh_view(ctx: BenchContext) -> Operation:
+    """REFRESH MATERIALIZED VIEW CONCURRENTLY vocab.word_rarity_metrics."""
+
+    def run(index: int) -> None:
+        with ctx.db.get_connection(autocommit=True) as conn:
+            conn.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY vocab.word_rarity_metrics")
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Startup
+# ---------------------------------------------------------------------------
+
+
+def _startup_scenario(name: str, argv: List[str]) -> None:
+    def setup(ctx: BenchContext) -> Operation:
+        def run(index: int) -> None:
+            completed = run_entry_point(argv)
+            if completed.returncode != 0:
+                lines = completed.stderr.strip().splitlines()
+                raise RuntimeError(lines[-1] if lines else f"exit status {completed.returncode}")
+
+        return run
+
+    setup.__doc__ = f"Cold start of `python {' '.join(argv)}` in a fresh interpreter."
+    scenario(f"startup.{name}", iterations=5, warmup=1, needs_database=False)(setup)
+
+
+for _name, _argv in ENTRY_POINTS.items():
+    _startup_scenario(_name, _argv)
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+
+def select_scenarios(patterns: Optional[Iterable[str]] = None) -> List[Scenario]:
+    """Scenarios whose name equals, or whose group matches, any pattern."""
+    patterns = list(patterns or [])
+    if not patterns:
+        return list(SCENARIOS.values())
+    selected = [
+        item for item in SCENARIOS.values()
+        if any(p == item.name or p == item.group for p in patterns)
+    ]
+    unknown = [p for p in patterns if not any(p == item.name or p == item.group for item in SCENARIOS.values())]
+    if unknown:
+        raise ValueError(f"unknown scenario(s): {', '.join(unknown)}")
+    return selected
+
+
+def run_scenarios(
+    ctx: BenchContext,
+    scenarios: Iterable[Scenario],
+    iterations: Optional[int] = None,
+    budget_seconds: Optional[float] = None,
+) -> List[ScenarioResult]:
+    results: List[ScenarioResult] = []
+    for item in scenarios:
+        try:
+            operation = item.setup(ctx)
+            samples = time_operation(
+                operation,
+                iterations or item.iterations,
+                warmup=item.warmup,
+                budget_seconds=budget_seconds,
+            )
+            result = summarize(item.name, item.group, samples)
+        except ScenarioSkipped as exc:
+            result = ScenarioResult(item.name, item.group, status="skipped", detail=str(exc))
+        except Exception as exc:
+            logger.exception(f"Scenario {item.name} failed")
+            result = ScenarioResult(item.name, item.group, status="error", detail=f"{type(exc).__name__}: {exc}")
+        logger.info(
+            f"{item.name}: {result.status}"
+            + (f" p50={result.p50_ms:.2f}ms p95={result.p95_ms:.2f}ms n={result.iterations}" if result.status == "ok" else f" ({result.detail})")
+        )
+        results.append(result)
+    return results
+
+
+__all__ = [
+    "BenchContext",
+    "SCENARIOS",
+    "Scenario",
+    "run_scenarios",
+    "scenario",
+    "select_scenarios",
+]
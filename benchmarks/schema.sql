@@ -0,0 +1,256 @@
+-- Schema for the synthetic benchmark corpus.
+--
+-- Mirrors the production tables the benchmark scenarios touch (see
+-- analysis/migration/postgres_schema.sql, create_rarity_materialized_view.sql
+-- and migrations/). Keep indexes in step with production so query plans match.
+-- Loaded into an empty benchmark database by `python -m benchmarks generate`,
+-- which first checks (benchmarks.corpus.check_schema_replaceable) that any
+-- existing vocab schema is empty or a previous benchmark corpus.
+
+DROP SCHEMA IF EXISTS vocab CASCADE;
+CREATE SCHEMA vocab;
+SET search_path TO vocab;
+
+CREATE TABLE defined (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    term VARCHAR(100),
+    part_of_speech VARCHAR(50),
+    definition TEXT,
+    quizzed INTEGER,
+    correct2 INTEGER,
+    date_added DATE,
+    frequency DOUBLE PRECISION,
+    wav_url VARCHAR(255),
+    word_source VARCHAR(100),
+    definition_source VARCHAR(100),
+    bad INTEGER,
+    freq_src TEXT,
+    len INTEGER,
+    phrase INTEGER,
+    hyphenated INTEGER,
+    has_circular_definition BOOLEAN DEFAULT FALSE,
+    corrected_definition TEXT,
+    needs_manual_circularity_review BOOLEAN DEFAULT FALSE,
+    python_wordfreq REAL,
+    ngram_freq DOUBLE PRECISION,
+    commoncrawl_freq NUMERIC(8, 3),
+    definition_reliability NUMERIC(3, 2),
+    definition_updated TIMESTAMP,
+    final_rarity NUMERIC(8, 6),
+    obsolete_or_archaic BOOLEAN DEFAULT FALSE,
+    definition_with_links TEXT
+);
+CREATE INDEX idx_defined_term ON defined (term);
+
+CREATE TABLE domains (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE word_domains (
+    word_id INTEGER PRIMARY KEY,
+    primary_domain VARCHAR(100),
+    domain_id INTEGER
+);
+CREATE INDEX idx_word_domains_primary ON word_domains (primary_domain);
+
+CREATE TABLE word_phonetics (
+    word_id INTEGER PRIMARY KEY,
+    word VARCHAR(255) NOT NULL,
+    ipa_transcription TEXT,
+    arpabet_transcription TEXT,
+    syllable_count INTEGER,
+    stress_pattern VARCHAR(50),
+    phonemes_json TEXT,
+    transcription_source VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE pronunciation_files (
+    id SERIAL PRIMARY KEY,
+    word_id INTEGER NOT NULL UNIQUE REFERENCES defined(id) ON DELETE CASCADE,
+    term TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    source TEXT NOT NULL,
+    accent TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE definition_embeddings (
+    word_id INTEGER PRIMARY KEY,
+    word VARCHAR(255) NOT NULL,
+    definition_text TEXT NOT NULL,
+    embedding_json TEXT,
+    embedding_model VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE definition_similarity (
+    word1_id INTEGER NOT NULL,
+    word2_id INTEGER NOT NULL,
+    cosine_similarity NUMERIC(6, 5),
+    embedding_model VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (word1_id, word2_id, embedding_model)
+);
+CREATE INDEX idx_definition_similarity_word2 ON definition_similarity (word2_id);
+
+CREATE TABLE pronunciation_similarity (
+    word1_id INTEGER NOT NULL,
+    word2_id INTEGER NOT NULL,
+    overall_similarity NUMERIC(6, 5),
+    phonetic_distance NUMERIC(6, 5),
+    stress_similarity NUMERIC(6, 5),
+    rhyme_score NUMERIC(6, 5),
+    syllable_similarity NUMERIC(6, 5),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (word1_id, word2_id)
+);
+CREATE INDEX idx_pronunciation_similarity_word2 ON pronunciation_similarity (word2_id);
+
+CREATE TABLE users (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    username VARCHAR(50) NOT NULL UNIQUE,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    full_name VARCHAR(255),
+    password_hash VARCHAR(255) NOT NULL,
+    role TEXT DEFAULT 'user',
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_login_at TIMESTAMP
+);
+
+CREATE TABLE quiz_sessions (
+    id VARCHAR(50) PRIMARY KEY,
+    user_id INTEGER,
+    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    quiz_type VARCHAR(20),
+    difficulty VARCHAR(20),
+    topic_domain VARCHAR(100),
+    topic_pos VARCHAR(50),
+    total_questions INTEGER,
+    correct_answers INTEGER DEFAULT 0,
+    session_config JSONB
+);
+CREATE INDEX idx_quiz_sessions_user ON quiz_sessions (user_id);
+
+CREATE TABLE user_quiz_results (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    question_type TEXT NOT NULL,
+    is_correct BOOLEAN NOT NULL,
+    response_time_ms INTEGER,
+    answered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    difficulty_level TEXT DEFAULT 'medium',
+    session_id VARCHAR(50)
+);
+CREATE INDEX idx_user_quiz_results_user ON user_quiz_results (user_id, answered_at);
+
+CREATE TABLE user_word_mastery (
+    user_id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    mastery_level TEXT DEFAULT 'learning',
+    total_attempts INTEGER DEFAULT 0,
+    correct_attempts INTEGER DEFAULT 0,
+    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    next_review TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    streak INTEGER DEFAULT 0,
+    ease_factor REAL DEFAULT 2.5,
+    PRIMARY KEY (user_id, word_id)
+);
+
+CREATE TABLE user_excluded_words (
+    user_id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    excluded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, word_id)
+);
+
+CREATE TABLE user_flashcard_progress (
+    user_id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    mastery_level TEXT DEFAULT 'learning',
+    study_count INTEGER DEFAULT 0,
+    correct_count INTEGER DEFAULT 0,
+    last_studied TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    next_review TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    interval_days INTEGER DEFAULT 1,
+    ease_factor REAL DEFAULT 2.5,
+    PRIMARY KEY (user_id, word_id)
+);
+
+CREATE TABLE flashcard_decks (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    user_id INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE flashcard_deck_items (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    deck_id INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Identifies the loaded corpus so results are only compared like for like.
+CREATE TABLE benchmark_corpus (
+    fingerprint TEXT PRIMARY KEY,
+    spec JSONB NOT NULL,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE MATERIALIZED VIEW word_rarity_metrics AS
+WITH freq_percentiles AS (
+  SELECT
+    id,
+    term,
+    CASE WHEN python_wordfreq IS NOT NULL AND python_wordfreq != -999
+         THEN 1.0 - PERCENT_RANK() OVER (ORDER BY python_wordfreq) END AS python_wordfreq_rarity,
+    CASE WHEN ngram_freq IS NOT NULL AND ngram_freq != -999
+         THEN 1.0 - PERCENT_RANK() OVER (ORDER BY ngram_freq) END AS ngram_freq_rarity,
+    CASE WHEN commoncrawl_freq IS NOT NULL AND commoncrawl_freq != -999
+         THEN 1.0 - PERCENT_RANK() OVER (ORDER BY commoncrawl_freq) END AS commoncrawl_freq_rarity
+  FROM defined
+)
+SELECT
+  id,
+  term,
+  python_wordfreq_rarity,
+  ngram_freq_rarity,
+  commoncrawl_freq_rarity,
+  CASE
+    WHEN python_wordfreq_rarity IS NULL AND ngram_freq_rarity IS NULL AND commoncrawl_freq_rarity IS NULL
+    THEN NULL
+    ELSE (
+      COALESCE(python_wordfreq_rarity * 0.45, 0) +
+      COALESCE(ngram_freq_rarity * 0.35, 0) +
+      COALESCE(commoncrawl_freq_rarity * 0.20, 0)
+    ) / (
+      CASE WHEN python_wordfreq_rarity IS NOT NULL THEN 0.45 ELSE 0 END +
+      CASE WHEN ngram_freq_rarity IS NOT NULL THEN 0.35 ELSE 0 END +
+      CASE WHEN commoncrawl_freq_rarity IS NOT NULL THEN 0.20 ELSE 0 END
+    )
+  END AS final_rarity,
+  CURRENT_TIMESTAMP AS calculated_at,
+  (
+    CASE WHEN python_wordfreq_rarity IS NOT NULL THEN 1 ELSE 0 END +
+    CASE WHEN ngram_freq_rarity IS NOT NULL THEN 1 ELSE 0 END +
+    CASE WHEN commoncrawl_freq_rarity IS NOT NULL THEN 1 ELSE 0 END
+  ) AS num_sources
+FROM freq_percentiles
+WITH NO DATA;
+
+CREATE UNIQUE INDEX idx_word_rarity_id ON word_rarity_metrics (id);
+CREATE INDEX idx_word_rarity_final ON word_rarity_metrics (final_rarity DESC NULLS LAST);
+CREATE INDEX idx_word_rarity_term ON word_rarity_metrics (term);
+CREATE INDEX idx_word_rarity_sources ON word_rarity_metrics (num_sources);
@@ -18,6 +18,8 @@ from urllib.parse import urlparse
 import psycopg
 from tqdm import tqdm
 
+from core.pronunciation_batch import AUDIO_FORMATS, DEFAULT_MANIFEST_PATH, AudioJob, BatchAudioGenerator
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -44,7 +46,15 @@ USER_AGENT = 'Mozilla/5.0 (Educational Vocabulary App; Contact: vocabulary@examp
 class PronunciationLibraryBuilder:
     """Build comprehensive pronunciation library with respectful scraping"""
 
-    def __init__(self):
+    def __init__(self, local_tts: Optional[str] = None, workers: Optional[int] = None,
+                 audio_format: str = 'wav', manifest_path: Path = DEFAULT_MANIFEST_PATH):
+        # With a local engine, words that need synthesis are collected and
+        # rendered in parallel at the end instead of one gTTS call each.
+        self.local_tts = local_tts
+        self.workers = workers
+        self.audio_format = audio_format
+        self.manifest_path = manifest_path
+        self.deferred_jobs = []
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': USER_AGENT})
         self.stats = {
@@ -238,6 +248,45 @@ class PronunciationLibraryBuilder:
         except Exception as e:
             logger.error(f"Database update failed for word_id {word_id}: {e}")
 
+    def update_database_many(self, rows):
+        """Update many (word_id, local_path) pairs over one connection"""
+        if not rows:
+            return
+        try:
+            conn = self.get_db_connection()
+            with conn.cursor() as cursor:
+                cursor.executemany(
+                    "UPDATE vocab.defined SET wav_url = %s WHERE id = %s",
+                    [(f"/pronunciation/{Path(local_path).name}", word_id) for word_id, local_path in rows]
+                )
+                conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Database update failed for {len(rows)} words: {e}")
+
+    def synthesize_deferred(self):
+        """Render every deferred word with the local engine on a process pool"""
+        if not self.deferred_jobs:
+            return
+        logger.info(f"Synthesizing {len(self.deferred_jobs)} words with {self.local_tts}")
+        batch = BatchAudioGenerator(PRONUNCIATION_DIR, self.local_tts, audio_format=self.audio_format,
+                                    workers=self.workers, manifest_path=self.manifest_path)
+        completed = []
+
+        def on_result(word_id, local_path):
+            completed.append((word_id, local_path))
+            if len(completed) >= 500:
+                self.update_database_many(completed)
+                completed.clear()
+
+        try:
+            stats = batch.run(self.deferred_jobs, on_result)
+        finally:
+            self.update_database_many(completed)
+        self.stats['synthesized'] += stats.rendered + stats.linked + stats.skipped
+        self.stats['failed'] += stats.failed
+        self.deferred_jobs = []
+
     def process_all_words(self, limit: Optional[int] = None):
         """
         Process ALL words with intelligent source selection:
@@ -317,7 +366,10 @@ class PronunciationLibraryBuilder:
                 else:
                     logger.info(f"No Free Dictionary audio found for {term}")
 
-            # Strategy 3: Synthesize with gTTS
+            # Strategy 3: Synthesize locally (batched below) or with gTTS
+            if self.local_tts:
+                self.deferred_jobs.append(AudioJob(word_id, term, term))
+                continue
             logger.info(f"Synthesizing {term} with gTTS (last resort)")
             result_path = self.synthesize_with_gtts(word_id, term)
             if result_path:
@@ -326,6 +378,7 @@ class PronunciationLibraryBuilder:
             else:
                 self.stats['failed'] += 1
 
+        self.synthesize_deferred()
         self.print_phase_stats()
 
     def print_phase_stats(self):
@@ -374,10 +427,38 @@ def main():
         type=int,
         help='Limit number of words to process (for testing)'
     )
+    parser.add_argument(
+        '--local-tts',
+        choices=['espeak', 'pyttsx3', 'festival'],
+        help='Synthesize with a local engine on a process pool instead of gTTS'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Synthesis processes for --local-tts (default: one per CPU core)'
+    )
+    parser.add_argument(
+        '--format',
+        dest='audio_format',
+        choices=sorted(AUDIO_FORMATS),
+        default='wav',
+        help='Output format for --local-tts; mp3/ogg are transcoded with ffmpeg'
+    )
+    parser.add_argument(
+        '--manifest',
+        type=Path,
+        default=DEFAULT_MANIFEST_PATH,
+        help='Resumable record of locally synthesized files'
+    )
 
     args = parser.parse_args()
 
-    builder = PronunciationLibraryBuilder()
+    builder = PronunciationLibraryBuilder(
+        local_tts=args.local_tts,
+        workers=args.workers,
+        audio_format=args.audio_format,
+        manifest_path=args.manifest,
+    )
 
     logger.info("=" * 60)
     logger.info("PRONUNCIATION LIBRARY BUILDER")
@@ -388,7 +469,7 @@ def main():
     logger.info(f"  1. Local file (skip if exists)")
     logger.info(f"  2. Merriam-Webster (from database URLs)")
     logger.info(f"  3. Free Dictionary API")
-    logger.info(f"  4. gTTS Synthesis")
+    logger.info(f"  4. {args.local_tts or 'gTTS'} Synthesis")
     logger.info("")
 
     # Process all words with intelligent fallback
@@ -4,8 +4,12 @@ Classify all vocabulary terms using domain_classifier.py and store in word_domai
 
 This script reads all terms from the defined table, runs the domain classifier,
 and stores the results in the word_domains table.
+
+Definition vectors are reused from a local matrix cache and from
+vocab.definition_embeddings; only definitions missing from both are encoded.
 """
 
+import os
 import sys
 import logging
 from pathlib import Path
@@ -14,7 +18,7 @@ import psycopg
 from core.secure_config import get_database_config
 
 # Import the domain classifier
-from domain_classifier import DomainClassifier
+from domain_classifier import DefinitionEmbeddingsProvider, DomainClassifier, MatrixCacheProvider
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,12 +26,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+EMBEDDING_CACHE_DIR = Path(
+    os.getenv("DOMAIN_EMBEDDINGS_DIR", str(Path(__file__).resolve().parent / "temp" / "domain_embeddings"))
+)
+CACHE_SAVE_EVERY = 20  # batches
 
-def fetch_all_terms() -> List[Tuple[int, str, str]]:
-    """Fetch all terms with definitions from defined table."""
-    config = get_database_config()
 
-    conn = psycopg.connect(
+def connect() -> psycopg.Connection:
+    """Open a connection to the vocabulary database."""
+    config = get_database_config()
+    return psycopg.connect(
         host=config.host,
         port=config.port,
         dbname=config.database,
@@ -36,6 +44,11 @@ def fetch_all_terms() -> List[Tuple[int, str, str]]:
         options=f'-c search_path={config.schema}'
     )
 
+
+def fetch_all_terms() -> List[Tuple[int, str, str]]:
+    """Fetch all terms with definitions from defined table."""
+    conn = connect()
+
     cursor = conn.cursor()
 
     logger.info("Fetching all terms from defined table...")
@@ -59,7 +72,11 @@ def classify_and_store(batch_size: int = 500):
 
     # Initialize the domain classifier
     logger.info("Initializing domain classifier...")
-    classifier = DomainClassifier()
+    matrix_cache = MatrixCacheProvider(EMBEDDING_CACHE_DIR / "definitions.npz")
+    classifier = DomainClassifier(
+        embedding_providers=[matrix_cache, DefinitionEmbeddingsProvider(connect)],
+        embedding_cache_dir=str(EMBEDDING_CACHE_DIR),
+    )
 
     # Fetch all terms
     all_terms = fetch_all_terms()
@@ -69,15 +86,7 @@ def classify_and_store(batch_size: int = 500):
         return
 
     # Get database connection
-    config = get_database_config()
-    conn = psycopg.connect(
-        host=config.host,
-        port=config.port,
-        dbname=config.database,
-        user=config.user,
-        password=config.password,
-        options=f'-c search_path={config.schema}'
-    )
+    conn = connect()
 
     # Process in batches
     total_processed = 0
@@ -97,7 +106,7 @@ def classify_and_store(batch_size: int = 500):
 
         # Classify the batch
         logger.info(f"Classifying batch {batch_num + 1}/{total_batches} ({len(batch)} terms)...")
-        results = classifier.classify_batch(terms, definitions)
+        results = classifier.classify_batch(terms, definitions, word_ids=word_ids)
 
         # Prepare data for database insertion
         records_to_insert = []
@@ -124,6 +133,12 @@ def classify_and_store(batch_size: int = 500):
 
         total_processed += len(batch)
         logger.info(f"Progress: {total_processed:,}/{len(all_terms):,} ({100.0*total_processed/len(all_terms):.1f}%)")
+        if (batch_num + 1) % CACHE_SAVE_EVERY == 0:
+            matrix_cache.save()
+
+    matrix_cache.save()
+    stats = classifier.embedding_stats
+    logger.info(f"Definition vectors: {stats.reused:,} reused, {stats.encoded:,} encoded")
 
     # Verify results
     with conn.cursor() as cursor:
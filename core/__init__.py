@@ -6,14 +6,28 @@ This package contains the fundamental building blocks of the vocabulary system:
 - Authentication and authorization
 - Definition lookup and validation
 - Deduplication services
+
+The names below are loaded on first access, so importing one submodule
+(e.g. ``core.config``) does not pull in fastapi, pandas or the NLTK corpora.
 """
 
-from .config import get_db_config, VocabularyConfig
-from .auth import get_current_user
-from .comprehensive_definition_lookup import ComprehensiveDefinitionLookup, enhance_candidate_with_definitions
-from .english_word_validator import validate_english_word, validate_english_words
-from .vocabulary_deduplicator import is_duplicate_term, filter_duplicate_candidates, get_existing_terms
-from .custom_database_manager import CustomDatabaseManager
+from .lazy_imports import lazy_exports
+
+_EXPORTS = {
+    'get_db_config': '.config',
+    'VocabularyConfig': '.config',
+    'get_current_user': '.auth',
+    'ComprehensiveDefinitionLookup': '.comprehensive_definition_lookup',
+    'enhance_candidate_with_definitions': '.comprehensive_definition_lookup',
+    'validate_english_word': '.english_word_validator',
+    'validate_english_words': '.english_word_validator',
+    'is_duplicate_term': '.vocabulary_deduplicator',
+    'filter_duplicate_candidates': '.vocabulary_deduplicator',
+    'get_existing_terms': '.vocabulary_deduplicator',
+    'CustomDatabaseManager': '.custom_database_manager',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
 
 __all__ = [
     'get_db_config',
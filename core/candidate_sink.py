@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""Bulk sink for harvested vocabulary candidates.
+
+Harvesters used to write candidates row by row (or with ``executemany``), so
+on a full Wiktionary dump the database round trips dominated the run. A
+``CandidateSink`` buffers rows instead and, per flush:
+
+1. ``COPY``s them into a session-local staging table (temporary tables are
+   never WAL-logged, so this is the cheap, unlogged path),
+2. merges them into the target table with one ``INSERT ... SELECT`` that
+   keeps the first row per term and skips terms the target (or any table
+   listed in ``skip_existing_in``) already has.
+
+The dedupe rules of the old per-row writers are kept: ``vocabulary_candidates``
+relies on its ``UNIQUE (term)`` constraint, ``candidate_words`` (which has no
+such constraint) skips terms already present case-insensitively in
+``candidate_words`` or ``defined``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SINK_BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class CandidateTable:
+    """How rows are staged and merged into one candidate table."""
+
+    table: str
+    columns: Tuple[Tuple[str, str], ...]  # (name, staging type)
+    case_insensitive: bool = False
+    skip_existing_in: Tuple[str, ...] = ()
+    on_conflict: Optional[str] = None
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.columns)
+
+    @property
+    def staging_table(self) -> str:
+        return f"{self.table.rsplit('.', 1)[-1]}_staging"
+
+    def key(self, alias: str) -> str:
+        return f"LOWER({alias}.term)" if self.case_insensitive else f"{alias}.term"
+
+    def staging_ddl(self) -> str:
+        columns = ",\n                ".join(f"{name} {sql_type}" for name, sql_type in self.columns)
+        return f"""
+            CREATE TEMP TABLE IF NOT EXISTS {self.staging_table} (
+                seq BIGINT NOT NULL,
+                {columns}
+            ) ON COMMIT DELETE ROWS
+        """
+
+    def merge_sql(self) -> str:
+        names = ", ".join(self.column_names)
+        staged = ", ".join(f"s.{name}" for name in self.column_names)
+        exclusions = [
+            f"NOT EXISTS (SELECT 1 FROM {table} e WHERE {self.key('e')} = {self.key('s')})"
+            for table in self.skip_existing_in
+        ]
+        where = "\n            WHERE " + "\n              AND ".join(exclusions) if exclusions else ""
+        conflict = f"\n            ON CONFLICT {self.on_conflict}" if self.on_conflict else ""
+        return f"""
+            INSERT INTO {self.table} ({names})
+            SELECT {staged}
+            FROM (
+                SELECT DISTINCT ON ({self.key('st')}) st.*
+                FROM {self.staging_table} st
+                ORDER BY {self.key('st')}, st.seq
+            ) s{where}
+            ORDER BY s.seq{conflict}
+        """
+
+
+# Wiktionary crawler output (vocab.vocabulary_candidates has UNIQUE (term))
+VOCABULARY_CANDIDATES = CandidateTable(
+    table="vocab.vocabulary_candidates",
+    columns=(
+        ("term", "TEXT"),
+        ("zipf_score", "DOUBLE PRECISION"),
+        ("definition", "TEXT"),
+        ("part_of_speech", "TEXT"),
+        ("etymology", "TEXT"),
+        ("obsolete_or_archaic", "BOOLEAN"),
+        ("source_dump_date", "TEXT"),
+    ),
+    on_conflict="(term) DO NOTHING",
+)
+
+# Spider / harvester output
+CANDIDATE_WORDS = CandidateTable(
+    table="vocab.candidate_words",
+    columns=(
+        ("term", "VARCHAR(100)"),
+        ("source_type", "TEXT"),
+        ("source_reference", "VARCHAR(255)"),
+        ("part_of_speech", "VARCHAR(50)"),
+        ("utility_score", "NUMERIC(5, 3)"),
+        ("rarity_indicators", "JSONB"),
+        ("context_snippet", "TEXT"),
+        ("raw_definition", "TEXT"),
+        ("etymology_preview", "TEXT"),
+        ("date_discovered", "DATE"),
+    ),
+    case_insensitive=True,
+    skip_existing_in=("vocab.candidate_words", "vocab.defined"),
+)
+
+
+@dataclass
+class SinkStats:
+    """Cumulative counters across flushes."""
+
+    flushes: int = 0
+    rows_staged: int = 0
+    rows_inserted: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_staged / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class CandidateSink:
+    """Buffers candidate rows and writes them with COPY + one merge per flush.
+
+    ``connect`` returns a new psycopg connection; it is opened once per flush
+    and closed afterwards. Rows are tuples in ``target.columns`` order (or
+    dicts keyed by column name). Callers decide when to flush; ``full`` turns
+    true once ``batch_size`` rows are buffered.
+    """
+
+    target: CandidateTable
+    connect: Callable[[], psycopg.Connection]
+    batch_size: int = DEFAULT_SINK_BATCH_SIZE
+    stats: SinkStats = field(default_factory=SinkStats)
+    rows: List[Sequence[Any]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def full(self) -> bool:
+        return len(self.rows) >= self.batch_size
+
+    def add(self, row: Sequence[Any] | Dict[str, Any]) -> None:
+        if isinstance(row, dict):
+            row = tuple(row.get(name) for name in self.target.column_names)
+        self.rows.append(row)
+
+    def clear(self) -> None:
+        """Discard buffered rows (e.g. after a failed flush)."""
+
+        self.rows = []
+
+    def flush(self) -> int:
+        """Write buffered rows; returns how many new rows reached the target.
+
+        On failure the buffer is kept so the caller can retry or discard it.
+        """
+
+        if not self.rows:
+            return 0
+
+        started = time.perf_counter()
+        conn = self.connect()
+        try:
+            inserted = self.write(conn, self.rows)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        elapsed = time.perf_counter() - started
+
+        staged = len(self.rows)
+        self.rows = []
+        self.stats.flushes += 1
+        self.stats.rows_staged += staged
+        self.stats.rows_inserted += inserted
+        self.stats.seconds += elapsed
+        logger.debug(f"Flushed {staged:,} rows into {self.target.table} ({inserted:,} new) in {elapsed:.2f}s, "
+                    f"{staged / elapsed if elapsed > 0 else 0:,.0f} rows/s "
+                    f"(session: {self.stats.rows_per_second:,.0f} rows/s)")
+        return inserted
+
+    def write(self, conn: psycopg.Connection, rows: Sequence[Sequence[Any]]) -> int:
+        """Stage and merge ``rows`` inside the caller's transaction."""
+
+        target = self.target
+        with conn.cursor() as cur:
+            cur.execute(target.staging_ddl())
+            copy_sql = f"COPY {target.staging_table} (seq, {', '.join(target.column_names)}) FROM STDIN"
+            with cur.copy(copy_sql) as copy:
+                for seq, row in enumerate(rows):
+                    copy.write_row((seq, *row))
+            cur.execute(target.merge_sql())
+            return cur.rowcount
+
+
+__all__ = [
+    "CANDIDATE_WORDS",
+    "CandidateSink",
+    "CandidateTable",
+    "DEFAULT_SINK_BATCH_SIZE",
+    "SinkStats",
+    "VOCABULARY_CANDIDATES",
+]
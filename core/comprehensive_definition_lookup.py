@@ -5,26 +5,48 @@ Multi-source, multi-tier dictionary lookup with reliability scoring and caching
 """
 
 import asyncio
-import aiohttp
 import json
 import time
 import re
 import hashlib
-from typing import Dict, List, Optional, Tuple, Any, Set
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Any, Set, Callable, Awaitable, Iterable
+from dataclasses import dataclass, asdict, field, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import logging
 import sqlite3
 from urllib.parse import quote, urljoin
-from bs4 import BeautifulSoup
 import mysql.connector
 from .config import get_db_config
+from .lazy_imports import lazy_import
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# The HTTP client and HTML parser load on the first lookup, not whenever the
+# web app or a script imports this module.
+aiohttp = lazy_import('aiohttp')
+bs4 = lazy_import('bs4')
 
 logger = logging.getLogger(__name__)
 
 CACHE_SCHEMA_VERSION = 2
 
+# Concurrent lookup defaults
+DEFAULT_SOURCE_TIMEOUT = 15.0  # seconds before a single source is abandoned
+DEFAULT_SOURCE_CONCURRENCY = 4  # in-flight requests per source
+DEFAULT_TERM_CONCURRENCY = 16  # terms looked up at once by lookup_many
+HIGH_CONFIDENCE_RELIABILITY = 0.8
+
+# Definition cache bounds
+DEFAULT_CACHE_MEMORY_ENTRIES = 10000
+DEFAULT_CACHE_MAX_ENTRIES = 200000
+DEFAULT_CACHE_MAX_AGE_DAYS = 30
+
+SourceHandler = Callable[[str], Awaitable[List["Definition"]]]
+
 @dataclass
 class Definition:
     """Represents a single definition with metadata"""
@@ -80,18 +102,55 @@ SPECIAL_CASE_DEFINITIONS: Dict[str, List[Definition]] = {
 }
 
 class DefinitionCache:
-    """SQLite-based caching system for definitions"""
+    """SQLite-based caching system for definitions
+
+    Each thread keeps one long-lived WAL-mode connection, and a bounded
+    in-memory LRU sits in front of SQLite so repeated hits never touch disk.
+    Access statistics are buffered and written back in batches rather than
+    turning every read into a write. Entries older than ``max_age_days`` or
+    beyond ``max_entries`` (least recently accessed first) are evicted.
+    """
     
-    def __init__(self, cache_file: str = "definition_cache.db"):
+    def __init__(
+        self,
+        cache_file: str = "definition_cache.db",
+        memory_entries: int = DEFAULT_CACHE_MEMORY_ENTRIES,
+        max_entries: Optional[int] = DEFAULT_CACHE_MAX_ENTRIES,
+        max_age_days: Optional[float] = DEFAULT_CACHE_MAX_AGE_DAYS,
+        access_flush_size: int = 256,
+        access_flush_interval: float = 30.0,
+    ):
         self.cache_file = cache_file
+        self.memory_entries = max(0, memory_entries)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.access_flush_size = access_flush_size
+        self.access_flush_interval = access_flush_interval
+        
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        # term_hash -> (result, cached_at as epoch seconds)
+        self._memory: "OrderedDict[str, Tuple[LookupResult, float]]" = OrderedDict()
+        # term_hash -> (pending access count, last access epoch seconds)
+        self._pending_access: Dict[str, Tuple[int, float]] = {}
+        self._last_access_flush = time.monotonic()
+        self._puts_since_evict = 0
         self._init_cache()
     
-    def _init_cache(self):
-        """Initialize the cache database"""
-        conn = sqlite3.connect(self.cache_file)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.cache_file, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._create_schema(conn)
+            self._local.conn = conn
+        return conn
+    
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection):
+        conn.execute("""
             CREATE TABLE IF NOT EXISTS definition_cache (
                 term_hash TEXT PRIMARY KEY,
                 term TEXT NOT NULL,
@@ -103,88 +162,254 @@ class DefinitionCache:
         """)
         
         # Create index for faster lookups
-        cursor.execute("""
+        conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_term ON definition_cache(term)
         """)
-        
         conn.commit()
-        conn.close()
+    
+    def _init_cache(self):
+        """Initialize the cache database"""
+        self._connection()
     
     def _get_term_hash(self, term: str) -> str:
         """Generate hash for term caching"""
         return hashlib.sha256(term.lower().encode()).hexdigest()[:16]
     
+    @staticmethod
+    def _utc_now() -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+    
+    @staticmethod
+    def _format_timestamp(value: datetime) -> str:
+        # Same text format SQLite's CURRENT_TIMESTAMP produces
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    
+    # -- in-memory LRU ---------------------------------------------------
+    
+    @staticmethod
+    def _copy_result(result: LookupResult, cache_hit: bool) -> LookupResult:
+        """Copy down to the definitions, so callers and the LRU never share lists"""
+        return replace(
+            result,
+            definitions_by_pos={
+                pos: [replace(defn, examples=list(defn.examples or [])) for defn in defs]
+                for pos, defs in result.definitions_by_pos.items()
+            },
+            sources_consulted=list(result.sources_consulted),
+            cache_hit=cache_hit,
+        )
+    
+    def _remember(self, term_hash: str, result: LookupResult, cached_at: float):
+        if not self.memory_entries:
+            return
+        with self._lock:
+            self._memory[term_hash] = (result, cached_at)
+            self._memory.move_to_end(term_hash)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+    
+    def _recall(self, term_hash: str, max_age_hours: int) -> Optional[LookupResult]:
+        with self._lock:
+            entry = self._memory.get(term_hash)
+            if entry is None:
+                return None
+            result, cached_at = entry
+            if cached_at <= time.time() - max_age_hours * 3600:
+                del self._memory[term_hash]
+                return None
+            self._memory.move_to_end(term_hash)
+        return self._copy_result(result, cache_hit=True)
+    
+    # -- access statistics -----------------------------------------------
+    
+    def _record_access(self, term_hashes: Iterable[str]):
+        now = time.time()
+        with self._lock:
+            for term_hash in term_hashes:
+                count, _ = self._pending_access.get(term_hash, (0, now))
+                self._pending_access[term_hash] = (count + 1, now)
+            due = (
+                len(self._pending_access) >= self.access_flush_size
+                or time.monotonic() - self._last_access_flush >= self.access_flush_interval
+            )
+        if due:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered access statistics back to SQLite"""
+        with self._lock:
+            pending, self._pending_access = self._pending_access, {}
+            self._last_access_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            conn = self._connection()
+            conn.executemany(
+                """
+                UPDATE definition_cache
+                SET access_count = access_count + ?, last_accessed = ?
+                WHERE term_hash = ?
+                """,
+                [
+                    (count, self._format_timestamp(datetime.fromtimestamp(last, timezone.utc)), term_hash)
+                    for term_hash, (count, last) in pending.items()
+                ],
+            )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Cache access statistics flush failed: {e}")
+    
+    # -- reads -----------------------------------------------------------
+    
     def get(self, term: str, max_age_hours: int = 24) -> Optional[LookupResult]:
         """Retrieve cached result if available and not expired"""
-        term_hash = self._get_term_hash(term)
+        return self.get_many([term], max_age_hours).get(term.lower())
+    
+    def get_many(self, terms: Iterable[str], max_age_hours: int = 24) -> Dict[str, LookupResult]:
+        """Retrieve every cached, unexpired result for ``terms`` keyed by lower-cased term"""
+        hashes = {self._get_term_hash(term): term.lower() for term in terms if term}
+        found: Dict[str, LookupResult] = {}
+        missing = []
         
-        try:
-            conn = sqlite3.connect(self.cache_file)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT result_json, cached_at FROM definition_cache 
-                WHERE term_hash = ? AND cached_at > datetime('now', '-{} hours')
-            """.format(max_age_hours), (term_hash,))
+        for term_hash, term in hashes.items():
+            result = self._recall(term_hash, max_age_hours)
+            if result is not None:
+                found[term] = result
+            else:
+                missing.append(term_hash)
+        
+        if missing:
+            try:
+                found.update(self._read_rows(missing, hashes, max_age_hours))
+            except Exception as e:
+                logger.error(f"Cache read error for {len(missing)} terms: {e}")
+        
+        if found:
+            self._record_access(self._get_term_hash(term) for term in found)
+        return found
+    
+    def _read_rows(
+        self,
+        term_hashes: List[str],
+        hash_to_term: Dict[str, str],
+        max_age_hours: int,
+    ) -> Dict[str, LookupResult]:
+        conn = self._connection()
+        cutoff = self._format_timestamp(self._utc_now() - timedelta(hours=max_age_hours))
+        found: Dict[str, LookupResult] = {}
+        stale = []
+        
+        for start in range(0, len(term_hashes), 500):
+            chunk = term_hashes[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(
+                f"""
+                SELECT term_hash, result_json, cached_at FROM definition_cache
+                WHERE term_hash IN ({placeholders}) AND cached_at > ?
+                """,
+                (*chunk, cutoff),
+            ).fetchall()
             
-            row = cursor.fetchone()
-            if row:
-                # Update access statistics
-                cursor.execute("""
-                    UPDATE definition_cache 
-                    SET access_count = access_count + 1, last_accessed = CURRENT_TIMESTAMP
-                    WHERE term_hash = ?
-                """, (term_hash,))
-                conn.commit()
-                
-                # Deserialize result
-                result_data = json.loads(row[0])
+            for term_hash, result_json, cached_at in rows:
+                result_data = json.loads(result_json)
                 if result_data.get('schema_version') != CACHE_SCHEMA_VERSION:
                     logger.info(
                         "Cache entry for '%s' uses schema %s (expected %s); refreshing",
-                        term,
+                        hash_to_term[term_hash],
                         result_data.get('schema_version'),
                         CACHE_SCHEMA_VERSION,
                     )
-                    cursor.execute(
-                        "DELETE FROM definition_cache WHERE term_hash = ?",
-                        (term_hash,),
-                    )
-                    conn.commit()
-                    return None
+                    stale.append(term_hash)
+                    continue
                 result = self._deserialize_result(result_data)
-                result.cache_hit = True
-                return result
-                
-        except Exception as e:
-            logger.error(f"Cache read error for '{term}': {e}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+                cached_epoch = datetime.fromisoformat(cached_at).replace(tzinfo=timezone.utc).timestamp()
+                self._remember(term_hash, result, cached_epoch)
+                found[hash_to_term[term_hash]] = self._copy_result(result, cache_hit=True)
         
-        return None
+        if stale:
+            conn.executemany("DELETE FROM definition_cache WHERE term_hash = ?", [(h,) for h in stale])
+            conn.commit()
+        return found
+    
+    # -- writes ----------------------------------------------------------
     
     def put(self, term: str, result: LookupResult):
         """Store result in cache"""
-        term_hash = self._get_term_hash(term)
-        result_json = json.dumps(self._serialize_result(result))
+        self.put_many([(term, result)])
+    
+    def put_many(self, items: Iterable[Tuple[str, LookupResult]]):
+        """Store several results in one transaction"""
+        now = time.time()
+        timestamp = self._format_timestamp(datetime.fromtimestamp(now, timezone.utc))
+        rows = []
+        for term, result in items:
+            term_hash = self._get_term_hash(term)
+            rows.append((term_hash, term, json.dumps(self._serialize_result(result)), timestamp, timestamp))
+            self._remember(term_hash, self._copy_result(result, cache_hit=False), now)
+        if not rows:
+            return
         
         try:
-            conn = sqlite3.connect(self.cache_file)
-            cursor = conn.cursor()
-            
-            cursor.execute("""
+            conn = self._connection()
+            conn.executemany("""
                 INSERT OR REPLACE INTO definition_cache 
                 (term_hash, term, result_json, cached_at, access_count, last_accessed)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP, 1, CURRENT_TIMESTAMP)
-            """, (term_hash, term, result_json))
-            
+                VALUES (?, ?, ?, ?, 1, ?)
+            """, rows)
             conn.commit()
         except Exception as e:
-            logger.error(f"Cache write error for '{term}': {e}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+            logger.error(f"Cache write error for {len(rows)} terms: {e}")
+            return
+        
+        with self._lock:
+            self._puts_since_evict += len(rows)
+            evict_due = self._puts_since_evict >= 1000
+            if evict_due:
+                self._puts_since_evict = 0
+        if evict_due:
+            self.evict()
+    
+    def evict(self) -> int:
+        """Drop entries past ``max_age_days`` and beyond ``max_entries``; returns rows removed"""
+        self.flush()
+        removed = 0
+        try:
+            conn = self._connection()
+            if self.max_age_days is not None:
+                cutoff = self._format_timestamp(self._utc_now() - timedelta(days=self.max_age_days))
+                removed += conn.execute(
+                    "DELETE FROM definition_cache WHERE cached_at < ?", (cutoff,)
+                ).rowcount
+            if self.max_entries is not None:
+                removed += conn.execute(
+                    """
+                    DELETE FROM definition_cache WHERE term_hash IN (
+                        SELECT term_hash FROM definition_cache
+                        ORDER BY last_accessed DESC, cached_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                ).rowcount
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Cache eviction failed: {e}")
+            return removed
+        
+        if removed:
+            # Simplest way to keep the LRU consistent with what was deleted
+            with self._lock:
+                self._memory.clear()
+            logger.info(f"Evicted {removed} definition cache entries")
+        return removed
+    
+    def close(self):
+        """Flush statistics and close this thread's connection"""
+        self.flush()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
     
     def _serialize_result(self, result: LookupResult) -> Dict:
         """Convert LookupResult to serializable format"""
@@ -217,12 +442,85 @@ class DefinitionCache:
             lookup_timestamp=datetime.fromisoformat(data['lookup_timestamp'])
         )
 
+class SourceRateLimiter:
+    """Spaces out calls to one source by a minimum interval.
+
+    Each caller reserves the next free slot before sleeping, so concurrent
+    lookups queue up behind each other instead of all firing once the
+    interval has elapsed.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = max(0.0, interval)
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+@dataclass
+class StubDefinitionSource:
+    """Local definition source that never touches the network.
+
+    Pass instances to ``ComprehensiveDefinitionLookup(sources=...)`` in tests
+    or offline runs. ``delay`` simulates latency and ``error`` makes every
+    call raise.
+    """
+    definitions: Dict[str, List[Definition]] = field(default_factory=dict)
+    tier: int = 2
+    base_reliability: float = 0.8
+    rate_limit: float = 0.0
+    timeout: float = DEFAULT_SOURCE_TIMEOUT
+    delay: float = 0.0
+    error: Optional[Exception] = None
+    calls: List[str] = field(default_factory=list)
+
+    async def __call__(self, term: str) -> List[Definition]:
+        self.calls.append(term)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        # Copies, because cross-source scoring adjusts reliability in place
+        return [replace(defn) for defn in self.definitions.get(term, [])]
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            'tier': self.tier,
+            'base_reliability': self.base_reliability,
+            'api_key_required': False,
+            'rate_limit': self.rate_limit,
+            'timeout': self.timeout,
+        }
+
+
 class ComprehensiveDefinitionLookup:
-    """Multi-source definition lookup system with reliability scoring"""
+    """Multi-source definition lookup system with reliability scoring
+
+    All enabled sources are queried concurrently, each behind its own rate
+    limiter, concurrency cap and timeout. A lookup returns as soon as every
+    source has answered or ``enough_definitions`` high-confidence definitions
+    (from at least two sources) have arrived; pass ``enough_definitions=None``
+    to always wait for every source.
+    """
     
-    def __init__(self):
-        self.cache = DefinitionCache()
+    def __init__(
+        self,
+        sources: Optional[Dict[str, StubDefinitionSource]] = None,
+        cache: Optional[DefinitionCache] = None,
+        enough_definitions: Optional[int] = 3,
+        confidence_threshold: float = HIGH_CONFIDENCE_RELIABILITY,
+        max_concurrent_terms: int = DEFAULT_TERM_CONCURRENCY,
+    ):
+        self.cache = cache if cache is not None else DefinitionCache()
         self.session = None
+        self.enough_definitions = enough_definitions
+        self.confidence_threshold = confidence_threshold
+        self.max_concurrent_terms = max(1, max_concurrent_terms)
         
         # Source configuration with reliability tiers
         self.source_config = {
@@ -314,8 +612,30 @@ class ComprehensiveDefinitionLookup:
             'wordnik': None  # Add your API key
         }
         
-        # Rate limiting tracking
-        self.last_call_times = {}
+        # Network-backed sources; ones without a handler are not queried
+        self.source_handlers: Dict[str, SourceHandler] = {
+            'free_dictionary': self._lookup_free_dictionary,
+            'wiktionary': self._lookup_wiktionary,
+            'cambridge': self._lookup_cambridge,
+            'onelook': self._lookup_onelook,
+            'merriam_webster': self._lookup_merriam_webster,
+            'oxford': self._lookup_oxford,
+            'wordnik': self._lookup_wordnik,
+        }
+
+        if sources is not None:
+            self.source_config = {name: source.config() for name, source in sources.items()}
+            self.source_handlers = dict(sources)
+
+        # Per-source rate limiting and concurrency caps, shared by all lookups
+        self.rate_limiters = {
+            name: SourceRateLimiter(config['rate_limit'])
+            for name, config in self.source_config.items()
+        }
+        self.source_semaphores = {
+            name: asyncio.Semaphore(config.get('max_concurrent', DEFAULT_SOURCE_CONCURRENCY))
+            for name, config in self.source_config.items()
+        }
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -331,6 +651,7 @@ class ComprehensiveDefinitionLookup:
         """Async context manager exit"""
         if self.session:
             await self.session.close()
+        self.cache.flush()
     
     async def lookup_term(self, term: str, use_cache: bool = True) -> LookupResult:
         """
@@ -350,30 +671,9 @@ class ComprehensiveDefinitionLookup:
         
         logger.info(f"Looking up definitions for: '{term}'")
         
-        # Collect definitions from all available sources
-        all_definitions = []
-        sources_consulted = []
-        
-        for source_name, config in self.source_config.items():
-            try:
-                logger.info(f"Trying source: {source_name}")
-                if config['api_key_required'] and not self._has_api_key(source_name):
-                    logger.info(f"Skipping {source_name}: no API key configured")
-                    continue
-                
-                await self._respect_rate_limit(source_name)
-                logger.info(f"Calling _lookup_from_source for {source_name}")
-                
-                definitions = await self._lookup_from_source(term, source_name)
-                logger.info(f"Got {len(definitions) if definitions else 0} definitions from {source_name}")
-                if definitions:
-                    all_definitions.extend(definitions)
-                    sources_consulted.append(source_name)
-                    logger.info(f"Added {len(definitions)} definitions from {source_name}")
-                
-            except Exception as e:
-                logger.error(f"Error looking up '{term}' in {source_name}: {e}")
-        
+        # Query every enabled source concurrently
+        all_definitions, sources_consulted = await self._gather_definitions(term)
+
         if not all_definitions:
             special_defs = SPECIAL_CASE_DEFINITIONS.get(term)
             if special_defs:
@@ -407,6 +707,144 @@ class ComprehensiveDefinitionLookup:
         
         return result
     
+    async def lookup_many(self, terms: Iterable[str], use_cache: bool = True) -> Dict[str, LookupResult]:
+        """
+        Look up many terms, pipelining up to ``max_concurrent_terms`` at once.
+
+        Sources stay within their own rate limits because every concurrent
+        lookup shares the same limiters. Results are keyed by normalized term;
+        a term whose lookup fails gets an empty result. Fetched results are
+        cached in chunks of ``max_concurrent_terms`` as they complete, and
+        whatever is pending when the call is interrupted is cached too, so a
+        rerun only fetches what is still missing.
+        """
+        unique_terms = list(dict.fromkeys(t.strip().lower() for t in terms if t and t.strip()))
+        results = self.cache.get_many(unique_terms) if use_cache else {}
+        misses = [term for term in unique_terms if term not in results]
+        gate = asyncio.Semaphore(self.max_concurrent_terms)
+        fresh: Dict[str, Optional[LookupResult]] = {}
+        pending: List[Tuple[str, LookupResult]] = []
+
+        def save_pending():
+            if use_cache and pending:
+                self.cache.put_many(pending)
+            pending.clear()
+
+        async def run(term: str):
+            async with gate:
+                try:
+                    result = await self.lookup_term(term, use_cache=False)
+                except Exception as e:
+                    logger.error(f"Lookup failed for '{term}': {e}")
+                    result = None
+            fresh[term] = result
+            if result is not None:
+                pending.append((term, result))
+                if len(pending) >= self.max_concurrent_terms:
+                    save_pending()
+
+        tasks = [asyncio.create_task(run(term)) for term in misses]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            save_pending()
+
+        return {
+            term: results.get(term) or fresh.get(term) or self._empty_result(term)
+            for term in unique_terms
+        }
+
+    def _enabled_sources(self) -> List[str]:
+        """Sources that have a handler and, where needed, an API key"""
+        enabled = []
+        for source_name, config in self.source_config.items():
+            if source_name not in self.source_handlers:
+                continue
+            if config['api_key_required'] and not self._has_api_key(source_name):
+                logger.info(f"Skipping {source_name}: no API key configured")
+                continue
+            enabled.append(source_name)
+        return enabled
+
+    async def _query_source(self, term: str, source_name: str) -> List[Definition]:
+        """Query one source under its concurrency cap, rate limit and timeout"""
+        config = self.source_config[source_name]
+        async def rate_limited_lookup() -> List[Definition]:
+            await self._respect_rate_limit(source_name)
+            return await self._lookup_from_source(term, source_name)
+
+        async with self.source_semaphores[source_name]:
+            # The rate-limit wait counts against the timeout, so a backed-up
+            # source is abandoned like a slow one
+            return await asyncio.wait_for(
+                rate_limited_lookup(),
+                timeout=config.get('timeout', DEFAULT_SOURCE_TIMEOUT),
+            )
+
+    def _has_enough_definitions(self, results: Dict[str, List[Definition]]) -> bool:
+        """Whether the early-stop criterion is met by the results so far"""
+        if self.enough_definitions is None:
+            return False
+        confident = [
+            (source_name, defn)
+            for source_name, definitions in results.items()
+            for defn in definitions
+            if defn.reliability_score >= self.confidence_threshold
+        ]
+        sources = {source_name for source_name, _ in confident}
+        return len(confident) >= self.enough_definitions and len(sources) >= 2
+
+    async def _gather_definitions(self, term: str) -> Tuple[List[Definition], List[str]]:
+        """
+        Fan out to all enabled sources and collect their definitions.
+
+        Returns definitions and consulted sources in source_config order,
+        regardless of which source answered first.
+        """
+        source_names = self._enabled_sources()
+        tasks = {
+            asyncio.create_task(self._query_source(term, source_name)): source_name
+            for source_name in source_names
+        }
+        results: Dict[str, List[Definition]] = {}
+        pending = set(tasks)
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    source_name = tasks[task]
+                    try:
+                        definitions = task.result()
+                    except asyncio.TimeoutError:
+                        logger.warning(f"Timed out looking up '{term}' in {source_name}")
+                        continue
+                    except Exception as e:
+                        logger.error(f"Error looking up '{term}' in {source_name}: {e}")
+                        continue
+                    logger.debug(f"Got {len(definitions) if definitions else 0} definitions from {source_name}")
+                    if definitions:
+                        results[source_name] = definitions
+
+                if pending and self._has_enough_definitions(results):
+                    logger.debug(f"Enough definitions for '{term}'; cancelling {len(pending)} sources")
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        all_definitions = []
+        sources_consulted = []
+        for source_name in source_names:
+            if source_name in results:
+                all_definitions.extend(results[source_name])
+                sources_consulted.append(source_name)
+        return all_definitions, sources_consulted
+
     def _empty_result(self, term: str) -> LookupResult:
         """Create empty result for invalid terms"""
         return LookupResult(
@@ -440,7 +878,7 @@ class ComprehensiveDefinitionLookup:
         cleaned = cleaned.rstrip(':-–—;,. ')
         return cleaned
 
-    def _extract_headwords(self, soup: BeautifulSoup, extra_selectors: Optional[List[str]] = None) -> Set[str]:
+    def _extract_headwords(self, soup: 'BeautifulSoup', extra_selectors: Optional[List[str]] = None) -> Set[str]:
         """Collect potential headword strings from a soup."""
         selectors = [
             'span.hw',
@@ -484,7 +922,7 @@ class ComprehensiveDefinitionLookup:
 
         return headwords
 
-    def _headword_matches(self, soup: BeautifulSoup, term: str, extra_selectors: Optional[List[str]] = None) -> bool:
+    def _headword_matches(self, soup: 'BeautifulSoup', term: str, extra_selectors: Optional[List[str]] = None) -> bool:
         """Check whether the soup represents the exact headword requested."""
         target = self._normalize_term(term)
         candidates = self._extract_headwords(soup, extra_selectors)
@@ -507,38 +945,15 @@ class ComprehensiveDefinitionLookup:
     
     async def _respect_rate_limit(self, source_name: str):
         """Enforce rate limiting for source"""
-        config = self.source_config[source_name]
-        rate_limit = config['rate_limit']
-        
-        last_call = self.last_call_times.get(source_name, 0)
-        time_since_last = time.time() - last_call
-        
-        if time_since_last < rate_limit:
-            sleep_time = rate_limit - time_since_last
-            logger.debug(f"Rate limiting {source_name}: sleeping {sleep_time:.1f}s")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_call_times[source_name] = time.time()
-    
+        await self.rate_limiters[source_name].acquire()
+
     async def _lookup_from_source(self, term: str, source_name: str) -> List[Definition]:
         """Look up term from specific source"""
-        if source_name == 'free_dictionary':
-            return await self._lookup_free_dictionary(term)
-        elif source_name == 'wiktionary':
-            return await self._lookup_wiktionary(term)
-        elif source_name == 'cambridge':
-            return await self._lookup_cambridge(term)
-        elif source_name == 'onelook':
-            return await self._lookup_onelook(term)
-        elif source_name == 'merriam_webster':
-            return await self._lookup_merriam_webster(term)
-        elif source_name == 'oxford':
-            return await self._lookup_oxford(term)
-        elif source_name == 'wordnik':
-            return await self._lookup_wordnik(term)
-        else:
+        handler = self.source_handlers.get(source_name)
+        if handler is None:
             return []
-    
+        return await handler(term)
+
     async def _lookup_free_dictionary(self, term: str) -> List[Definition]:
         """Lookup from Free Dictionary API"""
         url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{quote(term)}"
@@ -641,7 +1056,7 @@ class ComprehensiveDefinitionLookup:
         definitions = []
         
         try:
-            soup = BeautifulSoup(html_text, 'html.parser')
+            soup = bs4.BeautifulSoup(html_text, 'html.parser')
             
             # Find English section - handle both old and new Wiktionary HTML structure
             english_header = soup.find('h2', {'id': 'English'})
@@ -790,7 +1205,7 @@ class ComprehensiveDefinitionLookup:
         definitions = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = bs4.BeautifulSoup(html, 'html.parser')
 
             if not self._headword_matches(soup, term, extra_selectors=['span.dhw', 'span.di-title', 'span.di-title .hw']):
                 logger.info(f"Cambridge: headword mismatch for '{term}', skipping definitions")
@@ -934,7 +1349,7 @@ class ComprehensiveDefinitionLookup:
                     return []
                     
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = bs4.BeautifulSoup(html, 'html.parser')
 
                 if not self._headword_matches(soup, term, extra_selectors=['span.hword', 'h1.hword']):
                     logger.info(f"Merriam-Webster: headword mismatch for '{term}', skipping")
@@ -1017,7 +1432,7 @@ class ComprehensiveDefinitionLookup:
                     return []
                     
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = bs4.BeautifulSoup(html, 'html.parser')
 
                 if not self._headword_matches(soup, term, extra_selectors=['h1.headword', 'h2.headword', 'span.headword', 'span.hw']):
                     logger.info(f"Oxford: headword mismatch for '{term}', skipping")
@@ -1094,7 +1509,7 @@ class ComprehensiveDefinitionLookup:
                     return []
                     
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = bs4.BeautifulSoup(html, 'html.parser')
 
                 if not self._headword_matches(soup, term, extra_selectors=['h1.word', 'span.word']):
                     logger.info(f"Wordnik: headword mismatch for '{term}', skipping")
@@ -1164,7 +1579,7 @@ class ComprehensiveDefinitionLookup:
                     return []
                     
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = bs4.BeautifulSoup(html, 'html.parser')
 
                 if not self._headword_matches(soup, term, extra_selectors=['span.hwd', 'h2.h1']):
                     logger.info(f"Collins: headword mismatch for '{term}', skipping")
@@ -1233,7 +1648,7 @@ class ComprehensiveDefinitionLookup:
                     return []
                     
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = bs4.BeautifulSoup(html, 'html.parser')
 
                 if not self._headword_matches(soup, term, extra_selectors=['h1', 'span.one-click-content']):
                     logger.info(f"Dictionary.com: headword mismatch for '{term}', skipping")
@@ -1289,7 +1704,7 @@ class ComprehensiveDefinitionLookup:
                     return []
                     
                 html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                soup = bs4.BeautifulSoup(html, 'html.parser')
 
                 if not self._headword_matches(soup, term, extra_selectors=['h1', 'h2']):
                     logger.info(f"Vocabulary.com: headword mismatch for '{term}', skipping")
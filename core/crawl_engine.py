@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""Concurrent crawl engine with per-host politeness.
+
+The autonomous spider used to fetch one page at a time, sleeping
+``rate_limit_delay`` between requests, and parsed each page on the event loop.
+This module splits a crawl into three parts:
+
+* ``CrawlFrontier`` - a priority queue of URLs grouped by host. A host is only
+  handed out once its politeness delay (the configured delay, or the
+  robots.txt ``Crawl-delay`` if that is longer) has passed since its previous
+  request started, and never with more than ``max_per_host`` requests in
+  flight. The first request to a host is always its robots.txt.
+* ``CrawlEngine`` - a pool of fetch workers sharing one keep-alive
+  ``aiohttp`` session whose connector is sized by the total concurrency budget.
+* A process pool that runs the caller's page processor (HTML to text,
+  candidate extraction and filtering) so parsing never stalls the fetchers.
+
+Throughput therefore grows with concurrency across hosts while every single
+host still sees at most one request per delay interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import urldefrag, urlsplit
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "VocabularySpider/1.0 (+https://github.com/flipsmash/vocabulary)"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST_DELAY = 1.0
+DEFAULT_TIMEOUT = 30.0
+
+_ROBOTS_KIND = "robots"
+
+
+def host_key(url: str) -> str:
+    """``scheme://netloc`` of a URL, the unit politeness is applied to."""
+
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+# ---------------------------------------------------------------------------
+# Frontier
+
+
+@dataclass
+class CrawlRequest:
+    """A URL waiting in (or handed out by) the frontier."""
+
+    url: str
+    priority: float = 0.0
+    depth: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def host(self) -> str:
+        return host_key(self.url)
+
+    @property
+    def is_robots(self) -> bool:
+        return self.metadata.get("kind") == _ROBOTS_KIND
+
+
+@dataclass
+class HostState:
+    """Politeness and robots.txt state for one host."""
+
+    delay: float
+    queue: List[Tuple[float, int, CrawlRequest]] = field(default_factory=list)
+    next_allowed: float = 0.0
+    in_flight: int = 0
+    robots_state: str = "unknown"  # unknown -> fetching -> ready
+    robots: Optional[RobotFileParser] = None
+
+
+class CrawlFrontier:
+    """Priority frontier that only releases URLs whose host may be contacted.
+
+    Higher ``priority`` is served first; equal priorities are FIFO. Picking the
+    next request scans the hosts that have queued URLs, which is cheap for the
+    handful of sites a spider session visits.
+    """
+
+    def __init__(self, per_host_delay: float = DEFAULT_PER_HOST_DELAY, max_per_host: int = 1,
+                 respect_robots: bool = True, user_agent: str = DEFAULT_USER_AGENT,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be at least 1")
+        self.per_host_delay = per_host_delay
+        self.max_per_host = max_per_host
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self.clock = clock
+        self.disallowed = 0
+        self._hosts: Dict[str, HostState] = {}
+        self._active: Set[str] = set()
+        self._seen: Set[str] = set()
+        self._sequence = itertools.count()
+        self._queued = 0
+        self._in_flight = 0
+
+    def __len__(self) -> int:
+        return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def host_state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(delay=self.per_host_delay)
+            if not self.respect_robots:
+                state.robots_state = "ready"
+            self._hosts[host] = state
+        return state
+
+    def add(self, url: str, priority: float = 0.0, depth: int = 0,
+            metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Queue ``url`` unless it was seen before or robots.txt forbids it."""
+
+        url = urldefrag(url)[0]
+        if urlsplit(url).scheme not in ("http", "https") or url in self._seen:
+            return False
+        self._seen.add(url)
+
+        request = CrawlRequest(url, priority, depth, dict(metadata or {}))
+        state = self.host_state(request.host)
+        if state.robots_state == "ready" and not self._allowed(state, url):
+            self.disallowed += 1
+            return False
+        heapq.heappush(state.queue, (-priority, next(self._sequence), request))
+        self._queued += 1
+        self._active.add(request.host)
+        return True
+
+    def clear(self) -> None:
+        """Drop queued URLs, keeping host timing, robots rules and the seen set."""
+
+        for state in self._hosts.values():
+            state.queue.clear()
+        self._active.clear()
+        self._queued = 0
+
+    def next_request(self, now: Optional[float] = None) -> Tuple[Optional[CrawlRequest], Optional[float]]:
+        """Hand out the best request whose host is due.
+
+        Returns ``(request, None)``, or ``(None, wait)`` where ``wait`` is the
+        number of seconds until a host becomes due (``None`` when no host can
+        become due without a request completing first).
+        """
+
+        now = self.clock() if now is None else now
+        best_host = None
+        best_key = None
+        wait = None
+        for host in self._active:
+            state = self._hosts[host]
+            if state.robots_state == "fetching" or state.in_flight >= self.max_per_host:
+                continue
+            if state.next_allowed > now:
+                remaining = state.next_allowed - now
+                wait = remaining if wait is None else min(wait, remaining)
+                continue
+            key = state.queue[0][:2] if state.robots_state == "ready" else (float("-inf"), -1)
+            if best_key is None or key < best_key:
+                best_host, best_key = host, key
+
+        if best_host is None:
+            return None, wait
+
+        state = self._hosts[best_host]
+        if state.robots_state == "unknown":
+            state.robots_state = "fetching"
+            request = CrawlRequest(f"{best_host}/robots.txt", metadata={"kind": _ROBOTS_KIND})
+        else:
+            request = heapq.heappop(state.queue)[2]
+            self._queued -= 1
+            if not state.queue:
+                self._active.discard(best_host)
+        state.in_flight += 1
+        state.next_allowed = now + state.delay
+        self._in_flight += 1
+        return request, None
+
+    def complete(self, request: CrawlRequest) -> None:
+        """Release the host slot taken by ``request``."""
+
+        state = self._hosts[request.host]
+        state.in_flight -= 1
+        self._in_flight -= 1
+
+    def set_robots(self, host: str, robots_txt: Optional[str], status: int = 200) -> None:
+        """Install a host's robots.txt and drop queued URLs it disallows.
+
+        Following RFC 9309, a missing file (4xx) allows everything while an
+        unreachable one (5xx or network error) disallows the whole host.
+        """
+
+        state = self.host_state(host)
+        parser = RobotFileParser()
+        if status == 200 and robots_txt is not None:
+            parser.parse(robots_txt.splitlines())
+        elif 400 <= status < 500:
+            parser.allow_all = True
+        else:
+            parser.disallow_all = True
+        # RobotFileParser.can_fetch() refuses everything until it has been read
+        parser.modified()
+        state.robots = parser
+        state.robots_state = "ready"
+
+        crawl_delay = parser.crawl_delay(self.user_agent)
+        if crawl_delay:
+            state.delay = max(state.delay, float(crawl_delay))
+
+        kept = [entry for entry in state.queue if self._allowed(state, entry[2].url)]
+        dropped = len(state.queue) - len(kept)
+        if dropped:
+            heapq.heapify(kept)
+            state.queue = kept
+            self._queued -= dropped
+            self.disallowed += dropped
+            if not kept:
+                self._active.discard(host)
+            logger.info(f"robots.txt for {host} disallows {dropped} queued URL(s)")
+
+    def _allowed(self, state: HostState, url: str) -> bool:
+        return state.robots is None or state.robots.can_fetch(self.user_agent, url)
+
+
+# ---------------------------------------------------------------------------
+# Engine
+
+
+@dataclass
+class FetchResult:
+    """Outcome of one page fetch, handed to the crawl's ``on_page`` callback."""
+
+    request: CrawlRequest
+    status: int = 0
+    elapsed_ms: float = 0.0
+    processed: Any = None
+    error: Optional[str] = None  # Exception raised while fetching or processing
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status == 200
+
+
+@dataclass
+class CrawlStats:
+    """Counters for one ``CrawlEngine.crawl`` call."""
+
+    pages: int = 0
+    errors: int = 0
+    robots_fetches: int = 0
+    disallowed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_minute(self) -> float:
+        return self.pages * 60.0 / self.elapsed if self.elapsed > 0 else 0.0
+
+
+# process(url, html, metadata) runs in the process pool and must be picklable;
+# on_page(result) runs on the event loop and returns links to follow
+PageProcessor = Callable[[str, str, Dict[str, Any]], Any]
+PageCallback = Callable[[FetchResult], Awaitable[Optional[Iterable[Union[str, CrawlRequest]]]]]
+
+
+class CrawlEngine:
+    """Fetch pool + process pool driving a ``CrawlFrontier``.
+
+    Use as an async context manager; the HTTP session, the process pool and
+    the frontier (with its per-host timing and robots rules) live for the
+    whole context, so successive ``crawl`` calls stay polite to hosts they
+    share. ``process_workers=0`` runs page processing in a thread instead.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY,
+                 per_host_delay: float = DEFAULT_PER_HOST_DELAY, max_per_host: int = 1,
+                 process_workers: Optional[int] = None, respect_robots: bool = True,
+                 user_agent: str = DEFAULT_USER_AGENT, timeout: float = DEFAULT_TIMEOUT):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.process_workers = (min(4, os.cpu_count() or 1)
+                                if process_workers is None else max(0, process_workers))
+        self.frontier = CrawlFrontier(per_host_delay, max_per_host, respect_robots, user_agent)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._executor: Optional[Executor] = None
+        self._wakeup: Optional[asyncio.Condition] = None
+
+    async def __aenter__(self) -> "CrawlEngine":
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.frontier.max_per_host,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": self.user_agent},
+        )
+        if self.process_workers:
+            self._executor = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def crawl(self, seeds: Iterable[Union[str, CrawlRequest]], process: PageProcessor,
+                    on_page: PageCallback, max_pages: Optional[int] = None,
+                    max_depth: Optional[int] = None) -> CrawlStats:
+        """Crawl from ``seeds`` until the frontier drains or ``max_pages`` are fetched.
+
+        Every successfully fetched page is passed through ``process`` in the
+        process pool; ``on_page`` then receives the ``FetchResult`` (including
+        failures) and may return URLs or ``CrawlRequest``s to enqueue.
+        Whatever is still queued when the budget runs out is discarded.
+        """
+
+        if self._session is None:
+            raise RuntimeError("CrawlEngine must be used as an async context manager")
+
+        stats = CrawlStats()
+        disallowed_before = self.frontier.disallowed
+        self._wakeup = asyncio.Condition()
+        budget = {"dispatched": 0}
+        started = time.monotonic()
+
+        for seed in seeds:
+            self._enqueue(seed, None, max_depth)
+
+        async def next_request() -> Optional[CrawlRequest]:
+            async with self._wakeup:
+                while True:
+                    if max_pages is not None and budget["dispatched"] >= max_pages:
+                        return None
+                    request, wait = self.frontier.next_request()
+                    if request is not None:
+                        if not request.is_robots:
+                            budget["dispatched"] += 1
+                        return request
+                    if wait is None and self.frontier.in_flight == 0:
+                        self._wakeup.notify_all()
+                        return None
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+
+        async def worker() -> None:
+            while True:
+                request = await next_request()
+                if request is None:
+                    return
+                try:
+                    await self._handle(request, process, on_page, stats, max_depth)
+                finally:
+                    self.frontier.complete(request)
+                    async with self._wakeup:
+                        self._wakeup.notify_all()
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        self.frontier.clear()
+
+        stats.elapsed = time.monotonic() - started
+        stats.disallowed = self.frontier.disallowed - disallowed_before
+        logger.info(f"Crawl finished: {stats.pages} pages ({stats.errors} errors) in "
+                    f"{stats.elapsed:.1f}s, {stats.pages_per_minute:.1f} pages/min")
+        return stats
+
+    def _enqueue(self, item: Union[str, CrawlRequest], parent: Optional[CrawlRequest],
+                 max_depth: Optional[int]) -> bool:
+        if isinstance(item, CrawlRequest):
+            request = item
+        else:
+            request = CrawlRequest(
+                item,
+                priority=parent.priority if parent else 0.0,
+                depth=parent.depth + 1 if parent else 0,
+                metadata=parent.metadata if parent else {},
+            )
+        if max_depth is not None and request.depth > max_depth:
+            return False
+        return self.frontier.add(request.url, request.priority, request.depth, request.metadata)
+
+    async def _fetch(self, url: str) -> Tuple[int, Optional[str]]:
+        async with self._session.get(url) as response:
+            if response.status != 200:
+                return response.status, None
+            return response.status, await response.text(errors="replace")
+
+    async def _handle(self, request: CrawlRequest, process: PageProcessor, on_page: PageCallback,
+                      stats: CrawlStats, max_depth: Optional[int]) -> None:
+        started = time.perf_counter()
+
+        if request.is_robots:
+            stats.robots_fetches += 1
+            try:
+                status, body = await self._fetch(request.url)
+            except Exception as e:
+                logger.warning(f"Could not fetch {request.url}: {e}")
+                status, body = 0, None
+            self.frontier.set_robots(request.host, body, status)
+            return
+
+        result = FetchResult(request)
+        try:
+            result.status, body = await self._fetch(request.url)
+            if body is not None:
+                loop = asyncio.get_running_loop()
+                result.processed = await loop.run_in_executor(
+                    self._executor, process, request.url, body, request.metadata
+                )
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+
+        stats.pages += 1
+        if not result.ok:
+            stats.errors += 1
+            logger.debug(f"Fetch failed for {request.url}: {result.error or f'HTTP {result.status}'}")
+
+        try:
+            follow = await on_page(result)
+        except Exception as e:
+            logger.error(f"Error handling {request.url}: {e}")
+            return
+        for item in follow or ():
+            self._enqueue(item, request, max_depth)
+
+
+__all__ = [
+    "CrawlEngine",
+    "CrawlFrontier",
+    "CrawlRequest",
+    "CrawlStats",
+    "DEFAULT_CONCURRENCY",
+    "DEFAULT_PER_HOST_DELAY",
+    "DEFAULT_USER_AGENT",
+    "FetchResult",
+    "HostState",
+    "host_key",
+]
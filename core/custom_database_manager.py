@@ -3,7 +3,6 @@ Custom Database Manager configured for your specific database schema
 """
 
 import mysql.connector
-import pandas as pd
 import json
 import logging
 from typing import List, Tuple, Optional, Dict
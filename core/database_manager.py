@@ -1,20 +1,36 @@
 #!/usr/bin/env python3
-"""Centralized PostgreSQL connection manager with pooling."""
+"""Centralized PostgreSQL connection manager with pooling.
+
+Pooled connections are set up once, when the pool opens them, rather than on
+every checkout. Hot queries are registered by name with
+``db_manager.register_statement`` and run through
+``cursor.execute_statement``. They are prepared server-side the first time
+they run on a connection, and later runs skip parsing and planning.
+
+Behind a transaction pooler (PgBouncer/Supavisor, see
+``DatabaseConfig.uses_transaction_pooler``) a checkout may land on a
+different server connection, so neither the session setup nor prepared
+statements would carry over. In that mode every checkout sets the
+``search_path`` again and statements are sent unprepared.
+"""
 
 from typing import Optional, Dict, Any, Generator, Union
 import logging
+import time
 from contextlib import contextmanager
 from threading import Lock
 
 import psycopg
 from psycopg.rows import dict_row
-from psycopg_pool import ConnectionPool
+from psycopg_pool import ConnectionPool, PoolTimeout
 from psycopg.pq import TransactionStatus
 
 try:
     from .secure_config import get_database_config
+    from .metrics import metrics
 except ImportError:
     from secure_config import get_database_config
+    from metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +60,9 @@ class DatabaseManager:
         self.config_obj = get_database_config()
         self.config = self.config_obj.to_dict()
         self.pool: Optional[ConnectionPool] = None
+        # Session state (search_path, prepared statements) survives between checkouts
+        self.session_state = not self.config_obj.uses_transaction_pooler
+        self.statements: Dict[str, str] = {}
         self._initialized = False
         self.setup_connection_pool()
 
@@ -54,10 +73,13 @@ class DatabaseManager:
             max_size = self.config_obj.pool_size or 10
             self.pool = ConnectionPool(
                 conninfo=conninfo,
-                min_size=1,
+                min_size=min(self.config_obj.pool_min_size, max_size),
                 max_size=max_size,
                 timeout=self.config_obj.timeout,
                 name="vocabulary_pool",
+                configure=self._configure_connection if self.session_state else None,
+                # Opened on first use, so importing this module never connects
+                open=False,
             )
             self._initialized = True
             logger.info("Database connection pool initialized successfully")
@@ -66,6 +88,57 @@ class DatabaseManager:
             logger.error(f"Failed to create PostgreSQL connection pool: {exc}")
             raise
 
+    def _configure_connection(self, connection: psycopg.Connection) -> None:
+        """Session setup, run once when the pool opens a new connection"""
+        if self.config_obj.schema:
+            connection.execute(
+                f'SET search_path TO "{self.config_obj.schema}"',
+                prepare=False,
+            )
+        # The pool only accepts connections that are back in the idle state
+        connection.commit()
+
+    def warm_pool(self, timeout: float = 30.0) -> bool:
+        """
+        Open the pool and block until it holds its minimum number of connections
+
+        Call at service startup so the first requests do not pay for
+        connection setup. Returns False (and logs) if the pool could not
+        fill up within ``timeout`` seconds.
+        """
+        if not self.pool:
+            raise RuntimeError("Database connection pool is not initialized")
+        started = time.perf_counter()
+        try:
+            self.pool.open(wait=True, timeout=timeout)
+        except PoolTimeout:
+            logger.warning(f"Connection pool not warm after {timeout:.0f}s: {self.pool.get_stats()}")
+            return False
+        logger.info(f"Connection pool warm with {self.pool.min_size} connections in {time.perf_counter() - started:.2f}s")
+        return True
+
+    def register_statement(self, name: str, sql: str) -> str:
+        """
+        Register a hot query under ``name`` for ``cursor.execute_statement``
+
+        Registering the same name twice is allowed only with identical SQL.
+
+        Returns:
+            The name, so callers can keep it in a module-level constant
+
+        Example:
+            WORD_BY_ID = db_manager.register_statement(
+                "word_by_id", "SELECT term FROM vocab.defined WHERE id = %s"
+            )
+            with db_manager.get_cursor() as cursor:
+                cursor.execute_statement(WORD_BY_ID, (123,))
+        """
+        existing = self.statements.get(name)
+        if existing is not None and existing != sql:
+            raise ValueError(f"Statement {name!r} is already registered with different SQL")
+        self.statements[name] = sql
+        return name
+
     @contextmanager
     def get_connection(self, dictionary: bool = False, autocommit: bool = False):
         """
@@ -86,11 +159,15 @@ class DatabaseManager:
         """
         if not self.pool:
             raise RuntimeError("Database connection pool is not initialized")
+        if self.pool.closed:
+            self.pool.open()
 
+        wait_started = time.perf_counter()
         with self.pool.connection() as connection:
+            metrics.observe_pool_wait(time.perf_counter() - wait_started)
             connection.autocommit = autocommit
             try:
-                if self.config_obj.schema:
+                if self.config_obj.schema and not self.session_state:
                     connection.execute(
                         f'SET search_path TO "{self.config_obj.schema}"',
                         prepare=False,
@@ -118,7 +195,7 @@ class DatabaseManager:
             autocommit: Whether to enable autocommit mode
 
         Yields:
-            Database cursor wrapper that disables prepared statements
+            Database cursor wrapper that disables ad-hoc prepared statements
 
         Example:
             with db_manager.get_cursor(dictionary=True) as cursor:
@@ -132,28 +209,57 @@ class DatabaseManager:
         with self.get_connection(dictionary=dictionary, autocommit=autocommit) as conn:
             with conn.cursor(**cursor_kwargs) as real_cursor:
                 # Wrap cursor to intercept execute() and disable prepared statements
-                yield CursorWrapper(real_cursor)
+                yield CursorWrapper(real_cursor, prepare=self.session_state, statements=self.statements)
 
 
 class CursorWrapper:
     """
     Wrapper around psycopg cursor that disables prepared statements by default.
     Prevents "prepared statement already exists" errors when reusing connections.
+    Registered hot statements (and explicit prepare=True) are prepared only
+    when ``prepare`` says the connection keeps session state.
+    Statement timings are recorded in core.metrics by query fingerprint.
     """
 
-    def __init__(self, cursor):
+    def __init__(self, cursor, prepare: bool = False, statements: Optional[Dict[str, str]] = None):
         self._cursor = cursor
+        self._prepare = prepare
+        self._statements = statements if statements is not None else {}
 
     def execute(self, query, params=None, **kwargs):
         """Execute with prepare=False by default"""
+        if not self._prepare:
+            kwargs['prepare'] = False
         kwargs.setdefault('prepare', False)
-        return self._cursor.execute(query, params, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = self._cursor.execute(query, params, **kwargs)
+        except Exception:
+            metrics.observe_query(query, time.perf_counter() - started, failed=True)
+            raise
+        metrics.observe_query(query, time.perf_counter() - started, self._cursor.rowcount)
+        return result
+
+    def execute_statement(self, name: str, params=None):
+        """Execute a statement registered with DatabaseManager.register_statement"""
+        try:
+            query = self._statements[name]
+        except KeyError:
+            raise KeyError(f"No statement registered as {name!r}") from None
+        return self.execute(query, params, prepare=True)
 
     def executemany(self, query, params_seq, **kwargs):
         """Execute many - prepare parameter not supported by psycopg2"""
         # Remove 'prepare' if present, as psycopg2 doesn't support it
         kwargs.pop('prepare', None)
-        return self._cursor.executemany(query, params_seq, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = self._cursor.executemany(query, params_seq, **kwargs)
+        except Exception:
+            metrics.observe_query(query, time.perf_counter() - started, failed=True)
+            raise
+        metrics.observe_query(query, time.perf_counter() - started, self._cursor.rowcount)
+        return result
 
     # Delegate all other methods/attributes to the real cursor
     def __getattr__(self, name):
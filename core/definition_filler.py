@@ -5,26 +5,40 @@ This module provides the core logic used by the CLI to repair entries in the
 ``defined`` table that are missing definitions and/or part-of-speech tags. It
 leans on :class:`core.comprehensive_definition_lookup.ComprehensiveDefinitionLookup`
 so we reuse the existing multi-source definition pipeline.
+
+Large back-fills can use :func:`fill_missing_definitions_pipeline`, which
+streams the missing rows from a server-side cursor, looks terms up through a
+bounded pool of concurrent workers and writes the results in batches while
+recording a resume checkpoint.
 """
 
 from __future__ import annotations
 
 import asyncio
+import itertools
+import json
 import logging
+import os
 import re
-from dataclasses import dataclass
-from datetime import date
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from core.comprehensive_definition_lookup import (
     ComprehensiveDefinitionLookup,
     Definition,
     LookupResult,
 )
-from core.database_manager import database_cursor
+from core.database_manager import database_connection, database_cursor
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_WORKERS = 16
+DEFAULT_WRITE_BATCH = 500
+DEFAULT_FETCH_SIZE = 2000
+DEFAULT_CHECKPOINT_PATH = Path(__file__).resolve().parents[1] / "temp" / "definition_fill_checkpoint.json"
+
 
 # ---------------------------------------------------------------------------
 # Data containers used during filling
@@ -70,6 +84,61 @@ class FillSummary:
     skipped: int = 0
 
 
+@dataclass(slots=True)
+class FillCheckpoint:
+    """Resume point for the pipeline: every term up to ``last_term`` is done."""
+
+    last_term: Optional[str] = None
+    summary: FillSummary = field(default_factory=FillSummary)
+    updated_at: float = 0.0
+
+    @classmethod
+    def load(cls, path: Path) -> "FillCheckpoint":
+        if not path.exists():
+            return cls()
+        try:
+            data = json.loads(path.read_text())
+            return cls(
+                last_term=data.get("last_term"),
+                summary=FillSummary(**data.get("summary", {})),
+                updated_at=float(data.get("updated_at", 0.0)),
+            )
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Ignoring unreadable fill checkpoint %s: %s", path, exc)
+            return cls()
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.updated_at = time.time()
+        payload = {
+            "last_term": self.last_term,
+            "summary": asdict(self.summary),
+            "updated_at": self.updated_at,
+        }
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2))
+        os.replace(tmp_path, path)
+
+
+class ProgressWatermark:
+    """Track the highest term below which every term has completed.
+
+    Workers finish terms out of order; the checkpoint may only advance past a
+    term once all earlier terms are done too.
+    """
+
+    def __init__(self, term: Optional[str] = None):
+        self.term = term
+        self._next = 0
+        self._done: Dict[int, str] = {}
+
+    def complete(self, sequence: int, term: str) -> None:
+        self._done[sequence] = term
+        while self._next in self._done:
+            self.term = self._done.pop(self._next)
+            self._next += 1
+
+
 # ---------------------------------------------------------------------------
 # POS utilities – kept simple so we can unit-test them without hitting the DB
 
@@ -203,6 +272,53 @@ def _load_missing_rows(limit: Optional[int]) -> List[MissingDefinitionRow]:
     return missing_rows
 
 
+def _iter_missing_rows_by_term(
+    after_term: Optional[str] = None,
+    limit: Optional[int] = None,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+) -> Iterator[Tuple[str, MissingDefinitionRow]]:
+    """Stream ``(term key, row)`` pairs from a server-side cursor.
+
+    Rows are ordered by their lower-cased term so all rows of a term arrive
+    together, and ``after_term`` resumes after a checkpointed term.
+    """
+
+    query = (
+        "SELECT LOWER(TRIM(term)) AS term_key, id, term, part_of_speech "
+        "FROM vocab.defined "
+        "WHERE (definition IS NULL OR TRIM(definition) = '') "
+        "AND term IS NOT NULL AND TRIM(term) != ''"
+    )
+    params: List[Any] = []
+    if after_term is not None:
+        query += " AND LOWER(TRIM(term)) > %s"
+        params.append(after_term)
+    query += " ORDER BY term_key, id"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(int(limit))
+
+    with database_connection() as conn:
+        with conn.cursor(name="missing_definition_rows") as cursor:
+            cursor.itersize = fetch_size
+            cursor.execute(query, params)
+            for term_key, row_id, term, part_of_speech in cursor:
+                yield term_key, MissingDefinitionRow(
+                    id=row_id,
+                    term=term.strip(),
+                    part_of_speech=part_of_speech.strip() if part_of_speech else None,
+                )
+
+
+def group_rows_by_term(
+    keyed_rows: Iterable[Tuple[str, MissingDefinitionRow]],
+) -> Iterator[Tuple[str, List[MissingDefinitionRow]]]:
+    """Collapse consecutive rows sharing a term key into one group."""
+
+    for term_key, group in itertools.groupby(keyed_rows, key=lambda item: item[0]):
+        yield term_key, [row for _, row in group]
+
+
 def _fetch_existing_filled_keys(existing_pos_map: Dict[str, str]) -> set[Tuple[str, str]]:
     """Return the set of (term, pos) combinations that already have definitions."""
 
@@ -228,16 +344,8 @@ def _fetch_existing_filled_keys(existing_pos_map: Dict[str, str]) -> set[Tuple[s
 async def _lookup_terms(terms: Iterable[str]) -> Dict[str, LookupResult]:
     """Perform asynchronous lookups for the provided terms."""
 
-    results: Dict[str, LookupResult] = {}
     async with ComprehensiveDefinitionLookup() as lookup:
-        for term in terms:
-            try:
-                lookup_result = await lookup.lookup_term(term, use_cache=True)
-                results[term.lower()] = lookup_result
-            except Exception as exc:  # pragma: no cover - defensive logging
-                logger.error("Definition lookup failed for '%s': %s", term, exc)
-
-    return results
+        return await lookup.lookup_many(terms, use_cache=True)
 
 
 def _prepare_actions_for_term(
@@ -350,32 +458,48 @@ def _prepare_actions_for_term(
     return updates, inserts, skipped
 
 
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
 def _apply_updates(
     updates: List[UpdateAction],
     available_columns: set[str],
+    batch_size: int = DEFAULT_WRITE_BATCH,
 ) -> int:
-    """Persist updates to existing rows."""
+    """Persist updates to existing rows, one set-based UPDATE per batch."""
 
     if not updates:
         return 0
 
+    set_clauses = [
+        "definition = v.definition",
+        "part_of_speech = COALESCE(v.part_of_speech, d.part_of_speech)",
+    ]
+    if "definition_source" in available_columns:
+        set_clauses.append("definition_source = COALESCE(v.definition_source, d.definition_source)")
+
+    sql = f"""
+        UPDATE vocab.defined AS d
+        SET {', '.join(set_clauses)}
+        FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::text[])
+            AS v(id, definition, part_of_speech, definition_source)
+        WHERE d.id = v.id
+    """
+
     updated_rows = 0
     with database_cursor() as cursor:
-        for action in updates:
-            set_clauses = ["definition = %s"]
-            params: List[Any] = [action.definition_text]
-
-            if action.part_of_speech:
-                set_clauses.append("part_of_speech = %s")
-                params.append(action.part_of_speech)
-
-            if action.definition_source and "definition_source" in available_columns:
-                set_clauses.append("definition_source = %s")
-                params.append(action.definition_source)
-
-            params.append(action.row_id)
-            sql = f"UPDATE vocab.defined SET {', '.join(set_clauses)} WHERE id = %s"
-            cursor.execute(sql, params)
+        for chunk in _chunks(updates, batch_size):
+            cursor.execute(
+                sql,
+                (
+                    [action.row_id for action in chunk],
+                    [action.definition_text for action in chunk],
+                    [action.part_of_speech for action in chunk],
+                    [action.definition_source for action in chunk],
+                ),
+            )
             updated_rows += cursor.rowcount
 
     return updated_rows
@@ -384,36 +508,44 @@ def _apply_updates(
 def _apply_inserts(
     inserts: List[InsertAction],
     available_columns: set[str],
+    batch_size: int = DEFAULT_WRITE_BATCH,
 ) -> int:
     """Persist newly created rows for additional parts of speech."""
 
     if not inserts:
         return 0
 
-    inserted_rows = 0
     column_names = ["term", "definition"]
+    select_list = ["v.term", "v.definition"]
     if "part_of_speech" in available_columns:
         column_names.append("part_of_speech")
+        select_list.append("v.part_of_speech")
     if "definition_source" in available_columns:
         column_names.append("definition_source")
+        select_list.append("v.definition_source")
     if "date_added" in available_columns:
         column_names.append("date_added")
+        select_list.append("CURRENT_DATE")
 
-    placeholders = ", ".join(["%s"] * len(column_names))
-    insert_sql = f"INSERT INTO vocab.defined ({', '.join(column_names)}) VALUES ({placeholders})"
+    insert_sql = f"""
+        INSERT INTO vocab.defined ({', '.join(column_names)})
+        SELECT {', '.join(select_list)}
+        FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+            AS v(term, definition, part_of_speech, definition_source)
+    """
 
+    inserted_rows = 0
     with database_cursor() as cursor:
-        for action in inserts:
-            params: List[Any] = [action.term, action.definition_text]
-
-            if "part_of_speech" in available_columns:
-                params.append(action.part_of_speech)
-            if "definition_source" in available_columns:
-                params.append(action.definition_source)
-            if "date_added" in available_columns:
-                params.append(date.today())
-
-            cursor.execute(insert_sql, params)
+        for chunk in _chunks(inserts, batch_size):
+            cursor.execute(
+                insert_sql,
+                (
+                    [action.term for action in chunk],
+                    [action.definition_text for action in chunk],
+                    [action.part_of_speech for action in chunk],
+                    [action.definition_source for action in chunk],
+                ),
+            )
             inserted_rows += cursor.rowcount
 
     return inserted_rows
@@ -421,11 +553,35 @@ def _apply_inserts(
 
 def _fetch_defined_columns() -> set[str]:
     with database_cursor() as cursor:
-        cursor.execute("SHOW COLUMNS FROM vocab.defined")
+        cursor.execute(
+            """
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = 'vocab' AND table_name = 'defined'
+            """
+        )
         columns = {row[0] for row in cursor.fetchall()}
     return columns
 
 
+def _log_dry_run(updates: List[UpdateAction], inserts: List[InsertAction]) -> None:
+    for action in updates:
+        logger.info(
+            "[DRY RUN] Would update row %s ('%s', POS=%s) with definition from %s",
+            action.row_id,
+            action.term,
+            action.part_of_speech,
+            action.definition_source or "unknown source",
+        )
+    for action in inserts:
+        logger.info(
+            "[DRY RUN] Would insert new row for '%s' (%s) from %s",
+            action.term,
+            action.part_of_speech,
+            action.definition_source or "unknown source",
+        )
+
+
 def fill_missing_definitions(
     limit: Optional[int] = None,
     dry_run: bool = False,
@@ -485,21 +641,7 @@ def fill_missing_definitions(
     summary.skipped = total_skipped
 
     if dry_run:
-        for action in updates:
-            logger.info(
-                "[DRY RUN] Would update row %s ('%s', POS=%s) with definition from %s",
-                action.row_id,
-                action.term,
-                action.part_of_speech,
-                action.definition_source or "unknown source",
-            )
-        for action in inserts:
-            logger.info(
-                "[DRY RUN] Would insert new row for '%s' (%s) from %s",
-                action.term,
-                action.part_of_speech,
-                action.definition_source or "unknown source",
-            )
+        _log_dry_run(updates, inserts)
         return summary
 
     available_columns = _fetch_defined_columns()
@@ -517,8 +659,191 @@ def fill_missing_definitions(
     return summary
 
 
+async def _run_pipeline(
+    checkpoint: FillCheckpoint,
+    checkpoint_path: Optional[Path],
+    limit: Optional[int],
+    dry_run: bool,
+    workers: int,
+    batch_size: int,
+    fetch_size: int,
+) -> FillSummary:
+    summary = checkpoint.summary
+    existing_pos_map = await asyncio.to_thread(_fetch_existing_pos_values)
+    existing_filled_keys = await asyncio.to_thread(_fetch_existing_filled_keys, existing_pos_map)
+    available_columns = set() if dry_run else await asyncio.to_thread(_fetch_defined_columns)
+
+    watermark = ProgressWatermark(checkpoint.last_term)
+    pending_updates: List[UpdateAction] = []
+    pending_inserts: List[InsertAction] = []
+    flush_lock = asyncio.Lock()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    started = time.perf_counter()
+
+    async def flush() -> None:
+        async with flush_lock:
+            # Everything completed so far is in the buffers, so the watermark
+            # captured here is safe to persist once they are written.
+            updates, inserts = list(pending_updates), list(pending_inserts)
+            pending_updates.clear()
+            pending_inserts.clear()
+            last_term = watermark.term
+
+            if dry_run:
+                _log_dry_run(updates, inserts)
+            elif updates or inserts:
+                summary.updated += await asyncio.to_thread(
+                    _apply_updates, updates, available_columns, batch_size
+                )
+                summary.inserted += await asyncio.to_thread(
+                    _apply_inserts, inserts, available_columns, batch_size
+                )
+
+            if checkpoint_path is not None and not dry_run:
+                checkpoint.last_term = last_term
+                checkpoint.save(checkpoint_path)
+
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "Progress: %s terms looked up (%.1f/s), %s updated, %s inserted, %s skipped",
+                summary.looked_up,
+                summary.looked_up / elapsed if elapsed else 0.0,
+                summary.updated,
+                summary.inserted,
+                summary.skipped,
+            )
+
+    async def produce() -> None:
+        groups = group_rows_by_term(
+            _iter_missing_rows_by_term(checkpoint.last_term, limit, fetch_size)
+        )
+        sequence = 0
+        rows_read = 0
+        held: Optional[Tuple[str, List[MissingDefinitionRow]]] = None
+        try:
+            while True:
+                group = await asyncio.to_thread(next, groups, None)
+                if group is None:
+                    break
+                rows_read += len(group[1])
+                if held is not None:
+                    await queue.put((sequence, *held))
+                    sequence += 1
+                held = group
+            # LIMIT may have cut the last term short; leave it for the next run
+            truncated = limit is not None and rows_read >= limit and sequence > 0
+            if held is not None and not truncated:
+                await queue.put((sequence, *held))
+        finally:
+            for _ in range(workers):
+                await queue.put(None)
+
+    async def work(lookup: ComprehensiveDefinitionLookup) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            sequence, term_key, rows = item
+            try:
+                lookup_result = await lookup.lookup_term(rows[0].term, use_cache=True)
+            except Exception as exc:
+                logger.error("Definition lookup failed for '%s': %s", rows[0].term, exc)
+                lookup_result = None
+
+            summary.looked_up += 1
+            if lookup_result is None:
+                summary.skipped += len(rows)
+            else:
+                definitions_by_pos = extract_best_definitions(lookup_result, existing_pos_map)
+                term_updates, term_inserts, term_skipped = _prepare_actions_for_term(
+                    rows,
+                    definitions_by_pos,
+                    existing_pos_map,
+                    existing_filled_keys,
+                )
+                pending_updates.extend(term_updates)
+                pending_inserts.extend(term_inserts)
+                summary.skipped += term_skipped
+            watermark.complete(sequence, term_key)
+
+            if len(pending_updates) + len(pending_inserts) >= batch_size:
+                await flush()
+
+    async with ComprehensiveDefinitionLookup(max_concurrent_terms=workers) as lookup:
+        await asyncio.gather(produce(), *(work(lookup) for _ in range(workers)))
+    await flush()
+
+    return summary
+
+
+def fill_missing_definitions_pipeline(
+    limit: Optional[int] = None,
+    dry_run: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    batch_size: int = DEFAULT_WRITE_BATCH,
+    fetch_size: int = DEFAULT_FETCH_SIZE,
+    checkpoint_path: Optional[Path] = DEFAULT_CHECKPOINT_PATH,
+    restart: bool = False,
+) -> FillSummary:
+    """Fill missing definitions with streaming reads and batched writes.
+
+    Missing rows are streamed in term order from a server-side cursor and
+    looked up by ``workers`` concurrent workers (each source still obeys its
+    own rate limit). Updates and inserts are written every ``batch_size``
+    actions, after which the checkpoint records the last term below which
+    everything is done, so an interrupted run resumes from there.
+
+    Args:
+        limit: Optional limit on the number of rows processed in this run.
+        dry_run: When ``True`` we only log the actions without mutating the DB.
+        workers: Number of terms looked up concurrently.
+        batch_size: Number of pending actions that triggers a write.
+        fetch_size: Rows fetched per round trip from the server-side cursor.
+        checkpoint_path: Where progress is recorded; ``None`` disables resume.
+        restart: Ignore (and overwrite) any existing checkpoint.
+
+    Returns:
+        :class:`FillSummary` covering this run and any run it resumed.
+    """
+
+    checkpoint = FillCheckpoint()
+    if checkpoint_path is not None and not restart:
+        checkpoint = FillCheckpoint.load(checkpoint_path)
+        if checkpoint.last_term is not None:
+            logger.info("Resuming definition fill after '%s'", checkpoint.last_term)
+
+    summary = asyncio.run(
+        _run_pipeline(
+            checkpoint,
+            checkpoint_path,
+            limit,
+            dry_run,
+            max(1, workers),
+            max(1, batch_size),
+            fetch_size,
+        )
+    )
+
+    # A run that reached the end starts from the beginning next time
+    if checkpoint_path is not None and not dry_run and limit is None and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    logger.info(
+        "Filled definitions: %s updated, %s inserted, %s skipped",
+        summary.updated,
+        summary.inserted,
+        summary.skipped,
+    )
+
+    return summary
+
+
 __all__ = [
+    "FillCheckpoint",
+    "ProgressWatermark",
     "fill_missing_definitions",
+    "fill_missing_definitions_pipeline",
+    "group_rows_by_term",
     "normalize_pos",
     "map_to_existing_pos",
     "extract_best_definitions",
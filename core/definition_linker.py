@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""Token-trie linker for vocabulary terms inside definitions.
+
+All linkable terms (multi-word phrases included) are compiled into a trie over
+lowercase word tokens. A definition is linked in one left-to-right pass: at
+each word the trie is walked as far as the following words allow and the
+longest complete term wins.
+
+``DefinitionLinkIndex`` remembers, per definition, the digest of the text that
+was linked and its word tokens. The reverse postings derived from that
+(token -> definitions) tell which definitions can contain a given term, so
+adding, removing or re-pointing a term only relinks those definitions.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"[A-Za-z]+(?:['-][A-Za-z]+)*")
+
+INDEX_FORMAT_VERSION = 1
+DEFAULT_LINK_INDEX_PATH = Path(
+    os.getenv(
+        "DEFINITION_LINK_INDEX",
+        str(Path(__file__).resolve().parents[1] / "temp" / "definition_links" / "index.json.gz"),
+    )
+)
+
+TermKey = Tuple[str, ...]
+
+
+def normalize_tokens(value: str) -> TermKey:
+    """Split a term into lowercase word tokens (letters, apostrophes, hyphens)."""
+    if not value:
+        return tuple()
+    return tuple(token.lower() for token in WORD_PATTERN.findall(value))
+
+
+def tokenize_definition(value: str) -> List[Dict[str, str | bool]]:
+    """Return a token stream preserving delimiters for reconstruction."""
+    tokens: List[Dict[str, str | bool]] = []
+    if not value:
+        return tokens
+
+    cursor = 0
+    for match in WORD_PATTERN.finditer(value):
+        start, end = match.span()
+        if start > cursor:
+            tokens.append({"text": value[cursor:start], "is_word": False})
+        tokens.append(
+            {
+                "text": match.group(0),
+                "is_word": True,
+                "word_lower": match.group(0).lower(),
+            }
+        )
+        cursor = end
+
+    if cursor < len(value):
+        tokens.append({"text": value[cursor:], "is_word": False})
+
+    return tokens
+
+
+def definition_digest(definition: str) -> str:
+    """Digest of a definition's text; matches PostgreSQL ``md5(definition)``."""
+    return hashlib.md5(definition.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class VocabularyEntry:
+    word_id: int
+    tokens: TermKey
+
+
+# ---------------------------------------------------------------------------
+# Term trie
+# ---------------------------------------------------------------------------
+
+
+class _TrieNode:
+    __slots__ = ("children", "entry")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.entry: Optional[VocabularyEntry] = None
+
+
+class TermTrie:
+    """Trie over term token sequences; a node holding an entry ends a term."""
+
+    def __init__(self, entries: Iterable[VocabularyEntry] = ()) -> None:
+        self._root = _TrieNode()
+        self._size = 0
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, entry: VocabularyEntry) -> None:
+        node = self._root
+        for token in entry.tokens:
+            node = node.children.setdefault(token, _TrieNode())
+        if node.entry is None:
+            self._size += 1
+        node.entry = entry
+
+    def remove(self, tokens: TermKey) -> Optional[VocabularyEntry]:
+        path = [self._root]
+        for token in tokens:
+            child = path[-1].children.get(token)
+            if child is None:
+                return None
+            path.append(child)
+
+        entry, path[-1].entry = path[-1].entry, None
+        if entry is not None:
+            self._size -= 1
+        # Prune branches that no longer lead to any term.
+        for depth in range(len(tokens), 0, -1):
+            node = path[depth]
+            if node.entry is not None or node.children:
+                break
+            del path[depth - 1].children[tokens[depth - 1]]
+        return entry
+
+    def get(self, tokens: TermKey) -> Optional[VocabularyEntry]:
+        node = self._root
+        for token in tokens:
+            node = node.children.get(token)
+            if node is None:
+                return None
+        return node.entry
+
+    def longest_match(self, words: List[str], start: int) -> Optional[VocabularyEntry]:
+        """Longest term that begins at ``words[start]``."""
+        node = self._root
+        best: Optional[VocabularyEntry] = None
+        for index in range(start, len(words)):
+            node = node.children.get(words[index])
+            if node is None:
+                break
+            if node.entry is not None:
+                best = node.entry
+        return best
+
+
+def link_definition(
+    definition: str,
+    trie: TermTrie,
+    max_links: int,
+) -> Tuple[Optional[str], int]:
+    """Return HTML with anchors for known terms (or ``None``) and the link count."""
+    if not definition:
+        return None, 0
+
+    tokens = tokenize_definition(definition)
+    word_token_indices = [idx for idx, token in enumerate(tokens) if token.get("is_word")]
+    if not word_token_indices:
+        return None, 0
+
+    words = [tokens[idx]["word_lower"] for idx in word_token_indices]
+    spans: Dict[int, Tuple[int, str]] = {}
+    replacements = 0
+    word_cursor = 0
+
+    while word_cursor < len(words) and replacements < max_links:
+        match = trie.longest_match(words, word_cursor)  # type: ignore[arg-type]
+        if match is None:
+            word_cursor += 1
+            continue
+
+        length = len(match.tokens)
+        start_idx = word_token_indices[word_cursor]
+        end_idx = word_token_indices[word_cursor + length - 1]
+        matched_text = "".join(tokens[idx]["text"] for idx in range(start_idx, end_idx + 1))
+
+        if matched_text.strip():
+            anchor = (
+                f'<a href="/word/{match.word_id}" '
+                f'class="definition-link">{html.escape(matched_text)}</a>'
+            )
+            spans[start_idx] = (end_idx, anchor)
+            replacements += 1
+
+        word_cursor += length
+
+    if not spans:
+        return None, 0
+
+    parts: List[str] = []
+    token_idx = 0
+    while token_idx < len(tokens):
+        span = spans.get(token_idx)
+        if span:
+            end_idx, anchor_html = span
+            parts.append(anchor_html)
+            token_idx = end_idx + 1
+            continue
+
+        parts.append(html.escape(tokens[token_idx]["text"]))  # type: ignore[arg-type]
+        token_idx += 1
+
+    return "".join(parts), replacements
+
+
+def build_term_index(rows: Iterable[Tuple[int, str]], min_term_length: int) -> Dict[TermKey, int]:
+    """Map each linkable term key to the lowest word id spelling it."""
+    term_index: Dict[TermKey, int] = {}
+    for word_id, term in rows:
+        tokens = normalize_tokens(term)
+        if not tokens:
+            continue
+        if all(len(token) < min_term_length for token in tokens):
+            continue
+        current = term_index.get(tokens)
+        if current is None or word_id < current:
+            term_index[tokens] = word_id
+    return term_index
+
+
+# ---------------------------------------------------------------------------
+# Incremental link index
+# ---------------------------------------------------------------------------
+
+
+class DefinitionLinkIndex:
+    """What the last linking run saw, used to relink only what changed.
+
+    Stores the term map that was linked against (term key -> word id) and,
+    per definition, the digest of the linked text plus its distinct word
+    tokens. ``definitions_containing`` intersects the token postings of a
+    term, which is a superset of the definitions where that term can match.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_term_length: int,
+        max_links_per_definition: int,
+        terms: Optional[Mapping[TermKey, int]] = None,
+    ) -> None:
+        self.min_term_length = min_term_length
+        self.max_links_per_definition = max_links_per_definition
+        self.terms: Dict[TermKey, int] = dict(terms or {})
+        self.digests: Dict[int, str] = {}
+        self._definition_tokens: Dict[int, Tuple[str, ...]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.digests)
+
+    def settings_match(self, min_term_length: int, max_links_per_definition: int) -> bool:
+        return (self.min_term_length, self.max_links_per_definition) == (
+            min_term_length,
+            max_links_per_definition,
+        )
+
+    def record(self, word_id: int, definition: str) -> None:
+        """Remember ``definition`` as linked for ``word_id``."""
+        self.drop(word_id)
+        tokens = tuple(sorted(set(normalize_tokens(definition))))
+        self.digests[word_id] = definition_digest(definition)
+        self._definition_tokens[word_id] = tokens
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(word_id)
+
+    def drop(self, word_id: int) -> None:
+        self.digests.pop(word_id, None)
+        for token in self._definition_tokens.pop(word_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(word_id)
+                if not postings:
+                    del self._postings[token]
+
+    def definitions_containing(self, tokens: TermKey) -> Set[int]:
+        """Definitions whose words include every token of ``tokens``."""
+        postings = sorted((self._postings.get(token, set()) for token in set(tokens)), key=len)
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for other in postings[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+    def changed_terms(self, terms: Mapping[TermKey, int]) -> Set[TermKey]:
+        """Term keys added, removed or pointing at a different word id."""
+        changed = {key for key, word_id in terms.items() if self.terms.get(key) != word_id}
+        changed.update(key for key in self.terms if key not in terms)
+        return changed
+
+    def affected_definitions(
+        self,
+        terms: Mapping[TermKey, int],
+        digests: Mapping[int, str],
+    ) -> Tuple[Set[int], Set[int]]:
+        """Return (definitions to relink, definitions that disappeared).
+
+        ``terms`` is the current term map and ``digests`` the current
+        definition digests keyed by word id.
+        """
+        affected = {word_id for word_id, digest in digests.items() if self.digests.get(word_id) != digest}
+        for key in self.changed_terms(terms):
+            affected |= self.definitions_containing(key)
+        removed = {word_id for word_id in self.digests if word_id not in digests}
+        return affected - removed, removed
+
+    # -- persistence -------------------------------------------------------
+
+    def save(self, path: Path | str = DEFAULT_LINK_INDEX_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": INDEX_FORMAT_VERSION,
+            "min_term_length": self.min_term_length,
+            "max_links_per_definition": self.max_links_per_definition,
+            "terms": [[" ".join(key), word_id] for key, word_id in self.terms.items()],
+            "definitions": [
+                [word_id, digest, list(self._definition_tokens.get(word_id, ()))]
+                for word_id, digest in self.digests.items()
+            ],
+        }
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        logger.info(f"Saved link index for {len(self.digests):,} definitions to {path}")
+
+    @classmethod
+    def load(cls, path: Path | str = DEFAULT_LINK_INDEX_PATH) -> Optional["DefinitionLinkIndex"]:
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Ignoring unreadable link index {path}: {exc}")
+            return None
+        if payload.get("version") != INDEX_FORMAT_VERSION:
+            logger.info(f"Ignoring link index {path} with format version {payload.get('version')}")
+            return None
+
+        index = cls(
+            min_term_length=payload["min_term_length"],
+            max_links_per_definition=payload["max_links_per_definition"],
+            terms={tuple(key.split(" ")): word_id for key, word_id in payload["terms"]},
+        )
+        for word_id, digest, tokens in payload["definitions"]:
+            index.digests[word_id] = digest
+            index._definition_tokens[word_id] = tuple(tokens)
+            for token in tokens:
+                index._postings.setdefault(token, set()).add(word_id)
+        return index
+
+
+__all__ = [
+    "DEFAULT_LINK_INDEX_PATH",
+    "DefinitionLinkIndex",
+    "TermTrie",
+    "VocabularyEntry",
+    "WORD_PATTERN",
+    "build_term_index",
+    "definition_digest",
+    "link_definition",
+    "normalize_tokens",
+    "tokenize_definition",
+]
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""Read-only SQLite snapshot of the public dictionary data.
+
+The public pages (``/``, ``/browse``, ``/word/{id}``, ``/random``,
+``/api/words``) only show data that changes when the maintenance scripts
+run. ``export_snapshot`` denormalises that data into one SQLite file:
+
+* ``words``: one row per word, with the rarity view, domain, phonetics and
+  pronunciation columns already joined in, plus the global frequency rank;
+* ``words_fts``: an FTS5 trigram index over term and definition, used for
+  substring searches;
+* ``neighbours``: each word's most similar words for one embedding model;
+* ``snapshot_info``: format, build time and source metadata.
+
+With ``DICTIONARY_SNAPSHOT`` set to a snapshot file, the web app's
+``VocabularyDatabase`` serves those pages from it. A replica that only
+serves anonymous traffic then needs no PostgreSQL connection at all.
+Signed-in traffic still does: sign-in, per-user exclusions (so signed-in
+``/api/words`` searches), flashcards and quizzes always read PostgreSQL,
+so a replica that accepts signed-in users needs the usual ``DB_*``
+settings as well as ``DICTIONARY_SNAPSHOT``. Such a replica skips pool
+warm-up and flashcard table creation at startup; the tables are created
+by the primary app.
+
+Build the file with ``scripts/export_dictionary_snapshot.py`` after the
+maintenance scripts have run. Then restart the replicas: a running process
+keeps reading the file it opened.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .word_graph import DEFAULT_EMBEDDING_MODEL
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parents[1] / "dictionary_snapshot.sqlite"
+DEFAULT_NEIGHBOURS = 20
+
+# Column order matches WordQueryBuilder.WORD_COLUMNS in the web app, so rows
+# convert with WordQueryBuilder.tuple_to_word.
+WORD_COLUMNS = (
+    "id, term, definition, definition_with_links, part_of_speech, final_rarity, "
+    "num_sources, primary_domain, wav_url, ipa_transcription, arpabet_transcription, "
+    "syllable_count, stress_pattern, obsolete_or_archaic"
+)
+
+_SCHEMA = """
+CREATE TABLE snapshot_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL,
+    definition TEXT,
+    definition_with_links TEXT,
+    part_of_speech TEXT,
+    final_rarity REAL,
+    num_sources INTEGER,
+    primary_domain TEXT,
+    wav_url TEXT,
+    ipa_transcription TEXT,
+    arpabet_transcription TEXT,
+    syllable_count INTEGER,
+    stress_pattern TEXT,
+    obsolete_or_archaic INTEGER,
+    term_lower TEXT NOT NULL,
+    frequency_rank INTEGER
+);
+
+CREATE TABLE neighbours (
+    word_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    neighbour_id INTEGER NOT NULL,
+    similarity REAL NOT NULL,
+    PRIMARY KEY (word_id, position)
+) WITHOUT ROWID;
+"""
+
+_INDEXES = """
+CREATE INDEX words_term_lower ON words (term_lower);
+CREATE INDEX words_domain ON words (primary_domain, term_lower);
+CREATE INDEX words_part_of_speech ON words (part_of_speech, term_lower);
+CREATE INDEX words_frequency_rank ON words (frequency_rank);
+CREATE VIRTUAL TABLE words_fts USING fts5(
+    term, definition, content='words', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO words_fts (words_fts) VALUES ('rebuild');
+"""
+
+# Same joins as WordQueryBuilder, flattened to one row per word
+_EXPORT_WORDS_SQL = """
+SELECT DISTINCT ON (d.id)
+       d.id, d.term, d.definition, d.definition_with_links, d.part_of_speech,
+       COALESCE(d.final_rarity, wrm.final_rarity)::float8 AS final_rarity,
+       wrm.num_sources,
+       wd.primary_domain,
+       COALESCE(d.wav_url, CASE WHEN pf.filename IS NOT NULL
+                THEN '/pronunciation/' || pf.filename ELSE NULL END) AS wav_url,
+       wp.ipa_transcription, wp.arpabet_transcription, wp.syllable_count,
+       wp.stress_pattern, d.obsolete_or_archaic
+FROM vocab.defined d
+LEFT JOIN vocab.word_rarity_metrics wrm ON d.id = wrm.id
+LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
+LEFT JOIN vocab.word_phonetics wp ON d.id = wp.word_id
+LEFT JOIN vocab.pronunciation_files pf ON d.id = pf.word_id
+ORDER BY d.id
+"""
+
+_EXPORT_NEIGHBOURS_SQL = """
+SELECT word_id, position, neighbour_id, cosine_similarity::float8
+FROM (
+    SELECT pairs.*,
+           ROW_NUMBER() OVER (
+               PARTITION BY pairs.word_id ORDER BY pairs.cosine_similarity DESC, pairs.neighbour_id
+           ) AS position
+    FROM (
+        SELECT word1_id AS word_id, word2_id AS neighbour_id, cosine_similarity
+        FROM vocab.definition_similarity WHERE embedding_model = %s
+        UNION ALL
+        SELECT word2_id, word1_id, cosine_similarity
+        FROM vocab.definition_similarity WHERE embedding_model = %s
+    ) pairs
+) ranked
+WHERE position <= %s
+ORDER BY word_id, position
+"""
+
+_FETCH_BATCH_SIZE = 50000
+
+
+# ---------------------------------------------------------------------------
+# Export
+
+
+def frequency_ranks(rarities: Sequence[Optional[float]]) -> List[Optional[int]]:
+    """SQL ``RANK()`` by ascending rarity; words without rarity get no rank."""
+    order = sorted((r, i) for i, r in enumerate(rarities) if r is not None)
+    ranks: List[Optional[int]] = [None] * len(rarities)
+    previous = None
+    rank = 0
+    for position, (rarity, index) in enumerate(order, start=1):
+        if rarity != previous:
+            rank, previous = position, rarity
+        ranks[index] = rank
+    return ranks
+
+
+def export_snapshot(
+    conn,
+    path: Path | str = DEFAULT_SNAPSHOT_PATH,
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+    neighbours: int = DEFAULT_NEIGHBOURS,
+) -> Dict[str, int]:
+    """Write a snapshot of the dictionary from the PostgreSQL connection ``conn``.
+
+    The file is built next to ``path`` and moved into place when complete, so
+    readers never see a partial snapshot. Returns row counts per table.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    started = time.perf_counter()
+
+    with conn.cursor() as cursor:
+        cursor.execute(_EXPORT_WORDS_SQL)
+        words = [list(row) for row in cursor.fetchall()]
+    ranks = frequency_ranks([row[5] for row in words])
+    for row, rank in zip(words, ranks):
+        row[13] = None if row[13] is None else int(bool(row[13]))
+        row.extend([row[1].lower(), rank])
+
+    lite = sqlite3.connect(tmp_path)
+    try:
+        lite.executescript(_SCHEMA)
+        lite.executemany(f"INSERT INTO words VALUES ({', '.join('?' * 16)})", words)
+
+        neighbour_count = 0
+        with conn.cursor() as cursor:
+            cursor.execute(_EXPORT_NEIGHBOURS_SQL, (embedding_model, embedding_model, neighbours))
+            while True:
+                batch = cursor.fetchmany(_FETCH_BATCH_SIZE)
+                if not batch:
+                    break
+                lite.executemany("INSERT INTO neighbours VALUES (?, ?, ?, ?)", batch)
+                neighbour_count += len(batch)
+
+        lite.executescript(_INDEXES)
+        info = {
+            "format": SNAPSHOT_FORMAT,
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "embedding_model": embedding_model,
+            "neighbours": neighbours,
+            "word_count": len(words),
+        }
+        lite.executemany(
+            "INSERT INTO snapshot_info VALUES (?, ?)",
+            [(key, json.dumps(value)) for key, value in info.items()],
+        )
+        lite.commit()
+        lite.execute("VACUUM")
+    finally:
+        lite.close()
+
+    os.replace(tmp_path, path)
+    logger.info(
+        f"Dictionary snapshot {path}: {len(words):,} words, {neighbour_count:,} neighbours "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+    return {"words": len(words), "neighbours": neighbour_count}
+
+
+# ---------------------------------------------------------------------------
+# Serving
+
+
+class DictionarySnapshot:
+    """Read-only queries against a snapshot written by :func:`export_snapshot`.
+
+    Word rows come back in ``WORD_COLUMNS`` order, with the frequency rank
+    appended where the matching PostgreSQL query computes one. Each thread
+    gets its own SQLite connection.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Dictionary snapshot not found: {self.path}")
+        self._local = threading.local()
+        rows = self._query("SELECT key, value FROM snapshot_info")
+        self.info: Dict[str, Any] = {key: json.loads(value) for key, value in rows}
+        if self.info.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{self.path}: unsupported snapshot format {self.info.get('format')!r}")
+        self.embedding_model: str = self.info["embedding_model"]
+        self._ranked_count = self._query("SELECT COUNT(*) FROM words WHERE frequency_rank IS NOT NULL")[0][0]
+        self._domains = [row[0] for row in self._query(
+            "SELECT DISTINCT primary_domain FROM words WHERE primary_domain IS NOT NULL ORDER BY 1"
+        )]
+        self._parts_of_speech = [row[0] for row in self._query(
+            "SELECT DISTINCT part_of_speech FROM words WHERE part_of_speech IS NOT NULL ORDER BY 1"
+        )]
+        logger.info(f"Serving dictionary pages from snapshot {self.path} built {self.info.get('built_at')}")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # immutable=1: the file is replaced, never modified, so SQLite can skip locking
+            connection = sqlite3.connect(f"{self.path.as_uri()}?mode=ro&immutable=1", uri=True)
+            self._local.connection = connection
+        return connection
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        return self._connection().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _word_row(row: tuple) -> tuple:
+        # SQLite has no boolean type; obsolete_or_archaic is stored as 0/1
+        if row[13] is None:
+            return row
+        return row[:13] + (bool(row[13]),) + row[14:]
+
+    @staticmethod
+    def _prefix_range(prefix: str) -> Tuple[str, str]:
+        return prefix, prefix + "\U0010ffff"
+
+    @staticmethod
+    def _term_filter(query: str) -> Tuple[str, List[Any]]:
+        """``term ILIKE '%query%'``, through the trigram index once it has a trigram."""
+        if len(query) >= 3:
+            return "id IN (SELECT rowid FROM words_fts WHERE term LIKE ?)", [f"%{query}%"]
+        return "term LIKE ?", [f"%{query}%"]
+
+    def _search_conditions(
+        self,
+        query: Optional[str],
+        domain: Optional[str],
+        part_of_speech: Optional[str],
+        min_frequency: Optional[int],
+        max_frequency: Optional[int],
+        min_rarity: Optional[float],
+        max_rarity: Optional[float],
+    ) -> Tuple[List[str], List[Any]]:
+        conditions: List[str] = []
+        params: List[Any] = []
+        if query:
+            # Single letter search = starts with that letter
+            if len(query) == 1:
+                conditions.append("term_lower >= ? AND term_lower < ?")
+                params.extend(self._prefix_range(query.lower()))
+            else:
+                condition, condition_params = self._term_filter(query)
+                conditions.append(condition)
+                params.extend(condition_params)
+        for column, value in (("primary_domain", domain), ("part_of_speech", part_of_speech)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        for condition, value in (
+            ("final_rarity >= ?", min_rarity),
+            ("final_rarity <= ?", max_rarity),
+            ("frequency_rank >= ?", min_frequency),
+            ("frequency_rank <= ?", max_frequency),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        return conditions, params
+
+    # -- VocabularyDatabase queries ---------------------------------------
+
+    def count_search_words(
+        self,
+        query: Optional[str] = None,
+        domain: Optional[str] = None,
+        part_of_speech: Optional[str] = None,
+        min_frequency: Optional[int] = None,
+        max_frequency: Optional[int] = None,
+        min_rarity: Optional[float] = None,
+        max_rarity: Optional[float] = None,
+    ) -> int:
+        conditions, params = self._search_conditions(
+            query, domain, part_of_speech, min_frequency, max_frequency, min_rarity, max_rarity
+        )
+        where = " AND ".join(conditions) or "1=1"
+        return self._query(f"SELECT COUNT(*) FROM words WHERE {where}", params)[0][0]
+
+    def search_words(
+        self,
+        query: Optional[str] = None,
+        domain: Optional[str] = None,
+        part_of_speech: Optional[str] = None,
+        min_frequency: Optional[int] = None,
+        max_frequency: Optional[int] = None,
+        min_rarity: Optional[float] = None,
+        max_rarity: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[tuple]:
+        conditions, params = self._search_conditions(
+            query, domain, part_of_speech, min_frequency, max_frequency, min_rarity, max_rarity
+        )
+        conditions.insert(0, "frequency_rank IS NOT NULL")
+        rows = self._query(
+            f"SELECT {WORD_COLUMNS}, frequency_rank FROM words WHERE {' AND '.join(conditions)} "
+            "ORDER BY term_lower LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        return [self._word_row(row) for row in rows]
+
+    def get_word_by_id(self, word_id: int) -> Optional[tuple]:
+        rows = self._query(
+            f"SELECT {WORD_COLUMNS}, frequency_rank FROM words WHERE id = ? AND frequency_rank IS NOT NULL",
+            (word_id,),
+        )
+        return self._word_row(rows[0]) if rows else None
+
+    def get_word_by_term(self, term: str) -> Optional[tuple]:
+        rows = self._query(f"SELECT {WORD_COLUMNS} FROM words WHERE term_lower = ? LIMIT 1", (term.lower(),))
+        return self._word_row(rows[0]) if rows else None
+
+    def get_random_word(self) -> Optional[tuple]:
+        if not self._ranked_count:
+            return None
+        rows = self._query(
+            f"SELECT {WORD_COLUMNS}, frequency_rank FROM words WHERE frequency_rank IS NOT NULL LIMIT 1 OFFSET ?",
+            (random.randrange(self._ranked_count),),
+        )
+        return self._word_row(rows[0]) if rows else None
+
+    def get_similar_words(self, word_id: int, limit: int = 10) -> List[tuple]:
+        """``(word_id, term, cosine_similarity)`` for the snapshot's embedding model."""
+        return self._query(
+            "SELECT w.id, w.term, n.similarity FROM neighbours n JOIN words w ON w.id = n.neighbour_id "
+            "WHERE n.word_id = ? ORDER BY n.position LIMIT ?",
+            (word_id, limit),
+        )
+
+    def get_domains(self) -> List[str]:
+        return list(self._domains)
+
+    def get_parts_of_speech(self) -> List[str]:
+        return list(self._parts_of_speech)
+
+    def browse_words(
+        self,
+        letters: Optional[str] = None,
+        domain: Optional[str] = None,
+        part_of_speech: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[int, List[str], List[tuple]]:
+        """``(total, next letters, page rows)`` for ``/browse``.
+
+        As in PostgreSQL, the rank on this page is computed within the
+        filtered words, and the next-letter list ignores ``search``.
+        """
+        facet_conditions: List[str] = []
+        facet_params: List[Any] = []
+        for column, value in (("primary_domain", domain), ("part_of_speech", part_of_speech)):
+            if value:
+                facet_conditions.append(f"{column} = ?")
+                facet_params.append(value)
+
+        conditions, params = list(facet_conditions), list(facet_params)
+        if letters:
+            conditions.append("term_lower >= ? AND term_lower < ?")
+            params.extend(self._prefix_range(letters.lower()))
+        if search:
+            conditions.append(
+                "id IN (SELECT rowid FROM words_fts WHERE term LIKE ? "
+                "UNION SELECT rowid FROM words_fts WHERE definition LIKE ?)"
+                if len(search) >= 3 else "(term LIKE ? OR definition LIKE ?)"
+            )
+            params.extend([f"%{search.lower()}%"] * 2)
+        where = " AND ".join(conditions) or "1=1"
+
+        total = self._query(f"SELECT COUNT(*) FROM words WHERE {where}", params)[0][0]
+
+        available_letters: List[str] = []
+        if total > 0:
+            width = len(letters) + 1 if letters else 1
+            letter_conditions = list(facet_conditions)
+            letter_params: List[Any] = [width] + facet_params
+            if letters:
+                letter_conditions.append("term_lower >= ? AND term_lower < ? AND length(term_lower) >= ?")
+                letter_params.extend(self._prefix_range(letters.lower()) + (width,))
+            raw = [row[0] for row in self._query(
+                f"SELECT DISTINCT substr(term_lower, 1, ?) FROM words "
+                f"WHERE {' AND '.join(letter_conditions) or '1=1'} ORDER BY 1",
+                letter_params,
+            )]
+            if letters:
+                available_letters = sorted({value[len(letters)] for value in raw if len(value) > len(letters)})
+            else:
+                available_letters = raw
+
+        rows = self._query(
+            f"SELECT {WORD_COLUMNS}, RANK() OVER (ORDER BY final_rarity ASC NULLS LAST) AS frequency_rank "
+            f"FROM words WHERE {where} ORDER BY term_lower LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        return total, available_letters, [self._word_row(row) for row in rows]
+
+
+def snapshot_from_environment() -> Optional[DictionarySnapshot]:
+    """Open the snapshot named by ``DICTIONARY_SNAPSHOT``; None when unset."""
+    path = os.getenv("DICTIONARY_SNAPSHOT", "").strip()
+    if not path:
+        return None
+    return DictionarySnapshot(path)
+
+
+__all__ = [
+    "DEFAULT_SNAPSHOT_PATH",
+    "DictionarySnapshot",
+    "SNAPSHOT_FORMAT",
+    "export_snapshot",
+    "frequency_ranks",
+    "snapshot_from_environment",
+]
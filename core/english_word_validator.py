@@ -9,31 +9,36 @@ import logging
 from typing import Set, Optional, Tuple, List
 from pathlib import Path
 import json
+from functools import lru_cache
 
-try:
-    import wordfreq
-    WORDFREQ_AVAILABLE = True
-except ImportError:
-    WORDFREQ_AVAILABLE = False
+from core.lazy_imports import lazy_import, module_available
+
+# Both libraries load on first use; NLTK in particular takes seconds to import
+# and check its corpora, which every importer of this module used to pay.
+WORDFREQ_AVAILABLE = module_available('wordfreq')
+if not WORDFREQ_AVAILABLE:
     logging.warning("wordfreq not available, using fallback validation")
+wordfreq = lazy_import('wordfreq')
+
+NLTK_AVAILABLE = module_available('nltk')
+if not NLTK_AVAILABLE:
+    logging.warning("NLTK not available, using fallback validation")
+
+_NLTK_CORPORA = {'words': 'corpora/words', 'wordnet': 'corpora/wordnet'}
+
 
-try:
+@lru_cache(maxsize=None)
+def _nltk_corpus(name: str):
+    """Return NLTK corpus ``name``, downloading its data if not present."""
     import nltk
-    from nltk.corpus import words, wordnet
-    NLTK_AVAILABLE = True
-    
-    # Download required NLTK data if not present
+    import nltk.corpus
+
     try:
-        nltk.data.find('corpora/words')
-        nltk.data.find('corpora/wordnet')
+        nltk.data.find(_NLTK_CORPORA[name])
     except LookupError:
-        logging.info("Downloading required NLTK data...")
-        nltk.download('words', quiet=True)
-        nltk.download('wordnet', quiet=True)
-        
-except ImportError:
-    NLTK_AVAILABLE = False
-    logging.warning("NLTK not available, using fallback validation")
+        logging.info(f"Downloading required NLTK data: {name}...")
+        nltk.download(name, quiet=True)
+    return getattr(nltk.corpus, name)
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +68,7 @@ class EnglishWordValidator:
         # Load from NLTK if available
         if NLTK_AVAILABLE:
             try:
-                self.english_words.update(word.lower() for word in words.words())
+                self.english_words.update(word.lower() for word in _nltk_corpus('words').words())
                 self.logger.info(f"Loaded {len(self.english_words)} words from NLTK corpus")
             except Exception as e:
                 self.logger.warning(f"Could not load NLTK words: {e}")
@@ -196,7 +201,7 @@ class EnglishWordValidator:
         # Check with NLTK WordNet if available
         if NLTK_AVAILABLE:
             try:
-                synsets = wordnet.synsets(word_lower)
+                synsets = _nltk_corpus('wordnet').synsets(word_lower)
                 if synsets:
                     # Check if any synset is for English
                     for synset in synsets:
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Batched flashcard study results.
+
+The study page used to post every answer to ``/api/flashcards/study`` as it
+happened. That meant one request and one upsert into
+``user_flashcard_progress`` per card. The page now queues answers and posts
+them to ``/api/flashcards/study/batch`` every few cards or seconds. The
+queue is kept in ``localStorage`` under ``flashcardStudyQueue:<user_id>:<tab>``,
+so answers given just before the tab closed are sent by that user's next
+study page; signing out removes them. Each batch names the user it was
+recorded for, and the endpoint rejects a batch that names anyone else.
+
+``parse_study_results`` validates such a batch. Each result carries the
+client time it was answered (``studied_at``) and the batch carries the
+client time it was sent (``sent_at``). When ``sent_at`` and the server
+clock disagree by more than ``CLOCK_TOLERANCE``, each ``studied_at`` is
+moved by the difference, so a badly set client clock does not reorder
+answers. A malformed result is skipped and its index reported, so it does
+not cost the rest of the batch.
+
+Results are then applied with one set-based upsert,
+``CARD_PROGRESS_BATCH_UPSERT_SQL``. A result is applied only if it is newer
+than the word's stored ``last_studied``, so replaying a batch whose
+response was lost changes nothing. With one answer per word the outcome
+matches the single-card ``card_progress_upsert``. Several answers to one
+word in the same batch, however, count as one scheduling step: study and
+correct counts add up, but the interval is doubled or halved once,
+following the latest answer, and the mastery level is judged once on the
+final totals. The single-card path takes one step per answer.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Keeps a batch well within one request; the page sends far fewer.
+MAX_BATCH_RESULTS = 500
+# Client clocks within this of the server are trusted as they are, which
+# keeps the timestamps of a replayed batch identical to the first attempt.
+CLOCK_TOLERANCE = timedelta(minutes=2)
+
+
+@dataclass(frozen=True)
+class StudyResult:
+    word_id: int
+    is_correct: bool
+    studied_at: datetime
+
+
+def _client_time(value: Any, skew: timedelta = timedelta(0)) -> datetime:
+    """Client timestamp in epoch milliseconds (JavaScript ``Date.now()``), plus ``skew``."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"timestamp must be epoch milliseconds, got {value!r}")
+    try:
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc) + skew
+    except (OverflowError, OSError) as exc:
+        # Infinity or far outside the supported date range
+        raise ValueError(f"timestamp out of range: {value!r}") from exc
+
+
+def _study_result(item: Any, skew: timedelta, now: datetime, latest: datetime) -> StudyResult:
+    if not isinstance(item, dict):
+        raise ValueError("each result must be an object")
+    word_id, is_correct = item.get("word_id"), item.get("is_correct")
+    if isinstance(word_id, bool) or not isinstance(word_id, int) or word_id <= 0:
+        raise ValueError(f"invalid word_id {word_id!r}")
+    if not isinstance(is_correct, bool):
+        raise ValueError(f"invalid is_correct {is_correct!r}")
+    studied_at = now
+    if item.get("studied_at") is not None:
+        studied_at = min(_client_time(item["studied_at"], skew), latest)
+    return StudyResult(word_id, is_correct, studied_at)
+
+
+def parse_study_results(
+    items: Any,
+    sent_at: Any = None,
+    now: Optional[datetime] = None,
+) -> Tuple[List[StudyResult], List[int]]:
+    """Validate a batch of ``{"word_id", "is_correct", "studied_at"}`` items.
+
+    Timestamps are mapped onto the server clock using ``sent_at`` when the
+    client clock is off, and never end up more than ``CLOCK_TOLERANCE`` in
+    the future. Exact duplicates (the same word answered at the same
+    instant, e.g. from a queue sent twice) are dropped.
+    Returns the valid results in ``studied_at`` order and the indexes of
+    the items that failed validation. Raises ``ValueError`` only when the
+    batch as a whole is malformed: not a list, too long, or a bad
+    ``sent_at``.
+    """
+    if not isinstance(items, list):
+        raise ValueError("results must be a list")
+    if len(items) > MAX_BATCH_RESULTS:
+        raise ValueError(f"at most {MAX_BATCH_RESULTS} results per batch")
+
+    now = now or datetime.now(timezone.utc)
+    skew = now - _client_time(sent_at) if sent_at is not None else timedelta(0)
+    if abs(skew) <= CLOCK_TOLERANCE:
+        skew = timedelta(0)
+    latest = now + CLOCK_TOLERANCE
+
+    results = {}
+    rejected = []
+    for index, item in enumerate(items):
+        try:
+            result = _study_result(item, skew, now, latest)
+        except ValueError:
+            rejected.append(index)
+            continue
+        results[(result.word_id, result.studied_at)] = result
+
+    return sorted(results.values(), key=lambda result: result.studied_at), rejected
+
+
+def study_result_arrays(results: Sequence[StudyResult]) -> Tuple[List[int], List[bool], List[datetime]]:
+    """Column arrays for an ``unnest(%s::int[], %s::boolean[], %s::timestamptz[])``."""
+    return (
+        [result.word_id for result in results],
+        [result.is_correct for result in results],
+        [result.studied_at for result in results],
+    )
+
+
+# Queued study results, applied in one statement. Results no newer than the
+# stored last_studied are skipped, so the latest answer wins and a replayed
+# batch is a no-op. Scheduling follows each word's latest result in the batch,
+# as card_progress_upsert would: a right answer doubles the interval and is
+# reviewed after it, a wrong one halves the interval and is reviewed next day.
+# Several answers to one word in a batch make one scheduling step (see above).
+# Placeholders: word ids, correctness and times (see study_result_arrays),
+# then the user id three times; batch_upsert_params builds them in order.
+CARD_PROGRESS_BATCH_UPSERT_SQL = """
+    WITH results AS (
+        SELECT r.word_id, r.is_correct, r.studied_at
+        FROM unnest(%s::int[], %s::boolean[], %s::timestamptz[]) AS r (word_id, is_correct, studied_at)
+        JOIN vocab.defined d ON d.id = r.word_id
+        LEFT JOIN user_flashcard_progress ufp ON ufp.user_id = %s AND ufp.word_id = r.word_id
+        WHERE ufp.last_studied IS NULL OR r.studied_at > ufp.last_studied
+    ),
+    summary AS (
+        SELECT word_id,
+               COUNT(*) AS attempts,
+               COUNT(*) FILTER (WHERE is_correct) AS correct,
+               MAX(studied_at) AS last_studied,
+               (ARRAY_AGG(is_correct ORDER BY studied_at DESC))[1] AS last_correct
+        FROM results
+        GROUP BY word_id
+    ),
+    merged AS (
+        SELECT s.word_id, s.attempts, s.correct, s.last_studied,
+               COALESCE(ufp.study_count, 0) + s.attempts AS total_count,
+               COALESCE(ufp.correct_count, 0) + s.correct AS total_correct,
+               COALESCE(ufp.mastery_level, 'learning') AS mastery_level,
+               CASE
+                   WHEN ufp.user_id IS NULL THEN 1
+                   WHEN s.last_correct THEN LEAST(COALESCE(ufp.interval_days, 1) * 2, 30)
+                   ELSE GREATEST(COALESCE(ufp.interval_days, 1) / 2, 1)
+               END AS interval_days,
+               CASE
+                   WHEN ufp.user_id IS NOT NULL AND s.last_correct
+                       THEN LEAST(COALESCE(ufp.interval_days, 1) * 2, 30)
+                   ELSE 1
+               END AS review_days
+        FROM summary s
+        LEFT JOIN user_flashcard_progress ufp ON ufp.user_id = %s AND ufp.word_id = s.word_id
+    )
+    INSERT INTO user_flashcard_progress (
+        user_id, word_id, study_count, correct_count, last_studied, next_review, mastery_level, interval_days
+    )
+    SELECT %s, word_id, attempts, correct, last_studied,
+           last_studied + INTERVAL '1 day' * review_days,
+           CASE
+               WHEN total_correct >= total_count * 0.9 AND total_count >= 5 THEN 'mastered'
+               WHEN total_correct >= total_count * 0.8 AND total_count >= 3 THEN 'reviewing'
+               ELSE mastery_level
+           END,
+           interval_days
+    FROM merged
+    ON CONFLICT (user_id, word_id) DO UPDATE SET
+        study_count = user_flashcard_progress.study_count + EXCLUDED.study_count,
+        correct_count = user_flashcard_progress.correct_count + EXCLUDED.correct_count,
+        last_studied = EXCLUDED.last_studied,
+        next_review = EXCLUDED.next_review,
+        mastery_level = EXCLUDED.mastery_level,
+        interval_days = EXCLUDED.interval_days
+    WHERE EXCLUDED.last_studied > user_flashcard_progress.last_studied
+    """
+
+
+def batch_upsert_params(user_id: int, results: Sequence[StudyResult]) -> Tuple[Any, ...]:
+    """Parameters for ``CARD_PROGRESS_BATCH_UPSERT_SQL``, in placeholder order."""
+    word_ids, correct, studied_at = study_result_arrays(results)
+    return (word_ids, correct, studied_at, user_id, user_id, user_id)
+
+
+def apply_study_results(cursor: Any, statement: str, user_id: int, results: Sequence[StudyResult]) -> int:
+    """Run the batch upsert registered as ``statement``; returns the number of words updated."""
+    if not results:
+        return 0
+    cursor.execute_statement(statement, batch_upsert_params(user_id, results))
+    return cursor.rowcount
+
+
+__all__ = [
+    "CARD_PROGRESS_BATCH_UPSERT_SQL",
+    "CLOCK_TOLERANCE",
+    "MAX_BATCH_RESULTS",
+    "StudyResult",
+    "apply_study_results",
+    "batch_upsert_params",
+    "parse_study_results",
+    "study_result_arrays",
+]
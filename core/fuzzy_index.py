@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Near-duplicate term search with a fixed edit budget.
+
+Uses the symmetric-delete scheme: if two strings are within ``k`` Levenshtein
+edits, then some string can be reached from both by deleting at most ``k``
+characters. Every known term is indexed under the hashes of all of its
+``<= max_edits`` deletion variants (held in sorted numpy arrays), so a query
+hashes its own deletion variants, finds the handful of terms sharing one with
+``searchsorted`` and verifies only those with a bounded Levenshtein check.
+Nothing is scanned, so lookups stay sub-millisecond at corpus sizes in the
+hundreds of thousands.
+
+A sorted copy of the terms also answers prefix ("same root") queries.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EDITS = 1
+
+# Incremental additions are kept in a dict and folded into the arrays once
+# this many variants have accumulated
+_PENDING_MERGE_SIZE = 50000
+_MAX_CHAR = 0x10FFFF
+
+
+def deletion_variants(term: str, max_deletes: int) -> Set[str]:
+    """All strings obtained by deleting up to ``max_deletes`` characters."""
+
+    variants = {term}
+    frontier = {term}
+    for _ in range(max_deletes):
+        frontier = {
+            variant[:i] + variant[i + 1:]
+            for variant in frontier
+            for i in range(len(variant))
+        }
+        if not frontier:
+            break
+        variants |= frontier
+    return variants
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """Levenshtein distance, or ``None`` as soon as it must exceed the bound."""
+
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, char_b in enumerate(b, 1):
+            value = min(current[j - 1] + 1, previous[j] + 1, previous[j - 1] + (char_a != char_b))
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return None
+        previous = current
+    distance = previous[-1]
+    return distance if distance <= max_distance else None
+
+
+class FuzzyTermIndex:
+    """Symmetric-delete index over a term set plus a sorted prefix list.
+
+    ``max_edits`` is fixed when the index is built; queries may ask for any
+    budget up to it. Memory grows with the number of deletion variants, so
+    budgets above 2 are rarely worth it.
+    """
+
+    def __init__(self, terms: Iterable[str] = (), max_edits: int = DEFAULT_MAX_EDITS):
+        if max_edits < 0:
+            raise ValueError("max_edits must be non-negative")
+        self.max_edits = max_edits
+        self._terms: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._sorted: List[str] = []
+        self._hashes = np.empty(0, dtype=np.int64)
+        self._postings = np.empty(0, dtype=np.int32)
+        self._pending: Dict[int, List[int]] = {}
+        self._pending_count = 0
+
+        started = time.perf_counter()
+        hashes: List[int] = []
+        postings: List[int] = []
+        for term in terms:
+            if not term or term in self._ids:
+                continue
+            term_id = self._append(term)
+            for variant in deletion_variants(term, max_edits):
+                hashes.append(hash(variant))
+                postings.append(term_id)
+        self._sorted = sorted(self._terms)
+        self._set_arrays(np.array(hashes, dtype=np.int64), np.array(postings, dtype=np.int32))
+        if self._terms:
+            logger.debug(f"Fuzzy index: {len(self._terms):,} terms, {len(self._hashes):,} variants "
+                         f"in {time.perf_counter() - started:.2f}s")
+
+    def _append(self, term: str) -> int:
+        term_id = len(self._terms)
+        self._terms.append(term)
+        self._ids[term] = term_id
+        return term_id
+
+    def _set_arrays(self, hashes: np.ndarray, postings: np.ndarray) -> None:
+        order = np.argsort(hashes, kind="stable")
+        self._hashes = hashes[order]
+        self._postings = postings[order]
+
+    def _merge_pending(self) -> None:
+        if not self._pending:
+            return
+        hashes = [h for h, ids in self._pending.items() for _ in ids]
+        postings = [term_id for ids in self._pending.values() for term_id in ids]
+        self._set_arrays(
+            np.concatenate([self._hashes, np.array(hashes, dtype=np.int64)]),
+            np.concatenate([self._postings, np.array(postings, dtype=np.int32)]),
+        )
+        self._pending = {}
+        self._pending_count = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._ids
+
+    def add(self, term: str) -> bool:
+        """Index ``term`` if missing; returns whether it was new."""
+
+        if not term or term in self._ids:
+            return False
+        term_id = self._append(term)
+        insort(self._sorted, term)
+        for variant in deletion_variants(term, self.max_edits):
+            self._pending.setdefault(hash(variant), []).append(term_id)
+            self._pending_count += 1
+        if self._pending_count >= _PENDING_MERGE_SIZE:
+            self._merge_pending()
+        return True
+
+    # -- queries ------------------------------------------------------------
+
+    def with_prefix(self, prefix: str) -> Iterator[str]:
+        """Terms starting with ``prefix``, in sorted order."""
+
+        terms = self._sorted
+        start = bisect_left(terms, prefix)
+        if prefix and ord(prefix[-1]) < _MAX_CHAR:
+            end = bisect_left(terms, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        else:
+            end = len(terms)
+        for position in range(start, end):
+            yield terms[position]
+
+    def _candidate_ids(self, query: str, max_edits: int) -> Set[int]:
+        variant_hashes = np.fromiter(
+            (hash(variant) for variant in deletion_variants(query, max_edits)), dtype=np.int64
+        )
+        lefts = np.searchsorted(self._hashes, variant_hashes, side="left")
+        rights = np.searchsorted(self._hashes, variant_hashes, side="right")
+
+        candidates: Set[int] = set()
+        postings = self._postings
+        for left, right in zip(lefts.tolist(), rights.tolist()):
+            if right > left:
+                candidates.update(postings[left:right].tolist())
+        if self._pending:
+            for variant_hash in variant_hashes.tolist():
+                candidates.update(self._pending.get(variant_hash, ()))
+        return candidates
+
+    def within_edits(self, query: str, max_edits: Optional[int] = None,
+                     limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Known terms within ``max_edits`` Levenshtein edits of ``query``.
+
+        Returns ``(term, distance)`` pairs ordered by distance, then term.
+        """
+
+        budget = self.max_edits if max_edits is None else max_edits
+        if budget > self.max_edits:
+            raise ValueError(f"Index was built for at most {self.max_edits} edits, asked for {budget}")
+        if budget < 0:
+            return []
+
+        matches: List[Tuple[int, str]] = []
+        terms = self._terms
+        for term_id in self._candidate_ids(query, budget):
+            term = terms[term_id]
+            distance = bounded_levenshtein(query, term, budget)
+            if distance is not None:
+                matches.append((distance, term))
+
+        matches.sort()
+        if limit is not None:
+            matches = matches[:limit]
+        return [(term, distance) for distance, term in matches]
+
+
+__all__ = [
+    "DEFAULT_MAX_EDITS",
+    "FuzzyTermIndex",
+    "bounded_levenshtein",
+    "deletion_variants",
+]
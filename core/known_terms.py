@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""Shared membership index of every term already in the vocabulary pipeline.
+
+Harvesters and the deduplicator used to ask PostgreSQL whether a word was
+already in ``defined`` or ``candidate_words`` once per candidate, or reload
+both tables wholesale every few minutes. This module keeps that answer on
+disk instead:
+
+* ``terms.txt`` - sorted, normalised snapshot of both tables
+* ``bloom.bin`` - Bloom filter over the same terms
+* ``journal.txt`` - terms appended since the snapshot, one per line
+* ``meta.json`` - filter parameters and the snapshot generation
+
+Processes open the index once, answer lookups from the exact set (or just the
+Bloom filter when the set is not loaded) and append every term they store to
+the journal, which other processes pick up on their next refresh. A Bloom
+negative is definitive; only a Bloom positive is worth confirming against the
+database. Rebuild the snapshot with ``scripts/build_known_terms.py``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Set
+
+from core.fuzzy_index import DEFAULT_MAX_EDITS, FuzzyTermIndex
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+DEFAULT_KNOWN_TERMS_DIR = Path(
+    os.getenv("KNOWN_TERMS_DIR", str(Path(__file__).resolve().parents[1] / "temp" / "known_terms"))
+)
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+DEFAULT_REFRESH_INTERVAL = 5.0
+
+_TERMS_FILE = "terms.txt"
+_BLOOM_FILE = "bloom.bin"
+_JOURNAL_FILE = "journal.txt"
+_META_FILE = "meta.json"
+_FETCH_BATCH_SIZE = 50000
+
+
+def normalize_term(term: str) -> str:
+    """Normalise a term the way ``defined``/``candidate_words`` are compared."""
+
+    return term.strip().lower()
+
+
+# ---------------------------------------------------------------------------
+# Bloom filter
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a BLAKE2b digest."""
+
+    __slots__ = ("num_bits", "num_hashes", "bits")
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytearray] = None):
+        self.num_bits = max(8, int(num_bits))
+        self.num_hashes = max(1, int(num_hashes))
+        size = (self.num_bits + 7) // 8
+        if bits is None:
+            bits = bytearray(size)
+        elif len(bits) != size:
+            raise ValueError(f"Bloom filter expects {size} bytes, got {len(bits)}")
+        self.bits = bits
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE) -> "BloomFilter":
+        """Size a filter for ``capacity`` items at the given false positive rate."""
+
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        num_bits = math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = round(num_bits / capacity * math.log(2))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, term: str) -> Iterator[int]:
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, term: str) -> None:
+        bits = self.bits
+        for position in self._positions(term):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, term: str) -> bool:
+        bits = self.bits
+        for position in self._positions(term):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Index
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
+
+
+class KnownTermIndex:
+    """Snapshot + journal of known terms with an optional exact set.
+
+    With ``exact=True`` (the default) membership is answered from a Python
+    set. With ``exact=False`` only the Bloom filter is kept in memory and
+    positives can be confirmed through the ``confirm`` callback of
+    :meth:`contains`.
+    """
+
+    def __init__(self, directory: Path | str, exact: bool = True,
+                 refresh_interval: float = DEFAULT_REFRESH_INTERVAL):
+        self.directory = Path(directory)
+        self.exact = exact
+        self.refresh_interval = refresh_interval
+        self.generation = 0
+        self.bloom = BloomFilter(8, 1)
+        self._terms: Optional[Set[str]] = None
+        self._fuzzy: Optional[FuzzyTermIndex] = None
+        self._journal_offset = 0
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+
+    # -- building -----------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        terms: Iterable[str],
+        directory: Path | str = DEFAULT_KNOWN_TERMS_DIR,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> Path:
+        """Write a fresh snapshot of ``terms`` and start a new journal.
+
+        Journal lines written while the terms were being collected are carried
+        over into the new journal, so concurrent writers do not lose entries.
+        """
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        journal_path = directory / _JOURNAL_FILE
+        carried_from = journal_path.stat().st_size if journal_path.exists() else 0
+
+        unique = sorted({normalize_term(term) for term in terms if term and normalize_term(term)})
+        bloom = BloomFilter.for_capacity(len(unique), false_positive_rate)
+        for term in unique:
+            bloom.add(term)
+
+        previous = _read_meta(directory)
+        generation = (previous or {}).get("generation", 0) + 1
+
+        _write_atomic(directory / _TERMS_FILE, "".join(f"{term}\n" for term in unique).encode("utf-8"))
+        _write_atomic(directory / _BLOOM_FILE, bytes(bloom.bits))
+
+        carried = b""
+        if journal_path.exists():
+            with open(journal_path, "rb") as handle:
+                handle.seek(carried_from)
+                carried = handle.read()
+        _write_atomic(journal_path, carried)
+
+        meta = {
+            "format": FORMAT_VERSION,
+            "generation": generation,
+            "count": len(unique),
+            "num_bits": bloom.num_bits,
+            "num_hashes": bloom.num_hashes,
+            "false_positive_rate": false_positive_rate,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        _write_atomic(directory / _META_FILE, json.dumps(meta, indent=2).encode("utf-8"))
+        logger.info(f"Known-term index generation {generation}: {len(unique):,} terms, "
+                    f"{len(bloom.bits) / 1024:.0f} KiB filter")
+        return directory
+
+    @classmethod
+    def build_from_database(
+        cls,
+        directory: Path | str = DEFAULT_KNOWN_TERMS_DIR,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> Path:
+        """Snapshot every term in ``defined`` and ``candidate_words``."""
+
+        return cls.build(_iter_database_terms(), directory, false_positive_rate)
+
+    # -- loading ------------------------------------------------------------
+
+    @classmethod
+    def open(cls, directory: Path | str = DEFAULT_KNOWN_TERMS_DIR, exact: bool = True,
+             refresh_interval: float = DEFAULT_REFRESH_INTERVAL) -> "KnownTermIndex":
+        """Open an index written by :meth:`build`."""
+
+        index = cls(directory, exact=exact, refresh_interval=refresh_interval)
+        if _read_meta(index.directory) is None:
+            raise FileNotFoundError(f"No known-term index in {index.directory}")
+        index._load()
+        return index
+
+    def _load(self) -> None:
+        meta = _read_meta(self.directory)
+        if meta is None or meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported known-term index in {self.directory}")
+
+        bits = bytearray((self.directory / _BLOOM_FILE).read_bytes())
+        bloom = BloomFilter(meta["num_bits"], meta["num_hashes"], bits)
+        terms: Optional[Set[str]] = None
+        if self.exact:
+            with open(self.directory / _TERMS_FILE, encoding="utf-8") as handle:
+                terms = set(handle.read().splitlines())
+
+        self.bloom = bloom
+        self._terms = terms
+        self._fuzzy = None
+        self.generation = meta["generation"]
+        self._journal_offset = 0
+        self._read_journal()
+        self._next_refresh = time.monotonic() + self.refresh_interval
+
+    def _read_journal(self) -> int:
+        path = self.directory / _JOURNAL_FILE
+        try:
+            with open(path, "rb") as handle:
+                handle.seek(self._journal_offset)
+                data = handle.read()
+        except FileNotFoundError:
+            return 0
+        # Leave a partially written trailing line for the next read
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return 0
+        self._journal_offset += end
+        added = data[:end].decode("utf-8", errors="replace").splitlines()
+        for term in added:
+            self._remember(term)
+        return len(added)
+
+    def refresh(self) -> int:
+        """Pick up journal entries (or a rebuilt snapshot) from other processes."""
+
+        with self._lock:
+            self._next_refresh = time.monotonic() + self.refresh_interval
+            meta = _read_meta(self.directory)
+            if meta is not None and meta.get("generation") != self.generation:
+                self._load()
+                return len(self)
+            return self._read_journal()
+
+    def _maybe_refresh(self) -> None:
+        if time.monotonic() >= self._next_refresh:
+            try:
+                self.refresh()
+            except Exception as exc:
+                self._next_refresh = time.monotonic() + self.refresh_interval
+                logger.warning(f"Known-term index refresh failed: {exc}")
+
+    # -- queries ------------------------------------------------------------
+
+    def _remember(self, term: str) -> None:
+        if not term:
+            return
+        self.bloom.add(term)
+        if self._terms is not None:
+            self._terms.add(term)
+        if self._fuzzy is not None:
+            self._fuzzy.add(term)
+
+    def __contains__(self, term: str) -> bool:
+        # Hot path: the refresh deadline check is inlined to keep lookups cheap
+        if time.monotonic() >= self._next_refresh:
+            self._maybe_refresh()
+        terms = self._terms
+        if terms is not None:
+            return term.strip().lower() in terms
+        return term.strip().lower() in self.bloom
+
+    def might_contain(self, term: str) -> bool:
+        """Bloom filter answer: ``False`` means the term is certainly unknown."""
+
+        self._maybe_refresh()
+        return normalize_term(term) in self.bloom
+
+    def contains(self, term: str, confirm: Optional[Callable[[str], bool]] = None) -> bool:
+        """Membership test that only consults ``confirm`` for Bloom positives."""
+
+        if term not in self:
+            return False
+        if self._terms is None and confirm is not None:
+            return confirm(normalize_term(term))
+        return True
+
+    def fuzzy(self, max_edits: int = DEFAULT_MAX_EDITS) -> FuzzyTermIndex:
+        """Near-duplicate index over the exact set, built on first use.
+
+        Kept current as journal entries arrive; rebuilt after a new snapshot
+        generation or when a larger edit budget is requested.
+        """
+
+        if self._terms is None:
+            raise TypeError("Known-term index was opened without the exact term set")
+        self._maybe_refresh()
+        with self._lock:
+            if self._fuzzy is None or self._fuzzy.max_edits < max_edits:
+                self._fuzzy = FuzzyTermIndex(self._terms, max_edits)
+            return self._fuzzy
+
+    def __iter__(self) -> Iterator[str]:
+        if self._terms is None:
+            raise TypeError("Known-term index was opened without the exact term set")
+        self._maybe_refresh()
+        return iter(self._terms)
+
+    def __len__(self) -> int:
+        if self._terms is None:
+            meta = _read_meta(self.directory) or {}
+            return int(meta.get("count", 0))
+        return len(self._terms)
+
+    # -- updates ------------------------------------------------------------
+
+    def add_many(self, terms: Iterable[str]) -> int:
+        """Record newly stored terms locally and in the shared journal."""
+
+        new_terms = []
+        for term in terms:
+            if not term:
+                continue
+            term = normalize_term(term)
+            if term and "\n" not in term and (self._terms is None or term not in self._terms):
+                new_terms.append(term)
+        if not new_terms:
+            return 0
+
+        with self._lock:
+            # Catch up first so our own lines are not replayed as foreign ones
+            self._read_journal()
+            payload = "".join(f"{term}\n" for term in new_terms).encode("utf-8")
+            with open(self.directory / _JOURNAL_FILE, "ab") as handle:
+                handle.write(payload)
+            self._journal_offset += len(payload)
+            for term in new_terms:
+                self._remember(term)
+        return len(new_terms)
+
+    def add(self, term: str) -> bool:
+        return self.add_many([term]) == 1
+
+
+# ---------------------------------------------------------------------------
+# Database + process-wide access
+
+
+def _read_meta(directory: Path) -> Optional[dict]:
+    try:
+        with open(directory / _META_FILE, encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def _iter_database_terms() -> Iterator[str]:
+    from core.database_manager import db_manager
+
+    for table in ("defined", "candidate_words"):
+        with db_manager.get_connection() as conn:
+            with conn.cursor(name=f"known_terms_{table}") as cursor:
+                cursor.itersize = _FETCH_BATCH_SIZE
+                cursor.execute(
+                    f"SELECT LOWER(TRIM(term)) FROM vocab.{table} "
+                    "WHERE term IS NOT NULL AND TRIM(term) <> ''"
+                )
+                for (term,) in cursor:
+                    yield term
+
+
+_cached_index: Optional[KnownTermIndex] = None
+_cached_lock = threading.Lock()
+
+
+def get_known_terms(directory: Path | str = DEFAULT_KNOWN_TERMS_DIR) -> Optional[KnownTermIndex]:
+    """Open (once per process) the shared index; ``None`` if it was never built.
+
+    Set ``KNOWN_TERMS_EXACT=0`` to keep only the Bloom filter in memory.
+    """
+
+    global _cached_index
+    directory = Path(directory)
+    with _cached_lock:
+        if _cached_index is not None and _cached_index.directory == directory:
+            return _cached_index
+        exact = os.getenv("KNOWN_TERMS_EXACT", "1") != "0"
+        try:
+            _cached_index = KnownTermIndex.open(directory, exact=exact)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning(f"Unable to open known-term index {directory}: {exc}")
+            return None
+        return _cached_index
+
+
+def record_known_terms(terms: Iterable[str]) -> int:
+    """Append freshly stored terms to the shared index if one exists."""
+
+    index = get_known_terms()
+    if index is None:
+        return 0
+    try:
+        return index.add_many(terms)
+    except OSError as exc:
+        logger.warning(f"Unable to record known terms: {exc}")
+        return 0
+
+
+__all__ = [
+    "BloomFilter",
+    "DEFAULT_KNOWN_TERMS_DIR",
+    "KnownTermIndex",
+    "get_known_terms",
+    "normalize_term",
+    "record_known_terms",
+]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Deferred imports for heavy or optional dependencies.
+
+Importing any ``core`` module used to pull in everything ``core/__init__``
+re-exported: fastapi, pandas, aiohttp, bs4 and the NLTK corpora. Every cron
+script paid that cost on every start. The helpers here defer such imports
+to their first use:
+
+* ``lazy_import("pandas")`` returns a stand-in module that imports the real
+  one on first attribute access. A missing package only fails the code path
+  that needs it.
+* ``module_available("cupy")`` checks whether a module can be imported,
+  without importing it. Use it for ``*_AVAILABLE`` flags.
+* ``lazy_exports(__name__, {...})`` gives a package PEP 562 ``__getattr__``
+  and ``__dir__``. Names re-exported from submodules are then loaded when
+  they are first accessed.
+
+``python -m benchmarks importtime`` reports what an entry point still imports
+eagerly.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import types
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class LazyModule(types.ModuleType):
+    """Placeholder module that imports ``name`` on first attribute access."""
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_install_hint"] = install_hint
+
+    def _load(self) -> types.ModuleType:
+        try:
+            module = importlib.import_module(self.__name__)
+        except ImportError as exc:
+            hint = self.__dict__.get("_lazy_install_hint")
+            if hint:
+                raise ImportError(f"{self.__name__} is required here. Install with: {hint}") from exc
+            raise
+        # Later lookups hit the copied attributes and skip __getattr__.
+        self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r}>"
+
+
+def lazy_import(name: str, install_hint: Optional[str] = None) -> types.ModuleType:
+    """Return ``name`` if already imported, else a ``LazyModule`` for it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name, install_hint)
+
+
+@lru_cache(maxsize=None)
+def module_available(name: str) -> bool:
+    """True when ``name`` can be found on the path; does not import it."""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # find_spec imports parent packages, which may themselves be missing.
+        return False
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """PEP 562 ``__getattr__``/``__dir__`` for re-exports from submodules.
+
+    ``exports`` maps each public name to the module defining it, relative to
+    ``package`` (e.g. ``{"get_db_config": ".config"}``)::
+
+        __getattr__, __dir__ = lazy_exports(__name__, {...})
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module_name = exports[name]
+        except KeyError:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+        value = getattr(importlib.import_module(module_name, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
+
+
+__all__ = [
+    "LazyModule",
+    "lazy_exports",
+    "lazy_import",
+    "module_available",
+]
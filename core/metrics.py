@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""In-process request and query instrumentation.
+
+``metrics`` (the module-level ``MetricsRegistry``) collects three things:
+
+* per-route request latency histograms, fed by ``MetricsMiddleware``;
+* per-statement query timings keyed by a fingerprint of the SQL with
+  literals replaced by ``?``, fed by ``DatabaseManager`` cursors;
+* the time spent waiting for a pooled connection.
+
+Recording is a dict lookup, a bisect and a few additions under a lock, so it
+stays on in production; set ``VOCAB_METRICS=0`` to turn it off.
+``render_prometheus`` produces the text exposition format served at
+``/metrics``. That endpoint exposes SQL fingerprints and route templates,
+so it is only served when ``METRICS_TOKEN`` is set, and scrapers must send
+it as ``Authorization: Bearer <token>``.
+"""
+
+from __future__ import annotations
+
+import hmac
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds in seconds, matching the Prometheus client defaults.
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS: Tuple[float, ...] = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Distinct query fingerprints kept; beyond this, new ones share one series.
+MAX_QUERY_FINGERPRINTS = 2000
+OVERFLOW_FINGERPRINT = "<other>"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# ---------------------------------------------------------------------------
+# Query fingerprints
+# ---------------------------------------------------------------------------
+
+_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_PATTERN = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_PATTERN = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_PLACEHOLDER_PATTERN = re.compile(r"%\(\w+\)s|%s|\$\d+")
+_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_query(sql: str) -> str:
+    """Normalise ``sql`` so statements differing only in literals share a key.
+
+    >>> fingerprint_query("SELECT * FROM t WHERE id IN (1, 2, 3) AND term = 'x'")
+    'SELECT * FROM t WHERE id IN (?+) AND term = ?'
+    """
+    text = _COMMENT_PATTERN.sub(" ", sql)
+    text = _STRING_PATTERN.sub("?", text)
+    text = _PLACEHOLDER_PATTERN.sub("?", text)
+    text = _NUMBER_PATTERN.sub("?", text)
+    text = _LIST_PATTERN.sub("(?+)", text)
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+# ---------------------------------------------------------------------------
+# Histograms
+# ---------------------------------------------------------------------------
+
+
+class Histogram:
+    """Fixed-bucket latency histogram; callers hold the registry lock."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        running = 0
+        result = []
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            result.append((_format_float(bound), running))
+        result.append(("+Inf", self.count))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound below which ``q`` of observations fall."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            if running >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    latency: Histogram = field(default_factory=Histogram)
+    rows: int = 0
+    errors: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self.latency.total / self.latency.count if self.latency.count else 0.0
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: Optional[bool] = None, scrape_token: Optional[str] = None) -> None:
+        if enabled is None:
+            enabled = os.getenv("VOCAB_METRICS", "1").lower() not in {"0", "false", "no", "off"}
+        if scrape_token is None:
+            scrape_token = os.getenv("METRICS_TOKEN", "")
+        self.enabled = enabled
+        self.scrape_token = scrape_token.strip()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self.requests: Dict[Tuple[str, str], Histogram] = {}
+            self.responses: Dict[Tuple[str, str, str], int] = {}
+            self.queries: Dict[str, QueryStats] = {}
+            self.pool_wait = Histogram(POOL_WAIT_BUCKETS)
+
+    # -- recording ---------------------------------------------------------
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        if not self.enabled:
+            return
+        key = (method, route)
+        with self._lock:
+            histogram = self.requests.get(key)
+            if histogram is None:
+                histogram = self.requests[key] = Histogram()
+            histogram.observe(seconds)
+            status_key = (method, route, f"{status // 100}xx")
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def observe_query(self, sql: object, seconds: float, rows: int = 0, failed: bool = False) -> None:
+        if not self.enabled:
+            return
+        fingerprint = fingerprint_query(sql if isinstance(sql, str) else str(sql))
+        with self._lock:
+            stats = self.queries.get(fingerprint)
+            if stats is None:
+                if len(self.queries) >= MAX_QUERY_FINGERPRINTS:
+                    fingerprint = OVERFLOW_FINGERPRINT
+                    stats = self.queries.get(fingerprint)
+                if stats is None:
+                    stats = self.queries[fingerprint] = QueryStats(fingerprint)
+            stats.latency.observe(seconds)
+            if rows > 0:
+                stats.rows += rows
+            if failed:
+                stats.errors += 1
+
+    def observe_pool_wait(self, seconds: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.pool_wait.observe(seconds)
+
+    # -- reporting ---------------------------------------------------------
+
+    def slow_queries(self, limit: int = 20, order_by: str = "total") -> List[Dict[str, object]]:
+        """Top query fingerprints by ``total``, ``mean``, ``max`` or ``count``."""
+        with self._lock:
+            rows = [
+                {
+                    "fingerprint": stats.fingerprint,
+                    "count": stats.latency.count,
+                    "total": stats.latency.total,
+                    "mean": stats.mean,
+                    "p95": stats.latency.quantile(0.95),
+                    "max": stats.latency.max,
+                    "rows": stats.rows,
+                    "errors": stats.errors,
+                }
+                for stats in self.queries.values()
+            ]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit]
+
+    def slow_routes(self, limit: int = 20) -> List[Dict[str, object]]:
+        with self._lock:
+            rows = [
+                {
+                    "method": method,
+                    "route": route,
+                    "count": histogram.count,
+                    "total": histogram.total,
+                    "mean": histogram.total / histogram.count if histogram.count else 0.0,
+                    "p95": histogram.quantile(0.95),
+                    "max": histogram.max,
+                }
+                for (method, route), histogram in self.requests.items()
+            ]
+        rows.sort(key=lambda row: row["total"], reverse=True)
+        return rows[:limit]
+
+    def authorize_scrape(self, authorization: Optional[str]) -> bool:
+        """Whether an ``Authorization`` header carries the scrape token."""
+        if not self.scrape_token or not authorization:
+            return False
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() != "bearer":
+            return False
+        return hmac.compare_digest(credentials.strip().encode(), self.scrape_token.encode())
+
+    def render_prometheus(self) -> str:
+        """Everything recorded so far in the Prometheus text format (0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            lines += _histogram_lines(
+                "vocab_http_request_duration_seconds",
+                "HTTP request latency by route template.",
+                ((_labels(method=method, route=route), histogram) for (method, route), histogram in sorted(self.requests.items())),
+            )
+            lines += [
+                "# HELP vocab_http_responses_total HTTP responses by route and status class.",
+                "# TYPE vocab_http_responses_total counter",
+            ]
+            for (method, route, status), count in sorted(self.responses.items()):
+                lines.append(f"vocab_http_responses_total{_labels(method=method, route=route, status=status)} {count}")
+
+            lines += _histogram_lines(
+                "vocab_db_query_duration_seconds",
+                "Statement execution time by query fingerprint.",
+                ((_labels(query=fingerprint), stats.latency) for fingerprint, stats in sorted(self.queries.items())),
+            )
+            lines += [
+                "# HELP vocab_db_query_errors_total Statements that raised, by query fingerprint.",
+                "# TYPE vocab_db_query_errors_total counter",
+            ]
+            for fingerprint, stats in sorted(self.queries.items()):
+                if stats.errors:
+                    lines.append(f"vocab_db_query_errors_total{_labels(query=fingerprint)} {stats.errors}")
+
+            lines += _histogram_lines(
+                "vocab_db_pool_wait_seconds",
+                "Time spent waiting for a pooled database connection.",
+                [("", self.pool_wait)],
+            )
+            lines += [
+                "# HELP vocab_metrics_start_time_seconds When these metrics were last reset.",
+                "# TYPE vocab_metrics_start_time_seconds gauge",
+                f"vocab_metrics_start_time_seconds {self.started_at:.3f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+
+def _histogram_lines(name: str, help_text: str, series: Iterable[Tuple[str, Histogram]]) -> List[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for labels, histogram in series:
+        inner = labels[1:-1]
+        prefix = f"{inner}," if inner else ""
+        for bound, count in histogram.cumulative():
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+        lines.append(f"{name}_sum{labels} {histogram.total:.6f}")
+        lines.append(f"{name}_count{labels} {histogram.count}")
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# ASGI middleware
+# ---------------------------------------------------------------------------
+
+
+def route_label(scope: dict, root_path: str) -> str:
+    """Route template for a handled request, so path parameters do not add series."""
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
+    mounted_at = scope.get("root_path", root_path)
+    if mounted_at != root_path:
+        # Mounted sub-applications (static files) do not set a route.
+        return f"{mounted_at[len(root_path):]}/{{path}}"
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Record the latency and status of every HTTP request.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware``, which would
+    add a task and a memory stream to each request.
+    """
+
+    def __init__(self, app, registry: Optional[MetricsRegistry] = None) -> None:
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.registry.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        root_path = scope.get("root_path", "")
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.observe_request(
+                scope["method"], route_label(scope, root_path), status, time.perf_counter() - started
+            )
+
+
+metrics = MetricsRegistry()
+
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Histogram",
+    "MetricsMiddleware",
+    "MetricsRegistry",
+    "QueryStats",
+    "fingerprint_query",
+    "metrics",
+    "route_label",
+]
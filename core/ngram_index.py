@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""Compact, memory-mapped Google Books n-gram index.
+
+``ngram_lookup.lookup_terms`` used to decompress a whole per-letter shard for
+every call. This module builds a one-off columnar store from those shards:
+
+* ``terms.npy`` / ``term_offsets.npy`` – the lowercased terms, sorted by their
+  UTF-8 bytes and packed into one byte blob with an offset table;
+* ``series_offsets.npy`` / ``years.npy`` / ``counts.npy`` – each term's
+  per-year match counts as a CSR-style series (only years with a count);
+* ``totals.npy`` – each term's count summed over the indexed years;
+* ``year_totals.npy`` – corpus size per year from ``temp/total_counts``.
+
+Every array is opened with ``mmap_mode="r"``, so opening the index is cheap
+and a lookup touches only the pages of the terms it binary-searches for and
+the series it reads. Scoring a batch therefore costs time proportional to the
+batch size rather than to the size of the shards.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import time
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_INDEX_DIR = Path(
+    os.getenv("NGRAM_INDEX_DIR", str(PROJECT_ROOT / "temp" / "ngram_index"))
+)
+DEFAULT_NGRAM_DIR = PROJECT_ROOT / "temp" / "ngram_data"
+DEFAULT_TOTAL_COUNTS = PROJECT_ROOT / "temp" / "total_counts"
+DEFAULT_YEAR_MIN = 1800
+DEFAULT_YEAR_MAX = 2019
+INDEX_FORMAT = 1
+
+_ARRAYS = (
+    "terms",
+    "term_offsets",
+    "series_offsets",
+    "years",
+    "counts",
+    "totals",
+    "year_totals",
+)
+_TOTAL_COUNTS_RE = re.compile(r"(\d{4})\s*,\s*([0-9]+)\s*,\s*[0-9]+")
+
+
+# ---------------------------------------------------------------------------
+# Source parsing
+
+
+def parse_total_counts(path: Path | str) -> Dict[int, int]:
+    """Parse a Google Books ``total_counts`` file into ``{year: match_count}``.
+
+    Same rules as ``ngram_lookup.load_total_counts``: repeated years keep the
+    largest count.
+    """
+
+    year_totals: Dict[int, int] = {}
+    content = Path(path).read_text()
+    for year_str, count_str in _TOTAL_COUNTS_RE.findall(content):
+        year, count = int(year_str), int(count_str)
+        year_totals[year] = max(year_totals.get(year, 0), count)
+    return year_totals
+
+
+def iter_shard_rows(path: Path | str) -> Iterable[Tuple[str, int, int]]:
+    """Yield ``(lowercased term, year, match_count)`` from one shard.
+
+    Handles the 2012 layout (``word TAB year TAB match TAB volume``) and the
+    2020 layout (``word TAB year,match,volume TAB year,match,volume ...``).
+    Malformed lines are skipped.
+    """
+
+    with gzip.open(path, "rt", encoding="utf-8", errors="ignore") as handle:
+        for line in handle:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 2:
+                continue
+            word = parts[0].strip().lower()
+            if not word:
+                continue
+
+            if "," in parts[1]:
+                for field_value in parts[1:]:
+                    pieces = field_value.split(",")
+                    if len(pieces) < 2:
+                        continue
+                    try:
+                        yield word, int(pieces[0]), int(pieces[1])
+                    except ValueError:
+                        continue
+            elif len(parts) >= 3:
+                try:
+                    yield word, int(parts[1]), int(parts[2])
+                except ValueError:
+                    continue
+
+
+# ---------------------------------------------------------------------------
+# Building
+
+
+@dataclass(slots=True)
+class SeriesRun:
+    """Sorted, de-duplicated term series covering part of the vocabulary."""
+
+    terms: List[bytes]
+    series_offsets: np.ndarray
+    years: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def entry_count(self) -> int:
+        return int(self.years.size)
+
+
+def reduce_series(
+    terms: Sequence[bytes],
+    term_ids: np.ndarray,
+    years: np.ndarray,
+    counts: np.ndarray,
+) -> SeriesRun:
+    """Sort ``(term, year, count)`` rows and sum counts of duplicate pairs.
+
+    ``terms`` is the (unsorted, unique) vocabulary and ``term_ids`` indexes
+    into it for every row.
+    """
+
+    order = sorted(range(len(terms)), key=terms.__getitem__)
+    rank = np.empty(len(terms), dtype=np.int64)
+    rank[np.asarray(order, dtype=np.int64)] = np.arange(len(terms), dtype=np.int64)
+
+    row_rank = rank[np.asarray(term_ids, dtype=np.int64)]
+    years = np.asarray(years, dtype=np.int64)
+    rows = np.lexsort((years, row_rank))
+    row_rank, years = row_rank[rows], years[rows]
+    counts = np.asarray(counts, dtype=np.int64)[rows]
+
+    if rows.size:
+        boundary = np.ones(rows.size, dtype=bool)
+        boundary[1:] = (row_rank[1:] != row_rank[:-1]) | (years[1:] != years[:-1])
+        starts = np.flatnonzero(boundary)
+        counts = np.add.reduceat(counts, starts)
+        row_rank, years = row_rank[starts], years[starts]
+
+    # Terms whose rows all fell outside the year window get no entry
+    present = np.unique(row_rank)
+    sorted_terms = [terms[order[i]] for i in present.tolist()]
+    compact_rank = np.searchsorted(present, row_rank)
+    series_offsets = np.zeros(len(sorted_terms) + 1, dtype=np.int64)
+    np.add.at(series_offsets, compact_rank + 1, 1)
+    np.cumsum(series_offsets, out=series_offsets)
+
+    return SeriesRun(
+        terms=sorted_terms,
+        series_offsets=series_offsets,
+        years=years.astype(np.uint16),
+        counts=counts,
+    )
+
+
+def read_shard(
+    path: Path | str,
+    year_min: int = DEFAULT_YEAR_MIN,
+    year_max: int = DEFAULT_YEAR_MAX,
+) -> SeriesRun:
+    """Read one shard into a sorted series run restricted to the year window."""
+
+    vocabulary: Dict[bytes, int] = {}
+    term_ids = array("q")
+    years = array("H")
+    counts = array("q")
+
+    for word, year, count in iter_shard_rows(path):
+        if year < year_min or year > year_max:
+            continue
+        key = word.encode("utf-8")
+        term_id = vocabulary.get(key)
+        if term_id is None:
+            term_id = vocabulary[key] = len(vocabulary)
+        term_ids.append(term_id)
+        years.append(year)
+        counts.append(count)
+
+    return reduce_series(
+        list(vocabulary),
+        np.frombuffer(term_ids, dtype=np.int64),
+        np.frombuffer(years, dtype=np.uint16),
+        np.frombuffer(counts, dtype=np.int64),
+    )
+
+
+def merge_runs(runs: Sequence[SeriesRun]) -> SeriesRun:
+    """Combine per-shard runs into one sorted run.
+
+    Per-letter shards cover disjoint, ordered key ranges and are simply
+    concatenated; anything else (hash-partitioned 2020 shards, terms whose
+    lowercase form lands in another shard) is re-reduced.
+    """
+
+    runs = [run for run in runs if run.terms]
+    if not runs:
+        return reduce_series([], np.empty(0), np.empty(0), np.empty(0))
+    if len(runs) == 1:
+        return runs[0]
+
+    ordered = all(a.terms[-1] < b.terms[0] for a, b in zip(runs, runs[1:]))
+    if ordered:
+        entry_starts = np.cumsum([0] + [run.entry_count for run in runs[:-1]])
+        series_offsets = np.concatenate(
+            [runs[0].series_offsets[:1]]
+            + [run.series_offsets[1:] + start for run, start in zip(runs, entry_starts)]
+        )
+        return SeriesRun(
+            terms=[term for run in runs for term in run.terms],
+            series_offsets=series_offsets,
+            years=np.concatenate([run.years for run in runs]),
+            counts=np.concatenate([run.counts for run in runs]),
+        )
+
+    vocabulary: Dict[bytes, int] = {}
+    term_ids = []
+    for run in runs:
+        local_ids = np.array(
+            [vocabulary.setdefault(term, len(vocabulary)) for term in run.terms],
+            dtype=np.int64,
+        )
+        term_ids.append(np.repeat(local_ids, np.diff(run.series_offsets)))
+    return reduce_series(
+        list(vocabulary),
+        np.concatenate(term_ids),
+        np.concatenate([run.years for run in runs]),
+        np.concatenate([run.counts for run in runs]),
+    )
+
+
+def find_shards(ngram_dir: Path | str = DEFAULT_NGRAM_DIR) -> List[Path]:
+    """Return the 1-gram shards in ``ngram_dir`` in name order."""
+
+    return sorted(Path(ngram_dir).glob("googlebooks-eng-*.gz"))
+
+
+def write_index(
+    run: SeriesRun,
+    year_totals: Mapping[int, int],
+    output_dir: Path | str = DEFAULT_INDEX_DIR,
+    year_min: int = DEFAULT_YEAR_MIN,
+    year_max: int = DEFAULT_YEAR_MAX,
+    sources: Sequence[str] = (),
+) -> Path:
+    """Write ``run`` as an index directory, replacing any previous one."""
+
+    output_dir = Path(output_dir)
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    term_lengths = np.fromiter((len(term) for term in run.terms), dtype=np.int64, count=len(run.terms))
+    term_offsets = np.zeros(len(run.terms) + 1, dtype=np.int64)
+    np.cumsum(term_lengths, out=term_offsets[1:])
+
+    totals = np.zeros(len(run.terms), dtype=np.int64)
+    if run.counts.size:
+        nonempty = run.series_offsets[:-1] < run.series_offsets[1:]
+        totals[nonempty] = np.add.reduceat(run.counts, run.series_offsets[:-1][nonempty])
+
+    yearly = np.zeros(year_max - year_min + 1, dtype=np.int64)
+    for year, total in year_totals.items():
+        if year_min <= year <= year_max:
+            yearly[year - year_min] = total
+
+    arrays = {
+        "terms": np.frombuffer(b"".join(run.terms), dtype=np.uint8),
+        "term_offsets": term_offsets,
+        "series_offsets": run.series_offsets.astype(np.int64),
+        "years": run.years.astype(np.uint16),
+        "counts": run.counts.astype(np.int64),
+        "totals": totals,
+        "year_totals": yearly,
+    }
+    for name, values in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", values)
+
+    meta = {
+        "format": INDEX_FORMAT,
+        "year_min": year_min,
+        "year_max": year_max,
+        "term_count": len(run.terms),
+        "entry_count": run.entry_count,
+        "sources": list(sources),
+        "built_at": time.time(),
+    }
+    (tmp_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    os.replace(tmp_dir, output_dir)
+    return output_dir
+
+
+def build_index(
+    ngram_dir: Path | str = DEFAULT_NGRAM_DIR,
+    total_counts_path: Path | str = DEFAULT_TOTAL_COUNTS,
+    output_dir: Path | str = DEFAULT_INDEX_DIR,
+    year_min: int = DEFAULT_YEAR_MIN,
+    year_max: int = DEFAULT_YEAR_MAX,
+    shards: Optional[Sequence[Path | str]] = None,
+) -> Path:
+    """Build the index from the downloaded shards and the totals file."""
+
+    shard_paths = [Path(path) for path in shards] if shards is not None else find_shards(ngram_dir)
+    if not shard_paths:
+        raise FileNotFoundError(f"No n-gram shards found in {ngram_dir}")
+
+    year_totals = parse_total_counts(total_counts_path)
+    runs = []
+    for number, shard in enumerate(shard_paths, start=1):
+        started = time.perf_counter()
+        run = read_shard(shard, year_min, year_max)
+        runs.append(run)
+        logger.info(
+            f"[{number}/{len(shard_paths)}] {shard.name}: {len(run.terms):,} terms, "
+            f"{run.entry_count:,} year entries in {time.perf_counter() - started:.1f}s"
+        )
+
+    merged = merge_runs(runs)
+    return write_index(
+        merged,
+        year_totals,
+        output_dir,
+        year_min,
+        year_max,
+        sources=[shard.name for shard in shard_paths],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Querying
+
+
+class NgramIndex:
+    """Read-only view over an index directory written by :func:`build_index`."""
+
+    def __init__(self, path: Path | str, meta: Dict, arrays: Dict[str, np.ndarray]):
+        self.path = Path(path)
+        self.year_min = int(meta["year_min"])
+        self.year_max = int(meta["year_max"])
+        self.built_at = float(meta.get("built_at", 0.0))
+        self._terms = arrays["terms"]
+        self._term_offsets = arrays["term_offsets"]
+        self._series_offsets = arrays["series_offsets"]
+        self._years = arrays["years"]
+        self._counts = arrays["counts"]
+        self._totals = arrays["totals"]
+        self._year_totals = arrays["year_totals"]
+        self._corpus_total: Optional[int] = None
+
+    @classmethod
+    def open(cls, path: Path | str = DEFAULT_INDEX_DIR) -> "NgramIndex":
+        path = Path(path)
+        meta_path = path / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"N-gram index not found at {path}")
+        meta = json.loads(meta_path.read_text())
+        if meta.get("format") != INDEX_FORMAT:
+            raise ValueError(f"Unsupported n-gram index format {meta.get('format')!r} at {path}")
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS}
+        return cls(path, meta, arrays)
+
+    def __len__(self) -> int:
+        return int(self._term_offsets.size - 1)
+
+    def covers(self, year_start: int, year_end: int) -> bool:
+        return self.year_min <= year_start and year_end <= self.year_max
+
+    def year_totals(self) -> Dict[int, int]:
+        return {
+            self.year_min + offset: int(total)
+            for offset, total in enumerate(self._year_totals.tolist())
+            if total > 0
+        }
+
+    def _term_at(self, row: int) -> bytes:
+        start, end = self._term_offsets[row], self._term_offsets[row + 1]
+        return self._terms[start:end].tobytes()
+
+    def find(self, term: str) -> Optional[int]:
+        """Row of ``term`` (normalised like the shards), or ``None``."""
+
+        key = term.strip().lower().encode("utf-8")
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self._term_at(lo) == key:
+            return lo
+        return None
+
+    def __contains__(self, term: str) -> bool:
+        return self.find(term) is not None
+
+    def series(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """``(years, counts)`` for ``term``; both empty when it is absent."""
+
+        row = self.find(term)
+        if row is None:
+            return np.empty(0, dtype=np.uint16), np.empty(0, dtype=np.int64)
+        start, end = self._series_offsets[row], self._series_offsets[row + 1]
+        return np.asarray(self._years[start:end]), np.asarray(self._counts[start:end])
+
+    def total(self, term: str) -> Optional[int]:
+        row = self.find(term)
+        return int(self._totals[row]) if row is not None else None
+
+    def corpus_total(self) -> int:
+        """Sum of every term's total count over the indexed years."""
+
+        if self._corpus_total is None:
+            self._corpus_total = int(np.asarray(self._totals).sum(dtype=np.int64))
+        return self._corpus_total
+
+    def total_zipf_scores(self, terms: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Zipf score of each term's total count: ``log10(total / corpus * 1e6)``.
+
+        ``corpus`` is :meth:`corpus_total`. This is the formula ``temp/getngrams.py``
+        applies to ``word_frequencies_complete.txt`` (one total per word, divided
+        by the sum of all totals). Both files count only the indexed years
+        (``scripts/build_complete_ngram_index.py`` uses the same window), so
+        both sources score ``ngram_freq`` on the same scale. Terms that are
+        absent or never counted get ``None``.
+        """
+
+        corpus = self.corpus_total()
+        results: Dict[str, Optional[float]] = {}
+        for term in terms:
+            word = term.strip().lower()
+            if not word or word in results:
+                continue
+            count = self.total(word)
+            results[word] = math.log10(count / corpus * 1_000_000) if count and corpus else None
+        return results
+
+    def zipf_scores(
+        self,
+        terms: Iterable[str],
+        year_start: int = 1900,
+        year_end: int = 2019,
+        aggregator: str = "mean",
+        alpha: float = 1e-6,
+        year_totals: Optional[Mapping[int, int]] = None,
+        missing_as_none: bool = False,
+    ) -> Dict[str, Optional[float]]:
+        """Aggregate per-year Zipf scores exactly as ``lookup_terms`` does.
+
+        Each year in the window with a corpus total contributes
+        ``log10((count + alpha) / total * 1e6)``, zero counts included, and the
+        yearly values are averaged (or maxed). Terms absent from the index
+        therefore still get the smoothed floor score unless
+        ``missing_as_none`` is set.
+        """
+
+        if not self.covers(year_start, year_end):
+            raise ValueError(
+                f"Index covers {self.year_min}-{self.year_max}, not {year_start}-{year_end}"
+            )
+        totals_map = year_totals if year_totals is not None else self.year_totals()
+        valid_years = np.array(
+            [year for year in range(year_start, year_end + 1) if totals_map.get(year)],
+            dtype=np.int64,
+        )
+        year_slot = np.full(self.year_max - self.year_min + 1, -1, dtype=np.int64)
+        year_slot[valid_years - self.year_min] = np.arange(valid_years.size)
+        corpus = np.array([totals_map[year] for year in valid_years.tolist()], dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            floor = np.log10(alpha / corpus * 1_000_000)
+
+        results: Dict[str, Optional[float]] = {}
+        for term in terms:
+            word = term.strip().lower()
+            if not word or word in results:
+                continue
+            row = self.find(word)
+            if row is None and missing_as_none:
+                results[word] = None
+                continue
+
+            yearly = floor.copy()
+            if row is not None:
+                start, end = self._series_offsets[row], self._series_offsets[row + 1]
+                slots = year_slot[np.asarray(self._years[start:end], dtype=np.int64) - self.year_min]
+                keep = slots >= 0
+                slots = slots[keep]
+                counts = np.asarray(self._counts[start:end], dtype=np.float64)[keep]
+                yearly[slots] = np.log10((counts + alpha) / corpus[slots] * 1_000_000)
+
+            # With no smoothing, years without a count score -inf and are skipped
+            yearly = yearly[np.isfinite(yearly)]
+            if yearly.size == 0:
+                results[word] = None
+            elif aggregator == "max":
+                results[word] = float(yearly.max())
+            else:
+                results[word] = float(yearly.mean())
+        return results
+
+
+_cached_index: Optional[NgramIndex] = None
+
+
+def get_ngram_index(path: Path | str = DEFAULT_INDEX_DIR) -> Optional[NgramIndex]:
+    """Open (once per process) the index at ``path``; ``None`` if not built."""
+
+    global _cached_index
+    path = Path(path)
+    if _cached_index is not None and _cached_index.path == path:
+        return _cached_index
+    try:
+        _cached_index = NgramIndex.open(path)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.warning(f"Unable to open n-gram index {path}: {exc}")
+        return None
+    return _cached_index
+
+
+__all__ = [
+    "DEFAULT_INDEX_DIR",
+    "DEFAULT_NGRAM_DIR",
+    "DEFAULT_TOTAL_COUNTS",
+    "DEFAULT_YEAR_MAX",
+    "DEFAULT_YEAR_MIN",
+    "NgramIndex",
+    "SeriesRun",
+    "build_index",
+    "find_shards",
+    "get_ngram_index",
+    "iter_shard_rows",
+    "merge_runs",
+    "parse_total_counts",
+    "read_shard",
+    "reduce_series",
+    "write_index",
+]
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""Pronunciation audio for the web app.
+
+Requests are answered from, in order:
+
+1. the pre-rendered library in ``pronunciation_files`` (``{word_id}_{term}.wav``,
+   or ``.mp3``/``.ogg`` for transcoded batches),
+2. an on-disk cache of audio synthesised earlier, kept under a size cap with
+   least-recently-used eviction,
+3. a local TTS engine (eSpeak-NG, eSpeak or pyttsx3) run on a small thread
+   pool. Concurrent requests for the same word share one render, and the
+   number of words waiting for a render is bounded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIBRARY_DIR = Path("pronunciation_files")
+DEFAULT_CACHE_DIR = Path(
+    os.getenv(
+        "PRONUNCIATION_CACHE_DIR",
+        str(Path(__file__).resolve().parents[1] / "temp" / "pronunciation_cache"),
+    )
+)
+DEFAULT_CACHE_BYTES = int(os.getenv("PRONUNCIATION_CACHE_MB", "256")) * 1024 * 1024
+
+AUDIO_SUFFIX = ".wav"
+LIBRARY_SUFFIXES = (".wav", ".mp3", ".ogg")
+MAX_WORD_LENGTH = 64
+WORD_PATTERN = re.compile(r"^[^\W\d_](?:[^\W\d_]|[ '\-.])*$")
+LIBRARY_NAME_PATTERN = re.compile(r"^(\d+)_(.+)$")
+RENDER_TIMEOUT_SECONDS = 10
+
+# Renders ``text`` into a WAV file at the given path.
+Renderer = Callable[[str, Path], None]
+
+
+class PronunciationUnavailable(RuntimeError):
+    """No audio could be produced for the word."""
+
+
+class PronunciationBusy(PronunciationUnavailable):
+    """Too many words are already waiting for a render."""
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase ``word`` and collapse whitespace; raise ``ValueError`` if it is not speakable."""
+    key = " ".join((word or "").split()).lower()
+    if not key or len(key) > MAX_WORD_LENGTH or not WORD_PATTERN.match(key):
+        raise ValueError(f"Not a pronounceable word: {word!r}")
+    return key
+
+
+# ---------------------------------------------------------------------------
+# TTS engines
+# ---------------------------------------------------------------------------
+
+
+def render_with_espeak(binary: str, text: str, path: Path) -> None:
+    subprocess.run(
+        [binary, "-v", "en", "-s", "150", "-w", str(path), "--", text],
+        check=True,
+        capture_output=True,
+        timeout=RENDER_TIMEOUT_SECONDS,
+    )
+
+
+_pyttsx3_lock = threading.Lock()
+
+
+def render_with_pyttsx3(text: str, path: Path) -> None:
+    import pyttsx3
+
+    # pyttsx3 drives a single platform engine; renders must not overlap.
+    with _pyttsx3_lock:
+        engine = pyttsx3.init()
+        try:
+            engine.setProperty("rate", 130)
+            engine.save_to_file(text, str(path))
+            engine.runAndWait()
+        finally:
+            engine.stop()
+
+
+def detect_renderer() -> Optional[Renderer]:
+    """Pick the first local engine available: eSpeak-NG, eSpeak, then pyttsx3."""
+    for name in ("espeak-ng", "espeak"):
+        binary = shutil.which(name)
+        if binary:
+            logger.info(f"Pronunciation audio will be rendered with {binary}")
+            return lambda text, path: render_with_espeak(binary, text, path)
+    if importlib.util.find_spec("pyttsx3") is not None:
+        logger.info("Pronunciation audio will be rendered with pyttsx3")
+        return render_with_pyttsx3
+    logger.warning("No local TTS engine found; only pre-rendered pronunciations are served")
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Pre-rendered library
+# ---------------------------------------------------------------------------
+
+
+class PronunciationLibrary:
+    """Index of pre-rendered files by lowercase term.
+
+    Files are named ``{word_id}_{term}.wav``; where several ids share a term
+    the lowest id wins. The index is rebuilt when the directory changes.
+    """
+
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+        self._index: Dict[str, str] = {}
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, key: str) -> Optional[Path]:
+        self._refresh()
+        filename = self._index.get(key)
+        return self.directory / filename if filename else None
+
+    def _refresh(self) -> None:
+        try:
+            mtime_ns = self.directory.stat().st_mtime_ns
+        except OSError:
+            self._index, self._mtime_ns = {}, None
+            return
+        if mtime_ns == self._mtime_ns:
+            return
+        with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return
+            index: Dict[str, str] = {}
+            best_ids: Dict[str, int] = {}
+            for entry in os.scandir(self.directory):
+                stem, suffix = os.path.splitext(entry.name)
+                if suffix not in LIBRARY_SUFFIXES or not entry.is_file():
+                    continue
+                match = LIBRARY_NAME_PATTERN.match(stem)
+                if not match:
+                    continue
+                word_id, term = int(match.group(1)), match.group(2).lower()
+                if term not in best_ids or word_id < best_ids[term]:
+                    best_ids[term] = word_id
+                    index[term] = entry.name
+            self._index, self._mtime_ns = index, mtime_ns
+            logger.info(f"Indexed {len(index):,} pre-rendered pronunciations in {self.directory}")
+
+
+# ---------------------------------------------------------------------------
+# Disk cache
+# ---------------------------------------------------------------------------
+
+
+class AudioCache:
+    """Synthesised audio on disk with a least-recently-used size cap.
+
+    Recency is tracked in memory and mirrored into file mtimes, so the order
+    survives a restart.
+    """
+
+    def __init__(self, directory: Path | str, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        existing = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or not entry.name.endswith(AUDIO_SUFFIX):
+                continue
+            if entry.name.startswith("."):
+                # Leftover from a render interrupted mid-write.
+                Path(entry.path).unlink(missing_ok=True)
+                continue
+            stat = entry.stat()
+            existing.append((stat.st_mtime_ns, entry.name, stat.st_size))
+        for _, name, size in sorted(existing):
+            self._entries[name] = size
+            self.total_bytes += size
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def filename_for(key: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", key).strip("-")[:40] or "word"
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=6).hexdigest()
+        return f"{slug}-{digest}{AUDIO_SUFFIX}"
+
+    def temp_path(self) -> Path:
+        return self.directory / f".{uuid.uuid4().hex}{AUDIO_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Path]:
+        name = self.filename_for(key)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        path = self.directory / name
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.total_bytes -= self._entries.pop(name, 0)
+            return None
+        return path
+
+    def put(self, key: str, rendered: Path) -> Path:
+        """Move a finished render into the cache and evict down to the cap."""
+        name = self.filename_for(key)
+        path = self.directory / name
+        size = rendered.stat().st_size
+        os.replace(rendered, path)
+        with self._lock:
+            self.total_bytes += size - self._entries.pop(name, 0)
+            self._entries[name] = size
+        self._evict()
+        return path
+
+    def _evict(self) -> None:
+        with self._lock:
+            # The newest entry always stays, even if it alone exceeds the cap.
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                name, size = self._entries.popitem(last=False)
+                self.total_bytes -= size
+                (self.directory / name).unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class AudioStats:
+    library_hits: int = 0
+    cache_hits: int = 0
+    renders: int = 0
+    shared_renders: int = 0
+    failures: int = 0
+
+
+class PronunciationAudioService:
+    """Resolve a word to an audio file, rendering and caching it when needed."""
+
+    def __init__(
+        self,
+        library_dir: Path | str = DEFAULT_LIBRARY_DIR,
+        cache_dir: Path | str = DEFAULT_CACHE_DIR,
+        *,
+        max_cache_bytes: int = DEFAULT_CACHE_BYTES,
+        workers: int = 2,
+        max_pending: int = 64,
+        renderer: Optional[Renderer] = None,
+    ) -> None:
+        self.library = PronunciationLibrary(library_dir)
+        self.cache_dir = Path(cache_dir)
+        self.max_cache_bytes = max_cache_bytes
+        self.workers = workers
+        self.max_pending = max_pending
+        self.stats = AudioStats()
+        self._renderer = renderer
+        self._renderer_detected = renderer is not None
+        self._cache: Optional[AudioCache] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def cache(self) -> AudioCache:
+        # Created on first use so importing the web app touches no disk.
+        if self._cache is None:
+            self._cache = AudioCache(self.cache_dir, self.max_cache_bytes)
+        return self._cache
+
+    @property
+    def renderer(self) -> Optional[Renderer]:
+        if not self._renderer_detected:
+            self._renderer = detect_renderer()
+            self._renderer_detected = True
+        return self._renderer
+
+    async def get(self, word: str) -> Path:
+        """Path of an audio file for ``word``.
+
+        Raises ``ValueError`` for input that is not a word,
+        ``PronunciationBusy`` when the render queue is full and
+        ``PronunciationUnavailable`` when no audio can be produced.
+        """
+        key = normalize_word(word)
+
+        prerendered = await asyncio.to_thread(self.library.lookup, key)
+        if prerendered is not None:
+            self.stats.library_hits += 1
+            return prerendered
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats.cache_hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            if len(self._inflight) >= self.max_pending:
+                raise PronunciationBusy(f"{len(self._inflight)} pronunciations already rendering")
+            task = asyncio.ensure_future(self._render(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats.shared_renders += 1
+        # A client going away must not cancel a render others are waiting on.
+        return await asyncio.shield(task)
+
+    async def _render(self, key: str) -> Path:
+        renderer = self.renderer
+        if renderer is None:
+            raise PronunciationUnavailable("No local TTS engine is available")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pronunciation")
+
+        partial = self.cache.temp_path()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, renderer, key, partial)
+            if not partial.exists() or partial.stat().st_size == 0:
+                raise PronunciationUnavailable(f"TTS engine produced no audio for {key!r}")
+            path = self.cache.put(key, partial)
+        except Exception as exc:
+            partial.unlink(missing_ok=True)
+            self.stats.failures += 1
+            if isinstance(exc, PronunciationUnavailable):
+                raise
+            raise PronunciationUnavailable(f"Rendering {key!r} failed: {exc}") from exc
+
+        self.stats.renders += 1
+        return path
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+__all__ = [
+    "AudioCache",
+    "AudioStats",
+    "PronunciationAudioService",
+    "PronunciationBusy",
+    "PronunciationLibrary",
+    "PronunciationUnavailable",
+    "detect_renderer",
+    "normalize_word",
+]
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""Parallel, resumable synthesis of pronunciation files.
+
+Each word becomes an ``AudioJob`` carrying the text handed to the engine (a
+plain term, eSpeak ``[[ipa]]`` input or SAPI phoneme markup). The synthesis
+key hashes engine, text and output format, so:
+
+* a word whose manifest entry has the same key and whose file still exists is
+  skipped on the next run,
+* words that would be spoken identically are rendered once and the file is
+  linked under every word id.
+
+Rendering and the optional transcode to a compact format both run in the
+worker process; the parent only records results in an append-only JSON-lines
+manifest, which is what lets an interrupted build pick up where it stopped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.pronunciation_audio import RENDER_TIMEOUT_SECONDS, render_with_espeak, render_with_pyttsx3
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_PATH = Path(
+    os.getenv(
+        "PRONUNCIATION_MANIFEST",
+        str(Path(__file__).resolve().parents[1] / "temp" / "pronunciation_manifest.jsonl"),
+    )
+)
+
+# ffmpeg arguments per output format; "wav" keeps the engine's output as is.
+AUDIO_FORMATS: Dict[str, List[str]] = {
+    "wav": [],
+    "mp3": ["-ac", "1", "-ar", "22050", "-c:a", "libmp3lame", "-q:a", "6"],
+    "ogg": ["-ac", "1", "-ar", "24000", "-c:a", "libopus", "-b:a", "24k"],
+}
+
+# Renders ``text`` into a WAV file at the given path; must be picklable.
+Renderer = Callable[[str, Path], None]
+
+
+def sanitize_filename(filename: str) -> str:
+    """Replace characters that are unsafe in file names (same rule as the library builder)."""
+    for char in '<>:"/\\|?*':
+        filename = filename.replace(char, "_")
+    return filename
+
+
+@dataclass(frozen=True)
+class AudioJob:
+    word_id: int
+    term: str
+    text: str
+
+    def filename(self, audio_format: str) -> str:
+        return f"{self.word_id}_{sanitize_filename(self.term)}.{audio_format}"
+
+
+def synthesis_key(engine: str, text: str, audio_format: str) -> str:
+    """Hash of everything that determines the rendered audio."""
+    payload = "\0".join((engine, text, audio_format)).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=12).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Engines (run inside worker processes)
+# ---------------------------------------------------------------------------
+
+
+def render_with_espeak_ng(text: str, path: Path) -> None:
+    render_with_espeak(shutil.which("espeak-ng") or "espeak", text, path)
+
+
+def render_with_festival(text: str, path: Path) -> None:
+    quoted = text.replace("\\", "\\\\").replace('"', '\\"')
+    with tempfile.NamedTemporaryFile("w", suffix=".scm", delete=False) as handle:
+        handle.write(
+            f'(set! utt1 (Utterance Text "{quoted}"))\n'
+            "(utt.synth utt1)\n"
+            f'(utt.save.wave utt1 "{path}" \'riff)\n'
+        )
+        script = handle.name
+    try:
+        subprocess.run(["festival", "-b", script], check=True, capture_output=True, timeout=15)
+    finally:
+        os.unlink(script)
+
+
+ENGINE_RENDERERS: Dict[str, Renderer] = {
+    "espeak": render_with_espeak_ng,
+    "pyttsx3": render_with_pyttsx3,
+    "festival": render_with_festival,
+}
+
+
+def transcode(source: Path, destination: Path, audio_format: str) -> None:
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-i", str(source), *AUDIO_FORMATS[audio_format], str(destination)],
+        check=True,
+        capture_output=True,
+        timeout=RENDER_TIMEOUT_SECONDS,
+    )
+
+
+def synthesize(renderer: Renderer, text: str, output_path: Path, audio_format: str) -> int:
+    """Render ``text`` to ``output_path`` (transcoding if needed); return the file size.
+
+    Work happens on hidden temporary names in the output directory so a killed
+    worker never leaves a truncated file under the final name.
+    """
+    stem = output_path.parent / f".{uuid.uuid4().hex}"
+    rendered = stem.with_suffix(".wav")
+    encoded = stem.with_suffix(f".{audio_format}")
+    try:
+        renderer(text, rendered)
+        if not rendered.exists() or rendered.stat().st_size == 0:
+            raise RuntimeError("engine produced no audio")
+        if AUDIO_FORMATS[audio_format]:
+            transcode(rendered, encoded, audio_format)
+            rendered.unlink()
+        os.replace(encoded, output_path)
+        return output_path.stat().st_size
+    finally:
+        rendered.unlink(missing_ok=True)
+        encoded.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    word_id: int
+    key: str
+    filename: Optional[str]
+    error: Optional[str] = None
+
+
+class BatchManifest:
+    """Append-only record of finished jobs; the last line per word id wins."""
+
+    def __init__(self, path: Path | str = DEFAULT_MANIFEST_PATH) -> None:
+        self.path = Path(path)
+        self.entries: Dict[int, ManifestEntry] = {}
+        self._files_by_key: Dict[str, str] = {}
+        if self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _load(self) -> None:
+        with self.path.open("r", encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, 1):
+                try:
+                    entry = ManifestEntry(**json.loads(line))
+                except (ValueError, TypeError):
+                    # A run killed mid-write can leave a partial last line.
+                    logger.warning(f"Skipping unreadable manifest line {line_number} in {self.path}")
+                    continue
+                self._remember(entry)
+
+    def _remember(self, entry: ManifestEntry) -> None:
+        self.entries[entry.word_id] = entry
+        if entry.filename:
+            self._files_by_key[entry.key] = entry.filename
+
+    def is_done(self, word_id: int, key: str, output_dir: Path) -> bool:
+        entry = self.entries.get(word_id)
+        return (
+            entry is not None
+            and entry.key == key
+            and entry.filename is not None
+            and (output_dir / entry.filename).exists()
+        )
+
+    def file_for_key(self, key: str) -> Optional[str]:
+        return self._files_by_key.get(key)
+
+    def record(self, entry: ManifestEntry) -> None:
+        self._remember(entry)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry.__dict__, separators=(",", ":")) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Batch generator
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class BatchStats:
+    rendered: int = 0
+    linked: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes_written: int = 0
+
+
+class BatchAudioGenerator:
+    """Render pronunciation jobs on a process pool, resuming from a manifest.
+
+    ``on_result(word_id, path)`` is called in the parent for every word whose
+    file is in place after the run (rendered, linked or skipped), so callers
+    can update the database in batches.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        engine: str,
+        *,
+        audio_format: str = "wav",
+        workers: Optional[int] = None,
+        manifest_path: Path | str = DEFAULT_MANIFEST_PATH,
+        renderer: Optional[Renderer] = None,
+    ) -> None:
+        if audio_format not in AUDIO_FORMATS:
+            raise ValueError(f"Unsupported audio format: {audio_format}")
+        if renderer is None and engine not in ENGINE_RENDERERS:
+            raise ValueError(f"Unknown TTS engine: {engine}")
+        if AUDIO_FORMATS[audio_format] and shutil.which("ffmpeg") is None:
+            raise RuntimeError(f"ffmpeg is required to write {audio_format} files")
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.engine = engine
+        self.audio_format = audio_format
+        # pyttsx3 drives one platform speech engine per process; extra
+        # processes mostly contend for it.
+        default_workers = 1 if engine == "pyttsx3" else (os.cpu_count() or 1)
+        self.workers = max(1, workers or default_workers)
+        self.manifest = BatchManifest(manifest_path)
+        self.renderer = renderer or ENGINE_RENDERERS[engine]
+        self.stats = BatchStats()
+
+    def plan(self, jobs: Iterable[AudioJob]) -> Tuple[Dict[str, List[AudioJob]], List[Tuple[AudioJob, str]]]:
+        """Group jobs to render by synthesis key; return (to_render, already_done)."""
+        to_render: Dict[str, List[AudioJob]] = {}
+        done: List[Tuple[AudioJob, str]] = []
+        for job in jobs:
+            key = synthesis_key(self.engine, job.text, self.audio_format)
+            if self.manifest.is_done(job.word_id, key, self.output_dir):
+                done.append((job, self.manifest.entries[job.word_id].filename))
+            else:
+                to_render.setdefault(key, []).append(job)
+        return to_render, done
+
+    def run(
+        self,
+        jobs: Iterable[AudioJob],
+        on_result: Optional[Callable[[int, Path], None]] = None,
+    ) -> BatchStats:
+        to_render, done = self.plan(jobs)
+        self.stats = stats = BatchStats(skipped=len(done))
+        for job, filename in done:
+            if on_result:
+                on_result(job.word_id, self.output_dir / filename)
+
+        # Keys rendered by an earlier run for other word ids only need links.
+        for key in list(to_render):
+            existing = self.manifest.file_for_key(key)
+            if existing and (self.output_dir / existing).exists():
+                self._finish(key, to_render.pop(key), existing, on_result)
+
+        total = sum(len(group) for group in to_render.values())
+        logger.info(
+            f"Synthesising {len(to_render):,} distinct pronunciations for {total:,} words "
+            f"with {self.engine} on {self.workers} workers ({stats.skipped:,} already done)"
+        )
+        if not to_render:
+            return stats
+
+        pending_keys = iter(list(to_render))
+        in_flight: Dict[Future, str] = {}
+        window = self.workers * 4
+        finished_keys = 0
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+
+            def submit_next() -> None:
+                key = next(pending_keys, None)
+                if key is None:
+                    return
+                first = to_render[key][0]
+                output_path = self.output_dir / first.filename(self.audio_format)
+                future = executor.submit(synthesize, self.renderer, first.text, output_path, self.audio_format)
+                in_flight[future] = key
+
+            for _ in range(window):
+                submit_next()
+            while in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = in_flight.pop(future)
+                    group = to_render[key]
+                    finished_keys += 1
+                    try:
+                        stats.bytes_written += future.result()
+                    except Exception as exc:
+                        stats.failed += len(group)
+                        logger.error(f"Synthesis failed for '{group[0].term}': {exc}")
+                        for job in group:
+                            self.manifest.record(ManifestEntry(job.word_id, key, None, str(exc)))
+                    else:
+                        stats.rendered += 1
+                        self._finish(key, group, group[0].filename(self.audio_format), on_result)
+                    submit_next()
+                    if finished_keys % 500 == 0:
+                        logger.info(f"Synthesised {finished_keys:,}/{len(to_render):,} pronunciations...")
+
+        logger.info(
+            f"Batch complete: {stats.rendered:,} rendered, {stats.linked:,} linked, "
+            f"{stats.skipped:,} skipped, {stats.failed:,} failed"
+        )
+        return stats
+
+    def _finish(
+        self,
+        key: str,
+        group: List[AudioJob],
+        source_name: str,
+        on_result: Optional[Callable[[int, Path], None]],
+    ) -> None:
+        """Give every job in ``group`` its own file name pointing at ``source_name``."""
+        source = self.output_dir / source_name
+        for job in group:
+            filename = job.filename(self.audio_format)
+            target = self.output_dir / filename
+            if target != source:
+                self._link(source, target)
+                self.stats.linked += 1
+            self.manifest.record(ManifestEntry(job.word_id, key, filename))
+            if on_result:
+                on_result(job.word_id, target)
+
+    @staticmethod
+    def _link(source: Path, target: Path) -> None:
+        target.unlink(missing_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+
+__all__ = [
+    "AUDIO_FORMATS",
+    "AudioJob",
+    "BatchAudioGenerator",
+    "BatchManifest",
+    "BatchStats",
+    "DEFAULT_MANIFEST_PATH",
+    "ENGINE_RENDERERS",
+    "ManifestEntry",
+    "sanitize_filename",
+    "synthesis_key",
+    "synthesize",
+]
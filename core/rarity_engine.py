@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""Incremental rarity engine.
+
+Reproduces the ``word_rarity_metrics`` blend (inverted ``PERCENT_RANK`` per
+frequency source, weighted 45/35/20 with re-normalisation for missing sources)
+without refreshing the materialized view or rewriting every row of
+``defined``.
+
+The engine keeps the sorted value distribution of each source, plus the
+per-word values it was built from, in a state file. When only a few words get
+new frequencies their percentile ranks are found by binary search against the
+updated distributions and only rows whose rounded ``final_rarity`` actually
+changed are written back. Because every other word's rank drifts a little as
+the distributions change, a full recompute is triggered once the
+distributions have shifted (Kolmogorov–Smirnov distance from the last full
+recompute) beyond a tolerance.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("python_wordfreq", "ngram_freq", "commoncrawl_freq")
+WEIGHTS = np.array([0.45, 0.35, 0.20], dtype=np.float64)
+SENTINEL = -999.0
+RARITY_DECIMALS = 6  # final_rarity is NUMERIC(8, 6)
+DEFAULT_TOLERANCE = 0.01
+DEFAULT_STATE_PATH = Path(__file__).resolve().parents[1] / "temp" / "rarity_state.npz"
+
+
+# ---------------------------------------------------------------------------
+# Pure computation helpers
+
+
+def percent_rank_rarity(
+    sorted_values: np.ndarray,
+    total_rows: int,
+    values: np.ndarray,
+) -> np.ndarray:
+    """Inverted ``PERCENT_RANK`` for ``values`` against a sorted distribution.
+
+    Mirrors ``1 - PERCENT_RANK() OVER (ORDER BY col)`` evaluated over every
+    row of ``defined``: NULLs sort last and so never precede a value, while
+    ``-999`` sentinels sort first and do. Sentinels and NULLs (``NaN``) get no
+    rarity.
+    """
+
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    valid = ~np.isnan(values) & (values != SENTINEL)
+    if not valid.any():
+        return result
+
+    denominator = total_rows - 1
+    if denominator <= 0:
+        result[valid] = 1.0
+        return result
+
+    preceding = np.searchsorted(sorted_values, values[valid], side="left")
+    result[valid] = 1.0 - preceding / denominator
+    return result
+
+
+def blend_rarity(source_rarities: np.ndarray) -> np.ndarray:
+    """Weighted blend of per-source rarities (``n x 3``), ignoring NaNs."""
+
+    source_rarities = np.atleast_2d(source_rarities)
+    available = ~np.isnan(source_rarities)
+    weights = np.where(available, WEIGHTS, 0.0)
+    numerator = np.where(available, source_rarities, 0.0) @ WEIGHTS
+    denominator = weights.sum(axis=1)
+
+    blended = np.full(source_rarities.shape[0], np.nan)
+    has_data = denominator > 0
+    blended[has_data] = numerator[has_data] / denominator[has_data]
+    return blended
+
+
+def ks_distance(baseline: np.ndarray, current: np.ndarray) -> float:
+    """Kolmogorov–Smirnov distance between two sorted samples."""
+
+    if baseline.size == 0 and current.size == 0:
+        return 0.0
+    if baseline.size == 0 or current.size == 0:
+        return 1.0
+
+    points = np.concatenate([baseline, current])
+    cdf_baseline = np.searchsorted(baseline, points, side="right") / baseline.size
+    cdf_current = np.searchsorted(current, points, side="right") / current.size
+    return float(np.max(np.abs(cdf_baseline - cdf_current)))
+
+
+def rarity_changed(new_value: float, stored: Any) -> bool:
+    """Whether a freshly computed rarity differs from the stored column."""
+
+    if stored is None:
+        return not np.isnan(new_value)
+    if np.isnan(new_value):
+        return True
+    return round(float(new_value), RARITY_DECIMALS) != round(float(stored), RARITY_DECIMALS)
+
+
+def _to_float(value: Any) -> float:
+    if value is None:
+        return np.nan
+    if isinstance(value, Decimal):
+        return float(value)
+    return float(value)
+
+
+# ---------------------------------------------------------------------------
+# State
+
+
+@dataclass
+class RarityState:
+    """Distributions and per-word values the engine last computed from."""
+
+    ids: np.ndarray
+    values: np.ndarray  # n x 3, NaN for NULL
+    current: Dict[str, np.ndarray]
+    baseline: Dict[str, np.ndarray]
+    baseline_total_rows: int
+    computed_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_values(cls, ids: np.ndarray, values: np.ndarray) -> "RarityState":
+        order = np.argsort(ids)
+        ids, values = ids[order], values[order]
+        distributions = {
+            source: np.sort(values[:, column][~np.isnan(values[:, column])])
+            for column, source in enumerate(SOURCES)
+        }
+        return cls(
+            ids=ids,
+            values=values,
+            current=distributions,
+            baseline={source: array.copy() for source, array in distributions.items()},
+            baseline_total_rows=int(ids.shape[0]),
+        )
+
+    @property
+    def total_rows(self) -> int:
+        return int(self.ids.shape[0])
+
+    def drift(self) -> float:
+        """Largest distribution shift since the last full recompute."""
+
+        shifts = [ks_distance(self.baseline[source], self.current[source]) for source in SOURCES]
+        if self.baseline_total_rows:
+            shifts.append(abs(self.total_rows - self.baseline_total_rows) / self.baseline_total_rows)
+        return max(shifts) if shifts else 0.0
+
+    def apply(self, ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Fold new per-word values into the distributions.
+
+        Returns a boolean mask of the rows whose values actually changed.
+        """
+
+        positions = np.searchsorted(self.ids, ids)
+        in_range = positions < self.ids.shape[0]
+        known = np.zeros(ids.shape[0], dtype=bool)
+        known[in_range] = self.ids[positions[in_range]] == ids[in_range]
+
+        old_values = np.full(values.shape, np.nan)
+        old_values[known] = self.values[positions[known]]
+
+        same = (old_values == values) | (np.isnan(old_values) & np.isnan(values))
+        changed_rows = ~same.all(axis=1)
+
+        for column, source in enumerate(SOURCES):
+            moved = changed_rows & ~same[:, column]
+            removed = old_values[moved, column]
+            removed = removed[~np.isnan(removed)]
+            added = values[moved, column]
+            added = added[~np.isnan(added)]
+
+            distribution = self.current[source]
+            if removed.size:
+                distribution = _remove_sorted(distribution, removed)
+            if added.size:
+                added.sort()
+                distribution = np.insert(
+                    distribution, np.searchsorted(distribution, added), added
+                )
+            self.current[source] = distribution
+
+        update_known = known & changed_rows
+        self.values[positions[update_known]] = values[update_known]
+
+        new_rows = ~known
+        if new_rows.any():
+            merged_ids = np.concatenate([self.ids, ids[new_rows]])
+            merged_values = np.concatenate([self.values, values[new_rows]])
+            order = np.argsort(merged_ids)
+            self.ids, self.values = merged_ids[order], merged_values[order]
+
+        return changed_rows
+
+    def rarity_for(self, values: np.ndarray) -> np.ndarray:
+        """Blended rarity for rows of ``values`` against current distributions."""
+
+        per_source = np.column_stack(
+            [
+                percent_rank_rarity(self.current[source], self.total_rows, values[:, column])
+                for column, source in enumerate(SOURCES)
+            ]
+        )
+        return blend_rarity(per_source)
+
+    def save(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays: Dict[str, np.ndarray] = {"ids": self.ids, "values": self.values}
+        for source in SOURCES:
+            arrays[f"current_{source}"] = self.current[source]
+            arrays[f"baseline_{source}"] = self.baseline[source]
+        arrays["header"] = np.array(
+            json.dumps(
+                {
+                    "baseline_total_rows": self.baseline_total_rows,
+                    "computed_at": self.computed_at,
+                }
+            )
+        )
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path | str) -> "RarityState":
+        with np.load(Path(path), allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            return cls(
+                ids=data["ids"],
+                values=data["values"],
+                current={source: data[f"current_{source}"] for source in SOURCES},
+                baseline={source: data[f"baseline_{source}"] for source in SOURCES},
+                baseline_total_rows=int(header["baseline_total_rows"]),
+                computed_at=float(header["computed_at"]),
+            )
+
+
+def _remove_sorted(distribution: np.ndarray, removed: np.ndarray) -> np.ndarray:
+    """Remove one occurrence of each value in ``removed`` from a sorted array."""
+
+    unique, counts = np.unique(removed, return_counts=True)
+    starts = np.searchsorted(distribution, unique, side="left")
+    ends = np.searchsorted(distribution, unique, side="right")
+    # Never drop more copies than are present, should the state be out of step
+    counts = np.minimum(counts, ends - starts)
+    drop = np.concatenate(
+        [np.arange(start, start + count) for start, count in zip(starts, counts)]
+        or [np.empty(0, dtype=np.int64)]
+    )
+    return np.delete(distribution, drop)
+
+
+# ---------------------------------------------------------------------------
+# Engine
+
+
+@dataclass
+class RarityRunStats:
+    """Outcome of an engine run."""
+
+    mode: str = "incremental"
+    rows_examined: int = 0
+    values_changed: int = 0
+    rows_written: int = 0
+    drift: float = 0.0
+    duration_seconds: float = 0.0
+
+
+class RarityEngine:
+    """Maintains ``defined.final_rarity`` incrementally."""
+
+    def __init__(
+        self,
+        state_path: Optional[Path | str] = None,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ):
+        self.state_path = Path(
+            state_path or os.getenv("RARITY_STATE_PATH", str(DEFAULT_STATE_PATH))
+        )
+        self.tolerance = tolerance
+
+    # -- database access --------------------------------------------------
+
+    @staticmethod
+    def _fetch_rows(conn, word_ids: Optional[Sequence[int]] = None) -> List[tuple]:
+        sql = (
+            "SELECT id, python_wordfreq, ngram_freq, commoncrawl_freq, final_rarity "
+            "FROM vocab.defined"
+        )
+        params: Tuple[Any, ...] = ()
+        if word_ids is not None:
+            # Words that never got a rarity are always worth (re)checking
+            sql += " WHERE id = ANY(%s) OR final_rarity IS NULL"
+            params = (list(word_ids),)
+
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    @staticmethod
+    def _split_rows(rows: Iterable[tuple]) -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+        rows = list(rows)
+        ids = np.fromiter((int(row[0]) for row in rows), dtype=np.int64, count=len(rows))
+        values = np.array(
+            [[_to_float(row[1]), _to_float(row[2]), _to_float(row[3])] for row in rows],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        stored = [row[4] for row in rows]
+        return ids, values, stored
+
+    @staticmethod
+    def _write_changes(conn, updates: List[Tuple[Optional[float], int]]) -> int:
+        """COPY changed rarities into a staging table and merge them in one UPDATE."""
+
+        if not updates:
+            return 0
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS rarity_staging (
+                    id INTEGER PRIMARY KEY,
+                    final_rarity NUMERIC(8, 6)
+                ) ON COMMIT DELETE ROWS
+                """
+            )
+            with cur.copy("COPY rarity_staging (id, final_rarity) FROM STDIN") as copy:
+                for value, word_id in updates:
+                    copy.write_row((word_id, value))
+            cur.execute(
+                """
+                UPDATE vocab.defined AS d
+                SET final_rarity = s.final_rarity
+                FROM rarity_staging AS s
+                WHERE d.id = s.id
+                  AND d.final_rarity IS DISTINCT FROM s.final_rarity
+                """
+            )
+            return cur.rowcount
+
+    @staticmethod
+    def _collect_updates(
+        ids: np.ndarray,
+        computed: np.ndarray,
+        stored: List[Any],
+    ) -> List[Tuple[Optional[float], int]]:
+        updates: List[Tuple[Optional[float], int]] = []
+        for word_id, new_value, old_value in zip(ids.tolist(), computed.tolist(), stored):
+            if rarity_changed(new_value, old_value):
+                value = None if np.isnan(new_value) else round(new_value, RARITY_DECIMALS)
+                updates.append((value, word_id))
+        return updates
+
+    # -- public API -------------------------------------------------------
+
+    def load_state(self) -> Optional[RarityState]:
+        if not self.state_path.exists():
+            return None
+        try:
+            return RarityState.load(self.state_path)
+        except Exception as exc:
+            logger.warning(f"Unable to load rarity state {self.state_path}: {exc}")
+            return None
+
+    def full_recompute(self, conn, dry_run: bool = False) -> RarityRunStats:
+        """Recompute every word's rarity and write back the ones that changed."""
+
+        started = time.perf_counter()
+        ids, values, stored = self._split_rows(self._fetch_rows(conn))
+        state = RarityState.from_values(ids, values)
+
+        computed = state.rarity_for(values)
+        updates = self._collect_updates(ids, computed, stored)
+
+        stats = RarityRunStats(mode="full", rows_examined=len(stored), values_changed=len(stored))
+        if not dry_run:
+            stats.rows_written = self._write_changes(conn, updates)
+            conn.commit()
+            state.save(self.state_path)
+        else:
+            stats.rows_written = len(updates)
+
+        stats.duration_seconds = time.perf_counter() - started
+        return stats
+
+    def incremental_update(
+        self,
+        conn,
+        word_ids: Optional[Iterable[int]] = None,
+        dry_run: bool = False,
+    ) -> RarityRunStats:
+        """Update rarity for changed words, escalating to a full recompute.
+
+        ``word_ids`` lists the words whose frequencies changed. When omitted,
+        every row is read and compared against the stored state to find them.
+        """
+
+        started = time.perf_counter()
+        state = self.load_state()
+        if state is None:
+            logger.info("No rarity state found; running full recompute")
+            return self.full_recompute(conn, dry_run=dry_run)
+
+        ids_list = None if word_ids is None else sorted({int(i) for i in word_ids})
+        ids, values, stored = self._split_rows(self._fetch_rows(conn, ids_list))
+        changed_mask = state.apply(ids, values)
+        drift = state.drift()
+
+        if drift > self.tolerance:
+            logger.info(
+                "Rarity distribution drift %.4f exceeds tolerance %.4f; running full recompute",
+                drift,
+                self.tolerance,
+            )
+            stats = self.full_recompute(conn, dry_run=dry_run)
+            stats.drift = drift
+            return stats
+
+        # Unchanged words keep their stored rarity until the next full
+        # recompute; only changed or never-rated words are re-ranked.
+        targets = changed_mask | np.array([value is None for value in stored], dtype=bool)
+        target_stored = [value for value, keep in zip(stored, targets.tolist()) if keep]
+        computed = state.rarity_for(values[targets])
+        updates = self._collect_updates(ids[targets], computed, target_stored)
+
+        stats = RarityRunStats(
+            mode="incremental",
+            rows_examined=len(stored),
+            values_changed=int(changed_mask.sum()),
+            drift=drift,
+        )
+        if not dry_run:
+            stats.rows_written = self._write_changes(conn, updates)
+            conn.commit()
+            state.save(self.state_path)
+        else:
+            stats.rows_written = len(updates)
+
+        stats.duration_seconds = time.perf_counter() - started
+        return stats
+
+
+__all__ = [
+    "SOURCES",
+    "WEIGHTS",
+    "RarityEngine",
+    "RarityRunStats",
+    "RarityState",
+    "blend_rarity",
+    "ks_distance",
+    "percent_rank_rarity",
+]
@@ -14,6 +14,14 @@ from dataclasses import dataclass, asdict
 logger = logging.getLogger(__name__)
 
 
+def _env_flag(name: str) -> Optional[bool]:
+    """Parse a true/false environment variable; None when unset or empty"""
+    value = os.getenv(name, '').strip().lower()
+    if not value:
+        return None
+    return value in ('1', 'true', 'yes', 'on')
+
+
 @dataclass
 class DatabaseConfig:
     """Database configuration with validation"""
@@ -25,6 +33,12 @@ class DatabaseConfig:
     schema: str = 'public'
     pool_size: int = 10
     timeout: int = 30
+    # Connections the pool opens up front and keeps ready (capped at pool_size)
+    pool_min_size: int = 2
+    # PgBouncer/Supavisor in transaction mode hands each transaction to any
+    # server connection, so session settings and prepared statements do not
+    # stick. None means: assume a transaction pooler on its usual port, 6543.
+    transaction_pooler: Optional[bool] = None
 
     def __post_init__(self):
         """Validate configuration after initialization"""
@@ -36,6 +50,15 @@ class DatabaseConfig:
             raise ValueError("Database password is required")
         if not (1 <= self.port <= 65535):
             raise ValueError("Database port must be between 1 and 65535")
+        if self.pool_min_size < 1:
+            raise ValueError("Database pool_min_size must be at least 1")
+
+    @property
+    def uses_transaction_pooler(self) -> bool:
+        """True when per-connection session state cannot be relied on"""
+        if self.transaction_pooler is None:
+            return self.port == 6543
+        return self.transaction_pooler
 
     def to_dict(self, include_password: bool = True) -> Dict[str, Any]:
         """Convert to dictionary for psycopg.connect"""
@@ -114,7 +137,9 @@ class SecureConfigManager:
             password=os.getenv('DB_PASSWORD', ''),
             schema=os.getenv('DB_SCHEMA', 'vocab'),
             pool_size=int(os.getenv('DB_POOL_SIZE', '10')),
-            timeout=int(os.getenv('DB_TIMEOUT', '30'))
+            timeout=int(os.getenv('DB_TIMEOUT', '30')),
+            pool_min_size=int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            transaction_pooler=_env_flag('DB_TRANSACTION_POOLER'),
         )
 
     def _load_from_file(self) -> DatabaseConfig:
@@ -179,7 +204,10 @@ DB_USER=brian
 DB_PASSWORD=your_password_here
 DB_CHARSET=utf8mb4
 DB_POOL_SIZE=10
+DB_POOL_MIN_SIZE=2
 DB_TIMEOUT=30
+# true/false; unset assumes a transaction pooler on port 6543
+# DB_TRANSACTION_POOLER=
 
 # Application Configuration
 APP_ENV=development
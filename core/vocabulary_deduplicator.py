@@ -5,8 +5,11 @@ Centralized system to prevent duplicate terms from entering the candidate queue
 """
 
 import mysql.connector
-from typing import Set, List, Dict, Any, Optional, Tuple
+from typing import Collection, Set, List, Dict, Any, Optional, Tuple
 from .config import get_db_config
+from .known_terms import KnownTermIndex, get_known_terms, record_known_terms
+from .fuzzy_index import FuzzyTermIndex
+from itertools import islice
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,19 +17,58 @@ logger = logging.getLogger(__name__)
 class VocabularyDeduplicator:
     """Centralized deduplication system for vocabulary terms"""
     
-    def __init__(self):
+    def __init__(self, max_edits: int = 0):
         self.db_config = get_db_config()
         self._existing_terms_cache = None
         self._cache_timestamp = None
+        # Edit budget for near-duplicate detection; off by default, so only
+        # same-root terms count as similar
+        self.max_edits = max_edits
+        self._fuzzy_index = None
+        self._fuzzy_source = None
         
-    def get_all_existing_terms(self, force_refresh: bool = False) -> Set[str]:
+    def _known_term_index(self):
+        """Shared known-term index with the exact set loaded, if one was built"""
+        index = get_known_terms()
+        if index is not None and index.exact:
+            return index
+        return None
+    
+    def _existing_terms(self):
+        """Container of existing terms for membership tests (index or cached set)"""
+        index = self._known_term_index()
+        if index is not None:
+            return index
+        self.get_all_existing_terms()
+        return self._existing_terms_cache or set()
+    
+    def _fuzzy_index_for(self, existing_terms) -> FuzzyTermIndex:
+        """Fuzzy index over existing_terms, reused while the same set is passed in"""
+        if isinstance(existing_terms, KnownTermIndex):
+            return existing_terms.fuzzy(self.max_edits)
+        if self._fuzzy_index is None or self._fuzzy_source is not existing_terms:
+            self._fuzzy_index = FuzzyTermIndex(existing_terms, self.max_edits)
+            self._fuzzy_source = existing_terms
+        return self._fuzzy_index
+    
+    def get_all_existing_terms(self, force_refresh: bool = False) -> Collection[str]:
         """
         Get all existing terms from both main vocabulary and candidates
-        Uses caching for performance during batch operations
+        Uses caching for performance during batch operations. When the shared
+        known-term index is available it is returned as is (supports ``in``,
+        iteration and ``len``); treat the result as read-only
         """
         import time
         from datetime import datetime, timedelta
         
+        # The shared known-term index is kept current through its journal,
+        # so there is no need to reload whole tables from the database
+        index = self._known_term_index()
+        if index is not None:
+            if force_refresh:
+                index.refresh()
+            return index
+        
         # Use cache if it's fresh (less than 5 minutes old) and not forced refresh
         if (not force_refresh and 
             self._existing_terms_cache is not None and 
@@ -113,7 +155,7 @@ class VocabularyDeduplicator:
         
         # Use provided existing_terms or get them fresh
         if existing_terms is None:
-            existing_terms = self.get_all_existing_terms()
+            existing_terms = self._existing_terms()
         
         if term_lower in existing_terms:
             return True, "already_exists"
@@ -126,38 +168,45 @@ class VocabularyDeduplicator:
         
         return False, "unique"
     
-    def _find_similar_terms(self, term: str, existing_terms: Set[str], max_check: int = 1000) -> List[str]:
+    def _find_similar_terms(self, term: str, existing_terms: Set[str], max_check: int = 1000,
+                            max_edits: Optional[int] = None) -> List[str]:
         """
-        Find very similar terms (same root, different inflection)
-        Limited checking for performance
+        Find very similar terms (same root, different inflection): the term
+        and an existing term share their first 6 characters, lengths within 3.
+        With an edit budget, terms that many edits away count as well.
+        Answered from the fuzzy index, so existing terms are never scanned
         """
         if len(term) < 4:  # Skip similarity check for very short terms
             return []
         
+        index = self._fuzzy_index_for(existing_terms)
+        budget = self.max_edits if max_edits is None else min(max_edits, index.max_edits)
         similar = []
-        checked = 0
         
-        # Check for exact prefix/suffix matches that might indicate same root
-        term_root = term[:6]  # First 6 characters as rough root
-        
-        for existing in existing_terms:
-            if checked >= max_check:  # Limit to prevent performance issues
+        # Existing terms starting with the term's rough root (first 6 characters)
+        term_root = term[:6]
+        for existing in islice(index.with_prefix(term_root), max_check):
+            if len(similar) >= 3:
                 break
-                
-            if len(existing) < 4:
-                continue
-                
-            # Check if they share significant prefix (possible same root)
-            if (existing.startswith(term_root) and 
-                abs(len(existing) - len(term)) <= 3):
-                similar.append(existing)
-                checked += 1
-            elif (term.startswith(existing[:6]) and 
-                  abs(len(existing) - len(term)) <= 3):
+            if existing != term and len(existing) >= 4 and abs(len(existing) - len(term)) <= 3:
                 similar.append(existing)
-                checked += 1
-            
-            checked += 1
+        
+        # Existing terms of 4-5 characters that the term starts with ('abbot'
+        # for 'abbots'): the other half of the shared 6-character prefix rule,
+        # term.startswith(existing[:6]), for terms shorter than the root
+        for length in (4, 5):
+            root = term[:length]
+            if (len(similar) < 3 and length < len(term) and len(term) - length <= 3 and
+                    root in index and root not in similar):
+                similar.append(root)
+        
+        # Closest spellings (typos, single-letter variants), only when enabled
+        if budget > 0:
+            for existing, _ in index.within_edits(term, budget, limit=4):
+                if len(similar) >= 3:
+                    break
+                if existing != term and existing not in similar:
+                    similar.append(existing)
         
         return similar[:3]  # Return max 3 similar terms
     
@@ -170,7 +219,7 @@ class VocabularyDeduplicator:
             return [], {"total": 0, "unique": 0, "duplicates": 0, "invalid": 0}
         
         # Get existing terms once for efficiency
-        existing_terms = self.get_all_existing_terms()
+        existing_terms = self._existing_terms()
         
         filtered_candidates = []
         stats = {
@@ -219,10 +268,25 @@ class VocabularyDeduplicator:
         
         return filtered_candidates, stats
     
+    def record_stored_terms(self, terms: List[str]) -> int:
+        """Register newly stored terms so later checks see them without a reload"""
+        normalized = [t.lower().strip() for t in terms if t]
+        if self._existing_terms_cache is not None:
+            self._existing_terms_cache.update(normalized)
+            if self._fuzzy_source is self._existing_terms_cache:
+                for term in normalized:
+                    self._fuzzy_index.add(term)
+        return record_known_terms(normalized)
+    
     def clear_cache(self):
         """Clear the existing terms cache (useful after database updates)"""
         self._existing_terms_cache = None
         self._cache_timestamp = None
+        self._fuzzy_index = None
+        self._fuzzy_source = None
+        index = self._known_term_index()
+        if index is not None:
+            index.refresh()
         logger.debug("Cleared deduplication cache")
 
 # Global instance for easy importing
@@ -237,7 +301,7 @@ def filter_duplicate_candidates(candidates: List[Dict[str, Any]]) -> Tuple[List[
     """Convenience function to filter duplicate candidates"""
     return vocabulary_deduplicator.filter_duplicate_candidates(candidates)
 
-def get_existing_terms() -> Set[str]:
+def get_existing_terms() -> Collection[str]:
     """Convenience function to get all existing terms"""
     return vocabulary_deduplicator.get_all_existing_terms()
 
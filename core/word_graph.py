@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+"""In-memory similarity graph for visualisations and neighbourhood queries.
+
+The semantic (``definition_similarity``) and phonetic
+(``pronunciation_similarity``) edge lists are loaded once into compressed
+sparse row (CSR) arrays, with node metadata held alongside. Queries such as
+k-hop neighbourhoods, weight-filtered edge sets and shortest paths then run
+entirely in memory instead of issuing ``word1_id OR word2_id`` scans against
+the similarity tables for every request.
+
+Graphs can be built straight from the database or restored from a snapshot
+file produced by ``scripts/build_word_graph_snapshot.py``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+EDGE_KINDS = ("semantic", "phonetic")
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-mpnet-base-v2"
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parents[1] / "word_graph_snapshot.npz"
+
+_FETCH_BATCH_SIZE = 50000
+
+
+# ---------------------------------------------------------------------------
+# CSR storage
+
+
+@dataclass(slots=True)
+class CSRAdjacency:
+    """Symmetric adjacency in CSR form.
+
+    Each row holds the neighbours of one node ordered by descending weight so a
+    weight floor can be applied with a binary search instead of a scan.
+    """
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    @property
+    def edge_count(self) -> int:
+        """Number of undirected edges stored."""
+
+        return int(self.indices.shape[0] // 2)
+
+    def row(self, node_index: int, min_weight: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(neighbour_indices, weights)`` at or above ``min_weight``."""
+
+        start = int(self.indptr[node_index])
+        end = int(self.indptr[node_index + 1])
+        weights = self.weights[start:end]
+        if min_weight > 0.0 and weights.size:
+            # Rows are sorted descending, so negate to search an ascending view.
+            cutoff = int(np.searchsorted(-weights, -np.float32(min_weight), side="right"))
+            end = start + cutoff
+            weights = self.weights[start:end]
+        return self.indices[start:end], weights
+
+
+def build_csr(
+    num_nodes: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+) -> CSRAdjacency:
+    """Build a symmetric CSR adjacency from undirected edge arrays.
+
+    ``sources`` and ``targets`` are node *indices* (not word ids). Self loops
+    are dropped and duplicate pairs keep their highest weight.
+    """
+
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.asarray(weights, dtype=np.float32)
+
+    keep = sources != targets
+    sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+    if sources.size:
+        # Canonicalise pair order and drop duplicates, keeping the max weight.
+        low = np.minimum(sources, targets)
+        high = np.maximum(sources, targets)
+        order = np.lexsort((-weights, high, low))
+        low, high, weights = low[order], high[order], weights[order]
+        first = np.ones(low.shape[0], dtype=bool)
+        first[1:] = (low[1:] != low[:-1]) | (high[1:] != high[:-1])
+        low, high, weights = low[first], high[first], weights[first]
+
+        rows = np.concatenate([low, high])
+        cols = np.concatenate([high, low])
+        vals = np.concatenate([weights, weights])
+    else:
+        rows = np.empty(0, dtype=np.int64)
+        cols = np.empty(0, dtype=np.int64)
+        vals = np.empty(0, dtype=np.float32)
+
+    order = np.lexsort((-vals, rows))
+    rows, cols, vals = rows[order], cols[order], vals[order]
+
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+
+    return CSRAdjacency(
+        indptr=indptr,
+        indices=cols.astype(np.int32),
+        weights=vals.astype(np.float32),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Graph
+
+
+class WordGraph:
+    """Semantic and phonetic word graph held in CSR arrays."""
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        adjacency: Dict[str, CSRAdjacency],
+        metadata: Optional[Dict[int, Dict[str, Any]]] = None,
+        embedding_model: Optional[str] = None,
+        built_at: Optional[float] = None,
+    ):
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        self.adjacency = adjacency
+        self.metadata: Dict[int, Dict[str, Any]] = metadata or {}
+        self.embedding_model = embedding_model
+        self.built_at = built_at if built_at is not None else time.time()
+        self._index_by_id: Dict[int, int] = {
+            int(word_id): index for index, word_id in enumerate(self.node_ids.tolist())
+        }
+
+    # -- construction -----------------------------------------------------
+
+    @classmethod
+    def from_edge_lists(
+        cls,
+        edges: Dict[str, Iterable[Tuple[int, int, float]]],
+        metadata: Optional[Dict[int, Dict[str, Any]]] = None,
+        node_ids: Optional[Iterable[int]] = None,
+        embedding_model: Optional[str] = None,
+    ) -> "WordGraph":
+        """Build a graph from ``{kind: [(word1_id, word2_id, weight), ...]}``."""
+
+        edge_arrays: Dict[str, np.ndarray] = {}
+        id_pool: List[np.ndarray] = []
+
+        for kind in EDGE_KINDS:
+            rows = list(edges.get(kind, ()))
+            array = np.array(rows, dtype=np.float64).reshape(-1, 3)
+            edge_arrays[kind] = array
+            id_pool.append(array[:, 0].astype(np.int64))
+            id_pool.append(array[:, 1].astype(np.int64))
+
+        if node_ids is not None:
+            id_pool.append(np.fromiter((int(i) for i in node_ids), dtype=np.int64))
+        if metadata:
+            id_pool.append(np.fromiter((int(i) for i in metadata), dtype=np.int64))
+
+        all_ids = np.unique(np.concatenate(id_pool)) if id_pool else np.empty(0, dtype=np.int64)
+
+        adjacency: Dict[str, CSRAdjacency] = {}
+        for kind, array in edge_arrays.items():
+            sources = np.searchsorted(all_ids, array[:, 0].astype(np.int64))
+            targets = np.searchsorted(all_ids, array[:, 1].astype(np.int64))
+            adjacency[kind] = build_csr(all_ids.shape[0], sources, targets, array[:, 2])
+
+        return cls(all_ids, adjacency, metadata=metadata, embedding_model=embedding_model)
+
+    @classmethod
+    def load_from_database(
+        cls,
+        embedding_model: Optional[str] = None,
+        semantic_floor: float = 0.0,
+        phonetic_floor: float = 0.0,
+        include_phonetic: bool = True,
+    ) -> "WordGraph":
+        """Load edges and node metadata from PostgreSQL."""
+
+        from core.database_manager import db_manager
+
+        started = time.perf_counter()
+        model = embedding_model or DEFAULT_EMBEDDING_MODEL
+
+        edges: Dict[str, List[Tuple[int, int, float]]] = {"semantic": [], "phonetic": []}
+
+        with db_manager.get_connection() as conn:
+            with conn.cursor(name="word_graph_semantic") as cursor:
+                cursor.itersize = _FETCH_BATCH_SIZE
+                cursor.execute(
+                    """
+                    SELECT word1_id, word2_id, cosine_similarity
+                    FROM vocab.definition_similarity
+                    WHERE embedding_model = %s
+                      AND cosine_similarity >= %s
+                    """,
+                    (model, semantic_floor),
+                )
+                edges["semantic"] = _float_edges(cursor)
+
+        if include_phonetic:
+            try:
+                with db_manager.get_connection() as conn:
+                    with conn.cursor(name="word_graph_phonetic") as cursor:
+                        cursor.itersize = _FETCH_BATCH_SIZE
+                        cursor.execute(
+                            """
+                            SELECT word1_id, word2_id, overall_similarity
+                            FROM vocab.pronunciation_similarity
+                            WHERE overall_similarity >= %s
+                            """,
+                            (phonetic_floor,),
+                        )
+                        edges["phonetic"] = _float_edges(cursor)
+            except Exception as exc:
+                logger.warning(f"Unable to load phonetic edges: {exc}")
+
+        metadata = _load_node_metadata()
+        graph = cls.from_edge_lists(edges, metadata=metadata, embedding_model=model)
+
+        logger.info(
+            "Loaded word graph: %s nodes, %s semantic edges, %s phonetic edges in %.1fs",
+            graph.node_count,
+            graph.edge_count("semantic"),
+            graph.edge_count("phonetic"),
+            time.perf_counter() - started,
+        )
+        return graph
+
+    # -- snapshots --------------------------------------------------------
+
+    def save(self, path: Path | str) -> Path:
+        """Write the graph to an ``.npz`` snapshot file."""
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        arrays: Dict[str, np.ndarray] = {"node_ids": self.node_ids}
+        for kind, adjacency in self.adjacency.items():
+            arrays[f"{kind}_indptr"] = adjacency.indptr
+            arrays[f"{kind}_indices"] = adjacency.indices
+            arrays[f"{kind}_weights"] = adjacency.weights
+
+        header = {
+            "embedding_model": self.embedding_model,
+            "built_at": self.built_at,
+            "kinds": list(self.adjacency.keys()),
+        }
+        arrays["header"] = np.array(json.dumps(header))
+        arrays["metadata"] = np.array(
+            json.dumps({str(word_id): meta for word_id, meta in self.metadata.items()})
+        )
+
+        # Write to a temporary file first so readers never see a partial snapshot.
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Path | str) -> "WordGraph":
+        """Restore a graph from a snapshot written by :meth:`save`."""
+
+        with np.load(Path(path), allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            adjacency = {
+                kind: CSRAdjacency(
+                    indptr=data[f"{kind}_indptr"],
+                    indices=data[f"{kind}_indices"],
+                    weights=data[f"{kind}_weights"],
+                )
+                for kind in header.get("kinds", [])
+            }
+            raw_metadata = json.loads(str(data["metadata"]))
+            node_ids = data["node_ids"]
+
+        metadata = {int(word_id): meta for word_id, meta in raw_metadata.items()}
+        return cls(
+            node_ids,
+            adjacency,
+            metadata=metadata,
+            embedding_model=header.get("embedding_model"),
+            built_at=header.get("built_at"),
+        )
+
+    # -- basic accessors --------------------------------------------------
+
+    @property
+    def node_count(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    def edge_count(self, kind: str = "semantic") -> int:
+        adjacency = self.adjacency.get(kind)
+        return adjacency.edge_count if adjacency else 0
+
+    def has_node(self, word_id: int) -> bool:
+        return int(word_id) in self._index_by_id
+
+    def get_metadata(self, word_id: int) -> Optional[Dict[str, Any]]:
+        return self.metadata.get(int(word_id))
+
+    def _adjacency(self, kind: str) -> CSRAdjacency:
+        if kind not in self.adjacency:
+            raise ValueError(f"Unknown edge kind '{kind}'")
+        return self.adjacency[kind]
+
+    # -- queries ----------------------------------------------------------
+
+    def neighbors(
+        self,
+        word_id: int,
+        kind: str = "semantic",
+        min_weight: float = 0.0,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return ``(word_id, weight)`` pairs ordered by descending weight."""
+
+        index = self._index_by_id.get(int(word_id))
+        if index is None:
+            return []
+
+        indices, weights = self._adjacency(kind).row(index, min_weight)
+        if limit is not None:
+            indices, weights = indices[:limit], weights[:limit]
+
+        return list(zip(self.node_ids[indices].tolist(), weights.astype(float).tolist()))
+
+    def k_hop(
+        self,
+        word_id: int,
+        hops: int = 1,
+        kind: str = "semantic",
+        min_weight: float = 0.0,
+        max_nodes: Optional[int] = None,
+        per_node_limit: Optional[int] = None,
+    ) -> Dict[int, Tuple[int, Optional[int], float]]:
+        """Breadth-first neighbourhood around ``word_id``.
+
+        Returns a mapping of ``word_id -> (hop, parent_id, edge_weight)`` in
+        discovery order. Within each hop, stronger edges are visited first so
+        truncating at ``max_nodes`` keeps the most similar words. The centre
+        maps to ``(0, None, 1.0)``.
+        """
+
+        start = self._index_by_id.get(int(word_id))
+        if start is None:
+            return {}
+
+        adjacency = self._adjacency(kind)
+        visited: Dict[int, Tuple[int, int, float]] = {start: (0, -1, 1.0)}
+        frontier = [start]
+
+        for hop in range(1, max(hops, 0) + 1):
+            candidates: List[Tuple[float, int, int]] = []
+            for node in frontier:
+                indices, weights = adjacency.row(node, min_weight)
+                if per_node_limit is not None:
+                    indices, weights = indices[:per_node_limit], weights[:per_node_limit]
+                for neighbor, weight in zip(indices.tolist(), weights.tolist()):
+                    if neighbor not in visited:
+                        candidates.append((weight, neighbor, node))
+
+            candidates.sort(key=lambda item: item[0], reverse=True)
+            next_frontier: List[int] = []
+            for weight, neighbor, parent in candidates:
+                if neighbor in visited:
+                    continue
+                if max_nodes is not None and len(visited) >= max_nodes:
+                    break
+                visited[neighbor] = (hop, parent, weight)
+                next_frontier.append(neighbor)
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        node_ids = self.node_ids
+        return {
+            int(node_ids[index]): (
+                hop,
+                int(node_ids[parent]) if parent >= 0 else None,
+                float(weight),
+            )
+            for index, (hop, parent, weight) in visited.items()
+        }
+
+    def edges_within(
+        self,
+        word_ids: Iterable[int],
+        kind: str = "semantic",
+        min_weight: float = 0.0,
+    ) -> List[Tuple[int, int, float]]:
+        """Return each undirected edge among ``word_ids`` once."""
+
+        members = {
+            self._index_by_id[int(word_id)]
+            for word_id in word_ids
+            if int(word_id) in self._index_by_id
+        }
+        adjacency = self._adjacency(kind)
+        node_ids = self.node_ids
+
+        edges: List[Tuple[int, int, float]] = []
+        for node in members:
+            indices, weights = adjacency.row(node, min_weight)
+            for neighbor, weight in zip(indices.tolist(), weights.tolist()):
+                if neighbor > node and neighbor in members:
+                    edges.append((int(node_ids[node]), int(node_ids[neighbor]), float(weight)))
+
+        edges.sort(key=lambda edge: edge[2], reverse=True)
+        return edges
+
+    def shortest_path(
+        self,
+        source_id: int,
+        target_id: int,
+        kind: str = "semantic",
+        min_weight: float = 0.0,
+        max_hops: Optional[int] = None,
+    ) -> Optional[List[Tuple[int, float]]]:
+        """Strongest path between two words.
+
+        Edges cost ``1 - weight`` so the path favours high similarity links.
+        Returns ``[(word_id, weight_of_edge_into_word), ...]`` starting with the
+        source (weight ``1.0``), or ``None`` if the words are not connected.
+        """
+
+        start = self._index_by_id.get(int(source_id))
+        goal = self._index_by_id.get(int(target_id))
+        if start is None or goal is None:
+            return None
+        if start == goal:
+            return [(int(source_id), 1.0)]
+
+        # With a hop limit the search runs over (node, hops) states: a cheap
+        # route that reaches a node in many hops must not hide a dearer one
+        # that reaches it in few enough hops to go on to the goal.
+        adjacency = self._adjacency(kind)
+        State = Tuple[int, int]
+        origin: State = (start, 0)
+        best_cost: Dict[State, float] = {origin: 0.0}
+        previous: Dict[State, Tuple[State, float]] = {}
+        queue: List[Tuple[float, int, int]] = [(0.0, 0, start)]
+        reached: Optional[State] = None
+
+        while queue:
+            cost, hops, node = heapq.heappop(queue)
+            state = (node, hops)
+            if cost > best_cost.get(state, float("inf")):
+                continue
+            if node == goal:
+                reached = state
+                break
+            if max_hops is not None and hops >= max_hops:
+                continue
+
+            next_hops = hops + 1 if max_hops is not None else 0
+            indices, weights = adjacency.row(node, min_weight)
+            for neighbor, weight in zip(indices.tolist(), weights.tolist()):
+                next_cost = cost + max(1.0 - weight, 0.0)
+                next_state = (neighbor, next_hops)
+                if next_cost < best_cost.get(next_state, float("inf")):
+                    best_cost[next_state] = next_cost
+                    previous[next_state] = (state, weight)
+                    heapq.heappush(queue, (next_cost, next_hops, neighbor))
+
+        if reached is None:
+            return None
+
+        path: List[Tuple[int, float]] = []
+        state = reached
+        while state != origin:
+            parent, weight = previous[state]
+            path.append((int(self.node_ids[state[0]]), float(weight)))
+            state = parent
+        path.append((int(self.node_ids[start]), 1.0))
+        path.reverse()
+        return path
+
+
+# ---------------------------------------------------------------------------
+# Database helpers
+
+
+def _float_edges(rows: Iterable[Sequence[Any]]) -> List[Tuple[int, int, float]]:
+    edges: List[Tuple[int, int, float]] = []
+    for word1_id, word2_id, weight in rows:
+        if word1_id is None or word2_id is None or weight is None:
+            continue
+        edges.append((int(word1_id), int(word2_id), float(weight)))
+    return edges
+
+
+def _load_node_metadata() -> Dict[int, Dict[str, Any]]:
+    """Fetch the visualisation metadata for every word in ``defined``."""
+
+    from core.database_manager import db_manager
+
+    queries = [
+        """
+        SELECT d.id, d.term, d.definition, d.part_of_speech, d.final_rarity,
+               wd.primary_domain, wd.domain_id, dom.name, dom.description
+        FROM vocab.defined d
+        LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
+        LEFT JOIN vocab.domains dom ON wd.domain_id = dom.id
+        """,
+        """
+        SELECT d.id, d.term, d.definition, d.part_of_speech, d.final_rarity,
+               wd.primary_domain, NULL, wd.primary_domain, NULL
+        FROM vocab.defined d
+        LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
+        """,
+        """
+        SELECT d.id, d.term, d.definition, d.part_of_speech, d.final_rarity,
+               NULL, NULL, NULL, NULL
+        FROM vocab.defined d
+        """,
+    ]
+
+    rows: List[Sequence[Any]] = []
+    for sql in queries:
+        try:
+            with db_manager.get_cursor() as cursor:
+                cursor.execute(sql)
+                rows = cursor.fetchall()
+            break
+        except Exception as exc:
+            logger.warning(f"Node metadata query failed, trying fallback: {exc}")
+
+    metadata: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        metadata[int(row[0])] = build_node_metadata(*row)
+    return metadata
+
+
+def build_node_metadata(
+    word_id: int,
+    term: Optional[str],
+    definition: Optional[str],
+    part_of_speech: Optional[str],
+    final_rarity: Any,
+    primary_domain: Optional[str],
+    domain_id: Optional[int],
+    domain_name: Optional[str],
+    domain_description: Optional[str],
+) -> Dict[str, Any]:
+    """Shape a metadata row the way the visualisation endpoints expect."""
+
+    if isinstance(final_rarity, Decimal):
+        rarity_value: Optional[float] = float(final_rarity)
+    else:
+        rarity_value = float(final_rarity) if final_rarity is not None else None
+
+    definition_excerpt: Optional[str] = None
+    if isinstance(definition, str) and definition.strip():
+        clean_definition = definition.strip()
+        if len(clean_definition) > 200:
+            definition_excerpt = f"{clean_definition[:200].rstrip()}..."
+        else:
+            definition_excerpt = clean_definition
+
+    return {
+        "id": int(word_id),
+        "term": term,
+        "part_of_speech": part_of_speech,
+        "final_rarity": rarity_value,
+        "primary_domain": primary_domain,
+        "domain_id": int(domain_id) if domain_id is not None else None,
+        "domain_name": domain_name,
+        "domain_description": domain_description,
+        "definition_excerpt": definition_excerpt,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Process-wide service
+
+
+class WordGraphService:
+    """Holds the process-wide :class:`WordGraph` and loads it on demand.
+
+    The snapshot path comes from ``WORD_GRAPH_SNAPSHOT`` (default
+    ``word_graph_snapshot.npz`` in the project root). When no snapshot exists
+    the graph is built from the database if ``WORD_GRAPH_FROM_DB`` is set.
+    """
+
+    def __init__(self, snapshot_path: Optional[Path | str] = None):
+        self.snapshot_path = Path(
+            snapshot_path or os.getenv("WORD_GRAPH_SNAPSHOT", str(DEFAULT_SNAPSHOT_PATH))
+        )
+        self._graph: Optional[WordGraph] = None
+        self._lock = threading.Lock()
+        self._loading = False
+
+    @property
+    def graph(self) -> Optional[WordGraph]:
+        return self._graph
+
+    def is_ready(self, embedding_model: Optional[str] = None) -> bool:
+        graph = self._graph
+        if graph is None:
+            return False
+        return embedding_model is None or graph.embedding_model == embedding_model
+
+    def set_graph(self, graph: Optional[WordGraph]) -> None:
+        with self._lock:
+            self._graph = graph
+
+    def load(self, from_database: Optional[bool] = None) -> Optional[WordGraph]:
+        """Load the snapshot (or build from the database) synchronously."""
+
+        if from_database is None:
+            from_database = os.getenv("WORD_GRAPH_FROM_DB", "").lower() in {"1", "true", "yes"}
+
+        graph: Optional[WordGraph] = None
+        if self.snapshot_path.exists():
+            try:
+                graph = WordGraph.load(self.snapshot_path)
+                logger.info(
+                    "Loaded word graph snapshot %s (%s nodes)",
+                    self.snapshot_path,
+                    graph.node_count,
+                )
+            except Exception as exc:
+                logger.warning(f"Unable to load word graph snapshot: {exc}")
+
+        if graph is None and from_database:
+            graph = WordGraph.load_from_database(
+                embedding_model=os.getenv("WORD_GRAPH_MODEL") or None
+            )
+
+        if graph is not None:
+            self.set_graph(graph)
+        return graph
+
+    def load_in_background(self, from_database: Optional[bool] = None) -> threading.Thread:
+        """Start :meth:`load` in a daemon thread so startup is not blocked."""
+
+        def _run() -> None:
+            try:
+                self.load(from_database=from_database)
+            except Exception as exc:
+                logger.warning(f"Word graph load failed: {exc}")
+            finally:
+                self._loading = False
+
+        self._loading = True
+        thread = threading.Thread(target=_run, name="word-graph-loader", daemon=True)
+        thread.start()
+        return thread
+
+
+word_graph_service = WordGraphService()
+
+
+__all__ = [
+    "EDGE_KINDS",
+    "CSRAdjacency",
+    "WordGraph",
+    "WordGraphService",
+    "build_csr",
+    "build_node_metadata",
+    "word_graph_service",
+]
@@ -9,22 +9,27 @@ import sys
 import os
 import logging
 import time
+from functools import lru_cache
 from typing import Dict
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import existing components
-from core.custom_database_manager import CustomDatabaseManager
-from pronunciation.modern_pronunciation_system import ModernPhoneticProcessor
 
-# Try to import CUDA components
-CUDA_AVAILABLE = False
-try:
-    from pronunciation.cuda_similarity_calculator import CUDAIntegratedSimilaritySystem, check_cuda_setup
-    CUDA_AVAILABLE = check_cuda_setup()
-except ImportError:
-    print("[WARNING] CUDA components not available. Will use CPU-only version.")
+@lru_cache(maxsize=None)
+def cuda_available() -> bool:
+    """Import the CUDA components and probe the GPU, once, on first need.
+
+    Done lazily so --help and CPU-only commands skip importing CuPy and
+    initialising the device.
+    """
+    try:
+        from pronunciation.cuda_similarity_calculator import check_cuda_setup
+    except ImportError:
+        print("[WARNING] CUDA components not available. Will use CPU-only version.")
+        return False
+    return check_cuda_setup()
+
 
 # Database configuration
 from core.config import get_db_config
@@ -37,12 +42,16 @@ class EnhancedPronunciationSystem:
     """Enhanced system with optional CUDA acceleration and resume capability"""
     
     def __init__(self, db_config: Dict, use_cuda: bool = True):
+        from core.custom_database_manager import CustomDatabaseManager
+        from pronunciation.modern_pronunciation_system import ModernPhoneticProcessor
+
         self.db_manager = CustomDatabaseManager(**db_config)
         self.phonetic_processor = ModernPhoneticProcessor()
         
-        self.use_cuda = use_cuda and CUDA_AVAILABLE
+        self.use_cuda = use_cuda and cuda_available()
         
         if self.use_cuda:
+            from pronunciation.cuda_similarity_calculator import CUDAIntegratedSimilaritySystem
             logger.info("🚀 Initializing with CUDA acceleration")
             self.cuda_system = CUDAIntegratedSimilaritySystem(
                 self.db_manager, self.phonetic_processor
@@ -262,7 +271,7 @@ def benchmark_cuda_vs_cpu(system, sample_size: int = 1000):
     print(f"📊 Benchmarking with {len(df)} words ({len(df)*(len(df)-1)//2:,} pairs)")
     
     # Prepare data for CUDA
-    if CUDA_AVAILABLE:
+    if cuda_available():
         from modern_pronunciation_system import PhoneticData
         import json
         
@@ -324,7 +333,7 @@ def handle_cuda_similarities(system, threshold, force_cpu=False, auto_gpu=False)
         remaining_pairs = total_pairs - progress['current_similarities']
         print(f"🎯 Remaining: {remaining_pairs:,} pairs")
     
-    if CUDA_AVAILABLE and not force_cpu:
+    if cuda_available() and not force_cpu:
         estimated_gpu_time = total_pairs / 1000000  # Rough estimate: 1M pairs per second on GPU
         estimated_cpu_time = total_pairs / 50000    # Rough estimate: 50K pairs per second on CPU
         
@@ -443,7 +452,7 @@ def main():
         print("=" * 55)
         print("Configured for your vocabulary database with GPU acceleration")
         print()
-        if CUDA_AVAILABLE:
+        if cuda_available():
             print("✅ CUDA GPU acceleration is AVAILABLE")
             print("   Expect 10-100x speedup for similarity calculations!")
         else:
@@ -463,7 +472,7 @@ def main():
     
     # Handle CUDA check
     if args.check_cuda:
-        success = check_cuda_setup()
+        success = cuda_available()
         if success:
             print("\n🎉 CUDA is ready for GPU acceleration!")
             
@@ -706,7 +715,7 @@ def main():
                         print(f"   • {rec}")
         
         if args.benchmark:
-            if not CUDA_AVAILABLE:
+            if not cuda_available():
                 print("❌ Cannot benchmark: CUDA not available")
             else:
                 benchmark_cuda_vs_cpu(system, args.sample_size)
@@ -730,7 +739,7 @@ def main():
             handle_cuda_similarities(system, args.similarity_threshold, force_cpu=True, auto_gpu=False)
         
         if args.calculate_similarities_cuda:
-            if not CUDA_AVAILABLE:
+            if not cuda_available():
                 print("❌ CUDA not available. Use --calculate-similarities for CPU mode.")
                 return 1
             handle_cuda_similarities(system, args.similarity_threshold, force_cpu=False, auto_gpu=args.auto_gpu)
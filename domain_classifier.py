@@ -24,6 +24,7 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import json
 import logging
 import math
@@ -32,8 +33,9 @@ import random
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
@@ -730,6 +732,125 @@ except ImportError:  # pragma: no cover - optional dependency
     WordNetLemmatizer = None
 
 
+# ---------------------------------------------------------------------------
+# Compiled keyword matching
+# ---------------------------------------------------------------------------
+
+
+WORD_CHAR_PATTERN = regex.compile(r"\w")
+
+
+@lru_cache(maxsize=None)
+def _is_word_char(char: str) -> bool:
+    return WORD_CHAR_PATTERN.match(char) is not None
+
+
+@lru_cache(maxsize=None)
+def _fold_char(char: str) -> str:
+    folded = char.casefold()
+    return folded if len(folded) == 1 else char
+
+
+def _is_boundary(text: str, position: int) -> bool:
+    """Equivalent of ``\\b`` at ``position`` in ``text``."""
+
+    before = position > 0 and _is_word_char(text[position - 1])
+    after = position < len(text) and _is_word_char(text[position])
+    return before != after
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over many keywords.
+
+    ``find`` reports every keyword that ``\\b<keyword>\\b`` (case-insensitive)
+    would match, in a single pass over the text instead of one regex search per
+    keyword. Keywords whose case folding is not one-to-one (e.g. ``ß``) keep a
+    compiled regex so results stay identical to the per-pattern search.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+        self._fallback: Dict[int, regex.Pattern] = {}
+
+        for keyword in keywords:
+            self.add(keyword)
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def index(self, keyword: str) -> int:
+        return self._ids[keyword.lower()]
+
+    def add(self, keyword: str) -> int:
+        keyword = keyword.lower()
+        if keyword in self._ids:
+            return self._ids[keyword]
+
+        keyword_id = len(self.keywords)
+        self.keywords.append(keyword)
+        self._ids[keyword] = keyword_id
+
+        if not keyword or any(char.casefold() != char for char in keyword):
+            self._fallback[keyword_id] = regex.compile(
+                rf"\b{regex.escape(keyword)}\b", regex.IGNORECASE
+            )
+            return keyword_id
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += (keyword_id,)
+        return keyword_id
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+                queue.append(next_state)
+
+    def find(self, text: str) -> set[int]:
+        """Return the ids of all keywords occurring on word boundaries."""
+
+        folded = text.lower() if text.isascii() else "".join(map(_fold_char, text))
+        goto, fail, output = self._goto, self._fail, self._output
+        keywords = self.keywords
+        matched: set[int] = set()
+        state = 0
+
+        for end, char in enumerate(folded, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword_id in output[state]:
+                if keyword_id in matched:
+                    continue
+                start = end - len(keywords[keyword_id])
+                if _is_boundary(text, start) and _is_boundary(text, end):
+                    matched.add(keyword_id)
+
+        for keyword_id, pattern in self._fallback.items():
+            if pattern.search(text):
+                matched.add(keyword_id)
+        return matched
+
+
 # ---------------------------------------------------------------------------
 # Embedding backends
 # ---------------------------------------------------------------------------
@@ -775,6 +896,178 @@ class TfidfBackend(EmbeddingBackend):
         return self.vectorizer.transform(texts).astype(np.float32)
 
 
+# ---------------------------------------------------------------------------
+# Embedding providers (precomputed definition vectors)
+# ---------------------------------------------------------------------------
+
+
+def _text_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class EmbeddingProvider:
+    """Source of precomputed definition vectors keyed by word id.
+
+    ``fetch`` only returns vectors computed with ``model_name`` for exactly the
+    definition text given, so edited definitions are re-encoded. ``store``
+    receives freshly encoded vectors; read-only providers ignore it.
+    """
+
+    def fetch(
+        self, model_name: str, word_ids: Sequence[int], definitions: Sequence[str]
+    ) -> Dict[int, np.ndarray]:  # pragma: no cover - ABC
+        raise NotImplementedError
+
+    def store(
+        self,
+        model_name: str,
+        word_ids: Sequence[int],
+        definitions: Sequence[str],
+        vectors: np.ndarray,
+    ) -> None:
+        return None
+
+
+class MatrixCacheProvider(EmbeddingProvider):
+    """Local ``.npz`` cache of definition vectors (one float32 matrix).
+
+    Rows are looked up by word id and checked against a digest of the
+    definition text. New rows accumulate in memory until :meth:`save`.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.model_name: Optional[str] = None
+        self._index: Dict[int, int] = {}
+        self._digests: List[str] = []
+        self._rows: List[np.ndarray] = []
+        self._dirty = False
+
+        if self.path.exists():
+            with np.load(self.path, allow_pickle=False) as data:
+                self.model_name = str(data["model_name"])
+                matrix = data["vectors"]
+                self._rows = list(matrix)
+                self._digests = [str(digest) for digest in data["digests"]]
+                self._index = {int(word_id): row for row, word_id in enumerate(data["word_ids"])}
+            LOGGER.info(
+                "Loaded %d cached '%s' embeddings from %s",
+                len(self._rows),
+                self.model_name,
+                self.path,
+            )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def fetch(
+        self, model_name: str, word_ids: Sequence[int], definitions: Sequence[str]
+    ) -> Dict[int, np.ndarray]:
+        if model_name != self.model_name:
+            return {}
+        found: Dict[int, np.ndarray] = {}
+        for word_id, definition in zip(word_ids, definitions):
+            row = self._index.get(word_id)
+            if row is not None and self._digests[row] == _text_digest(definition):
+                found[word_id] = self._rows[row]
+        return found
+
+    def store(
+        self,
+        model_name: str,
+        word_ids: Sequence[int],
+        definitions: Sequence[str],
+        vectors: np.ndarray,
+    ) -> None:
+        if model_name != self.model_name:
+            if self._rows:
+                LOGGER.info("Discarding %d cached '%s' embeddings", len(self._rows), self.model_name)
+            self.model_name = model_name
+            self._index, self._digests, self._rows = {}, [], []
+
+        for word_id, definition, vector in zip(word_ids, definitions, vectors):
+            vector = np.asarray(vector, dtype=np.float32)
+            row = self._index.get(word_id)
+            if row is None:
+                self._index[word_id] = len(self._rows)
+                self._digests.append(_text_digest(definition))
+                self._rows.append(vector)
+            else:
+                self._digests[row] = _text_digest(definition)
+                self._rows[row] = vector
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache atomically if anything changed."""
+
+        if not self._dirty or self.model_name is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        word_ids = np.empty(len(self._rows), dtype=np.int64)
+        for word_id, row in self._index.items():
+            word_ids[row] = word_id
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as handle:
+            np.savez(
+                handle,
+                model_name=np.array(self.model_name),
+                word_ids=word_ids,
+                digests=np.array(self._digests),
+                vectors=np.vstack(self._rows).astype(np.float32),
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        LOGGER.info("Saved %d embeddings to %s", len(self._rows), self.path)
+
+
+class DefinitionEmbeddingsProvider(EmbeddingProvider):
+    """Reads vectors from ``vocab.definition_embeddings`` (read-only).
+
+    ``connect`` returns a DB-API connection (psycopg or psycopg2); one is
+    opened per fetch.
+    """
+
+    def __init__(self, connect: Callable[[], Any], table: str = "vocab.definition_embeddings") -> None:
+        self.connect = connect
+        self.table = table
+
+    def fetch(
+        self, model_name: str, word_ids: Sequence[int], definitions: Sequence[str]
+    ) -> Dict[int, np.ndarray]:
+        if not word_ids:
+            return {}
+        conn = self.connect()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT word_id, definition_text, embedding_json FROM {self.table} "
+                    "WHERE embedding_model = %s AND word_id = ANY(%s)",
+                    (model_name, list(word_ids)),
+                )
+                rows = cursor.fetchall()
+        finally:
+            conn.close()
+
+        wanted = dict(zip(word_ids, definitions))
+        found: Dict[int, np.ndarray] = {}
+        for word_id, definition_text, embedding_json in rows:
+            if not embedding_json or wanted.get(word_id) != definition_text:
+                continue
+            try:
+                found[word_id] = np.asarray(json.loads(embedding_json), dtype=np.float32)
+            except (json.JSONDecodeError, ValueError) as exc:
+                LOGGER.warning("Failed to parse embedding for word_id %s: %s", word_id, exc)
+        return found
+
+
+@dataclass
+class EmbeddingStats:
+    """Where definition vectors came from across ``classify_batch`` calls."""
+
+    reused: int = 0
+    encoded: int = 0
+
+
 # ---------------------------------------------------------------------------
 # Domain classifier implementation
 # ---------------------------------------------------------------------------
@@ -792,6 +1085,8 @@ class DomainClassifier:
         threshold_low: Optional[float] = None,
         tie_delta: Optional[float] = None,
         config_output_dir: Optional[str] = None,
+        embedding_providers: Optional[Sequence[EmbeddingProvider]] = None,
+        embedding_cache_dir: Optional[str] = None,
     ) -> None:
         _initialise_random_seeds()
 
@@ -865,6 +1160,33 @@ class DomainClassifier:
                 regex_rules=regex_rules,
             )
 
+        # One automaton over every keyword; postings map each match back to the
+        # (domain, negative?, position in the domain's keyword list) it scores.
+        self.keyword_matcher = KeywordMatcher(
+            word
+            for domain in self.config.domains
+            for word in (*domain.keywords, *domain.negative_keywords)
+        )
+        self._keyword_postings: Dict[int, List[Tuple[str, bool, int]]] = {}
+        for domain in self.config.domains:
+            for negative, words in ((False, domain.keywords), (True, domain.negative_keywords)):
+                for position, word in enumerate(words):
+                    keyword_id = self.keyword_matcher.index(word)
+                    self._keyword_postings.setdefault(keyword_id, []).append(
+                        (domain.name, negative, position)
+                    )
+        # Plain per-domain tuples so scoring avoids config attribute lookups.
+        self._rule_table = [
+            (
+                name,
+                max(self.domain_resources[name].config.base_weight, 0.0),
+                list(self.domain_resources[name].config.keywords),
+                list(self.domain_resources[name].config.negative_keywords),
+                self.domain_resources[name].regex_rules,
+            )
+            for name in self.domain_order
+        ]
+
         # Pre-calc prototypes for semantic scoring.
         self.prototype_texts = [self._prototype_text(domain) for domain in self.config.domains]
         self.embedding_backend: EmbeddingBackend
@@ -891,10 +1213,19 @@ class DomainClassifier:
                 self.prototype_texts
             ).toarray()  # type: ignore[attr-defined]
 
+        # Stored vectors are only reused for the exact model (or TF-IDF space)
+        # that would otherwise encode the definitions.
+        prototype_digest = _text_digest("\n".join(self.prototype_texts))
+        if self._semantic_backend_label == "sentence-transformers":
+            self.embedding_model_name = self.config.embedding_model
+        else:
+            self.embedding_model_name = f"tfidf-{prototype_digest}"
+        self.embedding_providers: List[EmbeddingProvider] = list(embedding_providers or [])
+        self.embedding_stats = EmbeddingStats()
+        self.embedding_cache_dir = Path(embedding_cache_dir) if embedding_cache_dir else None
+
         if self.prototype_embeddings is None:
-            self.prototype_embeddings = self.embedding_backend.encode(
-                self.prototype_texts
-            )
+            self.prototype_embeddings = self._load_prototype_embeddings(prototype_digest)
 
         self.prototype_embeddings = self._l2_normalise(self.prototype_embeddings)
 
@@ -933,18 +1264,25 @@ class DomainClassifier:
         return results[0]
 
     def classify_batch(
-        self, terms: Sequence[str], definitions: Sequence[str]
+        self,
+        terms: Sequence[str],
+        definitions: Sequence[str],
+        word_ids: Optional[Sequence[int]] = None,
     ) -> List[Dict[str, Any]]:
         """Classify multiple term/definition pairs.
 
         Notes
         -----
-        * Rule-scoring is executed per record.
+        * Rule-scoring is executed per record, with one keyword-automaton pass.
         * Embeddings are computed in batch for efficiency.
+        * With ``word_ids`` and embedding providers configured, stored
+          definition vectors are reused and only missing ones are encoded.
         """
 
         if len(terms) != len(definitions):
             raise ValueError("Terms and definitions must have matching lengths")
+        if word_ids is not None and len(word_ids) != len(terms):
+            raise ValueError("Word ids and terms must have matching lengths")
 
         clean_terms = [term or "" for term in terms]
         clean_defs = [definition or "" for definition in definitions]
@@ -958,7 +1296,7 @@ class DomainClassifier:
             rule_scores_list.append(scores)
             rule_evidence_list.append(evidence)
 
-        semantic_matrix = self._compute_semantic_scores(clean_defs)
+        semantic_matrix = self._compute_semantic_scores(clean_defs, word_ids)
 
         outputs: List[Dict[str, Any]] = []
         alpha = self.config.weights.alpha
@@ -1077,31 +1415,53 @@ class DomainClassifier:
         return cleaned
 
     def _score_rules(self, processed_text: str) -> Tuple[Dict[str, float], Dict[str, Dict[str, Any]]]:
-        scores: Dict[str, float] = {}
-        evidence: Dict[str, Dict[str, Any]] = {}
+        keyword_hits: Dict[str, Tuple[List[int], List[int]]] = {}
+        for keyword_id in self.keyword_matcher.find(processed_text):
+            for domain_name, negative, position in self._keyword_postings[keyword_id]:
+                keyword_hits.setdefault(domain_name, ([], []))[negative].append(position)
+        return self._tally_rule_scores(processed_text, keyword_hits)
+
+    def _score_rules_reference(
+        self, processed_text: str
+    ) -> Tuple[Dict[str, float], Dict[str, Dict[str, Any]]]:
+        """Per-pattern keyword search (one regex per keyword).
+
+        Superseded by the keyword automaton in :meth:`_score_rules`; kept as the
+        reference for parity checks and ``--benchmark-rules``.
+        """
 
+        keyword_hits: Dict[str, Tuple[List[int], List[int]]] = {}
         for domain_name in self.domain_order:
             resources = self.domain_resources[domain_name]
-            base_weight = max(resources.config.base_weight, 0.0)
-            matched_keywords = []
-            matched_negative = []
+            keyword_hits[domain_name] = (
+                [idx for idx, pattern in enumerate(resources.keyword_patterns) if pattern.search(processed_text)],
+                [idx for idx, pattern in enumerate(resources.negative_patterns) if pattern.search(processed_text)],
+            )
+        return self._tally_rule_scores(processed_text, keyword_hits)
+
+    def _tally_rule_scores(
+        self,
+        processed_text: str,
+        keyword_hits: Mapping[str, Tuple[List[int], List[int]]],
+    ) -> Tuple[Dict[str, float], Dict[str, Dict[str, Any]]]:
+        scores: Dict[str, float] = {}
+        evidence: Dict[str, Dict[str, Any]] = {}
+
+        for domain_name, base_weight, keywords, negative_keywords, regex_rules in self._rule_table:
+            hits = keyword_hits.get(domain_name)
+            if hits:
+                matched_keywords = [keywords[idx] for idx in sorted(hits[0])]
+                matched_negative = [negative_keywords[idx] for idx in sorted(hits[1])]
+            else:
+                matched_keywords, matched_negative = [], []
             matched_regexes = []
             raw_score = 0.0
 
-            for pattern, keyword in zip(
-                resources.keyword_patterns, resources.config.keywords
-            ):
-                if pattern.search(processed_text):
-                    matched_keywords.append(keyword)
-                    raw_score += base_weight
+            # Repeated addition keeps raw scores bit-identical to the per-pattern loop.
+            for _ in matched_keywords:
+                raw_score += base_weight
 
-            for pattern, keyword in zip(
-                resources.negative_patterns, resources.config.negative_keywords
-            ):
-                if pattern.search(processed_text):
-                    matched_negative.append(keyword)
-
-            for compiled, weight, description, raw_pattern in resources.regex_rules:
+            for compiled, weight, description, raw_pattern in regex_rules:
                 if compiled.search(processed_text):
                     matched_regexes.append(
                         {
@@ -1127,11 +1487,71 @@ class DomainClassifier:
 
         return scores, evidence
 
-    def _compute_semantic_scores(self, definitions: Sequence[str]) -> np.ndarray:
-        embeddings = self.embedding_backend.encode(definitions)
+    def _encode(self, texts: Sequence[str]) -> np.ndarray:
+        embeddings = self.embedding_backend.encode(texts)
         if hasattr(embeddings, "toarray"):
             embeddings = embeddings.toarray()
-        embeddings = embeddings.astype(np.float32)
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def _load_prototype_embeddings(self, prototype_digest: str) -> np.ndarray:
+        """Encode domain prototypes once per model and prototype set."""
+
+        if self.embedding_cache_dir is None:
+            return self._encode(self.prototype_texts)
+
+        safe_model = regex.sub(r"[^\w.-]+", "_", self.embedding_model_name)
+        cache_path = self.embedding_cache_dir / f"prototypes-{safe_model}-{prototype_digest}.npy"
+        if cache_path.exists():
+            cached = np.load(cache_path, allow_pickle=False)
+            if cached.shape[0] == len(self.prototype_texts):
+                return cached
+
+        prototypes = self._encode(self.prototype_texts)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(cache_path, prototypes)
+        return prototypes
+
+    def _definition_embeddings(
+        self, definitions: Sequence[str], word_ids: Optional[Sequence[int]]
+    ) -> np.ndarray:
+        if not word_ids or not self.embedding_providers:
+            self.embedding_stats.encoded += len(definitions)
+            return self._encode(definitions)
+
+        model_name = self.embedding_model_name
+        vectors: Dict[int, np.ndarray] = {}
+        for depth, provider in enumerate(self.embedding_providers):
+            pending = [(wid, text) for wid, text in zip(word_ids, definitions) if wid not in vectors]
+            if not pending:
+                break
+            pending_ids = [wid for wid, _ in pending]
+            found = provider.fetch(model_name, pending_ids, [text for _, text in pending])
+            if found and depth:
+                # Warm the faster providers in front of this one.
+                pending_texts = dict(pending)
+                found_ids = list(found)
+                found_texts = [pending_texts[wid] for wid in found_ids]
+                for earlier in self.embedding_providers[:depth]:
+                    earlier.store(model_name, found_ids, found_texts, np.vstack(list(found.values())))
+            vectors.update(found)
+
+        missing = [idx for idx, wid in enumerate(word_ids) if wid not in vectors]
+        if missing:
+            missing_ids = [word_ids[idx] for idx in missing]
+            missing_texts = [definitions[idx] for idx in missing]
+            encoded = self._encode(missing_texts)
+            for provider in self.embedding_providers:
+                provider.store(model_name, missing_ids, missing_texts, encoded)
+            vectors.update(zip(missing_ids, encoded))
+
+        self.embedding_stats.reused += len(word_ids) - len(missing)
+        self.embedding_stats.encoded += len(missing)
+        return np.vstack([vectors[wid] for wid in word_ids]).astype(np.float32)
+
+    def _compute_semantic_scores(
+        self, definitions: Sequence[str], word_ids: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        embeddings = self._definition_embeddings(definitions, word_ids)
         embeddings = self._l2_normalise(embeddings)
         sims = embeddings @ self.prototype_embeddings.T
         return sims
@@ -1379,6 +1799,74 @@ def run_self_test(classifier: DomainClassifier) -> None:
         )
 
 
+def run_rule_benchmark(
+    classifier: DomainClassifier,
+    definitions: Sequence[str],
+    *,
+    min_records: int = 5000,
+) -> Dict[str, float]:
+    """Time rule scoring with the keyword automaton vs. per-pattern search.
+
+    Reports full ``_score_rules`` throughput (regex rules and evidence included)
+    and the keyword search on its own, which is the part the automaton replaces.
+    """
+
+    import time
+
+    processed = [classifier._preprocess_text(text or "") for text in definitions]
+    if not processed:
+        raise ValueError("No definitions to benchmark")
+    processed = processed * max(1, math.ceil(min_records / len(processed)))
+
+    timings: Dict[str, float] = {}
+    outputs: Dict[str, List[Any]] = {}
+    for label, scorer in (
+        ("per_pattern", classifier._score_rules_reference),
+        ("automaton", classifier._score_rules),
+    ):
+        started = time.perf_counter()
+        outputs[label] = [scorer(text) for text in processed]
+        timings[label] = time.perf_counter() - started
+
+    keyword_patterns = [
+        pattern
+        for resources in classifier.domain_resources.values()
+        for pattern in (*resources.keyword_patterns, *resources.negative_patterns)
+    ]
+    search_timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    for text in processed:
+        [pattern.search(text) for pattern in keyword_patterns]
+    search_timings["per_pattern"] = time.perf_counter() - started
+    started = time.perf_counter()
+    for text in processed:
+        classifier.keyword_matcher.find(text)
+    search_timings["automaton"] = time.perf_counter() - started
+
+    mismatches = sum(
+        1 for fast, slow in zip(outputs["automaton"], outputs["per_pattern"]) if fast != slow
+    )
+    keywords = len(classifier.keyword_matcher)
+    print("\nRULE SCORING BENCHMARK")
+    print("======================")
+    print(f"Records: {len(processed):,}  Domains: {len(classifier.domain_order)}  Keywords: {keywords}")
+    for title, table in (("Rule scoring", timings), ("Keyword search only", search_timings)):
+        print(f"{title}:")
+        for label, elapsed in table.items():
+            print(f"  {label:<12} {elapsed:8.3f}s  {len(processed) / elapsed:12,.0f} records/s")
+        print(f"  speedup      {table['per_pattern'] / table['automaton']:.1f}x")
+    print(f"Mismatched records: {mismatches}")
+
+    return {
+        "records": float(len(processed)),
+        "per_pattern_seconds": timings["per_pattern"],
+        "automaton_seconds": timings["automaton"],
+        "speedup": timings["per_pattern"] / timings["automaton"],
+        "keyword_search_speedup": search_timings["per_pattern"] / search_timings["automaton"],
+        "mismatches": float(mismatches),
+    }
+
+
 # ---------------------------------------------------------------------------
 # CLI entrypoint
 # ---------------------------------------------------------------------------
@@ -1410,6 +1898,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         help="Directory for writing the default configuration when none exists",
     )
 
+    parser.add_argument(
+        "--embedding-cache-dir",
+        help="Directory for caching encoded domain prototype vectors",
+    )
+
     parser.add_argument("--alpha", type=float, help="Override alpha weight")
     parser.add_argument("--beta", type=float, help="Override beta weight")
     parser.add_argument(
@@ -1443,6 +1936,12 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Run built-in smoke tests and exit",
     )
+    parser.add_argument(
+        "--benchmark-rules",
+        action="store_true",
+        help="Benchmark rule scoring (automaton vs. per-pattern) on the input "
+        "definitions, or the self-test samples when no input is given, and exit",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -1527,12 +2026,21 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         threshold_low=args.threshold_low,
         tie_delta=args.tie_delta,
         config_output_dir=args.config_output_dir,
+        embedding_cache_dir=args.embedding_cache_dir,
     )
 
     if args.self_test:
         run_self_test(classifier)
         return 0
 
+    if args.benchmark_rules:
+        if args.input_csv or args.pg_read:
+            _, definitions = load_input_data(args)
+        else:
+            definitions = [definition for _, definition, _ in SELF_TEST_CASES]
+        report = run_rule_benchmark(classifier, definitions)
+        return 1 if report["mismatches"] else 0
+
     terms, definitions = load_input_data(args)
     records = classifier.classify_batch(terms, definitions)
 
@@ -13,6 +13,8 @@ import hashlib
 import logging
 import time
 import wordfreq
+from contextlib import nullcontext
+from functools import lru_cache
 from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta, date
 from dataclasses import dataclass, field
@@ -34,10 +36,13 @@ sys.path.insert(0, os.path.dirname(__file__))
 from core.secure_config import get_db_config
 from core.english_word_validator import validate_english_word
 from core.comprehensive_definition_lookup import ComprehensiveDefinitionLookup
+from core.known_terms import get_known_terms, record_known_terms
+from core.crawl_engine import CrawlEngine, CrawlRequest, FetchResult
+from core.candidate_sink import CANDIDATE_WORDS, CandidateSink
 from universal_vocabulary_extractor import UniversalVocabularyExtractor, VocabularyCandidate
 import mysql.connector
-from mysql.connector import Error
 import inflect
+import psycopg
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -57,8 +62,11 @@ class SpiderConfig:
     max_total_candidates: int = 500
     zipf_threshold: float = 2.5
     min_word_length: int = 4
-    rate_limit_delay: float = 1.0
+    rate_limit_delay: float = 1.0  # Minimum seconds between requests to the same host
     max_link_depth: int = 3
+    fetch_concurrency: int = 8  # Total in-flight requests across all hosts
+    process_workers: int = 2  # Processes for HTML parsing and candidate extraction
+    respect_robots: bool = True
     success_rate_update_interval: int = 10  # Update adaptive balancing every N URLs
 
 @dataclass 
@@ -124,6 +132,9 @@ class AutonomousVocabularySpider:
         self.extractor = UniversalVocabularyExtractor()
         self.inflect_engine = inflect.engine()
         self.definition_lookup = None  # Will be initialized in async context
+        self.known_terms = get_known_terms()  # None until scripts/build_known_terms.py has run
+        self.crawl_engine: Optional[CrawlEngine] = None  # Shared across sources during a session
+        self.candidate_sink = CandidateSink(CANDIDATE_WORDS, lambda: psycopg.connect(**self.db_config))
         
         # Session state
         self.session_id = f"spider_{int(time.time())}"
@@ -139,7 +150,8 @@ class AutonomousVocabularySpider:
         
         logger.info(f"Initialized autonomous spider session: {self.session_id}")
     
-    def _is_english_word_enhanced(self, word: str) -> bool:
+    @staticmethod
+    def _is_english_word_enhanced(word: str) -> bool:
         """Enhanced English word validation with non-Latin script detection"""
         if not word or len(word.strip()) < 2:
             return False
@@ -189,7 +201,8 @@ class AutonomousVocabularySpider:
             # Fallback validation
             return len(word) >= 3 and word.replace('-', '').replace("'", '').isalpha()
     
-    def _should_exclude_by_pos(self, pos: str, term: str) -> bool:
+    @staticmethod
+    def _should_exclude_by_pos(pos: str, term: str) -> bool:
         """Enhanced POS filtering with PUNCT classification review"""
         if not pos:
             return True  # Exclude words without POS
@@ -211,7 +224,7 @@ class AutonomousVocabularySpider:
         # Special handling for PUNCT - many are misclassified
         if pos == 'PUNCT':
             # Check if this "PUNCT" term is actually a meaningful word
-            if self._is_likely_misclassified_punct(term):
+            if AutonomousVocabularySpider._is_likely_misclassified_punct(term):
                 logger.info(f"Reclassifying '{term}' from PUNCT - appears to be a real word")
                 return False  # Don't exclude, it's probably a real word
             else:
@@ -219,7 +232,8 @@ class AutonomousVocabularySpider:
         
         return False  # Include all other POS types
     
-    def _is_likely_misclassified_punct(self, term: str) -> bool:
+    @staticmethod
+    def _is_likely_misclassified_punct(term: str) -> bool:
         """Check if a PUNCT-classified term is actually a meaningful word"""
         if not term or len(term) < 3:
             return False
@@ -288,7 +302,10 @@ class AutonomousVocabularySpider:
         if url_hash in self.visited_urls_cache:
             return True
         
-        # Check database
+        # Check database (off the event loop so concurrent fetches keep flowing)
+        return await asyncio.to_thread(self._query_url_visited, url_hash, source_type)
+    
+    def _query_url_visited(self, url_hash: str, source_type: SourceType) -> bool:
         conn = mysql.connector.connect(**self.db_config)
         cursor = conn.cursor()
         
@@ -317,7 +334,10 @@ class AutonomousVocabularySpider:
         """Record URL visit in database and cache"""
         url_hash = self._hash_url(url)
         self.visited_urls_cache.add(url_hash)
-        
+        await asyncio.to_thread(self._write_url_visit, url, url_hash, source_type, success, candidates_found)
+    
+    def _write_url_visit(self, url: str, url_hash: str, source_type: SourceType,
+                         success: bool, candidates_found: int):
         conn = mysql.connector.connect(**self.db_config)
         cursor = conn.cursor()
         
@@ -355,6 +375,14 @@ class AutonomousVocabularySpider:
         # Convert to singular form
         singular_term = self.inflect_engine.singular_noun(term.lower()) or term.lower()
         
+        # The shared known-term index answers negatives without a database
+        # round trip; only a Bloom-filter positive is confirmed in the database
+        if self.known_terms is not None:
+            return self.known_terms.contains(singular_term, confirm=self._is_term_in_database)
+        return self._is_term_in_database(singular_term)
+    
+    def _is_term_in_database(self, singular_term: str) -> bool:
+        """Query defined and candidate_words for an exact (lowercased) term"""
         conn = mysql.connector.connect(**self.db_config)
         cursor = conn.cursor()
         
@@ -380,38 +408,25 @@ class AutonomousVocabularySpider:
     
     async def filter_candidates_by_frequency(self, candidates: List[VocabularyCandidate], source_url: str = None) -> List[VocabularyCandidate]:
         """Filter candidates by wordfreq zipf score <= 2.5, exclude proper nouns, and add definitions"""
+        prefiltered = prefilter_candidates(candidates, self.config.min_word_length, self.config.zipf_threshold)
+        return await self.confirm_candidates(prefiltered, source_url)
+
+    async def confirm_candidates(self, candidates: List[VocabularyCandidate], source_url: str = None) -> List[VocabularyCandidate]:
+        """Drop already-stored terms and attach definitions to prefiltered candidates"""
         filtered = []
-        
+
         for candidate in candidates:
             try:
-                # ENHANCED POS filtering: Exclude problematic classifications
-                if self._should_exclude_by_pos(candidate.part_of_speech, candidate.term):
-                    continue
-                
-                # Check minimum length
-                if len(candidate.term) < self.config.min_word_length:
-                    continue
-                
-                # Check word frequency using wordfreq
-                zipf_score = wordfreq.zipf_frequency(candidate.term, 'en')
-                if zipf_score > self.config.zipf_threshold:
-                    continue  # Too common
-                
                 # Check if already stored (handles singularization and case)
                 if await self.is_word_already_stored(candidate.term):
                     continue  # Already exists
-                
-                # ENHANCED: Validate English word with script detection
-                if not self._is_english_word_enhanced(candidate.term):
-                    continue
-                
+
                 # Look up definition using comprehensive system
                 definition_text = await self.lookup_definition_for_candidate(candidate)
                 if not definition_text:
                     continue  # Skip if no definition found with matching POS
-                
-                # Add frequency info and definition to candidate
-                candidate.source_metadata['zipf_score'] = zipf_score
+
+                # Add definition to candidate
                 candidate.source_metadata['frequency_filter_passed'] = True
                 candidate.source_metadata['definition_text'] = definition_text
                 candidate.source_metadata['source_url'] = source_url
@@ -495,26 +510,7 @@ class AutonomousVocabularySpider:
                         return links
                     
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Find main content area
-                    content = soup.find('div', {'id': 'mw-content-text'})
-                    if not content:
-                        return links
-                    
-                    # Extract article links (not external, not files, not special pages)
-                    for link in content.find_all('a', href=True):
-                        href = link['href']
-                        if (href.startswith('/wiki/') and 
-                            ':' not in href and
-                            '#' not in href and
-                            not href.startswith('/wiki/File:')):
-                            full_url = urljoin('https://en.wikipedia.org', href)
-                            links.append(full_url)
-                    
-                    # Limit and randomize
-                    random.shuffle(links)
-                    return links[:20]  # Return up to 20 random links
+                    return extract_wikipedia_links(html)
                     
         except Exception as e:
             logger.error(f"Error extracting Wikipedia links from {url}: {e}")
@@ -593,57 +589,7 @@ class AutonomousVocabularySpider:
                         return None
                     
                     html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Remove script and style elements
-                    for script in soup(["script", "style", "nav", "footer", "header"]):
-                        script.decompose()
-                    
-                    # Extract text based on source type
-                    if source_type == SourceType.WIKIPEDIA:
-                        content = soup.find('div', {'id': 'mw-content-text'})
-                        if content:
-                            # Remove citation boxes, infoboxes, etc.
-                            for unwanted in content.find_all(['table', 'div'], class_=['navbox', 'infobox', 'citation']):
-                                unwanted.decompose()
-                            text = content.get_text()
-                        else:
-                            text = soup.get_text()
-                    
-                    elif source_type == SourceType.ARXIV:
-                        # For ArXiv, focus on abstract and main content
-                        abstract = soup.find('blockquote', class_='abstract')
-                        if abstract:
-                            text = abstract.get_text()
-                        else:
-                            text = soup.get_text()
-                    
-                    elif source_type == SourceType.GUTENBERG:
-                        # For Gutenberg, find the main text content
-                        content = soup.find('div', {'id': 'pg-machine-header'})
-                        if content and content.find_next('pre'):
-                            text = content.find_next('pre').get_text()
-                        else:
-                            # Try to find main content area
-                            main_text = soup.find('pre') or soup.find('div', class_='chapter')
-                            if main_text:
-                                text = main_text.get_text()
-                            else:
-                                text = soup.get_text()
-                    
-                    else:
-                        text = soup.get_text()
-                    
-                    # Clean up text
-                    lines = (line.strip() for line in text.splitlines())
-                    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                    text = ' '.join(chunk for chunk in chunks if chunk)
-                    
-                    # Limit text length to prevent memory issues
-                    if len(text) > 50000:
-                        text = text[:50000]
-                    
-                    return text if len(text) > 100 else None  # Minimum meaningful content
+                    return extract_page_text(html, source_type)
                     
         except Exception as e:
             logger.error(f"Error extracting text from {url}: {e}")
@@ -682,7 +628,6 @@ class AutonomousVocabularySpider:
     async def spider_source(self, source_type: SourceType, max_urls: int) -> List[VocabularyCandidate]:
         """Spider a specific source type for vocabulary"""
         candidates = []
-        urls_processed = 0
         
         logger.info(f"Starting to spider {source_type.value} (max {max_urls} URLs)")
         
@@ -703,136 +648,115 @@ class AutonomousVocabularySpider:
             logger.warning(f"No initial URLs found for {source_type.value}")
             return candidates
         
-        # Process URLs
-        while url_queue and urls_processed < max_urls:
-            url = url_queue.pop(0)
-            
-            # Check if recently visited
-            if await self.is_url_recently_visited(url, source_type):
-                continue
-            
-            start_time = time.time()
-            try:
-                # Extract text content
-                text_content = await self.extract_text_from_url(url, source_type)
-                response_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-                
-                if text_content:
-                    # Extract vocabulary candidates
-                    url_candidates = self.extractor.extract_candidates(
-                        text_content, 
-                        {'source_type': source_type.value, 'url': url}
-                    )
-                    
-                    # Filter candidates
-                    filtered_candidates = await self.filter_candidates_by_frequency(url_candidates, url)
-                    candidates.extend(filtered_candidates)
-                    
-                    # Record successful visit
-                    await self.record_url_visit(url, source_type, True, len(filtered_candidates))
-                    
-                    # Update performance metrics
-                    perf = self.performance_metrics[source_type]
-                    perf.urls_visited += 1
-                    perf.success_count += 1
-                    perf.total_candidates += len(filtered_candidates)
-                    perf.total_response_time += response_time
-                    
-                    logger.info(f"Processed {url}: {len(filtered_candidates)} candidates found")
-                    
-                    # Get more URLs from this page (for Wikipedia)
-                    if source_type == SourceType.WIKIPEDIA and len(url_queue) < 10:
-                        new_links = await self.get_wikipedia_links_from_page(url)
-                        # Add unvisited links
-                        for link in new_links:
-                            if not await self.is_url_recently_visited(link, source_type):
-                                url_queue.append(link)
-                                if len(url_queue) >= 20:  # Limit queue size
-                                    break
-                
-                else:
-                    # Record failed visit
-                    await self.record_url_visit(url, source_type, False, 0)
-                    perf = self.performance_metrics[source_type]
-                    perf.urls_visited += 1
-                    perf.total_response_time += response_time
-                
-            except Exception as e:
-                logger.error(f"Error processing {url}: {e}")
-                await self.record_url_visit(url, source_type, False, 0)
-                perf = self.performance_metrics[source_type]
-                perf.urls_visited += 1
-                perf.error_count += 1
-            
-            urls_processed += 1
+        # Skip seeds visited recently; links found on pages are checked as they arrive
+        seeds = [url for url in url_queue if not await self.is_url_recently_visited(url, source_type)]
+        page_metadata = {
+            'source_type': source_type.value,
+            'min_word_length': self.config.min_word_length,
+            'zipf_threshold': self.config.zipf_threshold,
+        }
+
+        async def handle_page(result: FetchResult) -> List[str]:
+            url = result.request.url
+            page = result.processed
+            perf = self.performance_metrics[source_type]
+            perf.urls_visited += 1
+            perf.total_response_time += result.elapsed_ms
             self.total_urls_visited += 1
-            
-            # Rate limiting
-            await asyncio.sleep(self.config.rate_limit_delay)
-        
-        logger.info(f"Completed spidering {source_type.value}: {len(candidates)} candidates from {urls_processed} URLs")
+
+            if not result.ok or not page or not page['has_text']:
+                if result.error:
+                    logger.error(f"Error processing {url}: {result.error}")
+                    perf.error_count += 1
+                await self.record_url_visit(url, source_type, False, 0)
+                return []
+
+            # Filter candidates (prefiltered in the worker process)
+            filtered_candidates = await self.confirm_candidates(page['candidates'], url)
+            candidates.extend(filtered_candidates)
+
+            # Record successful visit
+            await self.record_url_visit(url, source_type, True, len(filtered_candidates))
+            perf.success_count += 1
+            perf.total_candidates += len(filtered_candidates)
+
+            logger.info(f"Processed {url}: {len(filtered_candidates)} candidates found")
+
+            # Follow unvisited links (Wikipedia)
+            return [link for link in page['links']
+                    if not await self.is_url_recently_visited(link, source_type)]
+
+        # Pages are fetched concurrently across hosts; rate_limit_delay is enforced per host
+        engine_context = nullcontext(self.crawl_engine) if self.crawl_engine else self.create_crawl_engine()
+        async with engine_context as engine:
+            stats = await engine.crawl(
+                [CrawlRequest(url, metadata=page_metadata) for url in seeds], process_spider_page,
+                handle_page, max_pages=max_urls, max_depth=self.config.max_link_depth
+            )
+
+        logger.info(f"Completed spidering {source_type.value}: {len(candidates)} candidates from "
+                    f"{stats.pages} URLs ({stats.pages_per_minute:.1f} pages/min)")
         return candidates
     
+    def create_crawl_engine(self) -> CrawlEngine:
+        """Crawl engine sized from the spider config (use as an async context manager)"""
+        return CrawlEngine(
+            concurrency=self.config.fetch_concurrency,
+            per_host_delay=self.config.rate_limit_delay,
+            process_workers=self.config.process_workers,
+            respect_robots=self.config.respect_robots,
+        )
+    
     async def store_candidates(self, candidates: List[VocabularyCandidate]):
         """Store filtered candidates in database"""
         if not candidates:
             return
         
-        conn = mysql.connector.connect(**self.db_config)
-        cursor = conn.cursor()
-        
-        try:
-            insert_query = """
-                INSERT INTO vocab.candidate_words 
-                (term, source_type, source_reference, part_of_speech, utility_score, rarity_indicators,
-                 context_snippet, raw_definition, etymology_preview, date_discovered)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
+        for candidate in candidates:
+            source_type = candidate.source_metadata.get('source_type', 'unknown')
+            zipf_score = candidate.source_metadata.get('zipf_score', 0.0)
+            definition_text = candidate.source_metadata.get('definition_text', 'Definition not available')
+            source_url = candidate.source_metadata.get('source_url', '')
             
-            values = []
-            for candidate in candidates:
-                source_type = candidate.source_metadata.get('source_type', 'unknown')
-                zipf_score = candidate.source_metadata.get('zipf_score', 0.0)
-                definition_text = candidate.source_metadata.get('definition_text', 'Definition not available')
-                source_url = candidate.source_metadata.get('source_url', '')
-                
-                rarity_indicators = {
-                    'zipf_score': zipf_score,
-                    'frequency_rank': 'rare' if zipf_score <= 2.0 else 'uncommon',
-                    'source_quality': 'high' if source_type in ['wikipedia', 'arxiv', 'gutenberg'] else 'medium'
-                }
-                
-                values.append((
-                    candidate.term,
-                    source_type,
-                    source_url[:255] if source_url else None,  # Truncate to field length
-                    candidate.part_of_speech or 'unknown',
-                    candidate.preliminary_score,
-                    json.dumps(rarity_indicators),
-                    candidate.context[:500] if candidate.context else None,
-                    definition_text,
-                    json.dumps(candidate.morphological_type)[:500] if candidate.morphological_type else None,
-                    datetime.now()
-                ))
+            rarity_indicators = {
+                'zipf_score': zipf_score,
+                'frequency_rank': 'rare' if zipf_score <= 2.0 else 'uncommon',
+                'source_quality': 'high' if source_type in ['wikipedia', 'arxiv', 'gutenberg'] else 'medium'
+            }
             
-            cursor.executemany(insert_query, values)
-            conn.commit()
+            self.candidate_sink.add((
+                candidate.term,
+                source_type,
+                source_url[:255] if source_url else None,  # Truncate to field length
+                candidate.part_of_speech or 'unknown',
+                candidate.preliminary_score,
+                json.dumps(rarity_indicators),
+                candidate.context[:500] if candidate.context else None,
+                definition_text,
+                json.dumps(candidate.morphological_type)[:500] if candidate.morphological_type else None,
+                datetime.now()
+            ))
+        
+        try:
+            # COPY into a staging table, then one merge that skips terms already
+            # in candidate_words/defined (off the event loop)
+            inserted = await asyncio.to_thread(self.candidate_sink.flush)
+            record_known_terms(candidate.term for candidate in candidates)
             
-            logger.info(f"Successfully stored {len(candidates)} candidates in database")
+            logger.info(f"Successfully stored {inserted} of {len(candidates)} candidates in database "
+                        f"({self.candidate_sink.stats.rows_per_second:,.0f} rows/s this session)")
             
-        except Error as e:
+        except psycopg.Error as e:
             logger.error(f"Database error storing candidates: {e}")
-            conn.rollback()
-        finally:
-            cursor.close()
-            conn.close()
+            self.candidate_sink.clear()
     
     async def run_autonomous_session(self) -> Dict:
         """Run a complete autonomous spidering session"""
         logger.info(f"Starting autonomous spider session {self.session_id}")
         logger.info(f"Config: {self.config.max_urls_per_source} URLs/source, "
                    f"{self.config.max_session_duration_minutes}min max, "
-                   f"zipf≤{self.config.zipf_threshold}")
+                   f"zipf≤{self.config.zipf_threshold}, "
+                   f"{self.config.fetch_concurrency} concurrent fetches")
         
         # Setup database
         await self.setup_database_tables()
@@ -841,9 +765,9 @@ class AutonomousVocabularySpider:
         session_start = datetime.now()
         
         # Initialize definition lookup in async context
-        from core.comprehensive_definition_lookup import ComprehensiveDefinitionLookup
-        async with ComprehensiveDefinitionLookup() as definition_lookup:
+        async with ComprehensiveDefinitionLookup() as definition_lookup, self.create_crawl_engine() as crawl_engine:
             self.definition_lookup = definition_lookup
+            self.crawl_engine = crawl_engine
             
             try:
                 # Continue until limits reached
@@ -878,6 +802,7 @@ class AutonomousVocabularySpider:
                 logger.info("Session interrupted by user")
             except Exception as e:
                 logger.error(f"Session error: {e}")
+        self.crawl_engine = None
         
         # Final session summary
         duration = datetime.now() - session_start
@@ -914,6 +839,146 @@ class AutonomousVocabularySpider:
         
         return summary
 
+@lru_cache(maxsize=65536)
+def _zipf_frequency(term: str) -> float:
+    return wordfreq.zipf_frequency(term, 'en')
+
+def prefilter_candidates(candidates: List[VocabularyCandidate], min_word_length: int,
+                         zipf_threshold: float) -> List[VocabularyCandidate]:
+    """CPU-only candidate filters (POS, length, zipf, English validation) - no database access"""
+    filtered = []
+
+    for candidate in candidates:
+        try:
+            # ENHANCED POS filtering: Exclude problematic classifications
+            if AutonomousVocabularySpider._should_exclude_by_pos(candidate.part_of_speech, candidate.term):
+                continue
+
+            # Check minimum length
+            if len(candidate.term) < min_word_length:
+                continue
+
+            # Check word frequency using wordfreq
+            zipf_score = _zipf_frequency(candidate.term)
+            if zipf_score > zipf_threshold:
+                continue  # Too common
+
+            # ENHANCED: Validate English word with script detection
+            if not AutonomousVocabularySpider._is_english_word_enhanced(candidate.term):
+                continue
+
+            candidate.source_metadata['zipf_score'] = zipf_score
+            filtered.append(candidate)
+
+        except Exception as e:
+            logger.debug(f"Error filtering candidate '{candidate.term}': {e}")
+            continue
+
+    return filtered
+
+def extract_page_text(html: str, source_type: SourceType) -> Optional[str]:
+    """Extract meaningful text content from a fetched page"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Remove script and style elements
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+
+    # Extract text based on source type
+    if source_type == SourceType.WIKIPEDIA:
+        content = soup.find('div', {'id': 'mw-content-text'})
+        if content:
+            # Remove citation boxes, infoboxes, etc.
+            for unwanted in content.find_all(['table', 'div'], class_=['navbox', 'infobox', 'citation']):
+                unwanted.decompose()
+            text = content.get_text()
+        else:
+            text = soup.get_text()
+
+    elif source_type == SourceType.ARXIV:
+        # For ArXiv, focus on abstract and main content
+        abstract = soup.find('blockquote', class_='abstract')
+        if abstract:
+            text = abstract.get_text()
+        else:
+            text = soup.get_text()
+
+    elif source_type == SourceType.GUTENBERG:
+        # For Gutenberg, find the main text content
+        content = soup.find('div', {'id': 'pg-machine-header'})
+        if content and content.find_next('pre'):
+            text = content.find_next('pre').get_text()
+        else:
+            # Try to find main content area
+            main_text = soup.find('pre') or soup.find('div', class_='chapter')
+            if main_text:
+                text = main_text.get_text()
+            else:
+                text = soup.get_text()
+
+    else:
+        text = soup.get_text()
+
+    # Clean up text
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+
+    # Limit text length to prevent memory issues
+    if len(text) > 50000:
+        text = text[:50000]
+
+    return text if len(text) > 100 else None  # Minimum meaningful content
+
+def extract_wikipedia_links(html: str) -> List[str]:
+    """Extract up to 20 random Wikipedia article links from a page"""
+    links = []
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Find main content area
+    content = soup.find('div', {'id': 'mw-content-text'})
+    if not content:
+        return links
+
+    # Extract article links (not external, not files, not special pages)
+    for link in content.find_all('a', href=True):
+        href = link['href']
+        if (href.startswith('/wiki/') and
+            ':' not in href and
+            '#' not in href and
+            not href.startswith('/wiki/File:')):
+            full_url = urljoin('https://en.wikipedia.org', href)
+            links.append(full_url)
+
+    # Limit and randomize
+    random.shuffle(links)
+    return links[:20]  # Return up to 20 random links
+
+# Loaded once per crawl worker process (spaCy models are expensive to load)
+_page_extractor: Optional[UniversalVocabularyExtractor] = None
+
+def process_spider_page(url: str, html: str, metadata: Dict) -> Dict:
+    """Crawl-engine page processor, run in a worker process.
+
+    Does the CPU-bound part of handling a page - text extraction, link
+    extraction, spaCy candidate extraction and the prefilters - and returns
+    picklable results for the event loop to confirm against the database.
+    """
+    global _page_extractor
+    source_type = SourceType(metadata['source_type'])
+
+    # Wikipedia pages seed the next round of links from the same HTML
+    links = extract_wikipedia_links(html) if source_type == SourceType.WIKIPEDIA else []
+    text = extract_page_text(html, source_type)
+    if not text:
+        return {'has_text': False, 'candidates': [], 'links': links}
+
+    if _page_extractor is None:
+        _page_extractor = UniversalVocabularyExtractor()
+    candidates = _page_extractor.extract_candidates(text, {'source_type': source_type.value, 'url': url})
+    candidates = prefilter_candidates(candidates, metadata['min_word_length'], metadata['zipf_threshold'])
+    return {'has_text': True, 'candidates': candidates, 'links': links}
+
 async def main():
     """Main entry point for autonomous spider"""
     import argparse
@@ -923,6 +988,8 @@ async def main():
     parser.add_argument("--duration", type=int, default=120, help="Max session duration in minutes")
     parser.add_argument("--candidates", type=int, default=500, help="Max total candidates")
     parser.add_argument("--zipf-threshold", type=float, default=2.5, help="Max zipf frequency score")
+    parser.add_argument("--concurrency", type=int, default=8, help="Total concurrent fetches across hosts")
+    parser.add_argument("--host-delay", type=float, default=1.0, help="Min seconds between requests to one host")
     
     args = parser.parse_args()
     
@@ -930,7 +997,9 @@ async def main():
         max_urls_per_source=args.max_urls,
         max_session_duration_minutes=args.duration,
         max_total_candidates=args.candidates,
-        zipf_threshold=args.zipf_threshold
+        zipf_threshold=args.zipf_threshold,
+        rate_limit_delay=args.host_delay,
+        fetch_concurrency=args.concurrency
     )
     
     spider = AutonomousVocabularySpider(config)
@@ -26,6 +26,7 @@ sys.path.insert(0, parent_dir)
 from core.secure_config import get_db_config
 from core.english_word_validator import validate_english_word
 from core.vocabulary_deduplicator import filter_duplicate_candidates
+from core.known_terms import record_known_terms
 from wordfreq import zipf_frequency
 import mysql.connector
 from mysql.connector import Error
@@ -611,6 +612,7 @@ class ProjectGutenbergHarvester:
             if values:
                 cursor.executemany(insert_query, values)
                 conn.commit()
+                record_known_terms(row[0] for row in values)
 
             total_filtered = (
                 dedup_stats['duplicates'] + precheck_rejected + non_english_rejected + frequency_rejected
@@ -4,18 +4,38 @@ Universal Vocabulary Extractor - Extract sophisticated vocabulary from any text
 """
 
 import re
+import time
 import unicodedata
 import logging
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional, Iterable, Iterator, Union
 from collections import Counter
 from dataclasses import dataclass
-import wordfreq
-import nltk
+
+from core.lazy_imports import lazy_import
+
+# Imported on first use so callers that only need VocabularyCandidate stay light.
+wordfreq = lazy_import('wordfreq')
+nltk = lazy_import('nltk')
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Batch extraction defaults
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_CHUNK_CHARS = 100_000  # well under spaCy's 1,000,000 character max_length
+
+# Components skipped in lean mode (the batch default); entity features are
+# then reported empty. The parser stays: it supplies sentences and dep_.
+LEAN_DISABLED_COMPONENTS = ('ner',)
+
+PREFIX_PATTERN = re.compile(r'^(?:un|re|pre|dis|over|under|inter|trans|super|sub|anti|counter|meta|pseudo|proto|quasi)')
+SUFFIX_PATTERN = re.compile(r'(?:tion|sion|ment|ness|ity|ism|ology|ography|able|ible|ous|eous|ious|uous|ent|ant|ive|ary|ory)$')
+UNUSUAL_PHONETICS_PATTERN = re.compile(
+    r'[qx]|ph|gh|sch|tch|dge|ch|sh|th|ough|augh|eigh|tion|sion|eur|eau|ae|oe|ue|gue|que|psy|rhy|rrh',
+    re.IGNORECASE
+)
+
 @dataclass
 class VocabularyCandidate:
     """Structured vocabulary candidate"""
@@ -30,6 +50,18 @@ class VocabularyCandidate:
     source_metadata: Dict
     preliminary_score: float = 0.0
 
+@dataclass
+class ExtractionStats:
+    """Throughput of the most recent extraction call"""
+    documents: int = 0
+    chunks: int = 0
+    tokens: int = 0
+    seconds: float = 0.0
+    
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.seconds if self.seconds > 0 else 0.0
+
 class UniversalVocabularyExtractor:
     """Extract vocabulary candidates from any text source using linguistic analysis"""
     
@@ -106,34 +138,131 @@ class UniversalVocabularyExtractor:
             re.compile(r'^(?:http|www|com|org|net|edu|gov)'),  # URLs
             re.compile(r'[^\w\-\']'),  # Non-word characters (except hyphens and apostrophes)
         ]
+        
+        # Each filter family combined into one alternation so a lemma is
+        # scanned once instead of once per pattern
+        self.interesting_pattern = re.compile(
+            '|'.join(f'(?:{pattern.pattern})' for pattern in self.interesting_patterns.values()),
+            re.IGNORECASE
+        )
+        self.exclusion_pattern = re.compile(
+            '|'.join(f'(?:{pattern.pattern})' for pattern in self.exclusion_patterns)
+        )
+        self.last_stats = ExtractionStats()
     
     def extract_candidates(self, text: str, source_metadata: Dict = None) -> List[VocabularyCandidate]:
         """Extract vocabulary candidates from text"""
         if not text or len(text.strip()) < 50:
             return []
         
+        if self.use_spacy and self.nlp:
+            # Long texts are chunked and streamed through nlp.pipe, keeping NER
+            return self.extract_candidates_batch([text], [source_metadata], lean=False)[0]
+        
         # Clean and normalize text
         text = self._clean_text(text)
         
         candidates = []
         processed_tokens = set()
         
-        if self.use_spacy and self.nlp:
-            candidates = self._extract_with_spacy(text, source_metadata, processed_tokens)
-        else:
-            candidates = self._extract_with_nltk(text, source_metadata, processed_tokens)
+        started = time.perf_counter()
+        candidates = self._extract_with_nltk(text, source_metadata, processed_tokens)
+        self.last_stats = ExtractionStats(1, 1, len(text.split()), time.perf_counter() - started)
         
         # Rank candidates by interestingness
         return self._rank_candidates(candidates)
     
-    def _extract_with_spacy(self, text: str, source_metadata: Dict, processed_tokens: set) -> List[VocabularyCandidate]:
-        """Extract using spaCy for superior linguistic analysis"""
+    def extract_candidates_batch(self, texts: Iterable[str],
+                                 source_metadata: Union[Dict, List[Optional[Dict]], None] = None,
+                                 batch_size: int = DEFAULT_BATCH_SIZE, n_process: int = 1,
+                                 lean: bool = True,
+                                 max_chunk_chars: int = DEFAULT_MAX_CHUNK_CHARS) -> List[List[VocabularyCandidate]]:
+        """
+        Extract candidates from many texts in one spaCy nlp.pipe stream.
+        
+        Texts longer than max_chunk_chars are split on word boundaries and
+        the chunks batched together; candidates are de-duplicated per text.
+        source_metadata is either one dict for every text or one per text.
+        lean (default) skips LEAN_DISABLED_COMPONENTS for throughput, so
+        candidates lose the named-entity bonus; pass lean=False to keep it.
+        Returns one ranked candidate list per input text. Throughput
+        (tokens/sec) is logged and kept in self.last_stats.
+        """
+        texts = list(texts)
+        if source_metadata is None or isinstance(source_metadata, dict):
+            metadata = [source_metadata] * len(texts)
+        else:
+            metadata = list(source_metadata)
+            if len(metadata) != len(texts):
+                raise ValueError("source_metadata must have one entry per text")
+        
+        started = time.perf_counter()
+        stats = ExtractionStats(documents=len(texts))
+        
+        if not (self.use_spacy and self.nlp):
+            results = []
+            for text, meta in zip(texts, metadata):
+                results.append(self.extract_candidates(text, meta))
+                stats.chunks += self.last_stats.chunks
+                stats.tokens += self.last_stats.tokens
+            stats.seconds = time.perf_counter() - started
+            self.last_stats = stats
+            return results
+        
+        candidates: List[List[VocabularyCandidate]] = [[] for _ in texts]
+        processed_tokens: List[Set[str]] = [set() for _ in texts]
+        
+        def chunked_texts() -> Iterator[Tuple[str, int]]:
+            for index, text in enumerate(texts):
+                if not text or len(text.strip()) < 50:
+                    continue
+                for chunk in self._chunk_text(self._clean_text(text), max_chunk_chars):
+                    yield chunk, index
+        
+        disable = [name for name in LEAN_DISABLED_COMPONENTS if lean and name in self.nlp.pipe_names]
+        
+        try:
+            for doc, index in self.nlp.pipe(chunked_texts(), as_tuples=True, batch_size=batch_size,
+                                            n_process=n_process, disable=disable):
+                stats.chunks += 1
+                stats.tokens += len(doc)
+                candidates[index].extend(
+                    self._candidates_from_doc(doc, metadata[index], processed_tokens[index])
+                )
+        except Exception as e:
+            logger.error(f"Error in spaCy extraction: {e}")
+        
+        stats.seconds = time.perf_counter() - started
+        self.last_stats = stats
+        if stats.documents > 1 or stats.chunks > 1:
+            logger.info(f"Extracted {sum(len(c) for c in candidates)} candidates from {stats.documents} texts "
+                        f"({stats.chunks} chunks, {stats.tokens:,} tokens) in {stats.seconds:.1f}s "
+                        f"- {stats.tokens_per_second:,.0f} tokens/sec")
+        
+        # Rank candidates by interestingness
+        return [self._rank_candidates(text_candidates) for text_candidates in candidates]
+    
+    @staticmethod
+    def _chunk_text(text: str, max_chars: int) -> Iterator[str]:
+        """Split cleaned text into pieces of at most max_chars, on spaces where possible"""
+        start = 0
+        while len(text) - start > max_chars:
+            cut = text.rfind(' ', start + 1, start + max_chars + 1)
+            if cut == -1:
+                # No space in range: hard split inside an overlong token
+                yield text[start:start + max_chars]
+                start += max_chars
+                continue
+            yield text[start:cut]
+            start = cut + 1
+        if start < len(text):
+            yield text[start:]
+    
+    def _candidates_from_doc(self, doc, source_metadata: Dict, processed_tokens: set) -> List[VocabularyCandidate]:
+        """Collect candidates from a spaCy Doc"""
         candidates = []
         
         try:
-            # Process text with spaCy
-            doc = self.nlp(text)
-            
             for sent in doc.sents:
                 sentence_text = sent.text.strip()
                 
@@ -147,7 +276,7 @@ class UniversalVocabularyExtractor:
                     lemma = token.lemma_.lower()
                     
                     # Apply exclusion filters
-                    if any(pattern.match(lemma) for pattern in self.exclusion_patterns):
+                    if self.exclusion_pattern.match(lemma):
                         continue
                     
                     # Check if word matches interesting patterns
@@ -194,7 +323,7 @@ class UniversalVocabularyExtractor:
                         continue
                     
                     # Apply exclusion filters
-                    if any(pattern.match(word_lower) for pattern in self.exclusion_patterns):
+                    if self.exclusion_pattern.match(word_lower):
                         continue
                     
                     # Get lemma
@@ -247,9 +376,8 @@ class UniversalVocabularyExtractor:
             return False
         
         # Check morphological patterns
-        for pattern_name, pattern in self.interesting_patterns.items():
-            if pattern.search(lemma):
-                return True
+        if self.interesting_pattern.search(lemma):
+            return True
         
         # Academic/technical vocabulary based on POS and features
         if token.pos_ in ['NOUN', 'VERB', 'ADJ', 'ADV']:
@@ -281,9 +409,8 @@ class UniversalVocabularyExtractor:
             return False
         
         # Check morphological patterns
-        for pattern_name, pattern in self.interesting_patterns.items():
-            if pattern.search(word):
-                return True
+        if self.interesting_pattern.search(word):
+            return True
         
         # POS-based filtering
         interesting_pos = ['NN', 'NNS', 'NNP', 'NNPS', 'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ',
@@ -307,8 +434,8 @@ class UniversalVocabularyExtractor:
         """Extract linguistic features from spaCy token"""
         return {
             'syllable_count': self._estimate_syllables(token.text),
-            'has_prefix': bool(re.match(r'^(?:un|re|pre|dis|over|under|inter|trans|super|sub|anti|counter|meta|pseudo|proto|quasi)', token.lemma_)),
-            'has_suffix': bool(re.search(r'(?:tion|sion|ment|ness|ity|ism|ology|ography|able|ible|ous|eous|ious|uous|ent|ant|ive|ary|ory)$', token.lemma_)),
+            'has_prefix': bool(PREFIX_PATTERN.match(token.lemma_)),
+            'has_suffix': bool(SUFFIX_PATTERN.search(token.lemma_)),
             'capitalized_in_text': token.text[0].isupper(),
             'is_named_entity': token.ent_type_ != '',
             'entity_type': token.ent_type_,
@@ -322,8 +449,8 @@ class UniversalVocabularyExtractor:
         """Extract linguistic features using NLTK"""
         return {
             'syllable_count': self._estimate_syllables(word),
-            'has_prefix': bool(re.match(r'^(?:un|re|pre|dis|over|under|inter|trans|super|sub|anti|counter|meta|pseudo|proto|quasi)', word)),
-            'has_suffix': bool(re.search(r'(?:tion|sion|ment|ness|ity|ism|ology|ography|able|ible|ous|eous|ious|uous|ent|ant|ive|ary|ory)$', word)),
+            'has_prefix': bool(PREFIX_PATTERN.match(word)),
+            'has_suffix': bool(SUFFIX_PATTERN.search(word)),
             'capitalized_in_text': False,  # NLTK doesn't preserve this easily
             'is_named_entity': False,
             'entity_type': '',
@@ -390,12 +517,7 @@ class UniversalVocabularyExtractor:
     
     def _has_unusual_phonetics(self, word: str) -> bool:
         """Check for unusual letter combinations that suggest sophisticated vocabulary"""
-        unusual_patterns = [
-            r'[qx]', r'ph', r'gh', r'sch', r'tch', r'dge', r'ch', r'sh', r'th',
-            r'ough', r'augh', r'eigh', r'tion', r'sion', r'eur', r'eau', 
-            r'ae', r'oe', r'ue', r'gue', r'que', r'psy', r'rhy', r'rrh'
-        ]
-        return any(re.search(pattern, word, re.IGNORECASE) for pattern in unusual_patterns)
+        return bool(UNUSUAL_PHONETICS_PATTERN.search(word))
     
     def _get_wordnet_pos(self, nltk_pos: str) -> str:
         """Convert NLTK POS tag to WordNet POS"""
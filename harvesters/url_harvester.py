@@ -25,10 +25,14 @@ if parent_dir not in sys.path:
 
 from core.secure_config import get_db_config
 from core.comprehensive_definition_lookup import ComprehensiveDefinitionLookup
+from core.known_terms import get_known_terms, record_known_terms
 from harvesters.universal_vocabulary_extractor import UniversalVocabularyExtractor, VocabularyCandidate
 from harvesters.respectful_scraper import RespectfulScraper
-import wordfreq
-import spacy
+from core.lazy_imports import lazy_import
+
+# spaCy takes seconds to import; load it (and wordfreq) when a harvest starts.
+wordfreq = lazy_import('wordfreq')
+spacy = lazy_import('spacy')
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -52,6 +56,7 @@ class URLVocabularyHarvester:
         self.max_depth = max_depth
         self.max_urls = max_urls
         self.db_config = get_db_config()
+        self.known_terms = get_known_terms()
         
         # Initialize components
         self.extractor = UniversalVocabularyExtractor()
@@ -232,6 +237,13 @@ class URLVocabularyHarvester:
     
     async def is_word_already_stored(self, term: str) -> bool:
         """Check if word exists in defined or candidate_words tables"""
+        if self.known_terms is not None:
+            return self.known_terms.contains(term, confirm=self._is_term_in_database)
+        return self._is_term_in_database(term)
+    
+    def _is_term_in_database(self, term: str) -> bool:
+        """Query defined and candidate_words for the lowercased term"""
+        conn = cursor = None
         try:
             conn = mysql.connector.connect(**self.db_config)
             cursor = conn.cursor()
@@ -287,6 +299,7 @@ class URLVocabularyHarvester:
             conn.commit()
             
             stored_count = cursor.rowcount
+            record_known_terms(candidate.term for candidate in candidates)
             logger.info(f"Successfully stored {stored_count} candidates in database")
             return stored_count
             
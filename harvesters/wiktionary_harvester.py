@@ -21,6 +21,7 @@ sys.path.insert(0, parent_dir)
 from core.secure_config import get_db_config
 from core.english_word_validator import validate_english_word
 from core.vocabulary_deduplicator import filter_duplicate_candidates, get_existing_terms
+from core.known_terms import record_known_terms
 from core.comprehensive_definition_lookup import enhance_candidate_with_definitions
 import asyncio
 
@@ -448,6 +449,7 @@ class HarvesterDatabase:
             
             inserted_count = 0
             rejected_count = 0
+            inserted_terms = []
             
             for entry, score in zip(entries, scores):
                 # Validate English word before storing
@@ -508,11 +510,13 @@ class HarvesterDatabase:
                         date.today()
                     ))
                     inserted_count += 1
+                    inserted_terms.append(entry.term)
                 except mysql.connector.IntegrityError:
                     # Duplicate entry, skip
                     continue
             
             conn.commit()
+            record_known_terms(inserted_terms)
             logger.info(f"Successfully inserted {inserted_count} candidate words (rejected {rejected_count} non-English words)")
             return inserted_count
             
@@ -45,6 +45,14 @@ def main():
                        help='Limit the number of rows scanned when filling definitions')
     parser.add_argument('--fill-dry-run', action='store_true',
                        help='Preview definition fixes without modifying the database')
+    parser.add_argument('--fill-pipeline', action='store_true',
+                       help='Stream rows, look up terms concurrently and write in resumable batches')
+    parser.add_argument('--fill-workers', type=int, default=16,
+                       help='Concurrent term lookups in pipeline mode')
+    parser.add_argument('--fill-batch-size', type=int, default=500,
+                       help='Pending updates/inserts per batched write in pipeline mode')
+    parser.add_argument('--fill-restart', action='store_true',
+                       help='Ignore the pipeline checkpoint and start from the first term')
     # Legacy ingestion options (experimental system was moved to abandoned/)
     # Use the current harvesting system instead: gutenberg_harvester.py, wiktionary_harvester.py, etc.
     
@@ -75,15 +83,27 @@ def main():
 
         elif args.fill_missing_definitions:
             import logging
-            from core.definition_filler import fill_missing_definitions
+            from core.definition_filler import (
+                fill_missing_definitions,
+                fill_missing_definitions_pipeline,
+            )
 
             logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
             print("[INFO] Filling missing definitions ...")
-            summary = fill_missing_definitions(
-                limit=args.fill_limit,
-                dry_run=args.fill_dry_run,
-            )
+            if args.fill_pipeline:
+                summary = fill_missing_definitions_pipeline(
+                    limit=args.fill_limit,
+                    dry_run=args.fill_dry_run,
+                    workers=args.fill_workers,
+                    batch_size=args.fill_batch_size,
+                    restart=args.fill_restart,
+                )
+            else:
+                summary = fill_missing_definitions(
+                    limit=args.fill_limit,
+                    dry_run=args.fill_dry_run,
+                )
             print(
                 f"[OK] Looked up {summary.looked_up} terms | "
                 f"Updated {summary.updated} | Inserted {summary.inserted} | "
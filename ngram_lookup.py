@@ -2,6 +2,9 @@
 """
 Look up ngram frequencies for individual terms using the downloaded Google Books data.
 This provides the same results as the ngram.py API but using local data.
+
+When the compact index from scripts/build_ngram_index.py exists (and covers
+the requested years) lookups read it instead of streaming the .gz shards.
 """
 
 import os
@@ -59,8 +62,17 @@ def find_ngram_files():
 
     return files
 
+def open_ngram_index():
+    """Return the compact n-gram index if it has been built, else None."""
+    try:
+        from core.ngram_index import get_ngram_index
+    except ImportError:
+        return None
+    return get_ngram_index()
+
 def lookup_terms(terms: List[str], year_start: int = 1900, year_end: int = 2019,
-                aggregator: str = "mean", alpha: float = 1e-6, verbose: bool = False) -> Dict[str, Optional[float]]:
+                aggregator: str = "mean", alpha: float = 1e-6, verbose: bool = False,
+                use_index: bool = True) -> Dict[str, Optional[float]]:
     """Look up ngram frequencies for the given terms."""
 
     # Load total counts
@@ -75,6 +87,20 @@ def lookup_terms(terms: List[str], year_start: int = 1900, year_end: int = 2019,
     if verbose:
         print(f"Using years {year_start}-{year_end} ({len(valid_years)} years)")
 
+    # Answer from the compact index when available: cost scales with the batch
+    index = open_ngram_index() if use_index else None
+    if index is not None and index.covers(year_start, year_end):
+        if verbose:
+            print(f"Using n-gram index at {index.path}")
+        return index.zipf_scores(
+            terms,
+            year_start=year_start,
+            year_end=year_end,
+            aggregator=aggregator,
+            alpha=alpha,
+            year_totals=year_totals,
+        )
+
     # Find ngram files
     ngram_files = find_ngram_files()
     if not ngram_files:
@@ -215,6 +241,7 @@ def main():
     parser.add_argument("--alpha", type=float, default=1e-6, help="Smoothing parameter")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--format", choices=["simple", "detailed"], default="simple", help="Output format")
+    parser.add_argument("--no-index", action="store_true", help="Stream the .gz shards even if the compact index exists")
 
     args = parser.parse_args()
 
@@ -232,7 +259,8 @@ def main():
         year_end=year_end,
         aggregator=args.agg,
         alpha=args.alpha,
-        verbose=args.verbose
+        verbose=args.verbose,
+        use_index=not args.no_index
     )
 
     # Output results
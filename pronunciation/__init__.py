@@ -6,15 +6,23 @@ This package contains CUDA-accelerated pronunciation processing:
 - CUDA similarity calculator for massive-scale comparisons
 - Pronunciation generator using espeak
 - Performance optimization utilities
+
+Submodules load on first access, so CPU-only tools such as
+``pronunciation.pronunciation_generator`` work without CuPy installed.
 """
 
-from .modern_pronunciation_system import ModernPhoneticProcessor, ModernPronunciationSimilaritySystem
-from .cuda_similarity_calculator import CUDASimilarityCalculator
-from .pronunciation_generator import PronunciationGenerator
+from core.lazy_imports import lazy_exports
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'ModernPhoneticProcessor': '.modern_pronunciation_system',
+    'ModernPronunciationSimilaritySystem': '.modern_pronunciation_system',
+    'CUDASimilarityCalculator': '.cuda_similarity_calculator',
+    'PronunciationGenerator': '.pronunciation_generator',
+})
 
 __all__ = [
     'ModernPhoneticProcessor',
     'ModernPronunciationSimilaritySystem',
     'CUDASimilarityCalculator', 
     'PronunciationGenerator'
-]
\ No newline at end of file
+]
@@ -8,11 +8,8 @@ This module provides phonetic transcription capabilities using:
 """
 
 import mysql.connector
-import pandas as pd
-import numpy as np
 import re
 import logging
-import requests
 import json
 from typing import List, Tuple, Dict, Optional, Set
 from dataclasses import dataclass
@@ -24,6 +21,12 @@ import pickle
 import os
 from urllib.parse import quote
 
+from core.lazy_imports import lazy_import
+
+# Only the CMU dictionary download and the similarity export need these.
+pd = lazy_import("pandas")
+requests = lazy_import("requests")
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -18,6 +18,7 @@ import logging
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from core.config import get_db_config
+from core.pronunciation_batch import AUDIO_FORMATS, DEFAULT_MANIFEST_PATH, AudioJob, BatchAudioGenerator
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -274,8 +275,43 @@ class PronunciationGenerator:
         finally:
             conn.close()
     
-    def generate_batch(self, limit: int = 100, engine: Optional[str] = None):
-        """Generate pronunciations for a batch of words"""
+    def _synthesis_text(self, engine: str, term: str, ipa: Optional[str], arpabet: Optional[str]) -> Optional[str]:
+        """Text handed to the engine, mirroring the generate_with_* methods"""
+        if engine == 'espeak':
+            return f"[[{ipa}]]" if ipa else None
+        if engine == 'pyttsx3':
+            sapi_phonemes = self._arpabet_to_sapi_phonemes(arpabet) if arpabet else None
+            return f'<phoneme ph="{sapi_phonemes}">{term}</phoneme>' if sapi_phonemes else term
+        return term
+
+    def update_database_with_audio_paths(self, rows: List[Tuple[int, Path]]):
+        """Store web paths for many generated files over one connection"""
+        if not rows:
+            return
+        conn = mysql.connector.connect(**self.config)
+        cursor = conn.cursor()
+        
+        try:
+            cursor.executemany(
+                "UPDATE vocab.defined SET wav_url = %s WHERE id = %s",
+                [(f"/pronunciation/{Path(audio_path).name}", word_id) for word_id, audio_path in rows]
+            )
+            conn.commit()
+            logger.info(f"Updated database for {len(rows)} words")
+            
+        except Exception as e:
+            logger.error(f"Error updating database for {len(rows)} words: {e}")
+        finally:
+            conn.close()
+    
+    def generate_batch(self, limit: int = 100, engine: Optional[str] = None,
+                       workers: Optional[int] = None, audio_format: str = "wav",
+                       manifest_path: Path = DEFAULT_MANIFEST_PATH):
+        """Generate pronunciations for a batch of words on a process pool.
+
+        Words already recorded in the manifest with an unchanged synthesis key
+        are skipped, so an interrupted run resumes where it stopped.
+        """
         if not self.available_engines:
             logger.error("No TTS engines available. Please install eSpeak-NG, pyttsx3, or Festival.")
             return
@@ -287,35 +323,32 @@ class PronunciationGenerator:
         words = self.get_words_missing_audio(limit=limit)
         logger.info(f"Processing {len(words)} words missing audio files")
         
-        success_count = 0
-        
+        jobs = []
         for word_id, term, ipa, arpabet, stress, syllables in words:
-            try:
-                audio_path = None
-                
-                if selected_engine == 'espeak' and ipa:
-                    audio_path = self.generate_with_espeak(term, ipa, word_id)
-                elif selected_engine == 'pyttsx3':
-                    audio_path = self.generate_with_pyttsx3(term, word_id, arpabet)
-                elif selected_engine == 'festival':
-                    audio_path = self.generate_with_festival(term, word_id)
-                
-                if audio_path:
-                    self.update_database_with_audio_path(word_id, audio_path)
-                    success_count += 1
-                
-                # Progress update
-                if (success_count + 1) % 10 == 0:
-                    logger.info(f"Processed {success_count + 1}/{len(words)} words...")
-                    
-            except KeyboardInterrupt:
-                logger.info("Process interrupted by user")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error processing {term}: {e}")
-                continue
+            text = self._synthesis_text(selected_engine, term, ipa, arpabet)
+            if text:
+                jobs.append(AudioJob(word_id, term, text))
+        
+        batch = BatchAudioGenerator(self.output_dir, selected_engine, audio_format=audio_format,
+                                    workers=workers, manifest_path=manifest_path)
+        completed: List[Tuple[int, Path]] = []
+        
+        def on_result(word_id: int, audio_path: Path):
+            completed.append((word_id, audio_path))
+            if len(completed) >= 500:
+                self.update_database_with_audio_paths(completed)
+                completed.clear()
+        
+        try:
+            stats = batch.run(jobs, on_result)
+        except KeyboardInterrupt:
+            logger.info("Process interrupted by user; rerun to resume from the manifest")
+            return
+        finally:
+            self.update_database_with_audio_paths(completed)
         
-        logger.info(f"Completed: {success_count}/{len(words)} pronunciations generated successfully")
+        generated = stats.rendered + stats.linked + stats.skipped
+        logger.info(f"Completed: {generated}/{len(words)} pronunciations generated successfully")
 
 def main():
     import argparse
@@ -326,11 +359,18 @@ def main():
                        help="TTS engine to use (auto-detect if not specified)")
     parser.add_argument("--output-dir", default="pronunciation_files",
                        help="Directory to store generated audio files")
+    parser.add_argument("--workers", type=int,
+                       help="Synthesis processes (default: one per CPU core)")
+    parser.add_argument("--format", dest="audio_format", choices=sorted(AUDIO_FORMATS), default="wav",
+                       help="Output format; mp3/ogg are transcoded with ffmpeg (default: wav)")
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST_PATH,
+                       help="Resumable record of generated files")
     
     args = parser.parse_args()
     
     generator = PronunciationGenerator(output_dir=args.output_dir)
-    generator.generate_batch(limit=args.limit, engine=args.engine)
+    generator.generate_batch(limit=args.limit, engine=args.engine, workers=args.workers,
+                             audio_format=args.audio_format, manifest_path=args.manifest)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,269 +6,383 @@ This script processes all the googlebooks-eng-all-1gram-*.gz files and creates
 a comprehensive index of word frequencies, including even the rarest words.
 
 OPTIMIZATIONS:
-- Uses disk-based sorting with temporary files to handle millions of words
-- Processes files alphabetically so same words are grouped together
-- Merges partial results incrementally to keep memory usage low
+- Shards are processed in parallel by a process pool
+- Each worker spills sorted runs to disk whenever its share of the memory
+  budget fills up, so no shard is ever held in memory whole
+- Finished shards are checkpointed in the work directory; a restarted build
+  skips them
+- The merge is split into key ranges (chosen from keys sampled while the runs
+  were written) that are merged in parallel, each producing frequency-sorted
+  runs for the final streaming merge
+
+Counts are summed over the same year window as core.ngram_index
+(--year-min/--year-max, 1800-2019 by default), so getngrams.py and
+NgramIndex.total_zipf_scores score terms against the same corpus.
 """
 
+import bisect
 import gzip
-import sys
-import tempfile
 import heapq
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Tuple, TextIO
+from typing import Dict, Iterator, List, Optional, Tuple
 
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
 
-def process_single_file(
-    ngram_file: Path,
-    temp_dir: Path,
-    file_num: int,
-    total_files: int
-) -> Path:
+from core.ngram_index import DEFAULT_YEAR_MAX, DEFAULT_YEAR_MIN
+
+# Rough cost of one word -> count dict entry (key object, int, hash slot)
+BYTES_PER_ENTRY = 160
+# Record a (word, byte offset) seek point every this many lines of a run,
+# but at least SAMPLES_PER_RUN per run so small runs still split evenly
+SAMPLE_EVERY = 4096
+SAMPLES_PER_RUN = 256
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def parse_ngram_line(
+    line: str,
+    year_min: int = DEFAULT_YEAR_MIN,
+    year_max: int = DEFAULT_YEAR_MAX
+) -> Optional[Tuple[str, int]]:
     """
-    Process a single ngram .gz file and write sorted word frequencies to a temp file.
+    Parse one n-gram line into (lowercased word, match count within the years).
 
-    Args:
-        ngram_file: Path to the .gz file to process
-        temp_dir: Directory for temporary files
-        file_num: Current file number (for progress)
-        total_files: Total number of files
+    Handles both formats:
+    Version 2: word TAB year TAB match_count TAB volume_count
+    Version 3: word TAB year,match_count,volume_count TAB year,match_count,volume_count ...
+
+    Years outside year_min..year_max are not counted.
 
     Returns:
-        Path to temporary output file containing sorted word frequencies
+        (word, count) or None for blank/malformed lines and zero counts
     """
-    print(f"[{file_num}/{total_files}] Processing: {ngram_file.name}")
+    parts = line.strip().split('\t')
+    if len(parts) < 2:
+        return None
 
-    # Accumulate frequencies for this file
-    word_freqs: Dict[str, int] = {}
-    lines_processed = 0
+    word = parts[0].strip().lower()
+    if not word:
+        return None
 
-    try:
-        with gzip.open(ngram_file, 'rt', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                lines_processed += 1
-
-                if lines_processed % 5000000 == 0:
-                    print(f"  {lines_processed:,} lines, {len(word_freqs):,} unique words in this file")
-
-                # Parse different formats:
-                # Version 2: word TAB year TAB match_count TAB volume_count
-                # Version 3: word TAB year,match_count,volume_count TAB year,match_count,volume_count ...
-                parts = line.strip().split('\t')
-                if len(parts) < 2:
-                    continue
-
-                word = parts[0].strip().lower()
-                if not word:
-                    continue
-
-                # Try Version 3 format first (year,match,volume)
-                total_count = 0
-                is_version3 = False
-
-                for i in range(1, len(parts)):
-                    if ',' in parts[i]:
-                        # Version 3 format: year,match_count,volume_count
-                        is_version3 = True
-                        try:
-                            year_data = parts[i].split(',')
-                            if len(year_data) >= 2:
-                                match_count = int(year_data[1])
-                                total_count += match_count
-                        except (ValueError, IndexError):
-                            continue
-
-                # If not Version 3, try Version 2 format
-                if not is_version3 and len(parts) >= 3:
-                    try:
-                        count = int(parts[2])
-                        total_count = count
-                    except (ValueError, IndexError):
-                        continue
-
-                if total_count > 0:
-                    # Accumulate counts for this word
-                    word_freqs[word] = word_freqs.get(word, 0) + total_count
-
-        print(f"  Completed: {lines_processed:,} lines, {len(word_freqs):,} unique words")
-
-        # Sort by word (alphabetically) and write to temp file
-        temp_file = temp_dir / f"partial_{file_num:03d}.txt"
-        print(f"  Writing sorted results to {temp_file.name}")
-
-        with open(temp_file, 'w', encoding='utf-8') as out:
-            for word in sorted(word_freqs.keys()):
-                out.write(f"{word}\t{word_freqs[word]}\n")
-
-        print(f"  Temp file created: {temp_file.name}")
-        print()
-
-        return temp_file
-
-    except Exception as e:
-        print(f"  ERROR: {e}")
-        print()
+    # Try Version 3 format first (year,match,volume)
+    total_count = 0
+    is_version3 = False
+
+    for i in range(1, len(parts)):
+        if ',' in parts[i]:
+            is_version3 = True
+            try:
+                year_data = parts[i].split(',')
+                if len(year_data) >= 2 and year_min <= int(year_data[0]) <= year_max:
+                    total_count += int(year_data[1])
+            except (ValueError, IndexError):
+                continue
+
+    # If not Version 3, try Version 2 format
+    if not is_version3 and len(parts) >= 3:
+        try:
+            if not year_min <= int(parts[1]) <= year_max:
+                return None
+            total_count = int(parts[2])
+        except (ValueError, IndexError):
+            return None
+
+    if total_count <= 0:
         return None
+    return word, total_count
 
 
-def merge_sorted_files(
-    temp_files: List[Path],
-    output_file: Path,
-    min_frequency: int = 1
-) -> None:
+def write_sorted_run(word_freqs: Dict[str, int], run_path: Path) -> Dict:
     """
-    Merge multiple sorted temporary files into final output using heap merge.
+    Write a word -> count dict to run_path sorted by word.
 
-    This is memory-efficient as it only keeps one line per file in memory.
+    A seek point is recorded every few thousand lines so the merge can start
+    reading the run at any key range without scanning it from the top.
 
-    Args:
-        temp_files: List of sorted temporary files to merge
-        output_file: Final output file
-        min_frequency: Minimum frequency threshold
+    Returns:
+        Run descriptor {"path", "words", "samples": [[word, byte_offset], ...]}
     """
-    print(f"Merging {len(temp_files)} temporary files...")
-    print(f"Output: {output_file}")
-    print()
+    samples = []
+    offset = 0
+    sample_every = max(1, min(SAMPLE_EVERY, len(word_freqs) // SAMPLES_PER_RUN))
+    with open(run_path, 'wb') as out:
+        for i, word in enumerate(sorted(word_freqs)):
+            if i % sample_every == 0:
+                samples.append([word, offset])
+            line = f"{word}\t{word_freqs[word]}\n".encode('utf-8')
+            out.write(line)
+            offset += len(line)
 
-    # Open all temp files
-    file_handles: List[TextIO] = []
-    for tf in temp_files:
-        if tf and tf.exists():
-            file_handles.append(open(tf, 'r', encoding='utf-8'))
-
-    if not file_handles:
-        print("ERROR: No temp files to merge!")
-        return
-
-    # Initialize heap with first line from each file
-    # Heap entries: (word, count, file_index)
-    heap: List[Tuple[str, int, int]] = []
-
-    for i, fh in enumerate(file_handles):
-        line = fh.readline()
-        if line:
-            parts = line.strip().split('\t')
-            if len(parts) == 2:
-                word = parts[0]
-                count = int(parts[1])
-                heapq.heappush(heap, (word, count, i))
-
-    # Merge sorted streams
-    current_word = None
-    current_count = 0
-    words_written = 0
+    return {"path": str(run_path), "words": len(word_freqs), "samples": samples}
 
-    with open(output_file, 'w', encoding='utf-8') as out:
-        while heap:
-            # Get smallest word from heap
-            word, count, file_idx = heapq.heappop(heap)
-
-            # If same word as current, accumulate count
-            if word == current_word:
-                current_count += count
-            else:
-                # Write previous word if it meets threshold
-                if current_word is not None and current_count >= min_frequency:
-                    out.write(f"{current_word}\t{current_count}\n")
-                    words_written += 1
-
-                    if words_written % 100000 == 0:
-                        print(f"  Merged {words_written:,} words so far...")
-
-                # Start new word
-                current_word = word
-                current_count = count
-
-            # Read next line from same file
-            line = file_handles[file_idx].readline()
-            if line:
-                parts = line.strip().split('\t')
-                if len(parts) == 2:
-                    next_word = parts[0]
-                    next_count = int(parts[1])
-                    heapq.heappush(heap, (next_word, next_count, file_idx))
-
-        # Write final word
-        if current_word is not None and current_count >= min_frequency:
-            out.write(f"{current_word}\t{current_count}\n")
-            words_written += 1
 
-    # Close all file handles
-    for fh in file_handles:
-        fh.close()
+def process_shard(
+    ngram_file: Path,
+    run_dir: Path,
+    max_entries: int,
+    year_min: int = DEFAULT_YEAR_MIN,
+    year_max: int = DEFAULT_YEAR_MAX
+) -> Dict:
+    """
+    Stream one ngram .gz file into sorted runs of at most max_entries words.
 
-    print(f"Merge complete! {words_written:,} words written to {output_file}")
-    print()
+    Runs in a worker process. Whenever the in-memory dict reaches max_entries
+    it is written out as a sorted run and cleared.
+
+    Returns:
+        Shard descriptor with the run list, suitable for the checkpoint
+    """
+    start = time.time()
+    word_freqs: Dict[str, int] = {}
+    runs: List[Dict] = []
+    lines_processed = 0
+    stem = ngram_file.name.replace('.gz', '')
+
+    with gzip.open(ngram_file, 'rt', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            lines_processed += 1
+            parsed = parse_ngram_line(line, year_min, year_max)
+            if parsed is None:
+                continue
+
+            word, count = parsed
+            word_freqs[word] = word_freqs.get(word, 0) + count
+
+            if len(word_freqs) >= max_entries:
+                runs.append(write_sorted_run(word_freqs, run_dir / f"{stem}.run{len(runs):03d}"))
+                word_freqs.clear()
+
+    if word_freqs or not runs:
+        runs.append(write_sorted_run(word_freqs, run_dir / f"{stem}.run{len(runs):03d}"))
+
+    stat = ngram_file.stat()
+    return {
+        "name": ngram_file.name,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "lines": lines_processed,
+        "years": [year_min, year_max],
+        "runs": runs,
+        "seconds": round(time.time() - start, 1),
+    }
+
+
+def load_checkpoint(work_dir: Path) -> Dict[str, Dict]:
+    """Load completed shard descriptors from the work directory."""
+    path = work_dir / CHECKPOINT_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("shards", {})
+    except (OSError, ValueError):
+        print(f"WARNING: Ignoring unreadable checkpoint {path}")
+        return {}
+
+
+def save_checkpoint(work_dir: Path, shards: Dict[str, Dict]) -> None:
+    """Atomically rewrite the checkpoint with the completed shards."""
+    path = work_dir / CHECKPOINT_FILE
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"shards": shards}, f)
+    os.replace(tmp_path, path)
 
 
-def sort_output_by_frequency(input_file: Path, output_file: Path) -> None:
+def is_shard_done(
+    ngram_file: Path,
+    entry: Optional[Dict],
+    year_min: int = DEFAULT_YEAR_MIN,
+    year_max: int = DEFAULT_YEAR_MAX
+) -> bool:
+    """A checkpointed shard is reused only if its source, years and runs are unchanged."""
+    if not entry or entry.get("years") != [year_min, year_max]:
+        return False
+    stat = ngram_file.stat()
+    if entry.get("size") != stat.st_size or entry.get("mtime") != stat.st_mtime:
+        return False
+    return all(Path(run["path"]).exists() for run in entry.get("runs", []))
+
+
+def choose_key_ranges(runs: List[Dict], partitions: int) -> List[Tuple[Optional[str], Optional[str]]]:
     """
-    Sort the merged output by frequency (descending) instead of alphabetically.
+    Split the key space into contiguous [low, high) ranges of similar size.
 
-    Args:
-        input_file: Alphabetically sorted file
-        output_file: Frequency-sorted output file
+    Boundaries are quantiles of the seek-point samples, which are spread
+    evenly through every run.
     """
-    print("Sorting by frequency (descending)...")
-    print(f"Reading from: {input_file}")
-    print(f"Writing to: {output_file}")
+    keys = sorted(word for run in runs for word, _ in run["samples"])
+    if partitions <= 1 or len(keys) < partitions:
+        return [(None, None)]
+
+    boundaries = []
+    for i in range(1, partitions):
+        key = keys[i * len(keys) // partitions]
+        if not boundaries or key > boundaries[-1]:
+            boundaries.append(key)
+
+    lows = [None] + boundaries
+    highs = boundaries + [None]
+    return list(zip(lows, highs))
+
+
+def iter_run_range(run: Dict, low: Optional[str], high: Optional[str]) -> Iterator[Tuple[str, int]]:
+    """Yield (word, count) from a sorted run for low <= word < high."""
+    start_offset = 0
+    if low is not None:
+        sample_words = [word for word, _ in run["samples"]]
+        i = bisect.bisect_left(sample_words, low) - 1
+        if i >= 0:
+            start_offset = run["samples"][i][1]
+
+    with open(run["path"], 'rb') as f:
+        f.seek(start_offset)
+        for raw in f:
+            word, _, count = raw.decode('utf-8').rstrip('\n').partition('\t')
+            if low is not None and word < low:
+                continue
+            if high is not None and word >= high:
+                break
+            yield word, int(count)
+
+
+def write_frequency_run(entries: List[Tuple[int, str]], run_path: Path) -> Path:
+    """Write (count, word) entries sorted by count then word, both descending."""
+    entries.sort(reverse=True)
+    with open(run_path, 'w', encoding='utf-8') as out:
+        for count, word in entries:
+            out.write(f"{word}\t{count}\n")
+    return run_path
 
-    # Read all words and frequencies
-    word_freqs: List[Tuple[int, str]] = []
 
-    with open(input_file, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f):
-            if i % 100000 == 0 and i > 0:
-                print(f"  Read {i:,} words...")
+def merge_key_range(
+    runs: List[Dict],
+    low: Optional[str],
+    high: Optional[str],
+    output_prefix: Path,
+    min_frequency: int,
+    max_entries: int
+) -> Tuple[int, List[str]]:
+    """
+    Heap-merge every run over one key range, summing counts per word.
 
-            parts = line.strip().split('\t')
-            if len(parts) == 2:
-                word = parts[0]
-                count = int(parts[1])
-                word_freqs.append((count, word))
+    Runs in a worker process. Merged words meeting min_frequency are buffered
+    and spilled as frequency-sorted runs of at most max_entries words.
 
-    print(f"Total words read: {len(word_freqs):,}")
-    print("Sorting...")
+    Returns:
+        (words written, frequency run paths)
+    """
+    streams = [iter_run_range(run, low, high) for run in runs]
+    buffer: List[Tuple[int, str]] = []
+    freq_runs: List[str] = []
+    words_written = 0
 
-    # Sort by frequency (descending), then alphabetically for ties
-    word_freqs.sort(reverse=True, key=lambda x: (x[0], x[1]))
+    def spill():
+        path = output_prefix.with_name(f"{output_prefix.name}.freq{len(freq_runs):03d}")
+        freq_runs.append(str(write_frequency_run(buffer, path)))
+        buffer.clear()
+
+    current_word = None
+    current_count = 0
+    for word, count in heapq.merge(*streams):
+        if word == current_word:
+            current_count += count
+            continue
+        if current_word is not None and current_count >= min_frequency:
+            buffer.append((current_count, current_word))
+            words_written += 1
+            if len(buffer) >= max_entries:
+                spill()
+        current_word, current_count = word, count
+
+    if current_word is not None and current_count >= min_frequency:
+        buffer.append((current_count, current_word))
+        words_written += 1
+    if buffer:
+        spill()
+
+    return words_written, freq_runs
 
-    print("Writing sorted output...")
 
+def iter_frequency_run(path: str) -> Iterator[Tuple[int, str]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            word, _, count = line.rstrip('\n').partition('\t')
+            yield int(count), word
+
+
+def write_frequency_output(freq_runs: List[str], output_file: Path) -> Tuple[int, Optional[Tuple[int, str]], Optional[Tuple[int, str]]]:
+    """
+    Stream-merge frequency runs into the final output (descending frequency).
+
+    Returns:
+        (words written, most common entry, least common entry)
+    """
+    words_written = 0
+    first = last = None
     with open(output_file, 'w', encoding='utf-8') as out:
-        for count, word in word_freqs:
+        for count, word in heapq.merge(*(iter_frequency_run(p) for p in freq_runs), reverse=True):
             out.write(f"{word}\t{count}\n")
+            words_written += 1
+            if first is None:
+                first = (count, word)
+            last = (count, word)
+            if words_written % 1000000 == 0:
+                print(f"  Wrote {words_written:,} words...")
 
-    print(f"Frequency-sorted output written to: {output_file}")
-    if word_freqs:
-        print(f"Most common: {word_freqs[0][1]} ({word_freqs[0][0]:,})")
-        print(f"Least common: {word_freqs[-1][1]} ({word_freqs[-1][0]:,})")
-    else:
-        print("WARNING: No words found in the dataset!")
-    print()
+    return words_written, first, last
 
 
 def build_complete_index(
     ngram_dir: Path,
     output_file: Path,
     min_frequency: int = 1,
-    keep_temp_files: bool = False
+    keep_temp_files: bool = False,
+    workers: Optional[int] = None,
+    memory_mb: int = 2048,
+    work_dir: Optional[Path] = None,
+    max_entries: Optional[int] = None,
+    year_min: int = DEFAULT_YEAR_MIN,
+    year_max: int = DEFAULT_YEAR_MAX
 ) -> None:
     """
-    Build complete word frequency index using disk-based merge sort.
+    Build complete word frequency index using a parallel external merge sort.
 
     Args:
         ngram_dir: Directory containing googlebooks-*.gz files
         output_file: Path to final output file
         min_frequency: Minimum frequency threshold
-        keep_temp_files: Whether to keep temporary files after merging
+        keep_temp_files: Whether to keep the work directory after a successful build
+        workers: Worker processes (default: all cores)
+        memory_mb: Memory budget shared by all workers
+        work_dir: Directory for runs and the checkpoint (default: next to the output)
+        max_entries: Words per worker before spilling a run (default: from memory_mb)
+        year_min: First year counted
+        year_max: Last year counted
     """
+    workers = max(1, workers or os.cpu_count() or 1)
+    # Each worker gets an equal share of the budget for its in-memory dict/buffer
+    if max_entries is None:
+        max_entries = max(10000, memory_mb * 1024 * 1024 // (workers * BYTES_PER_ENTRY))
+    work_dir = (work_dir or output_file.parent / f".{output_file.stem}_build").resolve()
+
     print("=" * 70)
     print("BUILDING COMPLETE N-GRAM FREQUENCY INDEX")
     print("=" * 70)
     print(f"Source directory: {ngram_dir}")
     print(f"Output file: {output_file}")
     print(f"Minimum frequency: {min_frequency}")
+    print(f"Years: {year_min}-{year_max}")
+    print(f"Workers: {workers}, memory budget: {memory_mb} MB ({max_entries:,} words per worker)")
+    print(f"Work directory: {work_dir}")
     print()
 
     # Find all ngram files (supports both Version 2 and Version 3 naming)
@@ -283,47 +397,91 @@ def build_complete_index(
     print(f"Found {len(ngram_files)} ngram files")
     print()
 
-    # Create temp directory
-    with tempfile.TemporaryDirectory(prefix='ngram_build_') as temp_dir_str:
-        temp_dir = Path(temp_dir_str)
-        print(f"Using temporary directory: {temp_dir}")
-        print()
-
-        # Process each file and create sorted temp files
-        print("PHASE 1: Processing individual files...")
-        print("-" * 70)
-        temp_files: List[Path] = []
-
-        for i, ngram_file in enumerate(ngram_files, 1):
-            temp_file = process_single_file(ngram_file, temp_dir, i, len(ngram_files))
-            if temp_file:
-                temp_files.append(temp_file)
-
-        print("PHASE 1 COMPLETE")
-        print(f"Created {len(temp_files)} temporary files")
-        print()
+    run_dir = work_dir / "runs"
+    merge_dir = work_dir / "merge"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    # Process shards in parallel, skipping ones finished by an earlier run
+    print("PHASE 1: Processing shards into sorted runs...")
+    print("-" * 70)
+    checkpoint = load_checkpoint(work_dir)
+    completed = {f.name: checkpoint[f.name] for f in ngram_files if is_shard_done(f, checkpoint.get(f.name), year_min, year_max)}
+    pending = [f for f in ngram_files if f.name not in completed]
+    if completed:
+        print(f"Resuming: {len(completed)} shards already processed, {len(pending)} remaining")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_shard, f, run_dir, max_entries, year_min, year_max): f for f in pending}
+        for future in as_completed(futures):
+            ngram_file = futures[future]
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"  ERROR processing {ngram_file.name}: {e}")
+                continue
+            completed[entry["name"]] = entry
+            save_checkpoint(work_dir, completed)
+            words = sum(run["words"] for run in entry["runs"])
+            print(f"[{len(completed)}/{len(ngram_files)}] {entry['name']}: {entry['lines']:,} lines, "
+                  f"{words:,} words in {len(entry['runs'])} runs ({entry['seconds']}s)")
+
+    if len(completed) < len(ngram_files):
+        print(f"ERROR: {len(ngram_files) - len(completed)} shards failed; re-run to retry them")
+        sys.exit(1)
 
-        # Merge sorted temp files (alphabetically)
-        print("PHASE 2: Merging sorted files...")
-        print("-" * 70)
-        alpha_sorted_file = temp_dir / "merged_alpha_sorted.txt"
-        merge_sorted_files(temp_files, alpha_sorted_file, min_frequency)
+    runs = [run for f in ngram_files for run in completed[f.name]["runs"]]
+    print("PHASE 1 COMPLETE")
+    print(f"{len(runs)} sorted runs")
+    print()
 
-        print("PHASE 2 COMPLETE")
-        print()
+    # Merge key ranges in parallel
+    print("PHASE 2: Merging runs by key range...")
+    print("-" * 70)
+    if merge_dir.exists():
+        shutil.rmtree(merge_dir)
+    merge_dir.mkdir(parents=True)
+
+    ranges = choose_key_ranges(runs, workers * 2)
+    freq_runs: List[str] = []
+    total_words = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(merge_key_range, runs, low, high, merge_dir / f"range{i:04d}",
+                        min_frequency, max_entries)
+            for i, (low, high) in enumerate(ranges)
+        ]
+        for i, future in enumerate(futures):
+            words, range_runs = future.result()
+            total_words += words
+            freq_runs.extend(range_runs)
+            print(f"  Range {i + 1}/{len(ranges)}: {words:,} words")
+
+    print("PHASE 2 COMPLETE")
+    print(f"{total_words:,} words in {len(freq_runs)} frequency runs")
+    print()
 
-        # Sort by frequency
-        print("PHASE 3: Sorting by frequency...")
-        print("-" * 70)
-        sort_output_by_frequency(alpha_sorted_file, output_file)
+    # Final streaming merge by frequency
+    print("PHASE 3: Writing frequency-sorted output...")
+    print("-" * 70)
+    words_written, most_common, least_common = write_frequency_output(freq_runs, output_file)
+    if most_common:
+        print(f"Most common: {most_common[1]} ({most_common[0]:,})")
+        print(f"Least common: {least_common[1]} ({least_common[0]:,})")
+    else:
+        print("WARNING: No words found in the dataset!")
+    print("PHASE 3 COMPLETE")
+    print()
 
-        print("PHASE 3 COMPLETE")
-        print()
+    if keep_temp_files:
+        print(f"Keeping work directory: {work_dir}")
+    else:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
     print("=" * 70)
     print("INDEX BUILD COMPLETE!")
     print("=" * 70)
     print(f"Output file: {output_file}")
+    print(f"Words written: {words_written:,}")
     print(f"File size: {output_file.stat().st_size / (1024*1024):.1f} MB")
     print()
 
@@ -332,7 +490,7 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(
-        description="Build complete N-gram frequency index (memory-efficient)"
+        description="Build complete N-gram frequency index (parallel, memory-bounded)"
     )
     parser.add_argument(
         "--ngram-dir",
@@ -355,7 +513,38 @@ if __name__ == "__main__":
     parser.add_argument(
         "--keep-temp",
         action="store_true",
-        help="Keep temporary files after merging"
+        help="Keep the work directory (runs and checkpoint) after a successful build"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: all cores)"
+    )
+    parser.add_argument(
+        "--memory-mb",
+        type=int,
+        default=2048,
+        help="Memory budget in MB shared by all workers (default: 2048)"
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help="Directory for sorted runs and the resume checkpoint "
+             "(default: .<output>_build next to the output)"
+    )
+    parser.add_argument(
+        "--year-min",
+        type=int,
+        default=DEFAULT_YEAR_MIN,
+        help=f"First year counted (default: {DEFAULT_YEAR_MIN}, as in the n-gram index)"
+    )
+    parser.add_argument(
+        "--year-max",
+        type=int,
+        default=DEFAULT_YEAR_MAX,
+        help=f"Last year counted (default: {DEFAULT_YEAR_MAX}, as in the n-gram index)"
     )
 
     args = parser.parse_args()
@@ -367,5 +556,10 @@ if __name__ == "__main__":
         ngram_dir=args.ngram_dir,
         output_file=args.output,
         min_frequency=args.min_freq,
-        keep_temp_files=args.keep_temp
+        keep_temp_files=args.keep_temp,
+        workers=args.workers,
+        memory_mb=args.memory_mb,
+        work_dir=args.work_dir,
+        year_min=args.year_min,
+        year_max=args.year_max
     )
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Rebuild the shared known-term index.
+
+Snapshots every term in vocab.defined and vocab.candidate_words into the
+Bloom filter + exact set read by the harvesters, the deduplicator and the
+candidate review pages. Harvesters append new terms to the index journal as
+they store them, so this only needs to run occasionally (e.g. nightly) to
+compact the journal and drop deleted terms.
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.known_terms import (
+    DEFAULT_FALSE_POSITIVE_RATE,
+    DEFAULT_KNOWN_TERMS_DIR,
+    KnownTermIndex,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rebuild the known-term Bloom filter and exact set from the database'
+    )
+    parser.add_argument(
+        '--output',
+        default=str(DEFAULT_KNOWN_TERMS_DIR),
+        help='Index directory (shared by all harvester processes)'
+    )
+    parser.add_argument(
+        '--false-positive-rate',
+        type=float,
+        default=DEFAULT_FALSE_POSITIVE_RATE,
+        help=f'Target Bloom filter false positive rate (default: {DEFAULT_FALSE_POSITIVE_RATE})'
+    )
+    parser.add_argument(
+        '--silent',
+        action='store_true',
+        help='Minimal output (for cron jobs)'
+    )
+
+    args = parser.parse_args()
+
+    if args.silent:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    start_time = datetime.now()
+
+    try:
+        output = KnownTermIndex.build_from_database(args.output, args.false_positive_rate)
+        index = KnownTermIndex.open(output)
+    except Exception as e:
+        logger.error(f"Error building known-term index: {e}", exc_info=not args.silent)
+        return 1
+
+    duration = (datetime.now() - start_time).total_seconds()
+    filter_kb = len(index.bloom.bits) / 1024
+    summary = f"{len(index):,} terms, {filter_kb:.0f} KiB filter, generation {index.generation}"
+
+    if args.silent:
+        print(f"✓ Known-term index written: {summary}, {duration:.1f}s")
+    else:
+        logger.info(f"Index written to {output}")
+        logger.info(f"{summary} in {duration:.1f} seconds")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+        sys.exit(1)
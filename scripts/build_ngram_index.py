@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Build the compact Google Books n-gram index.
+
+Reads the downloaded 1-gram shards once and writes a sorted term dictionary
+plus per-year count series as memory-mapped arrays. ngram_lookup.lookup_terms
+and maintain_rarity.py then score terms without decompressing any shard.
+Re-run after downloading new shards.
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.ngram_index import (
+    DEFAULT_INDEX_DIR,
+    DEFAULT_NGRAM_DIR,
+    DEFAULT_TOTAL_COUNTS,
+    DEFAULT_YEAR_MAX,
+    DEFAULT_YEAR_MIN,
+    NgramIndex,
+    build_index,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build the memory-mapped n-gram index used for frequency lookups'
+    )
+    parser.add_argument(
+        '--ngram-dir',
+        default=str(DEFAULT_NGRAM_DIR),
+        help='Directory containing googlebooks-eng-*.gz shards'
+    )
+    parser.add_argument(
+        '--total-counts',
+        default=str(DEFAULT_TOTAL_COUNTS),
+        help='Google Books total_counts file (per-year corpus sizes)'
+    )
+    parser.add_argument(
+        '--output',
+        default=str(DEFAULT_INDEX_DIR),
+        help='Index directory to write (replaced atomically)'
+    )
+    parser.add_argument(
+        '--year-min',
+        type=int,
+        default=DEFAULT_YEAR_MIN,
+        help=f'First year kept in the series (default: {DEFAULT_YEAR_MIN})'
+    )
+    parser.add_argument(
+        '--year-max',
+        type=int,
+        default=DEFAULT_YEAR_MAX,
+        help=f'Last year kept in the series (default: {DEFAULT_YEAR_MAX})'
+    )
+    parser.add_argument(
+        '--silent',
+        action='store_true',
+        help='Minimal output (for cron jobs)'
+    )
+
+    args = parser.parse_args()
+
+    if args.silent:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    start_time = datetime.now()
+
+    try:
+        output = build_index(
+            ngram_dir=args.ngram_dir,
+            total_counts_path=args.total_counts,
+            output_dir=args.output,
+            year_min=args.year_min,
+            year_max=args.year_max,
+        )
+        index = NgramIndex.open(output)
+    except Exception as e:
+        logger.error(f"Error building n-gram index: {e}", exc_info=not args.silent)
+        return 1
+
+    duration = (datetime.now() - start_time).total_seconds()
+    size_mb = sum(p.stat().st_size for p in Path(output).iterdir()) / (1024 * 1024)
+    summary = f"{len(index):,} terms, {index.year_min}-{index.year_max}, {size_mb:.1f} MB"
+
+    if args.silent:
+        print(f"✓ N-gram index written: {summary}, {duration:.1f}s")
+    else:
+        logger.info(f"Index written to {output}")
+        logger.info(f"{summary} in {duration:.1f} seconds")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+        sys.exit(1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Build the in-memory word graph snapshot.
+
+Loads the semantic and phonetic similarity edge lists into CSR arrays and writes
+them, with node metadata, to a snapshot file the web app loads at startup.
+Run after similarity maintenance so the graph reflects the latest edges.
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.word_graph import DEFAULT_EMBEDDING_MODEL, DEFAULT_SNAPSHOT_PATH, WordGraph
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build the word graph snapshot used by the visualisation endpoints'
+    )
+    parser.add_argument(
+        '--output',
+        default=str(DEFAULT_SNAPSHOT_PATH),
+        help=f'Snapshot file to write (default: {DEFAULT_SNAPSHOT_PATH.name})'
+    )
+    parser.add_argument(
+        '--model',
+        default=DEFAULT_EMBEDDING_MODEL,
+        help='Embedding model whose semantic edges are loaded'
+    )
+    parser.add_argument(
+        '--semantic-floor',
+        type=float,
+        default=0.0,
+        help='Drop semantic edges below this cosine similarity (default: keep all)'
+    )
+    parser.add_argument(
+        '--phonetic-floor',
+        type=float,
+        default=0.0,
+        help='Drop phonetic edges below this similarity (default: keep all)'
+    )
+    parser.add_argument(
+        '--skip-phonetic',
+        action='store_true',
+        help='Only load semantic edges'
+    )
+    parser.add_argument(
+        '--silent',
+        action='store_true',
+        help='Minimal output (for cron jobs)'
+    )
+
+    args = parser.parse_args()
+
+    if args.silent:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    start_time = datetime.now()
+
+    try:
+        graph = WordGraph.load_from_database(
+            embedding_model=args.model,
+            semantic_floor=args.semantic_floor,
+            phonetic_floor=args.phonetic_floor,
+            include_phonetic=not args.skip_phonetic,
+        )
+        output = graph.save(args.output)
+    except Exception as e:
+        logger.error(f"Error building word graph snapshot: {e}", exc_info=not args.silent)
+        return 1
+
+    duration = (datetime.now() - start_time).total_seconds()
+    summary = (
+        f"{graph.node_count:,} nodes, {graph.edge_count('semantic'):,} semantic edges, "
+        f"{graph.edge_count('phonetic'):,} phonetic edges"
+    )
+
+    if args.silent:
+        print(f"✓ Word graph snapshot written: {summary}, {duration:.1f}s")
+    else:
+        logger.info(f"Snapshot written to {output}")
+        logger.info(f"{summary} in {duration:.1f} seconds")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+        sys.exit(1)
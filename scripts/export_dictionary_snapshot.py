@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Export the read-only dictionary snapshot.
+
+Copies the words, rarity ranks and nearest neighbours the public pages show
+into a SQLite file. Web app replicas started with DICTIONARY_SNAPSHOT pointing
+at it serve those pages without querying PostgreSQL. Run after the rarity and
+similarity maintenance so the snapshot reflects the latest data.
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.dictionary_snapshot import DEFAULT_NEIGHBOURS, DEFAULT_SNAPSHOT_PATH, export_snapshot
+from core.word_graph import DEFAULT_EMBEDDING_MODEL
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export the SQLite snapshot used to serve the public dictionary pages'
+    )
+    parser.add_argument(
+        '--output',
+        default=str(DEFAULT_SNAPSHOT_PATH),
+        help=f'Snapshot file to write (default: {DEFAULT_SNAPSHOT_PATH.name})'
+    )
+    parser.add_argument(
+        '--model',
+        default=DEFAULT_EMBEDDING_MODEL,
+        help='Embedding model whose similarity neighbours are exported'
+    )
+    parser.add_argument(
+        '--neighbours',
+        type=int,
+        default=DEFAULT_NEIGHBOURS,
+        help=f'Most similar words kept per word (default: {DEFAULT_NEIGHBOURS})'
+    )
+    parser.add_argument(
+        '--silent',
+        action='store_true',
+        help='Minimal output (for cron jobs)'
+    )
+
+    args = parser.parse_args()
+
+    if args.silent:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    start_time = datetime.now()
+
+    try:
+        from core.database_manager import db_manager
+
+        with db_manager.get_connection() as conn:
+            counts = export_snapshot(
+                conn,
+                args.output,
+                embedding_model=args.model,
+                neighbours=args.neighbours,
+            )
+    except Exception as e:
+        logger.error(f"Error exporting dictionary snapshot: {e}", exc_info=not args.silent)
+        return 1
+
+    duration = (datetime.now() - start_time).total_seconds()
+    summary = f"{counts['words']:,} words, {counts['neighbours']:,} neighbours"
+
+    if args.silent:
+        print(f"✓ Dictionary snapshot written: {summary}, {duration:.1f}s")
+    else:
+        logger.info(f"Snapshot written to {args.output}")
+        logger.info(f"{summary} in {duration:.1f} seconds")
+
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        logger.info("\nInterrupted by user")
+        sys.exit(1)
@@ -4,8 +4,11 @@ Comprehensive Rarity Maintenance Script
 
 This script ensures complete and up-to-date rarity data by:
 1. Backfilling missing frequency data (python_wordfreq, ngram_freq, commoncrawl_freq)
-2. Refreshing the word_rarity_metrics materialized view
-3. Updating final_rarity values in the defined table
+2. Updating final_rarity values in the defined table with the incremental
+   rarity engine (core.rarity_engine), which re-ranks only the words whose
+   frequencies changed and writes back only rows whose rarity changed
+3. Falling back to a full recompute (and a word_rarity_metrics materialized
+   view refresh) when the frequency distributions drift beyond --rarity-tolerance
 
 Designed to be run via cron for regular maintenance.
 
@@ -19,9 +22,12 @@ Usage:
     # Skip frequency updates (faster, only refreshes rarity)
     python scripts/maintain_rarity.py --skip-frequency
 
-    # Skip view refresh (only update frequency data)
+    # Skip rarity update (only update frequency data)
     python scripts/maintain_rarity.py --skip-refresh
 
+    # Force a full recompute and materialized view refresh
+    python scripts/maintain_rarity.py --full-refresh
+
     # Silent mode (only errors to stderr, good for cron)
     python scripts/maintain_rarity.py --silent
 
@@ -45,6 +51,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 import psycopg
 from core.config import VocabularyConfig
+from core.ngram_index import get_ngram_index
+from core.rarity_engine import DEFAULT_TOLERANCE, RarityEngine
 
 SENTINEL = -999.0
 TEMP_DIR = PROJECT_ROOT / "temp"
@@ -73,6 +81,8 @@ class MaintenanceStats:
     # Rarity stats
     final_rarity_before: int = 0
     final_rarity_updated: int = 0
+    rarity_mode: str = ""
+    rarity_drift: float = 0.0
 
     view_refreshed: bool = False
 
@@ -103,7 +113,23 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--skip-refresh",
         action="store_true",
-        help="Skip materialized view refresh (only update frequency data)"
+        help="Skip rarity update (only update frequency data)"
+    )
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Recompute rarity for every word and refresh the materialized view"
+    )
+    parser.add_argument(
+        "--rarity-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Distribution drift that triggers a full recompute (default: {DEFAULT_TOLERANCE})"
+    )
+    parser.add_argument(
+        "--rarity-state",
+        default=None,
+        help="Rarity engine state file (default: temp/rarity_state.npz)"
     )
     parser.add_argument(
         "--silent",
@@ -251,6 +277,22 @@ def compute_ngram_scores(terms: List[str]) -> Dict[str, float]:
     if not terms:
         return {}
 
+    # Prefer the compact n-gram index (scripts/build_ngram_index.py). It scores
+    # total counts over the same year window with the same formula as the
+    # getngrams fallback below, so ngram_freq stays on one scale whichever
+    # path fills it.
+    index = get_ngram_index()
+    if index is not None:
+        try:
+            raw_scores = index.total_zipf_scores(terms)
+            scores = {}
+            for normalized in {normalize_term(t) for t in terms}:
+                value = raw_scores.get(normalized)
+                scores[normalized] = float(value) if value is not None else SENTINEL
+            return scores
+        except Exception as e:
+            log(f"Warning: N-gram index lookup failed, falling back: {e}", is_error=True)
+
     # Ensure temp directory exists
     TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -420,27 +462,77 @@ def update_frequencies(
 
     # Apply updates
     if not dry_run:
-        with conn.cursor() as cur:
-            if python_updates:
-                cur.executemany(
-                    "UPDATE vocab.defined SET python_wordfreq = %s WHERE id = %s",
-                    python_updates
-                )
-            if ngram_updates:
-                cur.executemany(
-                    "UPDATE vocab.defined SET ngram_freq = %s WHERE id = %s",
-                    ngram_updates
-                )
-            if commoncrawl_updates:
-                cur.executemany(
-                    "UPDATE vocab.defined SET commoncrawl_freq = %s WHERE id = %s",
-                    commoncrawl_updates
-                )
+        staged = stage_frequency_rows(python_updates, ngram_updates, commoncrawl_updates)
+        changed = bulk_update_frequencies(conn, staged)
         conn.commit()
+        log(f"  Bulk update: {len(staged):,} staged rows, {changed:,} rows changed", silent)
 
     return python_success, python_fail, ngram_success, ngram_fail, commoncrawl_success, commoncrawl_fail
 
 
+def stage_frequency_rows(
+    python_updates: List[tuple],
+    ngram_updates: List[tuple],
+    commoncrawl_updates: List[tuple],
+) -> List[tuple]:
+    """
+    Merge per-column (value, id) updates into (id, python_wordfreq, ngram_freq,
+    commoncrawl_freq) rows. Columns a word does not need stay None.
+    """
+    rows: Dict[int, list] = {}
+    for column, updates in enumerate((python_updates, ngram_updates, commoncrawl_updates), start=1):
+        for value, word_id in updates:
+            row = rows.setdefault(word_id, [word_id, None, None, None])
+            row[column] = value
+    return [tuple(row) for row in rows.values()]
+
+
+def bulk_update_frequencies(conn: psycopg.Connection, rows: List[tuple]) -> int:
+    """
+    Apply staged frequency rows with COPY and a single UPDATE ... FROM.
+
+    Rows are copied into a temporary table and merged in one statement that
+    only touches words whose values actually differ. A None in a staged column
+    leaves that column unchanged.
+
+    Returns:
+        Number of rows in vocab.defined that changed
+    """
+    if not rows:
+        return 0
+
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS frequency_staging (
+                id INTEGER PRIMARY KEY,
+                python_wordfreq REAL,
+                ngram_freq DOUBLE PRECISION,
+                commoncrawl_freq NUMERIC(8, 3)
+            ) ON COMMIT DELETE ROWS
+        """)
+
+        with cur.copy(
+            "COPY frequency_staging (id, python_wordfreq, ngram_freq, commoncrawl_freq) FROM STDIN"
+        ) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+        cur.execute("""
+            UPDATE vocab.defined AS d
+            SET python_wordfreq = COALESCE(s.python_wordfreq, d.python_wordfreq),
+                ngram_freq = COALESCE(s.ngram_freq, d.ngram_freq),
+                commoncrawl_freq = COALESCE(s.commoncrawl_freq, d.commoncrawl_freq)
+            FROM frequency_staging AS s
+            WHERE d.id = s.id
+              AND (
+                  (s.python_wordfreq IS NOT NULL AND d.python_wordfreq IS DISTINCT FROM s.python_wordfreq)
+                  OR (s.ngram_freq IS NOT NULL AND d.ngram_freq IS DISTINCT FROM s.ngram_freq)
+                  OR (s.commoncrawl_freq IS NOT NULL AND d.commoncrawl_freq IS DISTINCT FROM s.commoncrawl_freq)
+              )
+        """)
+        return cur.rowcount
+
+
 def refresh_materialized_view(concurrently: bool = True, silent: bool = False):
     """Refresh the word_rarity_metrics materialized view."""
     refresh_sql = "REFRESH MATERIALIZED VIEW "
@@ -458,23 +550,23 @@ def refresh_materialized_view(concurrently: bool = True, silent: bool = False):
     log("Materialized view refreshed", silent)
 
 
-def update_final_rarity(conn: psycopg.Connection, dry_run: bool = False) -> int:
-    """Update final_rarity from materialized view."""
-    with conn.cursor() as cur:
-        cur.execute("""
-            UPDATE vocab.defined AS d
-            SET final_rarity = wrm.final_rarity
-            FROM vocab.word_rarity_metrics AS wrm
-            WHERE d.id = wrm.id
-              AND d.final_rarity IS NULL
-              AND wrm.final_rarity IS NOT NULL
-        """)
-        updated = cur.rowcount
-
-        if not dry_run:
-            conn.commit()
+def update_final_rarity(
+    conn: psycopg.Connection,
+    engine: RarityEngine,
+    changed_ids: List[int] | None,
+    full_refresh: bool = False,
+    dry_run: bool = False,
+):
+    """Update final_rarity with the rarity engine.
 
-        return updated
+    Only words in ``changed_ids`` (plus words still missing a rarity) are
+    re-ranked unless a full recompute is requested or the distributions have
+    drifted beyond the engine tolerance. ``changed_ids=None`` makes the engine
+    diff every row against its saved state instead.
+    """
+    if full_refresh:
+        return engine.full_recompute(conn, dry_run=dry_run)
+    return engine.incremental_update(conn, word_ids=changed_ids, dry_run=dry_run)
 
 
 def main():
@@ -514,12 +606,17 @@ def main():
                 log(f"  Normal mode: Skipping -999 values (use --force-recheck to recheck)", args.silent)
             log("", args.silent)
 
+            # Words whose frequencies were (re)computed this run
+            changed_ids = None
+
             # Update frequency data
             if not args.skip_frequency:
                 log("Phase 1: Updating frequency data...", args.silent)
                 candidates = fetch_all_frequency_candidates(conn, force_recheck=args.force_recheck)
                 log(f"Found {len(candidates):,} words needing frequency updates", args.silent)
 
+                changed_ids = [c["id"] for c in candidates]
+
                 if candidates:
                     (py_success, py_fail, ng_success, ng_fail,
                      cc_success, cc_fail) = update_frequencies(
@@ -544,26 +641,37 @@ def main():
                 log("Phase 1: Skipped (--skip-frequency)", args.silent)
                 log("", args.silent)
 
-            # Refresh materialized view
-            if not args.skip_refresh and not args.dry_run:
-                log("Phase 2: Refreshing materialized view...", args.silent)
-                refresh_materialized_view(args.concurrently, args.silent)
-                stats.view_refreshed = True
-                log("", args.silent)
-            else:
-                reason = "dry-run" if args.dry_run else "--skip-refresh"
-                log(f"Phase 2: Skipped ({reason})", args.silent)
+            # Update final_rarity
+            if not args.skip_refresh:
+                log("Phase 2: Updating final_rarity values...", args.silent)
+                engine = RarityEngine(
+                    state_path=args.rarity_state,
+                    tolerance=args.rarity_tolerance,
+                )
+                run = update_final_rarity(
+                    conn, engine, changed_ids, args.full_refresh, args.dry_run
+                )
+                stats.final_rarity_updated = run.rows_written
+                stats.rarity_mode = run.mode
+                stats.rarity_drift = run.drift
+                verb = "Would update" if args.dry_run else "Updated"
+                log(f"  Mode: {run.mode} (drift {run.drift:.4f}, tolerance {engine.tolerance})", args.silent)
+                log(f"  Examined {run.rows_examined:,} words, {run.values_changed:,} with changed frequencies", args.silent)
+                log(f"  {verb} {run.rows_written:,} final_rarity values in {run.duration_seconds:.1f}s", args.silent)
                 log("", args.silent)
 
-            # Update final_rarity
-            if not args.dry_run:
-                log("Phase 3: Updating final_rarity values...", args.silent)
-                updated = update_final_rarity(conn, args.dry_run)
-                stats.final_rarity_updated = updated
-                log(f"  Updated {updated:,} final_rarity values", args.silent)
+                # Keep the view's per-source columns in step after a full recompute
+                if run.mode == "full" and not args.dry_run:
+                    log("Phase 3: Refreshing materialized view...", args.silent)
+                    refresh_materialized_view(args.concurrently, args.silent)
+                    stats.view_refreshed = True
+                elif args.dry_run:
+                    log("Phase 3: View refresh skipped (dry-run)", args.silent)
+                else:
+                    log("Phase 3: View refresh skipped (incremental update)", args.silent)
                 log("", args.silent)
             else:
-                log("Phase 3: Skipped (dry-run)", args.silent)
+                log("Phase 2: Skipped (--skip-refresh)", args.silent)
                 log("", args.silent)
 
         stats.end_time = datetime.now()
@@ -584,7 +692,7 @@ def main():
             log(f"\nMaterialized view: Refreshed", args.silent)
 
         if stats.final_rarity_updated > 0:
-            log(f"\nRarity updates: {stats.final_rarity_updated:,} words", args.silent)
+            log(f"\nRarity updates ({stats.rarity_mode}): {stats.final_rarity_updated:,} words", args.silent)
 
         log("", args.silent)
         sys.exit(0)
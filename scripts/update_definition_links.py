@@ -5,65 +5,39 @@ Precompute HTML-linked definitions by inserting anchors for in-vocabulary terms.
 Usage examples:
     python scripts/update_definition_links.py
     python scripts/update_definition_links.py --dry-run --limit 500
+    python scripts/update_definition_links.py --full
 
 The script scans vocab.defined, ensures the `definition_with_links` column exists,
 and stores HTML snippets that the web app can display with `|safe`.
+
+After the first full run a link index is kept on disk (see
+core.definition_linker). Later runs compare terms and definition digests with
+it and relink only new or edited definitions plus the definitions containing
+terms that were added, removed or re-pointed.
 """
 
 from __future__ import annotations
 
 import argparse
-import html
 import logging
-import re
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from core.database_manager import db_manager
+from core.definition_linker import (
+    DEFAULT_LINK_INDEX_PATH,
+    DefinitionLinkIndex,
+    TermKey,
+    TermTrie,
+    VocabularyEntry,
+    build_term_index,
+    link_definition,
+)
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
 
-WORD_PATTERN = re.compile(r"[A-Za-z]+(?:['-][A-Za-z]+)*")
-
-
-def normalize_tokens(value: str) -> Tuple[str, ...]:
-    """Split a term into lowercase word tokens (letters, apostrophes, hyphens)."""
-    if not value:
-        return tuple()
-    return tuple(token.lower() for token in WORD_PATTERN.findall(value))
-
-
-def tokenize_definition(value: str) -> List[Dict[str, str | bool]]:
-    """Return a token stream preserving delimiters for reconstruction."""
-    tokens: List[Dict[str, str | bool]] = []
-    if not value:
-        return tokens
-
-    cursor = 0
-    for match in WORD_PATTERN.finditer(value):
-        start, end = match.span()
-        if start > cursor:
-            tokens.append({"text": value[cursor:start], "is_word": False})
-        tokens.append(
-            {
-                "text": match.group(0),
-                "is_word": True,
-                "word_lower": match.group(0).lower(),
-            }
-        )
-        cursor = end
-
-    if cursor < len(value):
-        tokens.append({"text": value[cursor:], "is_word": False})
-
-    return tokens
-
-
-@dataclass(frozen=True)
-class VocabularyEntry:
-    word_id: int
-    tokens: Tuple[str, ...]
+UPDATE_SQL = "UPDATE vocab.defined SET definition_with_links = %s WHERE id = %s"
 
 
 class DefinitionLinkBuilder:
@@ -77,8 +51,8 @@ class DefinitionLinkBuilder:
     ):
         self.min_term_length = max(1, min_term_length)
         self.max_links_per_definition = max(1, max_links_per_definition)
-        self._first_word_map: Dict[str, List[VocabularyEntry]] = {}
-        self._max_term_words: int = 1
+        self.terms: Dict[TermKey, int] = {}
+        self._trie = TermTrie()
 
     def ensure_column(self) -> None:
         """Ensure destination column exists."""
@@ -90,116 +64,32 @@ class DefinitionLinkBuilder:
                 """
             )
 
-    def load_vocabulary(self) -> None:
-        """Build index of known vocabulary terms."""
-        term_index: Dict[Tuple[str, ...], VocabularyEntry] = {}
-
-        with db_manager.get_cursor() as cursor:
-            cursor.execute("SELECT id, term FROM vocab.defined WHERE term IS NOT NULL")
-            rows = cursor.fetchall()
-
-        for word_id, term in rows:
-            tokens = normalize_tokens(term)
-            if not tokens:
-                continue
-            if all(len(token) < self.min_term_length for token in tokens):
-                continue
-            entry = term_index.get(tokens)
-            if entry is None or word_id < entry.word_id:
-                term_index[tokens] = VocabularyEntry(word_id=word_id, tokens=tokens)
-
-        first_word_map: Dict[str, List[VocabularyEntry]] = {}
-        for entry in term_index.values():
-            first_word_map.setdefault(entry.tokens[0], []).append(entry)
+    def load_vocabulary(self, rows: Optional[Sequence[Tuple[int, str]]] = None) -> None:
+        """Build the term trie from (id, term) rows, read from vocab.defined by default."""
+        if rows is None:
+            with db_manager.get_cursor() as cursor:
+                cursor.execute("SELECT id, term FROM vocab.defined WHERE term IS NOT NULL")
+                rows = cursor.fetchall()
 
-        self._first_word_map = first_word_map
-        self._max_term_words = max((len(entry.tokens) for entry in term_index.values()), default=1)
+        self.terms = build_term_index(rows, self.min_term_length)
+        self._trie = TermTrie(VocabularyEntry(word_id=word_id, tokens=tokens) for tokens, word_id in self.terms.items())
         logger.info(
             "Loaded %s vocabulary keys (%s max words, min token length %s)",
-            f"{len(term_index):,}",
-            self._max_term_words,
+            f"{len(self.terms):,}",
+            max((len(tokens) for tokens in self.terms), default=1),
             self.min_term_length,
         )
 
+    def new_index(self) -> DefinitionLinkIndex:
+        return DefinitionLinkIndex(
+            min_term_length=self.min_term_length,
+            max_links_per_definition=self.max_links_per_definition,
+            terms=self.terms,
+        )
+
     def build_html(self, definition: str) -> Tuple[Optional[str], int]:
         """Return HTML (if links inserted) and number of replacements."""
-        if not definition:
-            return None, 0
-
-        tokens = tokenize_definition(definition)
-        if not tokens:
-            return None, 0
-
-        word_token_indices = [idx for idx, token in enumerate(tokens) if token.get("is_word")]
-        if not word_token_indices:
-            return None, 0
-
-        spans: Dict[int, Tuple[int, str]] = {}
-        replacements = 0
-        word_cursor = 0
-
-        while word_cursor < len(word_token_indices):
-            if replacements >= self.max_links_per_definition:
-                break
-
-            token_index = word_token_indices[word_cursor]
-            token_lower = tokens[token_index]["word_lower"]  # type: ignore[index]
-            candidates = self._first_word_map.get(token_lower)
-            best_match: Optional[VocabularyEntry] = None
-            best_length = 0
-
-            if candidates:
-                for entry in candidates:
-                    term_length = len(entry.tokens)
-                    if term_length > len(word_token_indices) - word_cursor:
-                        continue
-
-                    matches = True
-                    for offset in range(term_length):
-                        compare_token = word_token_indices[word_cursor + offset]
-                        if tokens[compare_token]["word_lower"] != entry.tokens[offset]:
-                            matches = False
-                            break
-
-                    if matches and term_length > best_length:
-                        best_match = entry
-                        best_length = term_length
-
-            if best_match:
-                start_idx = word_token_indices[word_cursor]
-                end_idx = word_token_indices[word_cursor + best_length - 1]
-                matched_text = "".join(tokens[idx]["text"] for idx in range(start_idx, end_idx + 1))
-
-                if matched_text.strip():
-                    anchor = (
-                        f'<a href="/word/{best_match.word_id}" '
-                        f'class="definition-link">{html.escape(matched_text)}</a>'
-                    )
-                    spans[start_idx] = (end_idx, anchor)
-                    replacements += 1
-
-                word_cursor += best_length
-            else:
-                word_cursor += 1
-
-        if not spans:
-            return None, 0
-
-        parts: List[str] = []
-        token_idx = 0
-        while token_idx < len(tokens):
-            span = spans.get(token_idx)
-            if span:
-                end_idx, anchor_html = span
-                parts.append(anchor_html)
-                token_idx = end_idx + 1
-                continue
-
-            token_text = tokens[token_idx]["text"]
-            parts.append(html.escape(token_text))
-            token_idx += 1
-
-        return "".join(parts), replacements
+        return link_definition(definition, self._trie, self.max_links_per_definition)
 
 
 def process_definitions(
@@ -207,6 +97,7 @@ def process_definitions(
     limit: Optional[int],
     dry_run: bool,
     builder: DefinitionLinkBuilder,
+    index: Optional[DefinitionLinkIndex] = None,
 ) -> None:
     """Scan vocab.defined and update linkified definitions."""
     scan_sql = """
@@ -222,6 +113,17 @@ def process_definitions(
         cursor.execute(scan_sql, (limit,) if limit else None)
         rows = cursor.fetchall()
 
+    apply_links(rows, dry_run=dry_run, builder=builder, index=index)
+
+
+def apply_links(
+    rows: Sequence[Tuple[int, str, Optional[str]]],
+    *,
+    dry_run: bool,
+    builder: DefinitionLinkBuilder,
+    index: Optional[DefinitionLinkIndex] = None,
+) -> None:
+    """Relink (id, definition, existing html) rows and write the ones that changed."""
     total = len(rows)
     updated = 0
     total_links = 0
@@ -231,6 +133,8 @@ def process_definitions(
         for idx, (word_id, definition, existing_html) in enumerate(rows, start=1):
             new_html, replacements = builder.build_html(definition)
             total_links += replacements
+            if index is not None:
+                index.record(word_id, definition)
 
             if new_html == existing_html:
                 continue
@@ -242,17 +146,11 @@ def process_definitions(
                 continue
 
             if len(batch) >= 500:
-                cursor.executemany(
-                    "UPDATE vocab.defined SET definition_with_links = %s WHERE id = %s",
-                    batch,
-                )
+                cursor.executemany(UPDATE_SQL, batch)
                 batch.clear()
 
         if not dry_run and batch:
-            cursor.executemany(
-                "UPDATE vocab.defined SET definition_with_links = %s WHERE id = %s",
-                batch,
-            )
+            cursor.executemany(UPDATE_SQL, batch)
 
     logger.info(
         "Processed %s definitions | %s updated | %s links inserted",
@@ -264,6 +162,55 @@ def process_definitions(
         logger.info("Dry run mode: no database changes were committed.")
 
 
+def process_incremental(
+    *,
+    dry_run: bool,
+    builder: DefinitionLinkBuilder,
+    index: DefinitionLinkIndex,
+) -> None:
+    """Relink only definitions affected by term or definition changes since ``index``."""
+    with db_manager.get_cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT id, term, md5(definition)
+            FROM vocab.defined
+            WHERE term IS NOT NULL OR definition IS NOT NULL
+            """
+        )
+        rows = cursor.fetchall()
+
+    builder.load_vocabulary([(word_id, term) for word_id, term, _ in rows if term is not None])
+    digests = {word_id: digest for word_id, _, digest in rows if digest is not None}
+    changed_terms = index.changed_terms(builder.terms)
+    affected, removed = index.affected_definitions(builder.terms, digests)
+    logger.info(
+        "Link index: %s term changes, %s definitions to relink, %s removed",
+        f"{len(changed_terms):,}",
+        f"{len(affected):,}",
+        f"{len(removed):,}",
+    )
+
+    for word_id in removed:
+        index.drop(word_id)
+    index.terms = dict(builder.terms)
+    if not affected:
+        return
+
+    with db_manager.get_cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT id, definition, definition_with_links
+            FROM vocab.defined
+            WHERE id = ANY(%s) AND definition IS NOT NULL
+            ORDER BY id
+            """,
+            (sorted(affected),),
+        )
+        rows = cursor.fetchall()
+
+    apply_links(rows, dry_run=dry_run, builder=builder, index=index)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Link vocabulary terms within stored definitions.")
     parser.add_argument("--dry-run", action="store_true", help="Compute links without updating the database")
@@ -284,6 +231,17 @@ def main() -> None:
         default=25,
         help="Maximum number of anchors to inject into a single definition (default: 25)",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Relink every definition and rebuild the link index instead of updating incrementally",
+    )
+    parser.add_argument(
+        "--index-path",
+        type=Path,
+        default=DEFAULT_LINK_INDEX_PATH,
+        help=f"Link index file for incremental runs (default: {DEFAULT_LINK_INDEX_PATH})",
+    )
     args = parser.parse_args()
 
     builder = DefinitionLinkBuilder(
@@ -291,8 +249,22 @@ def main() -> None:
         max_links_per_definition=args.max_links,
     )
     builder.ensure_column()
-    builder.load_vocabulary()
-    process_definitions(limit=args.limit, dry_run=args.dry_run, builder=builder)
+
+    index = None if args.full or args.limit else DefinitionLinkIndex.load(args.index_path)
+    if index is not None and not index.settings_match(builder.min_term_length, builder.max_links_per_definition):
+        logger.info("Link settings changed since the last run; relinking everything.")
+        index = None
+
+    if index is not None:
+        process_incremental(dry_run=args.dry_run, builder=builder, index=index)
+    else:
+        builder.load_vocabulary()
+        # A --limit run only sees part of the table, so it cannot seed the index.
+        index = None if args.limit else builder.new_index()
+        process_definitions(limit=args.limit, dry_run=args.dry_run, builder=builder, index=index)
+
+    if index is not None and not args.dry_run:
+        index.save(args.index_path)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,20 @@
+// Signing out removes the user's unsent flashcard answers, which the study
+// page keeps in localStorage as 'flashcardStudyQueue:<user_id>:<tab>'.
+// Sign-out links carry the user id as data-user-id.
+document.addEventListener('click', function(event) {
+    const link = event.target.closest && event.target.closest('a[href="/logout"][data-user-id]');
+    if (!link) {
+        return;
+    }
+    const prefix = 'flashcardStudyQueue:' + link.dataset.userId + ':';
+    try {
+        for (let i = localStorage.length - 1; i >= 0; i--) {
+            const key = localStorage.key(i);
+            if (key && key.startsWith(prefix)) {
+                localStorage.removeItem(key);
+            }
+        }
+    } catch (error) {
+        // Storage disabled: nothing was queued
+    }
+});
@@ -81,7 +81,9 @@ def getNgrams(
     Get N-gram Zipf scores for words using pre-computed frequency index.
 
     This implementation uses word_frequencies.txt which contains total counts
-    across all years, so the year parameters are ignored.
+    over the year window it was built with (scripts/build_complete_ngram_index.py,
+    1800-2019 by default, the same window as the n-gram index), so the year
+    parameters are ignored.
 
     Args:
         words: List of words to score
@@ -0,0 +1,140 @@
+"""Tests for the synthetic benchmark corpus and result comparison."""
+
+import numpy as np
+import pytest
+
+from benchmarks.corpus import (
+    COLUMNS,
+    CorpusSpec,
+    SchemaInUse,
+    check_schema_replaceable,
+    generate_corpus,
+    load_corpus,
+    nearest_neighbours,
+)
+from benchmarks.importtime import ImportProfile, parse_importtime
+from benchmarks.runner import ScenarioResult, compare_results, percentile, summarize
+
+SMALL = CorpusSpec(words=300, users=4, quiz_answers=30, embedding_dim=16)
+
+
+def test_corpus_is_deterministic_and_consistent():
+    corpus = generate_corpus(SMALL)
+    assert generate_corpus(SMALL).digest() == corpus.digest()
+    assert generate_corpus(CorpusSpec(words=300, users=4, quiz_answers=30, embedding_dim=16, seed=7)).digest() != corpus.digest()
+    assert CorpusSpec(words=300).fingerprint != CorpusSpec(words=301).fingerprint
+
+    for table, rows in corpus.tables.items():
+        assert all(len(row) == len(COLUMNS[table]) for row in rows), table
+
+    terms = [row[1] for row in corpus.tables["defined"]]
+    assert len(terms) == SMALL.words == len(set(terms))
+    word_ids = {row[0] for row in corpus.tables["defined"]}
+    assert all(w1 < w2 and w1 in word_ids and w2 in word_ids for w1, w2, *_ in corpus.tables["definition_similarity"])
+    assert all(row[2] >= 0.4 for row in corpus.tables["definition_similarity"])
+    assert {row[1] for row in corpus.tables["user_quiz_results"]} <= {row[0] for row in corpus.tables["users"]}
+    # Production-like gaps: some words lack a frequency source entirely.
+    assert any(row[11] is None or row[11] == -999.0 for row in corpus.tables["defined"])
+
+
+def test_nearest_neighbours_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    indices, scores = nearest_neighbours(vectors, 3, block=16)
+
+    sims = vectors @ vectors.T
+    np.fill_diagonal(sims, -np.inf)
+    expected = np.argsort(-sims, axis=1)[:, :3]
+    assert (indices == expected).all()
+    assert np.allclose(scores, np.take_along_axis(sims, expected, axis=1))
+
+
+def test_summary_statistics():
+    assert percentile([4, 1, 3, 2], 0.5) == 2.5
+    result = summarize("search.prefix", "search", [0.001, 0.002, 0.003, 0.004, 0.010])
+    assert (result.iterations, result.p50_ms, result.min_ms, result.max_ms) == (5, 3.0, 1.0, 10.0)
+    assert result.p95_ms == 8.8
+    assert result.mean_ms == 4.0
+
+
+def _report(**p50):
+    return {"scenarios": {name: ScenarioResult(name, name.split(".")[0], p50_ms=ms).__dict__ for name, ms in p50.items()}}
+
+
+def test_compare_flags_regressions_above_threshold_and_noise_floor():
+    base = _report(**{"a.slow": 100.0, "a.fast": 2.0, "a.better": 50.0, "a.gone": 1.0})
+    head = _report(**{"a.slow": 130.0, "a.fast": 2.6, "a.better": 30.0, "a.new": 1.0})
+    head["scenarios"]["a.broken"] = ScenarioResult("a.broken", "a", status="error", detail="boom").__dict__
+    base["scenarios"]["a.broken"] = ScenarioResult("a.broken", "a", p50_ms=5.0).__dict__
+
+    verdicts = {c.name: c.verdict for c in compare_results(base, head, threshold=0.15, min_delta_ms=1.0)}
+    assert verdicts == {
+        "a.slow": "regression",
+        "a.fast": "unchanged",  # +30% but under the 1 ms noise floor
+        "a.better": "improvement",
+        "a.gone": "removed",
+        "a.new": "added",
+        "a.broken": "regression",
+    }
+
+
+def test_parse_importtime_reads_depth_and_totals():
+    stderr = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 | _io",
+        "import time:        40 |         40 |   encodings.aliases",
+        "import time:       300 |        900 |     core.config",
+        "import time:       500 |       1400 | core",
+        "Traceback (most recent call last):",
+    ])
+    records = parse_importtime(stderr)
+    assert [(r.module, r.depth) for r in records] == [("_io", 0), ("encodings.aliases", 1), ("core.config", 2), ("core", 0)]
+
+    profile = ImportProfile(["-c", "import core"], 0, 0.01, records)
+    assert profile.total_us == 1520
+    assert profile.top(1)[0].module == "core"
+    assert profile.top(1, by="self")[0].module == "core"
+
+
+class SchemaStateConnection:
+    """Answers the schema check with a fixed (is_benchmark, relations) row."""
+
+    def __init__(self, is_benchmark, relations):
+        self.row = (is_benchmark, relations)
+        self.executed = []
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append(sql)
+
+    def fetchone(self):
+        return self.row
+
+    def rollback(self):
+        pass
+
+
+@pytest.mark.parametrize("state", [(False, 0), (True, 17)])
+def test_absent_empty_or_benchmark_schema_may_be_replaced(state):
+    check_schema_replaceable(SchemaStateConnection(*state))
+
+
+def test_schema_with_real_data_is_refused_without_force():
+    conn = SchemaStateConnection(False, 42)
+    with pytest.raises(SchemaInUse, match="--force"):
+        check_schema_replaceable(conn)
+    with pytest.raises(SchemaInUse):
+        load_corpus(conn, generate_corpus(SMALL))
+    assert not any("DROP SCHEMA" in sql for sql in conn.executed)
+
+    check_schema_replaceable(conn, force=True)
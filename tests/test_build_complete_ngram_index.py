@@ -0,0 +1,55 @@
+"""Tests for the parallel external-sort n-gram frequency build."""
+
+import gzip
+import random
+
+from scripts.build_complete_ngram_index import build_complete_index, parse_ngram_line
+
+
+def _write_shards(ngram_dir):
+    rng = random.Random(7)
+    words = [f"w{i:03d}" for i in range(300)] + ["Lucid", "LUCID", "terse"]
+    lines_by_shard = []
+    for shard in range(3):
+        lines = []
+        for _ in range(400):
+            word = rng.choice(words)
+            # Mix the Version 2 and Version 3 line formats, plus junk
+            if rng.random() < 0.5:
+                lines.append(f"{word}\t{rng.randint(1900, 2000)}\t{rng.randint(1, 9)}\t1")
+            else:
+                lines.append(f"{word}\t1990,{rng.randint(1, 9)},1\t1991,{rng.randint(0, 9)},1")
+        lines.append("malformed")
+        lines_by_shard.append(lines)
+        with gzip.open(ngram_dir / f"googlebooks-eng-all-1gram-20120701-{shard}.gz", "wt") as handle:
+            handle.write("\n".join(lines) + "\n")
+    return [line for lines in lines_by_shard for line in lines]
+
+
+def test_parallel_spilling_build_matches_serial_build(tmp_path):
+    ngram_dir = tmp_path / "ngram_data"
+    ngram_dir.mkdir()
+    lines = _write_shards(ngram_dir)
+
+    serial = tmp_path / "serial.txt"
+    build_complete_index(ngram_dir, serial, workers=1, work_dir=tmp_path / "serial_work")
+
+    # A tiny spill threshold forces many sorted runs, several key ranges and
+    # several frequency runs per range
+    parallel = tmp_path / "parallel.txt"
+    build_complete_index(
+        ngram_dir, parallel, workers=3, max_entries=7, work_dir=tmp_path / "parallel_work"
+    )
+
+    assert parallel.read_bytes() == serial.read_bytes()
+    assert not (tmp_path / "parallel_work").exists()
+
+    counts = {}
+    for line in lines:
+        parsed = parse_ngram_line(line)
+        if parsed:
+            counts[parsed[0]] = counts.get(parsed[0], 0) + parsed[1]
+    expected = "".join(
+        f"{word}\t{count}\n" for count, word in sorted(((c, w) for w, c in counts.items()), reverse=True)
+    )
+    assert serial.read_text() == expected
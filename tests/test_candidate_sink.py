@@ -0,0 +1,90 @@
+"""Tests for the COPY-based candidate sink."""
+
+import pytest
+
+from core.candidate_sink import CANDIDATE_WORDS, VOCABULARY_CANDIDATES, CandidateSink
+
+
+class RecordingConnection:
+    """Stands in for a psycopg connection and records what the sink sends."""
+
+    def __init__(self, merged_rows=0, fail_merge=False):
+        self.statements = []
+        self.copied = []
+        self.merged_rows = merged_rows
+        self.fail_merge = fail_merge
+        self.committed = self.rolled_back = self.closed = False
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.statements.append(" ".join(sql.split()))
+        if sql.lstrip().startswith("INSERT") and self.fail_merge:
+            raise RuntimeError("merge failed")
+
+    def copy(self, sql):
+        self.statements.append(sql)
+        return self
+
+    def write_row(self, row):
+        self.copied.append(row)
+
+    @property
+    def rowcount(self):
+        return self.merged_rows
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def test_flush_copies_rows_and_merges_once():
+    conn = RecordingConnection(merged_rows=1)
+    sink = CandidateSink(VOCABULARY_CANDIDATES, lambda: conn, batch_size=2)
+    sink.add({"term": "lucid", "definition": "clear", "part_of_speech": "adjective"})
+    assert not sink.full
+    sink.add(("terse", -2.0, "brief", "adjective", None, False, "20250101"))
+    assert sink.full
+
+    assert sink.flush() == 1
+    assert conn.copied == [
+        (0, "lucid", None, "clear", "adjective", None, None, None),
+        (1, "terse", -2.0, "brief", "adjective", None, False, "20250101"),
+    ]
+    create, copy, merge = conn.statements
+    assert create.startswith("CREATE TEMP TABLE IF NOT EXISTS vocabulary_candidates_staging")
+    assert copy.startswith("COPY vocabulary_candidates_staging (seq, term, zipf_score")
+    assert "DISTINCT ON (st.term)" in merge and merge.endswith("ON CONFLICT (term) DO NOTHING")
+    assert conn.committed and conn.closed
+    assert len(sink) == 0 and sink.stats.rows_staged == 2 and sink.stats.rows_inserted == 1
+
+
+def test_candidate_words_merge_skips_existing_terms_case_insensitively():
+    merge = " ".join(CANDIDATE_WORDS.merge_sql().split())
+    assert "DISTINCT ON (LOWER(st.term))" in merge
+    assert "NOT EXISTS (SELECT 1 FROM vocab.candidate_words e WHERE LOWER(e.term) = LOWER(s.term))" in merge
+    assert "NOT EXISTS (SELECT 1 FROM vocab.defined e WHERE LOWER(e.term) = LOWER(s.term))" in merge
+    assert "ON CONFLICT" not in merge
+
+
+def test_failed_flush_rolls_back_and_keeps_rows():
+    conn = RecordingConnection(fail_merge=True)
+    sink = CandidateSink(CANDIDATE_WORDS, lambda: conn)
+    sink.add({"term": "Lucid"})
+
+    with pytest.raises(RuntimeError):
+        sink.flush()
+    assert conn.rolled_back and conn.closed and not conn.committed
+    assert len(sink) == 1 and sink.stats.flushes == 0
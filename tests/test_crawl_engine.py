@@ -0,0 +1,149 @@
+"""Tests for the concurrent crawl frontier and engine."""
+
+import asyncio
+import re
+import time
+
+from aiohttp import web
+
+from core.crawl_engine import CrawlEngine, CrawlFrontier
+
+PAGES_PER_HOST = 4
+LATENCY = 0.05
+
+
+def _links(url, html, metadata):
+    """Page processor: runs in the engine's process pool, so it must be module level."""
+    return re.findall(r'href="([^"]+)"', html)
+
+
+class FixtureSite:
+    """Local HTTP server serving a small linked site plus robots.txt."""
+
+    def __init__(self):
+        self.hits = []
+        self.app = web.Application()
+        self.app.router.add_get("/robots.txt", self.robots)
+        self.app.router.add_get("/page/{n}", self.page)
+        self.app.router.add_get("/private/{n}", self.page)
+        self.runner = None
+        self.base = None
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+        self.base = f"http://127.0.0.1:{port}"
+
+    async def robots(self, request):
+        self.hits.append((time.monotonic(), request.path))
+        return web.Response(text="User-agent: *\nDisallow: /private/\n")
+
+    async def page(self, request):
+        self.hits.append((time.monotonic(), request.path))
+        await asyncio.sleep(LATENCY)
+        n = int(request.match_info["n"])
+        links = [f"{self.base}/page/{n + 1}"] if n + 1 < PAGES_PER_HOST else []
+        links.append(f"{self.base}/private/{n}")
+        body = "".join(f'<a href="{link}">next</a>' for link in links)
+        return web.Response(text=f"<html><body>{body}</body></html>", content_type="text/html")
+
+
+async def _crawl(concurrency, delay, hosts=4, process_workers=0, max_pages=None):
+    sites = [FixtureSite() for _ in range(hosts)]
+    for site in sites:
+        await site.start()
+
+    fetched = []
+
+    async def on_page(result):
+        fetched.append((result.request.url, result.status))
+        return result.processed if result.ok else []
+
+    try:
+        async with CrawlEngine(concurrency=concurrency, per_host_delay=delay,
+                               process_workers=process_workers) as engine:
+            stats = await engine.crawl([f"{site.base}/page/0" for site in sites], _links, on_page,
+                                       max_pages=max_pages)
+    finally:
+        for site in sites:
+            await site.runner.cleanup()
+    return stats, sites, fetched
+
+
+def test_frontier_orders_by_priority_and_spaces_hosts():
+    frontier = CrawlFrontier(per_host_delay=1.0, respect_robots=False)
+    frontier.add("http://a.test/low", priority=0)
+    frontier.add("http://a.test/high", priority=5)
+    frontier.add("http://b.test/one", priority=1)
+    assert not frontier.add("http://a.test/high#fragment")
+
+    request, _ = frontier.next_request(now=0.0)
+    assert request.url == "http://a.test/high"
+    frontier.complete(request)
+
+    request, _ = frontier.next_request(now=0.0)
+    assert request.url == "http://b.test/one"
+    frontier.complete(request)
+
+    # a.test was contacted at t=0, so its next URL waits for the delay
+    assert frontier.next_request(now=0.5) == (None, 0.5)
+    request, _ = frontier.next_request(now=1.0)
+    assert request.url == "http://a.test/low"
+    assert len(frontier) == 0
+
+
+def test_frontier_fetches_robots_first_and_applies_it():
+    frontier = CrawlFrontier(per_host_delay=0.0)
+    frontier.add("http://a.test/ok")
+    frontier.add("http://a.test/private/x")
+
+    robots, _ = frontier.next_request(now=0.0)
+    assert robots.is_robots and robots.url == "http://a.test/robots.txt"
+    assert frontier.next_request(now=5.0) == (None, None)  # blocked until robots.txt arrives
+
+    frontier.set_robots("http://a.test", "User-agent: *\nDisallow: /private/\nCrawl-delay: 2\n")
+    frontier.complete(robots)
+    assert frontier.disallowed == 1
+    assert frontier.host_state("http://a.test").delay == 2.0
+    assert not frontier.add("http://a.test/private/y")
+
+    request, _ = frontier.next_request(now=2.0)
+    assert request.url == "http://a.test/ok"
+
+    frontier.set_robots("http://down.test", None, status=503)
+    assert not frontier.add("http://down.test/page")
+
+
+def test_engine_respects_robots_and_per_host_delay():
+    delay = 0.1
+    stats, sites, fetched = asyncio.run(_crawl(concurrency=4, delay=delay, process_workers=1))
+
+    assert stats.pages == 4 * PAGES_PER_HOST
+    assert stats.robots_fetches == 4
+    assert stats.disallowed == 4 * PAGES_PER_HOST
+    assert all(status == 200 for _, status in fetched)
+    for site in sites:
+        paths = [path for _, path in site.hits]
+        assert paths[0] == "/robots.txt"
+        assert not any(path.startswith("/private/") for path in paths)
+        times = [hit_time for hit_time, _ in site.hits]
+        gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+        assert min(gaps) >= delay * 0.9
+
+
+def test_throughput_scales_with_concurrency_across_hosts():
+    serial, _, _ = asyncio.run(_crawl(concurrency=1, delay=LATENCY))
+    concurrent, sites, _ = asyncio.run(_crawl(concurrency=4, delay=LATENCY))
+
+    assert serial.pages == concurrent.pages == 4 * PAGES_PER_HOST
+    assert concurrent.pages_per_minute > 2 * serial.pages_per_minute
+
+
+def test_max_pages_stops_the_crawl():
+    stats, sites, fetched = asyncio.run(_crawl(concurrency=2, delay=0.0, max_pages=3))
+
+    assert stats.pages == 3
+    assert len(fetched) == 3
@@ -0,0 +1,60 @@
+"""Tests for pooled-session settings and the hot statement registry."""
+
+import pytest
+
+from core.database_manager import CursorWrapper, db_manager
+from core.secure_config import DatabaseConfig
+
+
+class RecordingCursor:
+    rowcount = 1
+
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, query, params=None, **kwargs):
+        self.calls.append((query, params, kwargs.get("prepare")))
+
+
+def make_config(**overrides):
+    values = dict(host="localhost", port=5432, database="vocab", user="u", password="p")
+    values.update(overrides)
+    return DatabaseConfig(**values)
+
+
+def test_transaction_pooler_detection():
+    assert make_config(port=6543).uses_transaction_pooler
+    assert not make_config(port=5432).uses_transaction_pooler
+    assert make_config(port=5432, transaction_pooler=True).uses_transaction_pooler
+    assert not make_config(port=6543, transaction_pooler=False).uses_transaction_pooler
+    with pytest.raises(ValueError):
+        make_config(pool_min_size=0)
+
+
+def test_statements_are_prepared_only_with_session_state():
+    statements = {"word": "SELECT term FROM vocab.defined WHERE id = %s"}
+
+    session = RecordingCursor()
+    cursor = CursorWrapper(session, prepare=True, statements=statements)
+    cursor.execute_statement("word", (1,))
+    cursor.execute("SELECT 1")
+    cursor.execute("SELECT 2", prepare=True)
+    assert [call[2] for call in session.calls] == [True, False, True]
+
+    pooled = RecordingCursor()
+    cursor = CursorWrapper(pooled, prepare=False, statements=statements)
+    cursor.execute_statement("word", (1,))
+    cursor.execute("SELECT 2", prepare=True)
+    assert [call[2] for call in pooled.calls] == [False, False]
+    assert pooled.calls[0][:2] == (statements["word"], (1,))
+
+    with pytest.raises(KeyError, match="missing"):
+        cursor.execute_statement("missing")
+
+
+def test_register_statement_rejects_conflicting_sql(monkeypatch):
+    monkeypatch.setattr(db_manager, "statements", {})
+    assert db_manager.register_statement("word", "SELECT 1") == "word"
+    assert db_manager.register_statement("word", "SELECT 1") == "word"
+    with pytest.raises(ValueError):
+        db_manager.register_statement("word", "SELECT 2")
@@ -0,0 +1,106 @@
+"""Tests for the SQLite-backed DefinitionCache."""
+
+import sqlite3
+import threading
+from datetime import datetime
+
+from core.comprehensive_definition_lookup import Definition, DefinitionCache, LookupResult
+
+
+def _result(term):
+    return LookupResult(
+        term=term,
+        definitions_by_pos={
+            "noun": [Definition(f"meaning of {term}", "noun", "stub", 1, 0.9)]
+        },
+        overall_reliability=0.9,
+        sources_consulted=["stub"],
+        lookup_timestamp=datetime(2025, 1, 1),
+    )
+
+
+def _access_counts(path):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT term, access_count FROM definition_cache"))
+
+
+def test_round_trip_through_memory_and_disk(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = DefinitionCache(path)
+    cache.put_many([("alpha", _result("alpha")), ("beta", _result("beta"))])
+
+    hit = cache.get("Alpha")
+    assert hit.cache_hit
+    assert hit.definitions_by_pos["noun"][0].text == "meaning of alpha"
+
+    # A fresh instance has an empty LRU and must read from SQLite
+    cold = DefinitionCache(path)
+    found = cold.get_many(["alpha", "beta", "gamma"])
+    assert set(found) == {"alpha", "beta"}
+    assert all(result.cache_hit for result in found.values())
+    assert cold.get("alpha", max_age_hours=0) is None
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_cached_results_do_not_share_definitions(tmp_path):
+    cache = DefinitionCache(str(tmp_path / "cache.db"))
+    stored = _result("alpha")
+    cache.put("alpha", stored)
+    stored.definitions_by_pos["noun"].append(Definition("added later", "noun", "stub", 1, 0.1))
+
+    hit = cache.get("alpha")
+    assert len(hit.definitions_by_pos["noun"]) == 1
+    hit.definitions_by_pos["noun"][0].reliability_score = 0.0
+    hit.definitions_by_pos["verb"] = []
+
+    again = cache.get("alpha")
+    assert set(again.definitions_by_pos) == {"noun"}
+    assert again.definitions_by_pos["noun"][0].reliability_score == 0.9
+
+
+def test_access_counts_are_buffered_until_flush(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = DefinitionCache(path, access_flush_size=1000, access_flush_interval=3600)
+    cache.put("alpha", _result("alpha"))
+
+    for _ in range(5):
+        cache.get("alpha")
+    assert _access_counts(path) == {"alpha": 1}
+
+    cache.flush()
+    assert _access_counts(path) == {"alpha": 6}
+
+
+def test_eviction_by_size_and_age(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = DefinitionCache(path, max_entries=1, max_age_days=1)
+    cache.put_many([(term, _result(term)) for term in ("alpha", "beta", "gamma")])
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE definition_cache SET last_accessed = '2000-01-01 00:00:00' WHERE term = 'beta'")
+        conn.execute("UPDATE definition_cache SET cached_at = '2000-01-01 00:00:00' WHERE term = 'gamma'")
+
+    assert cache.evict() == 2
+    assert set(_access_counts(path)) == {"alpha"}
+    assert cache.get("gamma") is None
+
+
+def test_each_thread_uses_its_own_connection(tmp_path):
+    cache = DefinitionCache(str(tmp_path / "cache.db"), memory_entries=0)
+    cache.put("alpha", _result("alpha"))
+    connections = []
+
+    def worker():
+        assert cache.get("alpha").cache_hit
+        connections.append(cache._connection())
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(connections) == 2
+    assert connections[0] is not connections[1]
+    assert cache._connection() not in connections
@@ -2,9 +2,20 @@
 
 from datetime import datetime, timezone
 
-from core.comprehensive_definition_lookup import Definition, LookupResult
+import core.definition_filler as filler
+from core.comprehensive_definition_lookup import (
+    ComprehensiveDefinitionLookup,
+    Definition,
+    DefinitionCache,
+    LookupResult,
+    StubDefinitionSource,
+)
 from core.definition_filler import (
+    FillCheckpoint,
+    MissingDefinitionRow,
+    ProgressWatermark,
     extract_best_definitions,
+    group_rows_by_term,
     map_to_existing_pos,
     normalize_pos,
 )
@@ -70,3 +81,71 @@ def test_extract_best_definitions_picks_highest_reliability():
     assert set(best.keys()) == {"NOUN", "Verb"}
     assert best["NOUN"].text == "better definition"
     assert best["Verb"].text == "verb definition"
+
+
+def test_group_rows_by_term_and_watermark_ordering():
+    rows = [
+        ("alpha", MissingDefinitionRow(1, "alpha", None)),
+        ("alpha", MissingDefinitionRow(5, "Alpha", "noun")),
+        ("beta", MissingDefinitionRow(2, "beta", None)),
+    ]
+    groups = list(group_rows_by_term(rows))
+    assert [(key, [row.id for row in group]) for key, group in groups] == [
+        ("alpha", [1, 5]),
+        ("beta", [2]),
+    ]
+
+    watermark = ProgressWatermark("aardvark")
+    watermark.complete(1, "beta")
+    assert watermark.term == "aardvark"  # "alpha" (sequence 0) still running
+    watermark.complete(0, "alpha")
+    assert watermark.term == "beta"
+
+
+def test_pipeline_batches_writes_and_checkpoints(monkeypatch, tmp_path):
+    keyed_rows = [
+        (term, MissingDefinitionRow(row_id, term, pos))
+        for row_id, term, pos in [(1, "alpha", None), (2, "beta", "noun"), (3, "gamma", None)]
+    ]
+    source = StubDefinitionSource(
+        {
+            "alpha": [Definition("first letter", "noun", "stub", 1, 0.9)],
+            "beta": [Definition("second letter", "noun", "stub", 1, 0.9)],
+        }
+    )
+    writes = []
+    checkpoint_path = tmp_path / "fill.json"
+
+    monkeypatch.setattr(filler, "_fetch_existing_pos_values", lambda: {"noun": "noun"})
+    monkeypatch.setattr(filler, "_fetch_existing_filled_keys", lambda pos_map: set())
+    monkeypatch.setattr(filler, "_fetch_defined_columns", lambda: {"part_of_speech"})
+    monkeypatch.setattr(
+        filler,
+        "_iter_missing_rows_by_term",
+        lambda after, limit, fetch_size: iter([item for item in keyed_rows if after is None or item[0] > after]),
+    )
+    monkeypatch.setattr(
+        filler, "_apply_updates", lambda updates, columns, batch: writes.append([a.row_id for a in updates]) or len(updates)
+    )
+    monkeypatch.setattr(filler, "_apply_inserts", lambda inserts, columns, batch: len(inserts))
+    monkeypatch.setattr(
+        filler,
+        "ComprehensiveDefinitionLookup",
+        lambda **kwargs: ComprehensiveDefinitionLookup(
+            sources={"stub": source}, cache=DefinitionCache(str(tmp_path / "cache.db")), **kwargs
+        ),
+    )
+
+    summary = filler.fill_missing_definitions_pipeline(
+        limit=10, workers=2, batch_size=1, checkpoint_path=checkpoint_path
+    )
+
+    assert sorted(row_id for batch in writes for row_id in batch) == [1, 2]
+    assert (summary.looked_up, summary.updated, summary.skipped) == (3, 2, 1)
+    assert FillCheckpoint.load(checkpoint_path).last_term == "gamma"
+
+    # Resuming after the checkpoint finds nothing left to do
+    writes.clear()
+    filler.fill_missing_definitions_pipeline(workers=2, checkpoint_path=checkpoint_path)
+    assert writes == []
+    assert not checkpoint_path.exists()
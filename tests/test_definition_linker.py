@@ -0,0 +1,87 @@
+"""Tests for the trie-based definition linker and its incremental index."""
+
+from core.definition_linker import (
+    DefinitionLinkIndex,
+    TermTrie,
+    VocabularyEntry,
+    build_term_index,
+    definition_digest,
+    link_definition,
+)
+
+VOCABULARY = [(1, "sea"), (2, "sea horse"), (3, "horse"), (4, "Sea"), (5, "to"), (6, "dark horse")]
+DEFINITIONS = {
+    10: "A small fish; a sea horse swims upright.",
+    11: "A horse of unknown ability; a dark horse candidate.",
+    12: "Anything relating to the sea, horses excluded.",
+    13: "A <tall> & quiet person.",
+}
+
+
+def _trie(rows, min_term_length=3):
+    terms = build_term_index(rows, min_term_length)
+    return terms, TermTrie(VocabularyEntry(word_id, tokens) for tokens, word_id in terms.items())
+
+
+def _link_all(trie, definitions, max_links=25):
+    return {word_id: link_definition(text, trie, max_links) for word_id, text in definitions.items()}
+
+
+def test_longest_match_links_phrases_in_one_pass():
+    terms, trie = _trie(VOCABULARY)
+    assert terms[("sea",)] == 1  # lowest id wins for duplicate spellings
+    assert ("to",) not in terms  # every token shorter than min_term_length
+
+    html, links = link_definition(DEFINITIONS[10], trie, 25)
+    assert links == 1
+    assert html == 'A small fish; a <a href="/word/2" class="definition-link">sea horse</a> swims upright.'
+
+    html, links = link_definition(DEFINITIONS[11], trie, 25)
+    assert links == 2 and '<a href="/word/6" class="definition-link">dark horse</a>' in html
+
+    assert link_definition(DEFINITIONS[13], trie, 25) == (None, 0)
+    html, links = link_definition("sea sea sea", trie, 2)
+    assert links == 2 and html.endswith("</a> sea")
+
+
+def test_trie_remove_prunes_unused_branches():
+    _, trie = _trie(VOCABULARY)
+    assert trie.remove(("sea", "horse")).word_id == 2
+    assert trie.get(("sea", "horse")) is None and trie.get(("sea",)).word_id == 1
+    assert trie.longest_match(["sea", "horse"], 0).word_id == 1
+    assert trie.remove(("sea", "horse")) is None
+    assert len(trie) == 3
+
+
+def test_incremental_relink_matches_full_rebuild(tmp_path):
+    terms, trie = _trie(VOCABULARY)
+    index = DefinitionLinkIndex(min_term_length=3, max_links_per_definition=25, terms=terms)
+    for word_id, text in DEFINITIONS.items():
+        index.record(word_id, text)
+    index.save(tmp_path / "index.json.gz")
+    index = DefinitionLinkIndex.load(tmp_path / "index.json.gz")
+    assert index.settings_match(3, 25) and len(index) == len(DEFINITIONS)
+
+    # Add a phrase, drop a term, edit one definition and delete another.
+    vocabulary = [row for row in VOCABULARY if row[0] != 6] + [(7, "quiet person")]
+    definitions = {**DEFINITIONS, 12: "Anything relating to the open sea."}
+    del definitions[10]
+    new_terms, new_trie = _trie(vocabulary)
+    digests = {word_id: definition_digest(text) for word_id, text in definitions.items()}
+
+    affected, removed = index.affected_definitions(new_terms, digests)
+    assert affected == {11, 12, 13}
+    assert removed == {10}
+
+    previous = _link_all(trie, DEFINITIONS)
+    incremental = {word_id: previous[word_id] for word_id in definitions}
+    incremental.update(_link_all(new_trie, {word_id: definitions[word_id] for word_id in affected}))
+    assert incremental == _link_all(new_trie, definitions)
+
+    # Nothing to do once the index has caught up.
+    for word_id in removed:
+        index.drop(word_id)
+    for word_id in affected:
+        index.record(word_id, definitions[word_id])
+    index.terms = new_terms
+    assert index.affected_definitions(new_terms, digests) == (set(), set())
@@ -0,0 +1,137 @@
+"""Tests for the concurrent source fan-out in ComprehensiveDefinitionLookup."""
+
+import asyncio
+import time
+
+from core.comprehensive_definition_lookup import (
+    ComprehensiveDefinitionLookup,
+    Definition,
+    DefinitionCache,
+    SourceRateLimiter,
+    StubDefinitionSource,
+)
+
+
+def _definition(text, source, reliability=0.9, pos="noun"):
+    return Definition(
+        text=text,
+        part_of_speech=pos,
+        source=source,
+        source_tier=1,
+        reliability_score=reliability,
+    )
+
+
+def _lookup(sources, **kwargs):
+    return ComprehensiveDefinitionLookup(sources=sources, cache=DefinitionCache(":memory:"), **kwargs)
+
+
+def test_sources_are_queried_concurrently_and_merged_in_config_order():
+    sources = {
+        "slow": StubDefinitionSource({"lucid": [_definition("clear", "slow")]}, delay=0.2),
+        "fast": StubDefinitionSource({"lucid": [_definition("easily understood", "fast")]}, delay=0.2),
+        "broken": StubDefinitionSource(error=RuntimeError("boom")),
+    }
+    lookup = _lookup(sources, enough_definitions=None)
+
+    started = time.perf_counter()
+    result = asyncio.run(lookup.lookup_term("Lucid", use_cache=False))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35  # concurrent, not 0.2 + 0.2
+    assert result.sources_consulted == ["slow", "fast"]
+    assert [d.source for d in result.definitions_by_pos["noun"]] == ["slow", "fast"]
+
+
+def test_timeouts_and_early_stop_cancel_slow_sources():
+    confident = {
+        "a": StubDefinitionSource({"terse": [_definition("brief", "a"), _definition("curt", "a")]}),
+        "b": StubDefinitionSource({"terse": [_definition("concise", "b")]}),
+        "slow": StubDefinitionSource({"terse": [_definition("late", "slow")]}, delay=5.0),
+    }
+    started = time.perf_counter()
+    result = asyncio.run(_lookup(confident, enough_definitions=3).lookup_term("terse", use_cache=False))
+    assert time.perf_counter() - started < 1.0
+    assert result.sources_consulted == ["a", "b"]
+
+    timing_out = {
+        "a": StubDefinitionSource({"terse": [_definition("brief", "a")]}),
+        "hung": StubDefinitionSource({"terse": [_definition("never", "hung")]}, delay=5.0, timeout=0.1),
+    }
+    result = asyncio.run(_lookup(timing_out, enough_definitions=None).lookup_term("terse", use_cache=False))
+    assert result.sources_consulted == ["a"]
+
+
+def test_lookup_many_shares_per_source_rate_limits():
+    source = StubDefinitionSource(
+        {term: [_definition(f"{term} meaning", "rated")] for term in ("one", "two", "three")},
+        rate_limit=0.1,
+    )
+    lookup = _lookup({"rated": source}, max_concurrent_terms=8)
+
+    started = time.perf_counter()
+    results = asyncio.run(lookup.lookup_many(["one", "Two", "three", "one"], use_cache=False))
+    elapsed = time.perf_counter() - started
+
+    assert set(results) == {"one", "two", "three"}
+    assert all(result.sources_consulted == ["rated"] for result in results.values())
+    assert sorted(source.calls) == ["one", "three", "two"]
+    assert elapsed >= 0.19  # three calls spaced 0.1s apart
+
+
+def test_rate_limiter_reserves_consecutive_slots():
+    async def run():
+        limiter = SourceRateLimiter(0.05)
+        stamps = []
+
+        async def call():
+            await limiter.acquire()
+            stamps.append(time.monotonic())
+
+        await asyncio.gather(*(call() for _ in range(3)))
+        return stamps
+
+    stamps = sorted(asyncio.run(run()))
+    assert stamps[1] - stamps[0] >= 0.04
+    assert stamps[2] - stamps[1] >= 0.04
+
+
+def test_lookup_many_caches_completed_chunks_when_interrupted():
+    source = StubDefinitionSource(
+        {term: [_definition(f"{term} meaning", "stub")] for term in ("one", "two", "slow")}
+    )
+    lookup = _lookup({"stub": source}, max_concurrent_terms=2)
+    lookup_term = lookup.lookup_term
+
+    async def stalls_on_slow(term, use_cache=True):
+        if term == "slow":
+            await asyncio.sleep(5.0)
+        return await lookup_term(term, use_cache=use_cache)
+
+    lookup.lookup_term = stalls_on_slow
+
+    async def run():
+        try:
+            await asyncio.wait_for(lookup.lookup_many(["one", "two", "slow"]), timeout=0.3)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+    assert set(lookup.cache.get_many(["one", "two", "slow"])) == {"one", "two"}
+
+
+def test_rate_limit_wait_counts_against_the_source_timeout():
+    source = StubDefinitionSource(
+        {term: [_definition(f"{term} meaning", "rated")] for term in ("one", "two")},
+        rate_limit=2.0,
+        timeout=0.2,
+    )
+    lookup = _lookup({"rated": source}, max_concurrent_terms=2)
+
+    started = time.perf_counter()
+    results = asyncio.run(lookup.lookup_many(["one", "two"], use_cache=False))
+
+    assert time.perf_counter() - started < 1.0
+    consulted = sorted(len(result.sources_consulted) for result in results.values())
+    assert consulted == [0, 1]  # the second call would have waited 2s for its slot
@@ -0,0 +1,91 @@
+"""Tests for the read-only SQLite dictionary snapshot."""
+
+import pytest
+
+from core.dictionary_snapshot import DictionarySnapshot, export_snapshot, frequency_ranks
+
+WORDS = [
+    # id, term, definition, definition_with_links, part_of_speech, final_rarity, num_sources,
+    # primary_domain, wav_url, ipa, arpabet, syllables, stress, obsolete_or_archaic
+    (1, "Abate", "to lessen in intensity", None, "verb", 0.40, 3, "general", None, None, None, 2, None, False),
+    (2, "abscond", "to leave secretly", None, "verb", 0.70, 3, "law", None, None, None, 2, None, False),
+    (3, "absinthe", "a bitter green spirit", None, "noun", 0.70, 2, "food", None, None, None, 2, None, None),
+    (4, "bloviate", "to talk at length", None, "verb", 0.90, 2, "general", None, None, None, 4, None, True),
+    (5, "cabal", "a secret political clique", None, "noun", None, None, None, None, None, None, 2, None, False),
+]
+NEIGHBOURS = [(1, 1, 4, 0.8), (1, 2, 2, 0.5), (2, 1, 1, 0.5)]
+
+
+class SourceCursor:
+    def __init__(self):
+        self.rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        self.rows = list(WORDS if "DISTINCT ON" in sql else NEIGHBOURS)
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+
+class SourceConnection:
+    def cursor(self):
+        return SourceCursor()
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    counts = export_snapshot(SourceConnection(), tmp_path / "dictionary.sqlite", embedding_model="test-model")
+    assert counts == {"words": 5, "neighbours": 3}
+    return DictionarySnapshot(tmp_path / "dictionary.sqlite")
+
+
+def test_frequency_ranks_match_sql_rank():
+    assert frequency_ranks([0.5, None, 0.2, 0.5, 0.9]) == [2, None, 1, 2, 4]
+
+
+def test_word_lookups(snapshot):
+    assert snapshot.embedding_model == "test-model"
+    word = snapshot.get_word_by_id(4)
+    assert word[1] == "bloviate" and word[13] is True and word[14] == 4
+    # Words without rarity have no rank and, as in PostgreSQL, no detail row
+    assert snapshot.get_word_by_id(5) is None
+    assert snapshot.get_word_by_term("ABATE")[0] == 1
+    assert snapshot.get_random_word()[0] in {1, 2, 3, 4}
+    assert snapshot.get_similar_words(1) == [(4, "bloviate", 0.8), (2, "abscond", 0.5)]
+    assert snapshot.get_domains() == ["food", "general", "law"]
+    assert snapshot.get_parts_of_speech() == ["noun", "verb"]
+
+
+def test_search_filters(snapshot):
+    assert [row[0] for row in snapshot.search_words("a")] == [1, 2, 3]
+    assert [row[0] for row in snapshot.search_words("bsc")] == [2]
+    assert [row[0] for row in snapshot.search_words(min_rarity=0.6, part_of_speech="verb")] == [2, 4]
+    assert [row[0] for row in snapshot.search_words(max_frequency=2)] == [1, 2, 3]
+    assert [row[0] for row in snapshot.search_words(limit=2, offset=1)] == [2, 3]
+    # The count includes words without rarity, like count_search_words
+    assert snapshot.count_search_words("ab") == 4
+    assert snapshot.count_search_words("cab") == 1
+
+
+def test_browse_words(snapshot):
+    total, letters, rows = snapshot.browse_words()
+    assert total == 5 and letters == ["a", "b", "c"]
+    assert [row[0] for row in rows] == [1, 2, 3, 4, 5]
+
+    total, letters, rows = snapshot.browse_words(letters="ab")
+    assert (total, letters) == (3, ["a", "s"])
+    assert [row[14] for row in rows] == [1, 2, 2]  # ranked within the filtered words
+
+    total, _, rows = snapshot.browse_words(search="secret")
+    assert [row[0] for row in rows] == [2, 5]
+    assert snapshot.browse_words(domain="general", limit=1, offset=1)[2][0][0] == 4
@@ -0,0 +1,112 @@
+"""Tests for reusing stored definition vectors in DomainClassifier."""
+
+import json
+
+import numpy as np
+import pytest
+
+from domain_classifier import (
+    SELF_TEST_CASES,
+    DefinitionEmbeddingsProvider,
+    DomainClassifier,
+    EmbeddingProvider,
+    MatrixCacheProvider,
+)
+
+TERMS = [term for term, _, _ in SELF_TEST_CASES]
+DEFINITIONS = [definition for _, definition, _ in SELF_TEST_CASES]
+WORD_IDS = list(range(100, 100 + len(TERMS)))
+
+
+class StoredVectors(EmbeddingProvider):
+    """Read-only provider serving a fixed set of vectors."""
+
+    def __init__(self, model_name, vectors):
+        self.model_name = model_name
+        self.vectors = vectors
+
+    def fetch(self, model_name, word_ids, definitions):
+        if model_name != self.model_name:
+            return {}
+        return {word_id: self.vectors[word_id] for word_id in word_ids if word_id in self.vectors}
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.executed.append((sql, params))
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def _assert_same_results(actual, expected):
+    for got, want in zip(actual, expected):
+        assert got["primary_domain"] == want["primary_domain"]
+        assert got["scores"] == pytest.approx(want["scores"], abs=1e-6)
+
+
+def test_matrix_cache_skips_encoding_on_rerun(tmp_path):
+    baseline = DomainClassifier(config_output_dir=str(tmp_path)).classify_batch(TERMS, DEFINITIONS)
+
+    cache_path = tmp_path / "cache" / "definitions.npz"
+    first = DomainClassifier(config_output_dir=str(tmp_path),
+                             embedding_providers=[MatrixCacheProvider(cache_path)])
+    _assert_same_results(first.classify_batch(TERMS, DEFINITIONS, word_ids=WORD_IDS), baseline)
+    assert (first.embedding_stats.reused, first.embedding_stats.encoded) == (0, len(TERMS))
+    first.embedding_providers[0].save()
+
+    cache = MatrixCacheProvider(cache_path)
+    assert len(cache) == len(TERMS)
+    rerun = DomainClassifier(config_output_dir=str(tmp_path), embedding_providers=[cache])
+    _assert_same_results(rerun.classify_batch(TERMS, DEFINITIONS, word_ids=WORD_IDS), baseline)
+    assert (rerun.embedding_stats.reused, rerun.embedding_stats.encoded) == (len(TERMS), 0)
+
+    # An edited definition no longer matches its cached digest.
+    edited = DEFINITIONS[:-1] + [DEFINITIONS[-1] + " Revised."]
+    rerun.classify_batch(TERMS, edited, word_ids=WORD_IDS)
+    assert rerun.embedding_stats.encoded == 1
+
+
+def test_vectors_from_slower_providers_warm_the_cache(tmp_path):
+    classifier = DomainClassifier(config_output_dir=str(tmp_path))
+    model_name = classifier.embedding_model_name
+    stored = dict(zip(WORD_IDS, classifier._encode(DEFINITIONS)))
+    stale = StoredVectors("some-other-model", stored)
+    cache = MatrixCacheProvider(tmp_path / "definitions.npz")
+    classifier.embedding_providers = [cache, stale, StoredVectors(model_name, dict(list(stored.items())[:3]))]
+
+    classifier.classify_batch(TERMS, DEFINITIONS, word_ids=WORD_IDS)
+    assert (classifier.embedding_stats.reused, classifier.embedding_stats.encoded) == (3, len(TERMS) - 3)
+    assert set(cache.fetch(model_name, WORD_IDS, DEFINITIONS)) == set(WORD_IDS)
+
+
+def test_definition_embeddings_provider_ignores_stale_rows():
+    vector = [0.5, -0.25]
+    conn = FakeConnection([
+        (1, "current text", json.dumps(vector)),
+        (2, "old text", json.dumps(vector)),
+        (3, "third", None),
+    ])
+    provider = DefinitionEmbeddingsProvider(lambda: conn)
+
+    found = provider.fetch("all-MiniLM-L6-v2", [1, 2, 3], ["current text", "new text", "third"])
+    assert list(found) == [1]
+    assert found[1].dtype == np.float32 and found[1].tolist() == vector
+    sql, params = conn.executed[0]
+    assert "vocab.definition_embeddings" in sql and params == ("all-MiniLM-L6-v2", [1, 2, 3])
@@ -0,0 +1,71 @@
+"""Parity tests for the compiled keyword matcher in domain_classifier."""
+
+import random
+
+import regex
+import yaml
+
+import domain_classifier
+from domain_classifier import DEFAULT_CONFIG_YAML, SELF_TEST_CASES, DomainClassifier, KeywordMatcher
+
+EDGE_CASE_DEFINITIONS = [
+    "",
+    "Gears and a gear-train convert torque; the gear ratio matters.",
+    "An X-ray of the patient's cellular anatomy showed a clinical syndrome.",
+    "Special forces ops and counter-intel; counterintel units, special  forces.",
+    "Cell biology studies the cell; cellular respiration in cell-biology labs.",
+    "Straße and STRASSE; ſtatute vs statute; σοφία and ςοφία.",
+    "API, SDK and CLI tools; an algorithm is not a statute or a theorem.",
+    "Photosynthesis—photosynthesis! Habitat/habitats; enzyme_enzyme enzyme2",
+]
+
+
+def _classifier(tmp_path, extra_keywords=None):
+    config = yaml.safe_load(DEFAULT_CONFIG_YAML)
+    for domain in config["domains"]:
+        keywords, negatives = (extra_keywords or {}).get(domain["name"], ([], []))
+        domain["keywords"] += keywords
+        domain["negative_keywords"] += negatives
+    config_path = tmp_path / "domains.yaml"
+    config_path.write_text(yaml.safe_dump(config), encoding="utf-8")
+    return DomainClassifier(str(config_path))
+
+
+def test_score_rules_matches_per_pattern_search(tmp_path):
+    classifier = _classifier(
+        tmp_path,
+        {
+            "Life Sciences": (["cell", "cell biology", "cell-biology", "enzyme"], ["cell"]),
+            "Military & Security": (["special forces", "-intel", "ops"], []),
+            "Law, Government & Civics": (["statute", "straße", "ß"], ["ſtatute"]),
+            "Religion, Philosophy & Mythology": (["σοφία", "ςοφία", ""], []),
+        },
+    )
+    definitions = [definition for _, definition, _ in SELF_TEST_CASES] + EDGE_CASE_DEFINITIONS
+
+    for definition in definitions:
+        processed = classifier._preprocess_text(definition)
+        assert classifier._score_rules(processed) == classifier._score_rules_reference(processed), definition
+
+    # Duplicate keywords count once per listing, as with one pattern per keyword.
+    scores, evidence = classifier._score_rules(classifier._preprocess_text("enzyme"))
+    assert evidence["Life Sciences"]["keywords"] == ["enzyme", "enzyme"]
+
+    report = domain_classifier.run_rule_benchmark(classifier, definitions, min_records=50)
+    assert report["mismatches"] == 0
+
+
+def test_keyword_matcher_agrees_with_word_boundary_regexes():
+    rng = random.Random(7)
+    alphabet = "ab -1²ßsſσςİ_KSΣ'"
+    keywords = {"".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))) for _ in range(60)}
+    matcher = KeywordMatcher(keywords)
+    patterns = {
+        matcher.index(keyword): regex.compile(rf"\b{regex.escape(keyword.lower())}\b", regex.IGNORECASE)
+        for keyword in keywords
+    }
+
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        expected = {keyword_id for keyword_id, pattern in patterns.items() if pattern.search(text)}
+        assert matcher.find(text) == expected, text
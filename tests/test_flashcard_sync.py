@@ -0,0 +1,127 @@
+"""Tests for validating batched flashcard study results."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.database_manager import CursorWrapper
+from core.flashcard_sync import (
+    CARD_PROGRESS_BATCH_UPSERT_SQL,
+    MAX_BATCH_RESULTS,
+    StudyResult,
+    apply_study_results,
+    parse_study_results,
+    study_result_arrays,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+NOW_MS = NOW.timestamp() * 1000
+
+
+def test_results_keep_client_times_and_drop_duplicates():
+    items = [
+        {"word_id": 2, "is_correct": False, "studied_at": NOW_MS - 5000},
+        {"word_id": 1, "is_correct": True, "studied_at": NOW_MS - 9000},
+        {"word_id": 2, "is_correct": False, "studied_at": NOW_MS - 5000},
+        {"word_id": 3, "is_correct": True},
+    ]
+    results, rejected = parse_study_results(items, sent_at=NOW_MS - 1000, now=NOW)
+    assert rejected == []
+    assert [(r.word_id, r.is_correct) for r in results] == [(1, True), (2, False), (3, True)]
+    assert results[0].studied_at == NOW - timedelta(seconds=9)
+    assert results[2].studied_at == NOW
+
+    word_ids, correct, studied_at = study_result_arrays(results)
+    assert word_ids == [1, 2, 3] and correct == [True, False, True]
+    assert studied_at == [r.studied_at for r in results]
+
+
+def test_skewed_client_clock_is_corrected():
+    hour_ms = 3600 * 1000
+    items = [{"word_id": 1, "is_correct": True, "studied_at": NOW_MS + hour_ms - 4000}]
+    # The client clock runs an hour fast
+    results, _ = parse_study_results(items, sent_at=NOW_MS + hour_ms, now=NOW)
+    assert results[0].studied_at == NOW - timedelta(seconds=4)
+    # Without sent_at, future times are capped
+    results, _ = parse_study_results(items, now=NOW)
+    assert results[0].studied_at == NOW + timedelta(minutes=2)
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        None,
+        {"word_id": "1", "is_correct": True},
+        {"word_id": True, "is_correct": True},
+        {"word_id": 0, "is_correct": True},
+        {"word_id": 1, "is_correct": "yes"},
+        {"word_id": 1, "is_correct": True, "studied_at": "yesterday"},
+        {"word_id": 1, "is_correct": True, "studied_at": float("inf")},
+        {"word_id": 1, "is_correct": True, "studied_at": 1e300},
+        {"word_id": 1, "is_correct": True, "studied_at": float("nan")},
+    ],
+)
+def test_malformed_results_are_skipped_and_reported(item):
+    items = [
+        {"word_id": 1, "is_correct": True, "studied_at": NOW_MS - 2000},
+        item,
+        {"word_id": 2, "is_correct": False, "studied_at": NOW_MS - 1000},
+    ]
+    results, rejected = parse_study_results(items, now=NOW)
+    assert rejected == [1]
+    assert [r.word_id for r in results] == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "items, sent_at",
+    [
+        (None, None),
+        ({"word_id": 1, "is_correct": True}, None),
+        ([{"word_id": 1, "is_correct": True}] * (MAX_BATCH_RESULTS + 1), None),
+        ([], -1e300),
+        ([], "now"),
+    ],
+)
+def test_malformed_batches_are_rejected(items, sent_at):
+    with pytest.raises(ValueError):
+        parse_study_results(items, sent_at=sent_at, now=NOW)
+
+
+class PlaceholderCheckingCursor:
+    """Checks each positional parameter against the SQL around its placeholder."""
+
+    rowcount = 2
+
+    def __init__(self, user_id, results):
+        self.user_id = user_id
+        self.word_ids, self.correct, self.studied_at = study_result_arrays(results)
+        self.executed = 0
+
+    def execute(self, query, params=None, **kwargs):
+        pieces = query.split("%s")
+        assert len(pieces) - 1 == len(params)
+        for before, param, after in zip(pieces, params, pieces[1:]):
+            if after.startswith("::int[]"):
+                assert param == self.word_ids
+            elif after.startswith("::boolean[]"):
+                assert param == self.correct
+            elif after.startswith("::timestamptz[]"):
+                assert param == self.studied_at
+            else:
+                assert before.rstrip().endswith(("ufp.user_id =", "SELECT"))
+                assert param == self.user_id
+        self.executed += 1
+
+
+def test_batch_upsert_parameters_follow_placeholder_order():
+    results = [
+        StudyResult(11, True, NOW - timedelta(seconds=5)),
+        StudyResult(12, False, NOW),
+    ]
+    real_cursor = PlaceholderCheckingCursor(7, results)
+    cursor = CursorWrapper(real_cursor, statements={"batch": CARD_PROGRESS_BATCH_UPSERT_SQL})
+
+    assert apply_study_results(cursor, "batch", 7, results) == 2
+    assert real_cursor.executed == 1
+    assert apply_study_results(cursor, "batch", 7, []) == 0
+    assert real_cursor.executed == 1
@@ -0,0 +1,92 @@
+"""Tests for the symmetric-delete fuzzy term index."""
+
+import random
+
+import pytest
+
+from core.fuzzy_index import FuzzyTermIndex, bounded_levenshtein
+from core.vocabulary_deduplicator import VocabularyDeduplicator
+
+
+def _brute_force(terms, query, max_edits):
+    matches = []
+    for term in terms:
+        distance = bounded_levenshtein(query, term, max_edits)
+        if distance is not None:
+            matches.append((distance, term))
+    return [(term, distance) for distance, term in sorted(matches)]
+
+
+def test_within_edits_matches_brute_force():
+    rng = random.Random(5)
+    terms = {"".join(rng.choice("abcde") for _ in range(rng.randint(1, 7))) for _ in range(2000)}
+    index = FuzzyTermIndex(terms, max_edits=2)
+
+    for query in rng.sample(sorted(terms), 40) + ["", "zzz", "abcdeab"]:
+        for budget in (0, 1, 2):
+            assert index.within_edits(query, budget) == _brute_force(terms, query, budget)
+
+    with pytest.raises(ValueError):
+        index.within_edits("abc", 3)
+
+
+def test_incremental_adds_and_prefix_queries():
+    index = FuzzyTermIndex(["lucid", "lucidity", "pellucid"])
+    assert index.add("lucent")
+    assert not index.add("lucid")
+
+    assert index.within_edits("lucud") == [("lucid", 1)]
+    assert index.within_edits("lucant") == [("lucent", 1)]
+    assert list(index.with_prefix("luc")) == ["lucent", "lucid", "lucidity"]
+    assert "lucent" in index and len(index) == 4
+
+
+def test_deduplicator_finds_near_duplicates_without_scanning():
+    existing = {"abbot", "magnificent", "magnify", "serendipity", "obfuscate"}
+    dedup = VocabularyDeduplicator()
+
+    assert dedup.is_duplicate_term("Serendipty", existing) == (True, "similar_exists:serendipity")
+    assert dedup.is_duplicate_term("magnificence", existing) == (True, "similar_exists:magnificent")
+    assert dedup.is_duplicate_term("abbots", existing) == (True, "similar_exists:abbot")
+    assert dedup.is_duplicate_term("perspicacious", existing) == (False, "unique")
+
+    # Edit-distance matching is opt-in
+    assert dedup._find_similar_terms("xbfuscate", existing) == []
+    fuzzy = VocabularyDeduplicator(max_edits=1)
+    assert fuzzy._find_similar_terms("xbfuscate", existing) == ["obfuscate"]
+
+
+def _linear_scan_similar(term, existing_terms):
+    """The deduplicator's original same-root scan, without its 1000-term cap."""
+    if len(term) < 4:
+        return set()
+    similar = set()
+    term_root = term[:6]
+    for existing in existing_terms:
+        if len(existing) < 4:
+            continue
+        if existing.startswith(term_root) and abs(len(existing) - len(term)) <= 3:
+            similar.add(existing)
+        elif term.startswith(existing[:6]) and abs(len(existing) - len(term)) <= 3:
+            similar.add(existing)
+    return similar
+
+
+def test_indexed_similarity_matches_linear_scan():
+    existing = {
+        "abbot", "abbey", "bitter", "dimmer", "immunity", "saying", "magnificent", "magnify",
+        "magnitude", "serendipity", "obfuscate", "obfuscation", "runs", "running", "runner",
+        "lucid", "lucidity", "lucent", "cat", "catalogue", "catalog", "catalyst",
+    }
+    candidates = [
+        "abbots", "abbeys", "abbotship", "impunity", "gitter", "spying", "nimmer", "magnificence",
+        "magnifying", "magnet", "serendipitous", "obfuscated", "runways", "runnings", "lucidly",
+        "lucents", "cats", "catalogs", "catalytic", "perspicacious", "zzzz",
+    ]
+    dedup = VocabularyDeduplicator()
+    for term in candidates:
+        expected = _linear_scan_similar(term, existing)
+        found = dedup._find_similar_terms(term, existing)
+        assert set(found) <= expected, term
+        assert len(found) == min(3, len(expected)), term
+        assert dedup.is_duplicate_term(term, existing)[0] == bool(expected), term
@@ -0,0 +1,74 @@
+"""Tests for the shared known-term index."""
+
+from core.known_terms import BloomFilter, KnownTermIndex
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter.for_capacity(5000, 0.01)
+    for i in range(5000):
+        bloom.add(f"word{i}")
+
+    assert all(f"word{i}" in bloom for i in range(5000))
+    false_positives = sum(f"other{i}" in bloom for i in range(5000))
+    assert false_positives < 5000 * 0.03
+
+
+def test_journal_updates_are_shared_between_processes(tmp_path):
+    KnownTermIndex.build([" Lucid ", "terse", "", "TERSE"], tmp_path)
+    writer = KnownTermIndex.open(tmp_path)
+    reader = KnownTermIndex.open(tmp_path, refresh_interval=3600)
+
+    assert len(writer) == 2
+    assert "LUCID" in writer and "opaque" not in writer
+
+    assert writer.add_many(["Opaque", "terse"]) == 1
+    assert "opaque" in writer
+    assert "opaque" not in reader  # not refreshed yet
+    assert reader.refresh() == 1
+    assert "opaque" in reader
+
+    # A rebuild keeps lines journalled while the snapshot was being read
+    def database_terms():
+        yield "lucid"
+        writer.add("limpid")
+
+    KnownTermIndex.build(database_terms(), tmp_path)
+    reader.refresh()
+    assert reader.generation == 2
+    assert set(reader) == {"lucid", "limpid"}
+
+
+def test_bloom_only_mode_confirms_positives(tmp_path):
+    KnownTermIndex.build(["lucid", "terse"], tmp_path)
+    index = KnownTermIndex.open(tmp_path, exact=False)
+    confirmed = []
+
+    def confirm(term):
+        confirmed.append(term)
+        return term == "lucid"
+
+    assert index.contains("Lucid", confirm=confirm)
+    assert not index.contains("terse", confirm=confirm)  # deleted since the snapshot
+    assert not index.contains("zzyzx-not-a-term", confirm=confirm)
+    assert confirmed == ["lucid", "terse"]
+
+
+def test_fuzzy_index_follows_journal_updates(tmp_path):
+    KnownTermIndex.build(["lucid"], tmp_path)
+    index = KnownTermIndex.open(tmp_path)
+
+    assert index.fuzzy().within_edits("lucud") == [("lucid", 1)]
+    index.add("limpid")
+    assert index.fuzzy().within_edits("limpit") == [("limpid", 1)]
+
+
+def test_deduplicator_shares_the_index_without_copying(tmp_path, monkeypatch):
+    from core import vocabulary_deduplicator as module
+
+    KnownTermIndex.build(["lucid", "terse"], tmp_path)
+    index = KnownTermIndex.open(tmp_path)
+    monkeypatch.setattr(module, "get_known_terms", lambda: index)
+
+    dedup = module.VocabularyDeduplicator()
+    assert dedup.get_all_existing_terms() is index
+    assert dedup.is_duplicate_term("Terse") == (True, "already_exists")
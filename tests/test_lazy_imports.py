@@ -0,0 +1,48 @@
+"""Tests for deferred imports and lazy package re-exports."""
+
+import sys
+import types
+
+import pytest
+
+from core.lazy_imports import LazyModule, lazy_exports, lazy_import, module_available
+
+
+def test_lazy_import_defers_until_attribute_access():
+    sys.modules.pop("colorsys", None)
+    module = lazy_import("colorsys")
+    assert isinstance(module, LazyModule)
+    assert "colorsys" not in sys.modules
+
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+    assert "rgb_to_hsv" in vars(module)
+
+
+def test_lazy_import_returns_loaded_module_and_reports_missing():
+    assert lazy_import("json") is sys.modules["json"]
+
+    missing = lazy_import("no_such_module_for_tests", install_hint="pip install nothing")
+    with pytest.raises(ImportError, match="pip install nothing"):
+        missing.anything
+
+
+def test_module_available_does_not_import():
+    sys.modules.pop("wave", None)
+    assert module_available("wave")
+    assert "wave" not in sys.modules
+    assert not module_available("no_such_module_for_tests")
+    assert not module_available("no_such_package_for_tests.sub")
+
+
+def test_lazy_exports_resolves_and_caches(monkeypatch):
+    package = types.ModuleType("lazy_pkg_for_tests")
+    package.__path__ = []
+    monkeypatch.setitem(sys.modules, "lazy_pkg_for_tests", package)
+    package.__getattr__, package.__dir__ = lazy_exports("lazy_pkg_for_tests", {"dumps": "json"})
+
+    assert package.dumps is sys.modules["json"].dumps
+    assert "dumps" in vars(package)
+    assert "dumps" in dir(package)
+    with pytest.raises(AttributeError):
+        package.missing
@@ -0,0 +1,72 @@
+"""Tests for the staged bulk frequency update in maintain_rarity."""
+
+from scripts.maintain_rarity import bulk_update_frequencies, stage_frequency_rows
+
+
+class RecordingConnection:
+    """Stands in for a psycopg connection and records what the update sends."""
+
+    def __init__(self, updated_rows=0):
+        self.statements = []
+        self.copied = []
+        self.updated_rows = updated_rows
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        self.statements.append(" ".join(sql.split()))
+
+    def copy(self, sql):
+        self.statements.append(sql)
+        return self
+
+    def write_row(self, row):
+        self.copied.append(row)
+
+    @property
+    def rowcount(self):
+        return self.updated_rows
+
+
+def test_stage_frequency_rows_merges_columns_per_word():
+    rows = stage_frequency_rows(
+        python_updates=[(4.5, 1), (2.25, 2)],
+        ngram_updates=[(1.5e-07, 2), (3.0e-09, 3)],
+        commoncrawl_updates=[(3.125, 1)],
+    )
+
+    assert sorted(rows) == [
+        (1, 4.5, None, 3.125),
+        (2, 2.25, 1.5e-07, None),
+        (3, None, 3.0e-09, None),
+    ]
+    assert stage_frequency_rows([], [], []) == []
+
+
+def test_bulk_update_copies_into_staging_and_updates_once():
+    conn = RecordingConnection(updated_rows=2)
+    rows = [(1, 4.5, None, 3.125), (2, None, 1.5e-07, None)]
+
+    assert bulk_update_frequencies(conn, rows) == 2
+
+    create, copy, update = conn.statements
+    assert create.startswith("CREATE TEMP TABLE IF NOT EXISTS frequency_staging")
+    assert create.endswith("ON COMMIT DELETE ROWS")
+    assert copy == "COPY frequency_staging (id, python_wordfreq, ngram_freq, commoncrawl_freq) FROM STDIN"
+    assert conn.copied == rows
+    assert update.startswith("UPDATE vocab.defined AS d")
+    assert "FROM frequency_staging AS s WHERE d.id = s.id" in update
+    assert "COALESCE(s.ngram_freq, d.ngram_freq)" in update
+
+
+def test_bulk_update_without_rows_sends_nothing():
+    conn = RecordingConnection()
+    assert bulk_update_frequencies(conn, []) == 0
+    assert conn.statements == []
@@ -0,0 +1,113 @@
+"""Tests for request/query instrumentation and the Prometheus exposition."""
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from core.database_manager import CursorWrapper
+from core.metrics import MAX_QUERY_FINGERPRINTS, MetricsMiddleware, MetricsRegistry, fingerprint_query
+
+
+class RecordingCursor:
+    rowcount = 3
+
+    def execute(self, query, params=None, **kwargs):
+        if "broken" in query:
+            raise RuntimeError("syntax error")
+
+
+def test_fingerprints_strip_literals_and_collapse_lists():
+    assert fingerprint_query(
+        "SELECT id FROM vocab.defined -- lookup\n WHERE term = 'o''clock' AND id IN (1, 2,3) LIMIT 10"
+    ) == "SELECT id FROM vocab.defined WHERE term = ? AND id IN (?+) LIMIT ?"
+    assert fingerprint_query("UPDATE t SET x = %s WHERE id = %(id)s") == "UPDATE t SET x = ? WHERE id = ?"
+    assert fingerprint_query("SELECT col2, 1.5e3 FROM t2") == "SELECT col2, ? FROM t2"
+
+
+def test_registry_aggregates_queries_and_renders_prometheus():
+    registry = MetricsRegistry(enabled=True)
+    for seconds in (0.002, 0.02, 0.2):
+        registry.observe_query("SELECT * FROM t WHERE id = %s", seconds, rows=1)
+    registry.observe_query("SELECT * FROM t WHERE id = 7", 0.004, failed=True)
+    registry.observe_query("DELETE FROM t", 1.5)
+    registry.observe_pool_wait(0.0002)
+
+    top = registry.slow_queries(order_by="count")
+    assert top[0]["fingerprint"] == "SELECT * FROM t WHERE id = ?"
+    assert (top[0]["count"], top[0]["rows"], top[0]["errors"]) == (4, 3, 1)
+    assert top[0]["p95"] == 0.2  # the 0.25 bucket bound, capped at the observed max
+    assert registry.slow_queries(limit=1)[0]["fingerprint"] == "DELETE FROM t"
+
+    text = registry.render_prometheus()
+    assert 'vocab_db_query_duration_seconds_bucket{query="SELECT * FROM t WHERE id = ?",le="0.005"} 2' in text
+    assert 'vocab_db_query_duration_seconds_bucket{query="DELETE FROM t",le="+Inf"} 1' in text
+    assert 'vocab_db_query_errors_total{query="SELECT * FROM t WHERE id = ?"} 1' in text
+    assert 'vocab_db_pool_wait_seconds_bucket{le="0.0005"} 1' in text
+
+    for index in range(MAX_QUERY_FINGERPRINTS + 5):
+        registry.observe_query(f"SELECT * FROM table_{chr(97 + index % 26)}{index // 26}", 0.001)
+    assert len(registry.queries) == MAX_QUERY_FINGERPRINTS + 1
+    assert registry.queries["<other>"].latency.count > 0
+
+    disabled = MetricsRegistry(enabled=False)
+    disabled.observe_query("SELECT 1", 0.1)
+    assert not disabled.queries
+
+
+def test_middleware_labels_requests_by_route_template(tmp_path):
+    (tmp_path / "a.txt").write_text("hi")
+    registry = MetricsRegistry(enabled=True)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, registry=registry)
+    app.mount("/static", StaticFiles(directory=tmp_path), name="static")
+
+    @app.get("/word/{word_id}")
+    async def word(word_id: int):
+        if word_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": word_id}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    client = TestClient(app, raise_server_exceptions=False)
+    for path in ["/word/1", "/word/2", "/word/0", "/static/a.txt", "/nowhere", "/boom"]:
+        client.get(path)
+
+    assert registry.requests[("GET", "/word/{word_id}")].count == 3
+    assert registry.responses[("GET", "/word/{word_id}", "2xx")] == 2
+    assert registry.responses[("GET", "/word/{word_id}", "4xx")] == 1
+    assert registry.requests[("GET", "/static/{path}")].count == 1
+    assert registry.requests[("GET", "<unmatched>")].count == 1
+    assert registry.responses[("GET", "/boom", "5xx")] == 1
+    assert 'vocab_http_request_duration_seconds_count{method="GET",route="/word/{word_id}"} 3' in (
+        registry.render_prometheus()
+    )
+
+
+def test_cursor_wrapper_times_statements(monkeypatch):
+    registry = MetricsRegistry(enabled=True)
+    monkeypatch.setattr("core.database_manager.metrics", registry)
+    cursor = CursorWrapper(RecordingCursor())
+
+    cursor.execute("SELECT * FROM vocab.defined WHERE id = %s", (5,))
+    with pytest.raises(RuntimeError):
+        cursor.execute("SELECT broken")
+
+    stats = registry.queries["SELECT * FROM vocab.defined WHERE id = ?"]
+    assert (stats.latency.count, stats.rows) == (1, 3)
+    assert registry.queries["SELECT broken"].errors == 1
+
+
+def test_scrape_token_is_required_and_compared_exactly():
+    assert not MetricsRegistry(enabled=True, scrape_token="").authorize_scrape("Bearer ")
+
+    registry = MetricsRegistry(enabled=True, scrape_token="s3cret")
+    assert registry.authorize_scrape("Bearer s3cret")
+    assert registry.authorize_scrape("bearer  s3cret ")
+    assert not registry.authorize_scrape(None)
+    assert not registry.authorize_scrape("Bearer s3cre")
+    assert not registry.authorize_scrape("Basic s3cret")
+    assert not registry.authorize_scrape("s3cret")
@@ -0,0 +1,111 @@
+"""Tests for the memory-mapped n-gram index."""
+
+import gzip
+import importlib.util
+import math
+from pathlib import Path
+
+import pytest
+
+from core.ngram_index import NgramIndex, build_index
+from scripts.build_complete_ngram_index import build_complete_index
+
+YEAR_TOTALS = {1998: 1_000_000, 1999: 2_000_000, 2000: 4_000_000}
+
+
+def _write_shard(path, lines):
+    with gzip.open(path, "wt", encoding="utf-8") as handle:
+        handle.write("".join(line + "\n" for line in lines))
+
+
+def _build(tmp_path):
+    data_dir = tmp_path / "ngram_data"
+    data_dir.mkdir()
+    _write_shard(
+        data_dir / "googlebooks-eng-all-1gram-20120701-a.gz",
+        [
+            "Apple\t1999\t10\t3",
+            "aardvark\t1998\t4\t1",
+            "aardvark\t2000\t6\t2",
+            "apple\t1999\t5\t2",
+            "apple\t1850\t7\t1",  # outside the indexed window
+        ],
+    )
+    _write_shard(
+        data_dir / "googlebooks-eng-all-1gram-20120701-b.gz",
+        ["bee\t2000\t8\t4", "Bee\t2000\t2\t1", "bad line"],
+    )
+    totals = tmp_path / "total_counts"
+    totals.write_text("\t".join(f"{year},{count},1" for year, count in YEAR_TOTALS.items()))
+    output = build_index(data_dir, totals, tmp_path / "index", year_min=1990, year_max=2010)
+    return NgramIndex.open(output)
+
+
+def _expected_mean(counts, alpha=1e-6):
+    zipfs = [
+        math.log10((counts.get(year, 0) + alpha) / total * 1_000_000)
+        for year, total in YEAR_TOTALS.items()
+    ]
+    return sum(zipfs) / len(zipfs)
+
+
+def test_series_merge_case_variants_and_drop_out_of_window_years(tmp_path):
+    index = _build(tmp_path)
+
+    assert len(index) == 3
+    years, counts = index.series("APPLE")
+    assert years.tolist() == [1999]
+    assert counts.tolist() == [15]
+    assert index.total("bee") == 10
+    assert index.find("apples") is None
+    assert "aardvark" in index
+    assert index.year_totals() == YEAR_TOTALS
+
+
+def test_zipf_scores_match_streaming_formula(tmp_path):
+    index = _build(tmp_path)
+
+    scores = index.zipf_scores(["Aardvark", "bee", "zebra"], year_start=1990, year_end=2005)
+
+    assert scores["aardvark"] == pytest.approx(_expected_mean({1998: 4, 2000: 6}))
+    assert scores["bee"] == pytest.approx(_expected_mean({2000: 10}))
+    assert scores["zebra"] == pytest.approx(_expected_mean({}))
+    assert index.zipf_scores(["zebra"], 1990, 2005, missing_as_none=True) == {"zebra": None}
+    assert index.zipf_scores(["bee"], 1990, 2005, alpha=0)["bee"] == pytest.approx(
+        math.log10(10 / 4_000_000 * 1_000_000)
+    )
+    with pytest.raises(ValueError):
+        index.zipf_scores(["bee"], 1900, 2019)
+
+
+def test_total_zipf_scores_match_the_getngrams_fallback(tmp_path):
+    index = _build(tmp_path)
+    assert index.corpus_total() == 15 + 10 + 10
+
+    # The fallback reads word_frequencies_complete.txt next to getngrams.py.
+    # Built from the same shards and window, the 1850 apple row stays out of
+    # both corpora.
+    build_complete_index(
+        tmp_path / "ngram_data",
+        tmp_path / "word_frequencies_complete.txt",
+        workers=1,
+        work_dir=tmp_path / "complete_work",
+        year_min=1990,
+        year_max=2010,
+    )
+    lines = (tmp_path / "word_frequencies_complete.txt").read_text().splitlines()
+    assert dict(line.split("\t") for line in lines) == {"apple": "15", "aardvark": "10", "bee": "10"}
+
+    source = Path(__file__).resolve().parents[1] / "temp" / "getngrams.py"
+    spec = importlib.util.spec_from_file_location("getngrams_fixture", source)
+    getngrams = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(getngrams)
+    getngrams.__file__ = str(tmp_path / "getngrams.py")
+
+    words = ["apple", "bee", "zebra"]
+    fallback = getngrams.getNgrams(words)
+    indexed = index.total_zipf_scores(words)
+    assert indexed["apple"] == pytest.approx(fallback["apple"])
+    assert indexed["apple"] == pytest.approx(math.log10(15 / 35 * 1_000_000))
+    assert indexed["bee"] == pytest.approx(fallback["bee"])
+    assert indexed["zebra"] is None and fallback["zebra"] is None
@@ -0,0 +1,131 @@
+"""Tests for the pronunciation audio library, disk cache and render dedupe."""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from core.pronunciation_audio import (
+    AudioCache,
+    PronunciationAudioService,
+    PronunciationBusy,
+    PronunciationUnavailable,
+    normalize_word,
+)
+
+
+class RecordingRenderer:
+    """Writes ``size`` bytes per render and records what was spoken."""
+
+    def __init__(self, size=100, delay=0.0):
+        self.size = size
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, text, path):
+        with self._lock:
+            self.calls.append(text)
+        time.sleep(self.delay)
+        path.write_bytes(b"\0" * self.size)
+
+
+def _service(tmp_path, renderer, **kwargs):
+    library = tmp_path / "library"
+    library.mkdir(exist_ok=True)
+    return PronunciationAudioService(library, tmp_path / "cache", renderer=renderer, **kwargs)
+
+
+def test_normalize_word_rejects_paths_and_markup():
+    assert normalize_word("  Sea   Horse ") == "sea horse"
+    assert normalize_word("o'clock") == "o'clock"
+    for bad in ["", "../etc/passwd", "a/b", "<b>", "x" * 65, "123", "-dash"]:
+        with pytest.raises(ValueError):
+            normalize_word(bad)
+
+
+def test_prerendered_library_then_cache_then_render(tmp_path):
+    renderer = RecordingRenderer()
+    service = _service(tmp_path, renderer)
+    library = tmp_path / "library"
+    (library / "42_Ephemeral.wav").write_bytes(b"x")
+    (library / "7_ephemeral.wav").write_bytes(b"y")
+
+    async def run():
+        first = await service.get("EPHEMERAL")
+        rendered = await service.get("lucid")
+        cached = await service.get("Lucid")
+        return first, rendered, cached
+
+    first, rendered, cached = asyncio.run(run())
+    service.close()
+    assert first == library / "7_ephemeral.wav"
+    assert rendered == cached and rendered.parent == tmp_path / "cache"
+    assert renderer.calls == ["lucid"]
+    assert (service.stats.library_hits, service.stats.cache_hits, service.stats.renders) == (1, 1, 1)
+
+    # Files added later are picked up once the directory changes.
+    (library / "9_lucid.wav").write_bytes(b"z")
+    os.utime(library, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert asyncio.run(service.get("lucid")) == library / "9_lucid.wav"
+
+
+def test_concurrent_requests_share_one_render(tmp_path):
+    renderer = RecordingRenderer(delay=0.05)
+    service = _service(tmp_path, renderer, workers=2)
+
+    async def run():
+        return await asyncio.gather(*(service.get(word) for word in ["terse"] * 5 + ["laconic"] * 3))
+
+    paths = asyncio.run(run())
+    service.close()
+    assert sorted(renderer.calls) == ["laconic", "terse"]
+    assert len(set(paths[:5])) == 1 and len(set(paths[5:])) == 1
+    assert service.stats.shared_renders == 6
+
+
+def test_pending_renders_are_bounded_and_failures_surface(tmp_path):
+    service = _service(tmp_path, RecordingRenderer(delay=0.05), workers=1, max_pending=1)
+
+    async def run():
+        return await asyncio.gather(service.get("one"), service.get("two"), return_exceptions=True)
+
+    first, second = asyncio.run(run())
+    service.close()
+    assert first.name.startswith("one-") and isinstance(second, PronunciationBusy)
+
+    def broken(text, path):
+        path.write_bytes(b"partial")
+        raise OSError("engine crashed")
+
+    service = _service(tmp_path, broken)
+    with pytest.raises(PronunciationUnavailable, match="engine crashed"):
+        asyncio.run(service.get("three"))
+    service.close()
+    assert not [p for p in (tmp_path / "cache").iterdir() if p.name.startswith(".")]
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(tmp_path, max_bytes=250)
+    for word in ["alpha", "beta"]:
+        part = cache.temp_path()
+        part.write_bytes(b"\0" * 100)
+        cache.put(word, part)
+
+    assert cache.get("alpha") is not None  # alpha is now the most recent
+    part = cache.temp_path()
+    part.write_bytes(b"\0" * 100)
+    cache.put("gamma", part)
+
+    assert cache.get("beta") is None
+    assert cache.get("alpha") is not None and cache.get("gamma") is not None
+    assert cache.total_bytes == 200
+
+    # Recency is restored from file mtimes after a restart.
+    os.utime(tmp_path / cache.filename_for("alpha"), ns=(1, 1))
+    (tmp_path / ".interrupted.wav").write_bytes(b"\0" * 10)
+    reopened = AudioCache(tmp_path, max_bytes=150)
+    assert len(reopened) == 1 and reopened.get("gamma") is not None
+    assert not (tmp_path / ".interrupted.wav").exists()
@@ -0,0 +1,77 @@
+"""Tests for the process-pool pronunciation batch generator and its manifest."""
+
+from core.pronunciation_batch import AudioJob, BatchAudioGenerator, BatchManifest, synthesis_key
+
+
+def fake_engine(text, path):
+    """Module-level so worker processes can unpickle it; logs every render."""
+    if text == "unspeakable":
+        raise RuntimeError("engine rejected input")
+    with (path.parent / "renders.log").open("a", encoding="utf-8") as log:
+        log.write(text + "\n")
+    path.write_bytes(b"RIFF" + text.encode("utf-8"))
+
+
+def _renders(output_dir):
+    log = output_dir / "renders.log"
+    return sorted(log.read_text(encoding="utf-8").split()) if log.exists() else []
+
+
+def _generator(tmp_path, **kwargs):
+    return BatchAudioGenerator(
+        tmp_path / "audio",
+        "espeak",
+        workers=2,
+        manifest_path=tmp_path / "manifest.jsonl",
+        renderer=fake_engine,
+        **kwargs,
+    )
+
+
+JOBS = [
+    AudioJob(1, "lead", "[[lEd]]"),
+    AudioJob(2, "lead", "[[li:d]]"),
+    AudioJob(3, "Lead", "[[li:d]]"),  # same sound as word 2: rendered once
+    AudioJob(4, "a/b", "ab"),
+    AudioJob(5, "nope", "unspeakable"),
+]
+
+
+def test_batch_renders_each_sound_once_and_links_duplicates(tmp_path):
+    generator = _generator(tmp_path)
+    results = {}
+    stats = generator.run(JOBS, lambda word_id, path: results.setdefault(word_id, path))
+
+    audio = tmp_path / "audio"
+    assert _renders(audio) == ["[[lEd]]", "[[li:d]]", "ab"]
+    assert (stats.rendered, stats.linked, stats.failed) == (3, 1, 1)
+    assert sorted(results) == [1, 2, 3, 4]
+    assert results[4] == audio / "4_a_b.wav"
+    assert results[3].read_bytes() == results[2].read_bytes() == b"RIFF[[li:d]]"
+    assert not [p for p in audio.iterdir() if p.name.startswith(".")]
+
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+    assert manifest.entries[5].filename is None and "rejected" in manifest.entries[5].error
+    assert manifest.entries[2].key == synthesis_key("espeak", "[[li:d]]", "wav")
+
+
+def test_rerun_resumes_from_manifest(tmp_path):
+    _generator(tmp_path).run(JOBS[:3])
+    with (tmp_path / "manifest.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write('{"word_id": 9, "key"')  # torn final line from a killed run
+
+    # Word 1 changed pronunciation, word 2's file went missing, word 6 reuses
+    # an existing render under a new id.
+    (tmp_path / "audio" / "2_lead.wav").unlink()
+    (tmp_path / "audio" / "renders.log").unlink()
+    jobs = [AudioJob(1, "lead", "[[lEEd]]"), JOBS[1], JOBS[2], AudioJob(6, "leed", "[[li:d]]")]
+    results = {}
+    stats = _generator(tmp_path).run(jobs, lambda word_id, path: results.setdefault(word_id, path))
+
+    assert _renders(tmp_path / "audio") == ["[[lEEd]]"]
+    assert stats.skipped == 1 and stats.rendered == 1 and stats.linked == 2
+    assert sorted(results) == [1, 2, 3, 6]
+    assert (tmp_path / "audio" / "6_leed.wav").read_bytes() == b"RIFF[[li:d]]"
+
+    stats = _generator(tmp_path).run(jobs)
+    assert (stats.skipped, stats.rendered, stats.linked) == (4, 0, 0)
@@ -0,0 +1,79 @@
+"""Tests for the incremental rarity engine computations."""
+
+import numpy as np
+import pytest
+
+from core.rarity_engine import (
+    RarityState,
+    blend_rarity,
+    ks_distance,
+    percent_rank_rarity,
+)
+
+NAN = np.nan
+
+
+def _percent_rank_sql(column, value):
+    """Brute-force ``1 - PERCENT_RANK() OVER (ORDER BY column)`` with NULLS LAST."""
+    preceding = sum(1 for other in column if other is not None and other < value)
+    return 1.0 - preceding / (len(column) - 1)
+
+
+def test_percent_rank_matches_window_function_semantics():
+    column = [3.5, None, -999.0, 1.2, 3.5, 5.0, None]
+    distribution = np.sort(np.array([v for v in column if v is not None]))
+    values = np.array([NAN if v is None else v for v in column])
+
+    result = percent_rank_rarity(distribution, len(column), values)
+
+    for value, rarity in zip(column, result):
+        if value is None or value == -999.0:
+            assert np.isnan(rarity)
+        else:
+            assert rarity == pytest.approx(_percent_rank_sql(column, value))
+
+
+def test_blend_renormalises_missing_sources():
+    blended = blend_rarity(np.array([[0.5, NAN, NAN], [1.0, 0.0, NAN], [NAN, NAN, NAN]]))
+
+    assert blended[0] == pytest.approx(0.5)
+    assert blended[1] == pytest.approx(0.45 / 0.80)
+    assert np.isnan(blended[2])
+
+
+def test_incremental_apply_matches_full_rebuild():
+    ids = np.array([1, 2, 3, 4, 5])
+    values = np.array(
+        [
+            [4.0, 1.0, NAN],
+            [2.0, -999.0, 0.5],
+            [NAN, 3.0, 0.7],
+            [2.0, 2.0, NAN],
+            [5.0, NAN, 0.1],
+        ]
+    )
+    state = RarityState.from_values(ids, values.copy())
+
+    changed_ids = np.array([3, 6])
+    changed_values = np.array([[3.0, 3.0, 0.7], [1.0, NAN, NAN]])
+    mask = state.apply(changed_ids, changed_values)
+
+    expected_values = np.vstack([values, changed_values[1:]])
+    expected_values[2] = changed_values[0]
+    rebuilt = RarityState.from_values(np.array([1, 2, 3, 4, 5, 6]), expected_values)
+
+    assert mask.tolist() == [True, True]
+    assert state.total_rows == 6
+    for source in rebuilt.current:
+        np.testing.assert_array_equal(state.current[source], rebuilt.current[source])
+    np.testing.assert_allclose(
+        state.rarity_for(changed_values), rebuilt.rarity_for(changed_values)
+    )
+    assert state.drift() > 0
+
+
+def test_ks_distance_bounds():
+    base = np.array([1.0, 2.0, 3.0, 4.0])
+    assert ks_distance(base, base) == 0.0
+    assert ks_distance(base, np.array([1.0, 2.0, 3.0, 5.0])) == pytest.approx(0.25)
+    assert ks_distance(np.array([]), base) == 1.0
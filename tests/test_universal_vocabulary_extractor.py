@@ -0,0 +1,187 @@
+"""Tests for batched spaCy extraction in UniversalVocabularyExtractor."""
+
+import random
+import sys
+import types
+
+import pytest
+
+from harvesters.universal_vocabulary_extractor import ExtractionStats, UniversalVocabularyExtractor
+
+PIPE_NAMES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+
+class FakeToken:
+    def __init__(self, word):
+        self.text = word
+        self.lemma_ = word.lower()
+        self.pos_ = "NOUN"
+        self.tag_ = "NN"
+        self.is_punct = False
+        self.is_space = False
+        self.is_stop = False
+        self.is_alpha = word.isalpha()
+        self.ent_type_ = ""
+        self.dep_ = "dobj"
+        self.morph = ""
+        self.is_oov = False
+        self.has_vector = False
+
+
+class FakeSpan:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = [FakeToken(word) for word in text.split()]
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+
+class FakeDoc:
+    def __init__(self, text):
+        self.text = text
+        self.sents = [FakeSpan(text)]
+
+    def __len__(self):
+        return len(self.sents[0].tokens)
+
+
+class FakeNlp:
+    """Stands in for a loaded pipeline; records every pipe() call"""
+
+    def __init__(self, pipe_names=PIPE_NAMES):
+        self.pipe_names = list(pipe_names)
+        self.calls = []
+
+    def pipe(self, texts, as_tuples=False, batch_size=1000, n_process=1, disable=()):
+        assert as_tuples
+        call = {"batch_size": batch_size, "n_process": n_process, "disable": list(disable), "chunks": []}
+        self.calls.append(call)
+        for text, context in texts:
+            call["chunks"].append((text, context))
+            yield FakeDoc(text), context
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    nlp = FakeNlp()
+    monkeypatch.setitem(sys.modules, "spacy", types.SimpleNamespace(load=lambda name: nlp))
+    extractor = UniversalVocabularyExtractor()
+    assert extractor.use_spacy and extractor.nlp is nlp
+    return extractor
+
+
+def _text(*words):
+    # Padded past the 50-character minimum with words the filters reject
+    return " ".join(words + ("the",) * 20)
+
+
+def test_batch_streams_every_text_through_one_pipe_call(extractor):
+    texts = [
+        _text("phenomenology", "epistemology"),
+        "too short",
+        _text("cardiovascular", "phenomenology"),
+    ]
+    metadata = [{"source": "a"}, {"source": "b"}, {"source": "c"}]
+
+    results = extractor.extract_candidates_batch(texts, metadata, batch_size=7, n_process=2)
+
+    assert len(extractor.nlp.calls) == 1
+    call = extractor.nlp.calls[0]
+    assert call["batch_size"] == 7 and call["n_process"] == 2
+    assert [context for _, context in call["chunks"]] == [0, 2]
+
+    assert len(results) == 3
+    assert {c.term for c in results[0]} == {"phenomenology", "epistemology"}
+    assert results[1] == []
+    # De-duplication is per text, so a shared term appears in both lists
+    assert {c.term for c in results[2]} == {"cardiovascular", "phenomenology"}
+    assert all(c.source_metadata == {"source": "c"} for c in results[2])
+
+
+def test_single_metadata_dict_applies_to_every_text(extractor):
+    results = extractor.extract_candidates_batch(
+        [_text("phenomenology"), _text("epistemology")], {"source": "shared"}
+    )
+
+    assert [c.source_metadata for text in results for c in text] == [{"source": "shared"}] * 2
+
+    with pytest.raises(ValueError):
+        extractor.extract_candidates_batch([_text("phenomenology")], [{}, {}])
+
+
+def test_candidates_are_deduplicated_across_chunks_of_one_text(extractor):
+    text = " ".join(["phenomenology epistemology"] * 40)
+
+    [candidates] = extractor.extract_candidates_batch([text], max_chunk_chars=60)
+
+    assert len(extractor.nlp.calls[0]["chunks"]) > 1
+    assert sorted(c.term for c in candidates) == ["epistemology", "phenomenology"]
+
+
+def test_batch_is_lean_by_default_and_disables_only_ner(extractor, monkeypatch):
+    extractor.extract_candidates_batch([_text("phenomenology")])
+    extractor.extract_candidates_batch([_text("phenomenology")], lean=False)
+    # Single texts keep the full pipeline
+    extractor.extract_candidates(_text("phenomenology"))
+    assert [call["disable"] for call in extractor.nlp.calls] == [["ner"], [], []]
+
+    # A pipeline without NER has nothing to disable
+    monkeypatch.setattr(extractor.nlp, "pipe_names", ["tok2vec", "tagger", "parser"])
+    extractor.extract_candidates_batch([_text("phenomenology")], lean=True)
+    assert extractor.nlp.calls[-1]["disable"] == []
+
+
+def test_last_stats_report_documents_chunks_and_tokens(extractor):
+    texts = [_text("phenomenology"), "too short", " ".join(["epistemology"] * 30)]
+
+    extractor.extract_candidates_batch(texts, max_chunk_chars=100)
+
+    stats = extractor.last_stats
+    chunks = extractor.nlp.calls[0]["chunks"]
+    assert stats.documents == 3
+    assert stats.chunks == len(chunks) > 2
+    assert stats.tokens == sum(len(text.split()) for text, _ in chunks)
+    assert stats.seconds >= 0
+
+    assert ExtractionStats(tokens=500, seconds=2.0).tokens_per_second == 250.0
+    assert ExtractionStats(tokens=500, seconds=0.0).tokens_per_second == 0.0
+
+
+def test_chunk_text_splits_on_spaces_within_max_chars():
+    chunk = UniversalVocabularyExtractor._chunk_text
+
+    assert list(chunk("abcde fghij", 5)) == ["abcde", "fghij"]
+    assert list(chunk("abcde fghij", 11)) == ["abcde fghij"]
+    assert list(chunk("abc de fghij", 8)) == ["abc de", "fghij"]
+    assert list(chunk("", 5)) == []
+
+    words = [f"w{i}" * (i % 5 + 1) for i in range(200)]
+    text = " ".join(words)
+    pieces = list(chunk(text, 40))
+    assert all(0 < len(piece) <= 40 for piece in pieces)
+    assert " ".join(pieces) == text
+
+
+def test_chunk_text_hard_splits_text_without_whitespace():
+    chunk = UniversalVocabularyExtractor._chunk_text
+
+    assert list(chunk("a" * 25, 10)) == ["a" * 10, "a" * 10, "a" * 5]
+    assert list(chunk("ab " + "c" * 12, 5)) == ["ab", "ccccc", "ccccc", "cc"]
+
+
+def test_combined_patterns_match_the_per_pattern_loops(extractor):
+    rng = random.Random(7)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCXYZ0123456789-'. "
+    words = [
+        "phenomenology", "cardiology", "whence", "notwithstanding", "hyperbole",
+        "table", "NASA", "1999", "abc", "http", "www", "co-operate", "don't",
+        "x" * 30, "word.", "cat", "Straightforward", "antidisestablishment",
+    ]
+    words += ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 35))) for _ in range(3000)]
+
+    for word in words:
+        interesting = any(p.search(word) for p in extractor.interesting_patterns.values())
+        excluded = any(p.match(word) for p in extractor.exclusion_patterns)
+        assert bool(extractor.interesting_pattern.search(word)) == interesting, word
+        assert bool(extractor.exclusion_pattern.match(word)) == excluded, word
@@ -0,0 +1,82 @@
+"""Tests for parallel parsing of the Wiktionary multistream dump."""
+
+import bz2
+
+from wiktionary_crawler.wiktionary_rare_word_crawler import (
+    CheckpointManager,
+    CrawlerConfig,
+    MultistreamDumpParser,
+    read_multistream_index,
+)
+
+TERMS = ["lucid", "the", "terse", "limpid", "opaque", "pellucid", "turbid", "gelid", "Proper Noun"]
+
+
+def _page(page_id, title):
+    text = (f"==English==\n===Etymology===\nFrom Latin {title}us.\n\n"
+            f"===Adjective===\n# Having the quality of being {title}, in a literary sense.\n")
+    return (f"  <page>\n    <title>{title}</title>\n    <ns>0</ns>\n    <id>{page_id}</id>\n"
+            f"    <revision>\n      <text xml:space=\"preserve\">{text}</text>\n    </revision>\n  </page>\n")
+
+
+def _write_dump(tmp_path, pages_per_stream=2):
+    """Build a miniature multistream dump and its offset index."""
+    header = '<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">\n  <siteinfo/>\n'
+    dump = bytearray(bz2.compress(header.encode()))
+    index_lines = []
+    for start in range(0, len(TERMS), pages_per_stream):
+        offset = len(dump)
+        pages = ""
+        for page_id, title in enumerate(TERMS[start:start + pages_per_stream], start + 1):
+            pages += _page(page_id, title)
+            index_lines.append(f"{offset}:{page_id}:{title}\n")
+        dump += bz2.compress(pages.encode())
+    dump += bz2.compress(b"</mediawiki>\n")
+
+    dump_path = tmp_path / "dump-multistream.xml.bz2"
+    index_path = tmp_path / "dump-multistream-index.txt.bz2"
+    dump_path.write_bytes(bytes(dump))
+    index_path.write_bytes(bz2.compress("".join(index_lines).encode()))
+    return dump_path, index_path
+
+
+def _config(tmp_path, **kwargs):
+    return CrawlerConfig(db_config={}, dump_dir=tmp_path / "dumps", stoplist_path=tmp_path / "stoplist.txt",
+                         checkpoint_path=tmp_path / "checkpoint.json", **kwargs)
+
+
+def test_workers_parse_streams_and_merge_in_order(tmp_path):
+    dump_path, index_path = _write_dump(tmp_path)
+    streams = read_multistream_index(index_path, dump_path)
+    assert len(streams) == 5
+    assert streams[-1].offset + streams[-1].length == dump_path.stat().st_size
+
+    config = _config(tmp_path)
+    stoplist, existing = {"the"}, {"opaque"}
+    serial = list(MultistreamDumpParser(config, workers=1).iter_results(dump_path, streams, stoplist, existing))
+    parallel = list(MultistreamDumpParser(config, workers=3).iter_results(dump_path, streams, stoplist, existing))
+
+    assert [result.stream.index for result in parallel] == list(range(5))
+    assert parallel == serial
+    assert sum(result.pages for result in parallel) == len(TERMS)
+    assert sum(result.in_stoplist for result in parallel) == 1
+    assert sum(result.already_exists for result in parallel) == 1
+    terms = [entry.term for result in parallel for entry in result.entries]
+    assert terms == ["lucid", "terse", "limpid", "pellucid", "turbid", "gelid"]
+    assert all(entry.part_of_speech == "adjective" for result in parallel for entry in result.entries)
+
+
+def test_resume_skips_committed_streams(tmp_path):
+    dump_path, index_path = _write_dump(tmp_path)
+    streams = read_multistream_index(index_path, dump_path)
+    config = _config(tmp_path)
+
+    checkpoints = CheckpointManager(config)
+    checkpoints.save(4, 2, next_stream_offset=streams[2].offset, streams_completed=2)
+    checkpoint = CheckpointManager(config).load()
+    assert checkpoint["next_stream_offset"] == streams[2].offset
+
+    parser = MultistreamDumpParser(config, workers=2)
+    resumed = list(parser.iter_results(dump_path, streams, set(), set(), checkpoint["next_stream_offset"]))
+    assert [result.stream.index for result in resumed] == [2, 3, 4]
+    assert [entry.term for result in resumed for entry in result.entries] == ["opaque", "pellucid", "turbid", "gelid"]
@@ -0,0 +1,91 @@
+"""Tests for the in-memory CSR word graph."""
+
+import pytest
+
+from core.word_graph import WordGraph
+
+
+def _sample_graph():
+    edges = {
+        "semantic": [
+            (1, 2, 0.9),
+            (1, 3, 0.5),
+            (2, 4, 0.8),
+            (3, 4, 0.95),
+            (4, 5, 0.7),
+            (2, 1, 0.6),  # duplicate pair keeps the stronger weight
+        ],
+        "phonetic": [(1, 5, 0.75)],
+    }
+    metadata = {word_id: {"id": word_id, "term": f"w{word_id}"} for word_id in range(1, 7)}
+    return WordGraph.from_edge_lists(edges, metadata=metadata, embedding_model="test-model")
+
+
+def test_neighbors_sorted_and_filtered_by_weight():
+    graph = _sample_graph()
+
+    neighbors = graph.neighbors(1)
+    assert [word_id for word_id, _ in neighbors] == [2, 3]
+    assert [weight for _, weight in neighbors] == pytest.approx([0.9, 0.5])
+    assert [word_id for word_id, _ in graph.neighbors(1, min_weight=0.6)] == [2]
+    assert graph.neighbors(6) == []
+    assert graph.neighbors(99) == []
+    assert graph.edge_count("semantic") == 5
+    assert graph.neighbors(1, kind="phonetic")[0][0] == 5
+
+
+def test_k_hop_expands_and_respects_max_nodes():
+    graph = _sample_graph()
+
+    one_hop = graph.k_hop(1, hops=1)
+    assert set(one_hop) == {1, 2, 3}
+    assert one_hop[1] == (0, None, 1.0)
+
+    two_hop = graph.k_hop(1, hops=2)
+    assert set(two_hop) == {1, 2, 3, 4}
+    assert two_hop[4][0] == 2
+    assert two_hop[4][1] == 3  # reached through the strongest edge
+
+    limited = graph.k_hop(1, hops=3, max_nodes=3)
+    assert set(limited) == {1, 2, 3}
+
+
+def test_edges_within_returns_each_edge_once():
+    graph = _sample_graph()
+
+    edges = graph.edges_within([2, 3, 4], min_weight=0.75)
+    assert [(a, b) for a, b, _ in edges] == [(3, 4), (2, 4)]
+
+
+def test_shortest_path_prefers_strong_edges():
+    graph = _sample_graph()
+
+    path = graph.shortest_path(1, 5)
+    assert [word_id for word_id, _ in path] == [1, 2, 4, 5]
+    assert graph.shortest_path(1, 5, min_weight=0.85) is None
+    assert graph.shortest_path(1, 5, max_hops=2) is None
+    assert graph.shortest_path(1, 6) is None
+
+
+def test_hop_limited_path_is_not_shadowed_by_a_cheaper_longer_route():
+    graph = WordGraph.from_edge_lists(
+        {"semantic": [(1, 2, 0.99), (2, 3, 0.99), (1, 3, 0.1), (3, 4, 0.99)]}
+    )
+
+    assert [word_id for word_id, _ in graph.shortest_path(1, 4)] == [1, 2, 3, 4]
+    path = graph.shortest_path(1, 4, max_hops=2)
+    assert [word_id for word_id, _ in path] == [1, 3, 4]
+    assert [weight for _, weight in path] == pytest.approx([1.0, 0.1, 0.99])
+    assert graph.shortest_path(1, 4, max_hops=1) is None
+
+
+def test_snapshot_round_trip(tmp_path):
+    graph = _sample_graph()
+    snapshot = graph.save(tmp_path / "graph.npz")
+
+    restored = WordGraph.load(snapshot)
+
+    assert restored.embedding_model == "test-model"
+    assert restored.node_count == graph.node_count
+    assert restored.neighbors(4) == graph.neighbors(4)
+    assert restored.get_metadata(6) == {"id": 6, "term": "w6"}
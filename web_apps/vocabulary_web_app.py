@@ -5,8 +5,9 @@ Browse and explore vocabulary database with search, filtering, and detailed word
 """
 
 from fastapi import FastAPI, HTTPException, Query, Request, Form, Depends, status
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.templating import Jinja2Templates
 from typing import Optional, List, Any, Dict, Tuple
 from collections import defaultdict
@@ -32,6 +33,14 @@ from core.analytics import analytics
 from core.user_word_exclusions import UserWordExclusions
 import re
 from core.comprehensive_definition_lookup import ComprehensiveDefinitionLookup
+from core.word_graph import EDGE_KINDS, word_graph_service
+from core.dictionary_snapshot import snapshot_from_environment
+from core.flashcard_sync import (
+    CARD_PROGRESS_BATCH_UPSERT_SQL, StudyResult, apply_study_results, parse_study_results,
+)
+from core.known_terms import get_known_terms, record_known_terms
+from core.pronunciation_audio import PronunciationAudioService, PronunciationBusy, PronunciationUnavailable
+from core.metrics import MetricsMiddleware, metrics
 import asyncio
 from psycopg import errors as pg_errors
 
@@ -39,6 +48,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Vocabulary Explorer", description="Browse and explore vocabulary database")
+app.add_middleware(MetricsMiddleware)
+
+# Deepest neighbourhood offered by the word graph endpoint
+MAX_GRAPH_HOPS = 4
 
 # Setup templates
 templates = Jinja2Templates(directory="templates")
@@ -46,8 +59,37 @@ templates = Jinja2Templates(directory="templates")
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Pre-rendered pronunciations, with locally synthesised audio for words that have none
+pronunciation_audio = PronunciationAudioService(library_dir="pronunciation_files")
+
+
+class PronunciationFiles(StaticFiles):
+    """Serve ``pronunciation_files``; ``/pronunciation/{word}`` falls back to the audio service."""
+
+    async def get_response(self, path: str, scope):
+        try:
+            return await super().get_response(path, scope)
+        except StarletteHTTPException as exc:
+            if exc.status_code != 404 or path.endswith(".wav") or "/" in path:
+                raise
+
+        try:
+            audio_path = await pronunciation_audio.get(path)
+        except ValueError:
+            raise StarletteHTTPException(status_code=404)
+        except PronunciationBusy:
+            raise StarletteHTTPException(status_code=503, headers={"Retry-After": "2"})
+        except PronunciationUnavailable as e:
+            logger.warning(f"Pronunciation unavailable for '{path}': {e}")
+            raise StarletteHTTPException(status_code=503)
+
+        response = self.file_response(str(audio_path), os.stat(audio_path), scope)
+        response.headers["Cache-Control"] = "public, max-age=86400"
+        return response
+
+
 # Mount pronunciation files (audio)
-app.mount("/pronunciation", StaticFiles(directory="pronunciation_files"), name="pronunciation")
+app.mount("/pronunciation", PronunciationFiles(directory="pronunciation_files"), name="pronunciation")
 
 @dataclass
 class Word:
@@ -241,11 +283,40 @@ class WordQueryBuilder:
         return where_clause, params
 
 
+# Hot statements, prepared once per pooled connection (see core.database_manager)
+WORD_BY_ID_STATEMENT = db_manager.register_statement(
+    "word_by_id",
+    # Includes frequency_rank for display
+    f"""
+    SELECT * FROM (
+        SELECT {WordQueryBuilder.WORD_COLUMNS},
+               RANK() OVER (
+                   ORDER BY {WordQueryBuilder.RARITY_VALUE_EXPRESSION} ASC NULLS LAST
+               ) AS frequency_rank
+        {WordQueryBuilder.WORD_JOINS}
+        WHERE {WordQueryBuilder.RARITY_VALUE_EXPRESSION} IS NOT NULL
+    ) ranked
+    WHERE ranked.id = %s
+    """,
+)
+
+
 class VocabularyDatabase:
     def __init__(self):
         self.config = get_db_config()
         self._word_domains_table_available = True
         self._word_domains_domain_id_supported = True
+        # Read-only snapshot serving mode (DICTIONARY_SNAPSHOT); None reads PostgreSQL
+        self.snapshot = snapshot_from_environment()
+
+    @staticmethod
+    def _ranked_word(row: Optional[tuple]) -> Optional[Word]:
+        """Word from a row whose last column is the computed frequency_rank"""
+        if not row:
+            return None
+        word = WordQueryBuilder.tuple_to_word(row[:-1])
+        word.frequency_rank = row[-1]
+        return word
 
     def count_search_words(
         self,
@@ -262,6 +333,11 @@ class VocabularyDatabase:
         Note: min_frequency/max_frequency are legacy params that filter by frequency rank.
         These are computed on-the-fly when needed for backward compatibility.
         """
+        if self.snapshot is not None:
+            return self.snapshot.count_search_words(
+                query, domain, part_of_speech, min_frequency, max_frequency, min_rarity, max_rarity
+            )
+
         sql = """SELECT COUNT(*) FROM vocab.defined d
             LEFT JOIN word_rarity_metrics wrm ON d.id = wrm.id
             LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
@@ -341,6 +417,15 @@ class VocabularyDatabase:
         Note: Always computes frequency_rank for display purposes.
         If user_id is provided, excludes words that the user has excluded.
         """
+        # Exclusions are per-user live data, so signed-in searches stay on PostgreSQL;
+        # a snapshot replica needs the DB_* settings to serve signed-in traffic
+        if self.snapshot is not None and user_id is None:
+            rows = self.snapshot.search_words(
+                query, domain, part_of_speech, min_frequency, max_frequency,
+                min_rarity, max_rarity, limit, offset,
+            )
+            return [self._ranked_word(row) for row in rows]
+
         # ALWAYS compute rank for display (templates expect it)
         sql = f"""
             SELECT * FROM (
@@ -399,43 +484,22 @@ class VocabularyDatabase:
         params.extend([limit, offset])
 
         with db_manager.get_cursor() as cursor:
-            cursor.execute(sql, params)
+            # Few distinct filter combinations exist, so each is worth preparing
+            cursor.execute(sql, params, prepare=True)
             rows = cursor.fetchall()
 
-        # Convert rows to Word objects and set frequency_rank
-        words = []
-        for row in rows:
-            word = WordQueryBuilder.tuple_to_word(row[:-1])  # Exclude the extra frequency_rank column
-            word.frequency_rank = row[-1]  # Set the computed rank
-            words.append(word)
-
-        return words
+        return [self._ranked_word(row) for row in rows]
 
     def get_word_by_id(self, word_id: int) -> Optional[Word]:
         """Get word by ID using standard query builder"""
-        # Include frequency_rank for display
-        query = f"""
-            SELECT * FROM (
-                SELECT {WordQueryBuilder.WORD_COLUMNS},
-                       RANK() OVER (
-                           ORDER BY {WordQueryBuilder.RARITY_VALUE_EXPRESSION} ASC NULLS LAST
-                       ) AS frequency_rank
-                {WordQueryBuilder.WORD_JOINS}
-                WHERE {WordQueryBuilder.RARITY_VALUE_EXPRESSION} IS NOT NULL
-            ) ranked
-            WHERE ranked.id = %s
-        """
+        if self.snapshot is not None:
+            return self._ranked_word(self.snapshot.get_word_by_id(word_id))
 
         with db_manager.get_cursor() as cursor:
-            cursor.execute(query, (word_id,))
+            cursor.execute_statement(WORD_BY_ID_STATEMENT, (word_id,))
             result = cursor.fetchone()
 
-        if not result:
-            return None
-
-        word = WordQueryBuilder.tuple_to_word(result[:-1])
-        word.frequency_rank = result[-1]
-        return word
+        return self._ranked_word(result)
 
     def get_word_by_term(self, term: str) -> Optional[Word]:
         """Resolve a word by its textual term (case insensitive)."""
@@ -446,6 +510,9 @@ class VocabularyDatabase:
         if not normalized:
             return None
 
+        if self.snapshot is not None:
+            return WordQueryBuilder.tuple_to_word(self.snapshot.get_word_by_term(normalized))
+
         query = WordQueryBuilder.base_query("WHERE LOWER(d.term) = %s")
 
         with db_manager.get_cursor() as cursor:
@@ -843,8 +910,15 @@ class VocabularyDatabase:
         similarity_floor: float = 0.4,
         max_nodes: int = 30,
         include_secondary_edges: bool = True,
+        hops: int = 1,
+        edge_kind: str = "semantic",
     ) -> Dict[str, Any]:
-        """Build a local similarity graph around a focal word."""
+        """Build a local similarity graph around a focal word.
+
+        Served from the in-memory word graph when it is loaded for the selected
+        model, which also enables multi-hop and phonetic neighbourhoods. Falls
+        back to querying the similarity tables for a single hop otherwise.
+        """
 
         if word_id is None and not term:
             raise ValueError("Either word_id or term must be provided")
@@ -876,176 +950,128 @@ class VocabularyDatabase:
             elif available_models:
                 selected_model = available_models[0]
 
-        neighbor_limit = max_nodes - 1
-        neighbor_map: Dict[int, float] = {}
-
-        if neighbor_limit > 0 and selected_model:
-            neighbor_sql = """
-            SELECT
-                CASE WHEN ds.word1_id = %s THEN ds.word2_id ELSE ds.word1_id END AS neighbor_id,
-                ds.cosine_similarity
-            FROM vocab.definition_similarity ds
-            WHERE (ds.word1_id = %s OR ds.word2_id = %s)
-              AND ds.embedding_model = %s
-              AND ds.cosine_similarity >= %s
-            ORDER BY ds.cosine_similarity DESC
-            LIMIT %s
-            """
-
-            try:
-                with db_manager.get_cursor() as cursor:
-                    cursor.execute(
-                        neighbor_sql,
-                        (
-                            center_word.id,
-                            center_word.id,
-                            center_word.id,
-                            selected_model,
-                            similarity_floor,
-                            neighbor_limit,
-                        ),
-                    )
-                    neighbor_rows = cursor.fetchall()
-            except Exception as exc:
-                logger.warning(f"Unable to fetch neighbor graph: {exc}")
-                neighbor_rows = []
-
-            for neighbor_id, similarity in neighbor_rows:
-                if neighbor_id == center_word.id:
-                    continue
-
-                try:
-                    sid = int(neighbor_id)
-                except (TypeError, ValueError):
-                    continue
+        hops = max(1, min(int(hops), MAX_GRAPH_HOPS))
+        if edge_kind not in EDGE_KINDS:
+            raise ValueError(f"Unknown edge kind '{edge_kind}'")
 
-                if similarity is None:
-                    continue
-
-                if isinstance(similarity, Decimal):
-                    similarity_value = float(similarity)
-                else:
-                    similarity_value = float(similarity)
+        graph = word_graph_service.graph
+        use_graph = (
+            graph is not None
+            and graph.has_node(center_word.id)
+            and (edge_kind != "semantic" or graph.embedding_model == selected_model)
+        )
 
-                neighbor_map[sid] = similarity_value
+        if not use_graph:
+            if edge_kind != "semantic":
+                raise ValueError("Phonetic graphs require the in-memory word graph")
+            # Multi-hop expansion is only offered from the in-memory graph
+            hops = 1
+
+        # word_id -> (hop, parent_id, similarity of the edge that reached it)
+        hop_map: Dict[int, Tuple[int, Optional[int], float]] = {}
+
+        if use_graph:
+            hop_map = graph.k_hop(
+                center_word.id,
+                hops=hops,
+                kind=edge_kind,
+                min_weight=similarity_floor,
+                max_nodes=max_nodes,
+            )
+            metadata = {}
+            for node_id in hop_map:
+                node_meta = graph.get_metadata(node_id)
+                if node_meta:
+                    metadata[node_id] = node_meta
+            missing_ids = [node_id for node_id in hop_map if node_id not in metadata]
+            if missing_ids:
+                metadata.update(self._fetch_words_metadata(missing_ids))
+        else:
+            neighbor_map = self._fetch_neighbor_similarities(
+                center_word.id, selected_model, similarity_floor, max_nodes - 1
+            )
+            hop_map = {center_word.id: (0, None, 1.0)}
+            for neighbor_id, similarity_value in neighbor_map.items():
+                hop_map[neighbor_id] = (1, center_word.id, similarity_value)
+            metadata = self._fetch_words_metadata(list(hop_map.keys()))
 
-        node_ids = [center_word.id] + list(neighbor_map.keys())
-        metadata = self._fetch_words_metadata(node_ids)
+        # Ensure center metadata is present for consistent response
+        metadata.setdefault(
+            center_word.id,
+            {
+                "id": center_word.id,
+                "term": center_word.term,
+                "part_of_speech": center_word.part_of_speech,
+                "final_rarity": None,
+                "primary_domain": None,
+                "domain_id": None,
+                "domain_name": None,
+                "domain_description": None,
+                "definition_excerpt": center_word.definition[:200] + "..."
+                if center_word.definition and len(center_word.definition) > 200
+                else center_word.definition,
+            },
+        )
 
-        # Filter out neighbors without metadata (e.g., if missing joins)
+        # Filter out nodes without metadata (e.g., if missing joins)
+        valid_nodes = {
+            node_id: entry
+            for node_id, entry in hop_map.items()
+            if node_id != center_word.id and node_id in metadata
+        }
         valid_neighbor_map = {
             node_id: similarity
-            for node_id, similarity in neighbor_map.items()
-            if node_id in metadata
+            for node_id, (hop, _parent, similarity) in valid_nodes.items()
+            if hop == 1
         }
 
         edges: List[Dict[str, Any]] = []
         edge_keys = set()
         degree_counts = defaultdict(int)
 
-        for neighbor_id, similarity_value in valid_neighbor_map.items():
-            edge_key = tuple(sorted((center_word.id, neighbor_id)))
+        def add_edge(source_id: int, target_id: int, similarity_value: float) -> None:
+            if source_id == target_id:
+                return
+            if source_id not in metadata or target_id not in metadata:
+                return
+
+            edge_key = tuple(sorted((source_id, target_id)))
             if edge_key in edge_keys:
-                continue
+                return
+
             edge_keys.add(edge_key)
             edges.append(
                 {
-                    "source": center_word.id,
-                    "target": neighbor_id,
+                    "source": source_id,
+                    "target": target_id,
                     "similarity": similarity_value,
                 }
             )
-            degree_counts[center_word.id] += 1
-            degree_counts[neighbor_id] += 1
+            degree_counts[source_id] += 1
+            degree_counts[target_id] += 1
+
+        for node_id, (_hop, parent_id, similarity_value) in valid_nodes.items():
+            if parent_id is not None:
+                add_edge(parent_id, node_id, similarity_value)
 
         secondary_floor = None
-        if include_secondary_edges and valid_neighbor_map and selected_model:
-            neighbor_ids = list(valid_neighbor_map.keys())
-            if len(neighbor_ids) > 1:
-                secondary_floor = max(similarity_floor - 0.05, 0.3)
-                neighbor_tuple = tuple(int(node_id) for node_id in neighbor_ids)
-                in_clause = ", ".join(["%s"] * len(neighbor_tuple))
-                secondary_sql = f"""
-                SELECT ds.word1_id, ds.word2_id, ds.cosine_similarity
-                FROM vocab.definition_similarity ds
-                WHERE ds.embedding_model = %s
-                  AND ds.cosine_similarity >= %s
-                  AND ds.word1_id IN ({in_clause})
-                  AND ds.word2_id IN ({in_clause})
-                LIMIT 500
-                """
+        if include_secondary_edges and len(valid_nodes) > 1 and selected_model:
+            secondary_floor = max(similarity_floor - 0.05, 0.3)
+            if use_graph:
+                secondary_rows = graph.edges_within(
+                    valid_nodes.keys(), kind=edge_kind, min_weight=secondary_floor
+                )
+            else:
+                secondary_rows = self._fetch_secondary_similarities(
+                    list(valid_nodes.keys()), selected_model, secondary_floor
+                )
 
-                try:
-                    with db_manager.get_cursor() as cursor:
-                        cursor.execute(
-                            secondary_sql,
-                            (
-                                selected_model,
-                                secondary_floor,
-                                *neighbor_tuple,
-                                *neighbor_tuple,
-                            ),
-                        )
-                        secondary_rows = cursor.fetchall()
-                except Exception as exc:
-                    logger.warning(f"Unable to fetch secondary edges: {exc}")
-                    secondary_rows = []
-
-                for node_a, node_b, similarity in secondary_rows:
-                    try:
-                        source_id = int(node_a)
-                        target_id = int(node_b)
-                    except (TypeError, ValueError):
-                        continue
-
-                    if source_id == target_id:
-                        continue
-
-                    if source_id not in metadata or target_id not in metadata:
-                        continue
-
-                    if isinstance(similarity, Decimal):
-                        similarity_value = float(similarity)
-                    else:
-                        similarity_value = float(similarity)
-
-                    edge_key = tuple(sorted((source_id, target_id)))
-                    if edge_key in edge_keys:
-                        continue
-
-                    edge_keys.add(edge_key)
-                    edges.append(
-                        {
-                            "source": source_id,
-                            "target": target_id,
-                            "similarity": similarity_value,
-                        }
-                    )
-                    degree_counts[source_id] += 1
-                    degree_counts[target_id] += 1
-
-        # Ensure center metadata is present for consistent response
-        metadata.setdefault(
-            center_word.id,
-            {
-                "id": center_word.id,
-                "term": center_word.term,
-                "part_of_speech": center_word.part_of_speech,
-                "final_rarity": None,
-                "primary_domain": None,
-                "domain_id": None,
-                "domain_name": None,
-                "domain_description": None,
-                "definition_excerpt": center_word.definition[:200] + "..."
-                if center_word.definition and len(center_word.definition) > 200
-                else center_word.definition,
-            },
-        )
+            for node_a, node_b, similarity_value in secondary_rows:
+                add_edge(node_a, node_b, similarity_value)
 
         ordered_neighbor_ids = sorted(
-            valid_neighbor_map.keys(),
-            key=lambda node_id: valid_neighbor_map[node_id],
-            reverse=True,
+            valid_nodes.keys(),
+            key=lambda node_id: (valid_nodes[node_id][0], -valid_nodes[node_id][2]),
         )
 
         node_order = [center_word.id] + ordered_neighbor_ids
@@ -1073,6 +1099,7 @@ class VocabularyDatabase:
                 "is_center": node_id == center_word.id,
                 "degree": degree_counts.get(node_id, 0),
                 "similarity_to_center": 1.0 if node_id == center_word.id else valid_neighbor_map.get(node_id),
+                "hop": 0 if node_id == center_word.id else valid_nodes[node_id][0],
             }
 
             nodes.append(node_payload)
@@ -1101,6 +1128,7 @@ class VocabularyDatabase:
                     "is_center": node_id == center_word.id,
                     "degree": degree_counts.get(node_id, 0),
                     "similarity_to_center": 1.0 if node_id == center_word.id else valid_neighbor_map.get(node_id),
+                    "hop": 0 if node_id == center_word.id else None,
                 }
             )
 
@@ -1110,6 +1138,9 @@ class VocabularyDatabase:
             "similarity_floor": similarity_floor,
             "secondary_edge_floor": secondary_floor,
             "max_nodes": max_nodes,
+            "hops": hops,
+            "edge_kind": edge_kind,
+            "graph_source": "memory" if use_graph else "database",
             "node_count": len(nodes),
             "edge_count": len(edges),
         }
@@ -1121,6 +1152,139 @@ class VocabularyDatabase:
             "metadata": metadata_summary,
         }
 
+    def _fetch_neighbor_similarities(
+        self,
+        word_id: int,
+        embedding_model: Optional[str],
+        similarity_floor: float,
+        limit: int,
+    ) -> Dict[int, float]:
+        """Query the strongest semantic neighbours of a word from the database."""
+        neighbor_map: Dict[int, float] = {}
+        if limit <= 0 or not embedding_model:
+            return neighbor_map
+
+        neighbor_sql = """
+        SELECT
+            CASE WHEN ds.word1_id = %s THEN ds.word2_id ELSE ds.word1_id END AS neighbor_id,
+            ds.cosine_similarity
+        FROM vocab.definition_similarity ds
+        WHERE (ds.word1_id = %s OR ds.word2_id = %s)
+          AND ds.embedding_model = %s
+          AND ds.cosine_similarity >= %s
+        ORDER BY ds.cosine_similarity DESC
+        LIMIT %s
+        """
+
+        try:
+            with db_manager.get_cursor() as cursor:
+                cursor.execute(
+                    neighbor_sql,
+                    (word_id, word_id, word_id, embedding_model, similarity_floor, limit),
+                )
+                neighbor_rows = cursor.fetchall()
+        except Exception as exc:
+            logger.warning(f"Unable to fetch neighbor graph: {exc}")
+            neighbor_rows = []
+
+        for neighbor_id, similarity in neighbor_rows:
+            if neighbor_id == word_id or similarity is None:
+                continue
+
+            try:
+                sid = int(neighbor_id)
+            except (TypeError, ValueError):
+                continue
+
+            neighbor_map[sid] = float(similarity)
+
+        return neighbor_map
+
+    def _fetch_secondary_similarities(
+        self,
+        neighbor_ids: List[int],
+        embedding_model: str,
+        secondary_floor: float,
+    ) -> List[Tuple[int, int, float]]:
+        """Query similarity edges among a set of neighbour words."""
+        neighbor_tuple = tuple(int(node_id) for node_id in neighbor_ids)
+        in_clause = ", ".join(["%s"] * len(neighbor_tuple))
+        secondary_sql = f"""
+        SELECT ds.word1_id, ds.word2_id, ds.cosine_similarity
+        FROM vocab.definition_similarity ds
+        WHERE ds.embedding_model = %s
+          AND ds.cosine_similarity >= %s
+          AND ds.word1_id IN ({in_clause})
+          AND ds.word2_id IN ({in_clause})
+        LIMIT 500
+        """
+
+        try:
+            with db_manager.get_cursor() as cursor:
+                cursor.execute(
+                    secondary_sql,
+                    (embedding_model, secondary_floor, *neighbor_tuple, *neighbor_tuple),
+                )
+                secondary_rows = cursor.fetchall()
+        except Exception as exc:
+            logger.warning(f"Unable to fetch secondary edges: {exc}")
+            return []
+
+        edges: List[Tuple[int, int, float]] = []
+        for node_a, node_b, similarity in secondary_rows:
+            if similarity is None:
+                continue
+            try:
+                edges.append((int(node_a), int(node_b), float(similarity)))
+            except (TypeError, ValueError):
+                continue
+        return edges
+
+    def get_word_path(
+        self,
+        *,
+        source_id: int,
+        target_id: int,
+        similarity_floor: float = 0.4,
+        edge_kind: str = "semantic",
+        max_hops: int = 6,
+    ) -> Dict[str, Any]:
+        """Find the strongest similarity path between two words."""
+
+        graph = word_graph_service.graph
+        if graph is None:
+            raise RuntimeError("Word graph is not loaded")
+        if edge_kind not in EDGE_KINDS:
+            raise ValueError(f"Unknown edge kind '{edge_kind}'")
+
+        for word_id in (source_id, target_id):
+            if not graph.has_node(word_id):
+                raise ValueError(f"Word {word_id} is not in the word graph")
+
+        path = graph.shortest_path(
+            source_id,
+            target_id,
+            kind=edge_kind,
+            min_weight=max(0.0, min(similarity_floor, 1.0)),
+            max_hops=max(1, min(max_hops, 12)),
+        )
+
+        steps: List[Dict[str, Any]] = []
+        for word_id, similarity in path or []:
+            node_meta = graph.get_metadata(word_id) or {"id": word_id}
+            steps.append({**node_meta, "similarity_from_previous": similarity})
+
+        return {
+            "source_id": source_id,
+            "target_id": target_id,
+            "found": path is not None,
+            "path": steps,
+            "hops": max(len(steps) - 1, 0),
+            "edge_kind": edge_kind,
+            "embedding_model": graph.embedding_model,
+            "similarity_floor": similarity_floor,
+        }
+
     def get_similar_words(self, word_id: int, limit: int = 10, embedding_model: str = None) -> List[tuple]:
         """
         Get semantically similar words based on definition embeddings.
@@ -1137,6 +1301,9 @@ class VocabularyDatabase:
             # Default to mpnet for higher quality semantic similarity
             embedding_model = "sentence-transformers/all-mpnet-base-v2"
 
+        if self.snapshot is not None and embedding_model == self.snapshot.embedding_model:
+            return self.snapshot.get_similar_words(word_id, limit)
+
         sql = """
         SELECT d.id, d.term, ds.cosine_similarity
         FROM vocab.definition_similarity ds
@@ -1159,6 +1326,9 @@ class VocabularyDatabase:
 
     def get_random_word(self) -> Optional[Word]:
         """Get random word using standard query builder with frequency_rank"""
+        if self.snapshot is not None:
+            return self._ranked_word(self.snapshot.get_random_word())
+
         with db_manager.get_cursor() as cursor:
             cursor.execute("SELECT COUNT(*) FROM vocab.defined")
             total_count = cursor.fetchone()[0]
@@ -1183,14 +1353,108 @@ class VocabularyDatabase:
             cursor.execute(query, (random_offset,))
             result = cursor.fetchone()
 
-        if not result:
-            return None
+        return self._ranked_word(result)
 
-        word = WordQueryBuilder.tuple_to_word(result[:-1])
-        word.frequency_rank = result[-1]
-        return word
+    def browse_words(
+        self,
+        letters: Optional[str] = None,
+        domain: Optional[str] = None,
+        part_of_speech: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> Tuple[int, List[str], List[Word]]:
+        """Total count, next-letter choices and one page of words for /browse"""
+        if self.snapshot is not None:
+            total_words, available_letters, rows = self.snapshot.browse_words(
+                letters, domain, part_of_speech, search, limit, offset
+            )
+            return total_words, available_letters, [self._ranked_word(row) for row in rows]
+
+        # Build base query with filters using helper
+        filter_conditions, params = WordQueryBuilder.build_filters(
+            letters=letters,
+            domain=domain,
+            part_of_speech=part_of_speech,
+            search=search
+        )
+        base_query = WordQueryBuilder.base_query() + filter_conditions
+
+        count_query = f"SELECT COUNT(*) FROM ({base_query}) as filtered"
+        letter_query = None
+        letter_params: list[Any] = []
+
+        with db_manager.get_cursor() as cursor:
+            cursor.execute(count_query, params)
+            total_words = cursor.fetchone()[0]
+
+        available_letters: list[str] = []
+        if total_words > 0:
+            if not letters:
+                letter_query = """
+                SELECT DISTINCT LOWER(LEFT(d.term, 1)) as first_letter
+                FROM vocab.defined d
+                LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
+                WHERE 1=1
+                """
+                if domain:
+                    letter_query += " AND wd.primary_domain = %s"
+                    letter_params.append(domain)
+                if part_of_speech:
+                    letter_query += " AND d.part_of_speech = %s"
+                    letter_params.append(part_of_speech)
+                letter_query += " ORDER BY first_letter"
+            else:
+                next_pos = len(letters) + 1
+                letter_query = (
+                    "SELECT DISTINCT LOWER(LEFT(d.term, %s)) as next_letters "
+                    "FROM vocab.defined d "
+                    "LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id "
+                    "WHERE LOWER(d.term) LIKE %s AND LENGTH(d.term) >= %s"
+                )
+                letter_params = [next_pos, f"{letters.lower()}%", next_pos]
+                if domain:
+                    letter_query += " AND wd.primary_domain = %s"
+                    letter_params.append(domain)
+                if part_of_speech:
+                    letter_query += " AND d.part_of_speech = %s"
+                    letter_params.append(part_of_speech)
+                letter_query += " ORDER BY next_letters"
+
+            with db_manager.get_cursor() as cursor:
+                cursor.execute(letter_query, letter_params)
+                raw_letters = [row[0] for row in cursor.fetchall()]
+
+            if not letters:
+                available_letters = raw_letters
+            else:
+                available_letters = sorted({val[len(letters)] for val in raw_letters if len(val) > len(letters)})
+
+        # Build query with frequency_rank for display
+        words_query = f"""
+            SELECT * FROM (
+                SELECT {WordQueryBuilder.WORD_COLUMNS},
+                       RANK() OVER (
+                           ORDER BY {WordQueryBuilder.RARITY_VALUE_EXPRESSION} ASC NULLS LAST
+                       ) AS frequency_rank
+                {WordQueryBuilder.WORD_JOINS}
+                {filter_conditions}
+            ) ranked
+            ORDER BY LOWER(ranked.term) ASC LIMIT %s OFFSET %s
+        """
+        words_params = params + [limit, offset]
+
+        with db_manager.get_cursor() as cursor:
+            cursor.execute(words_query, words_params)
+            results = cursor.fetchall()
+
+        words = [self._ranked_word(row) for row in results]
+        return total_words, available_letters, words
 
     def get_domains(self) -> List[str]:
+        if self.snapshot is not None:
+            return self.snapshot.get_domains()
+
         sql = """
         SELECT DISTINCT primary_domain
         FROM vocab.word_domains
@@ -1211,6 +1475,9 @@ class VocabularyDatabase:
             return []
 
     def get_parts_of_speech(self) -> List[str]:
+        if self.snapshot is not None:
+            return self.snapshot.get_parts_of_speech()
+
         with db_manager.get_cursor() as cursor:
             cursor.execute(
                 "SELECT DISTINCT part_of_speech FROM vocab.defined "
@@ -1248,92 +1515,16 @@ async def browse(request: Request,
     """Browse words hierarchically by letters with pagination"""
     current_user = await get_optional_current_user(request)
     
-    # Build base query with filters using helper
-    filter_conditions, params = WordQueryBuilder.build_filters(
+    offset = (page - 1) * per_page
+    total_words, available_letters, words = db.browse_words(
         letters=letters,
         domain=domain,
         part_of_speech=part_of_speech,
-        search=search
+        search=search,
+        limit=per_page,
+        offset=offset,
     )
-    base_query = WordQueryBuilder.base_query() + filter_conditions
-    
-    count_query = f"SELECT COUNT(*) FROM ({base_query}) as filtered"
-    letter_query = None
-    letter_params: list[Any] = []
-
-    with db_manager.get_cursor() as cursor:
-        cursor.execute(count_query, params)
-        total_words = cursor.fetchone()[0]
-
-    available_letters: list[str] = []
-    if total_words > 0:
-        if not letters:
-            letter_query = """
-            SELECT DISTINCT LOWER(LEFT(d.term, 1)) as first_letter
-            FROM vocab.defined d
-            LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
-            WHERE 1=1
-            """
-            if domain:
-                letter_query += " AND wd.primary_domain = %s"
-                letter_params.append(domain)
-            if part_of_speech:
-                letter_query += " AND d.part_of_speech = %s"
-                letter_params.append(part_of_speech)
-            letter_query += " ORDER BY first_letter"
-        else:
-            next_pos = len(letters) + 1
-            letter_query = (
-                "SELECT DISTINCT LOWER(LEFT(d.term, %s)) as next_letters "
-                "FROM vocab.defined d "
-                "LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id "
-                "WHERE LOWER(d.term) LIKE %s AND LENGTH(d.term) >= %s"
-            )
-            letter_params = [next_pos, f"{letters.lower()}%", next_pos]
-            if domain:
-                letter_query += " AND wd.primary_domain = %s"
-                letter_params.append(domain)
-            if part_of_speech:
-                letter_query += " AND d.part_of_speech = %s"
-                letter_params.append(part_of_speech)
-            letter_query += " ORDER BY next_letters"
 
-        with db_manager.get_cursor() as cursor:
-            cursor.execute(letter_query, letter_params)
-            raw_letters = [row[0] for row in cursor.fetchall()]
-
-        if not letters:
-            available_letters = raw_letters
-        else:
-            available_letters = sorted({val[len(letters)] for val in raw_letters if len(val) > len(letters)})
-
-    offset = (page - 1) * per_page
-
-    # Build query with frequency_rank for display
-    words_query = f"""
-        SELECT * FROM (
-            SELECT {WordQueryBuilder.WORD_COLUMNS},
-                   RANK() OVER (
-                       ORDER BY {WordQueryBuilder.RARITY_VALUE_EXPRESSION} ASC NULLS LAST
-                   ) AS frequency_rank
-            {WordQueryBuilder.WORD_JOINS}
-            {filter_conditions}
-        ) ranked
-        ORDER BY LOWER(ranked.term) ASC LIMIT %s OFFSET %s
-    """
-    words_params = params + [per_page, offset]
-
-    with db_manager.get_cursor() as cursor:
-        cursor.execute(words_query, words_params)
-        results = cursor.fetchall()
-
-    # Convert results to Word objects and set frequency_rank
-    words = []
-    for row in results:
-        word = WordQueryBuilder.tuple_to_word(row[:-1])
-        word.frequency_rank = row[-1]
-        words.append(word)
-    
     # Generate letter path breadcrumb
     letter_path = []
     if letters:
@@ -1561,6 +1752,8 @@ async def word_graph(
     similarity_floor: float = Query(0.4, ge=0.0, le=1.0, description="Minimum cosine similarity to include"),
     max_nodes: int = Query(30, ge=2, le=150, description="Maximum nodes in the response"),
     include_secondary_edges: bool = Query(True, description="Include edges among neighbor nodes"),
+    hops: int = Query(1, ge=1, le=MAX_GRAPH_HOPS, description="Neighbourhood depth (needs the in-memory graph above 1)"),
+    edge_kind: str = Query("semantic", description="Edge type: semantic or phonetic"),
 ):
     """Force-directed graph data seeded from definition similarities."""
     if word_id is None and (term is None or not term.strip()):
@@ -1576,6 +1769,8 @@ async def word_graph(
             similarity_floor=similarity_floor,
             max_nodes=max_nodes,
             include_secondary_edges=include_secondary_edges,
+            hops=hops,
+            edge_kind=edge_kind,
         )
         return graph_payload
     except ValueError as err:
@@ -1584,6 +1779,32 @@ async def word_graph(
         logger.error(f"Error building word graph: {exc}")
         raise HTTPException(status_code=500, detail="Unable to build word graph")
 
+
+@app.get("/api/visualizations/word-path")
+async def word_path(
+    source_id: int = Query(..., description="ID of the starting word"),
+    target_id: int = Query(..., description="ID of the destination word"),
+    similarity_floor: float = Query(0.4, ge=0.0, le=1.0, description="Ignore edges below this similarity"),
+    edge_kind: str = Query("semantic", description="Edge type: semantic or phonetic"),
+    max_hops: int = Query(6, ge=1, le=12, description="Longest path to consider"),
+):
+    """Strongest similarity path between two words from the in-memory graph."""
+    try:
+        return db.get_word_path(
+            source_id=source_id,
+            target_id=target_id,
+            similarity_floor=similarity_floor,
+            edge_kind=edge_kind,
+            max_hops=max_hops,
+        )
+    except ValueError as err:
+        raise HTTPException(status_code=400, detail=str(err)) from err
+    except RuntimeError as err:
+        raise HTTPException(status_code=503, detail=str(err)) from err
+    except Exception as exc:
+        logger.error(f"Error finding word path: {exc}")
+        raise HTTPException(status_code=500, detail="Unable to find word path")
+
 @app.get("/word/{word_id}", response_class=HTMLResponse)
 async def word_detail(request: Request, word_id: int):
     """Detailed word page"""
@@ -1896,47 +2117,47 @@ async def admin_dashboard(request: Request):
         logger.error(f"Error loading admin dashboard: {e}")
         raise HTTPException(status_code=500, detail="Failed to load admin dashboard")
 
-# Pronunciation endpoint
-@app.get("/pronunciation/{word}")
-async def get_pronunciation_audio(word: str):
-    """Generate pronunciation audio for a word using Windows SAPI"""
-    try:
-        import subprocess
-        import tempfile
-        import os
-        from fastapi.responses import FileResponse
-        
-        # Create temporary wav file
-        temp_dir = tempfile.gettempdir()
-        wav_file = os.path.join(temp_dir, f"{word}_{hash(word)}.wav")
-        
-        # Use Windows built-in text-to-speech
-        powershell_script = f"""
-        Add-Type -AssemblyName System.Speech
-        $synth = New-Object System.Speech.Synthesis.SpeechSynthesizer
-        $synth.SetOutputToWaveFile("{wav_file}")
-        $synth.Speak("{word}")
-        $synth.Dispose()
-        """
-        
-        # Execute PowerShell script
-        result = subprocess.run([
-            "powershell", "-Command", powershell_script
-        ], capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0 and os.path.exists(wav_file):
-            return FileResponse(
-                wav_file,
-                media_type="audio/wav",
-                filename=f"{word}.wav",
-                headers={"Cache-Control": "public, max-age=3600"}
-            )
-        else:
-            raise HTTPException(status_code=500, detail="Could not generate pronunciation")
-            
-    except Exception as e:
-        logger.error(f"Pronunciation generation failed for '{word}': {e}")
-        raise HTTPException(status_code=500, detail="Pronunciation unavailable")
+# Instrumentation
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Request, query and pool-wait metrics in the Prometheus text format.
+
+    Served only when METRICS_TOKEN is set, to scrapers presenting it as a
+    bearer token; /admin/metrics shows the same data to signed-in admins.
+    """
+    if not metrics.scrape_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not metrics.authorize_scrape(request.headers.get("authorization")):
+        raise HTTPException(status_code=401, detail="Invalid metrics token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/admin/metrics", response_class=HTMLResponse)
+async def admin_metrics(request: Request,
+                        order_by: str = Query("total", pattern="^(total|mean|max|count)$"),
+                        limit: int = Query(25, ge=1, le=200),
+                        current_user: User = Depends(get_current_admin_user)):
+    """Slowest routes and query fingerprints since the last reset"""
+    return templates.TemplateResponse("admin_metrics.html", {
+        "request": request,
+        "current_user": current_user,
+        "enabled": metrics.enabled,
+        "scrape_enabled": bool(metrics.scrape_token),
+        "started_at": datetime.fromtimestamp(metrics.started_at),
+        "pool_wait": metrics.pool_wait,
+        "routes": metrics.slow_routes(limit),
+        "queries": metrics.slow_queries(limit, order_by=order_by),
+        "order_by": order_by,
+        "limit": limit,
+    })
+
+
+@app.post("/admin/metrics/reset")
+async def admin_reset_metrics(current_user: User = Depends(get_current_admin_user)):
+    """Start a fresh measurement window"""
+    metrics.reset()
+    return RedirectResponse(url="/admin/metrics", status_code=status.HTTP_303_SEE_OTHER)
 
 # Quiz endpoints
 @app.get("/quiz", response_class=HTMLResponse)
@@ -2415,6 +2636,71 @@ class Flashcard:
     success_rate: float = 0.0
 
 
+# Flashcard hot statements, prepared once per pooled connection
+CARD_PROGRESS_UPSERT_STATEMENT = db_manager.register_statement(
+    "card_progress_upsert",
+    """
+    INSERT INTO user_flashcard_progress (
+        user_id, word_id, study_count, correct_count, last_studied, next_review, mastery_level, interval_days
+    )
+    VALUES (%s, %s, 1, %s, NOW(), NOW() + INTERVAL '1 day', 'learning', 1)
+    ON CONFLICT (user_id, word_id) DO UPDATE SET
+        study_count = user_flashcard_progress.study_count + 1,
+        correct_count = user_flashcard_progress.correct_count + EXCLUDED.correct_count,
+        last_studied = NOW(),
+        mastery_level = CASE
+            WHEN (user_flashcard_progress.correct_count + EXCLUDED.correct_count) >= (user_flashcard_progress.study_count + 1) * 0.9
+                 AND user_flashcard_progress.study_count + 1 >= 5 THEN 'mastered'
+            WHEN (user_flashcard_progress.correct_count + EXCLUDED.correct_count) >= (user_flashcard_progress.study_count + 1) * 0.8
+                 AND user_flashcard_progress.study_count + 1 >= 3 THEN 'reviewing'
+            ELSE user_flashcard_progress.mastery_level
+        END,
+        next_review = CASE
+            WHEN EXCLUDED.correct_count > 0 THEN NOW() + INTERVAL '1 day' * LEAST(user_flashcard_progress.interval_days * 2, 30)
+            ELSE NOW() + INTERVAL '1 day'
+        END,
+        interval_days = CASE
+            WHEN EXCLUDED.correct_count > 0 THEN LEAST(user_flashcard_progress.interval_days * 2, 30)
+            ELSE GREATEST(user_flashcard_progress.interval_days / 2, 1)
+        END
+    """,
+)
+
+# Queued study results, applied in one set-based statement (see core.flashcard_sync)
+CARD_PROGRESS_BATCH_UPSERT_STATEMENT = db_manager.register_statement(
+    "card_progress_batch_upsert", CARD_PROGRESS_BATCH_UPSERT_SQL
+)
+
+RANDOM_CARDS_STATEMENT = db_manager.register_statement(
+    "random_cards",
+    f"""
+    SELECT d.id, 0 as deck_id,
+           d.id, d.term, d.definition, d.part_of_speech,
+           COALESCE(d.final_rarity, wrm.final_rarity) AS final_rarity, wrm.num_sources,
+           wd.primary_domain, {WordQueryBuilder.PRONUNCIATION_URL_EXPRESSION} AS wav_url,
+           wp.ipa_transcription, wp.arpabet_transcription, wp.syllable_count, wp.stress_pattern,
+           d.obsolete_or_archaic,
+           COALESCE(ufp.mastery_level, 'learning') as mastery_level,
+           ufp.last_studied, ufp.study_count,
+           COALESCE(ufp.correct_count * 100.0 / NULLIF(ufp.study_count, 0), 0) as success_rate
+    FROM vocab.defined d
+    LEFT JOIN word_rarity_metrics wrm ON d.id = wrm.id
+    LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
+    LEFT JOIN vocab.word_phonetics wp ON d.id = wp.word_id
+    LEFT JOIN vocab.pronunciation_files pf ON d.id = pf.word_id
+    LEFT JOIN vocab.user_flashcard_progress ufp ON d.id = ufp.word_id AND ufp.user_id = %s
+    WHERE d.definition IS NOT NULL AND d.definition <> ''
+      AND d.id NOT IN (
+          SELECT word_id
+          FROM vocab.user_excluded_words
+          WHERE user_id = %s
+      )
+    ORDER BY RANDOM()
+    LIMIT %s
+    """,
+)
+
+
 class FlashcardDatabase:
     def __init__(self):
         self.config = get_db_config()
@@ -2653,65 +2939,21 @@ class FlashcardDatabase:
     def update_card_progress(self, user_id: int, word_id: int, is_correct: bool):
         correct_increment = 1 if is_correct else 0
         with self._cursor() as cursor:
-            cursor.execute(
-                """
-                INSERT INTO user_flashcard_progress (
-                    user_id, word_id, study_count, correct_count, last_studied, next_review, mastery_level, interval_days
-                )
-                VALUES (%s, %s, 1, %s, NOW(), NOW() + INTERVAL '1 day', 'learning', 1)
-                ON CONFLICT (user_id, word_id) DO UPDATE SET
-                    study_count = user_flashcard_progress.study_count + 1,
-                    correct_count = user_flashcard_progress.correct_count + EXCLUDED.correct_count,
-                    last_studied = NOW(),
-                    mastery_level = CASE
-                        WHEN (user_flashcard_progress.correct_count + EXCLUDED.correct_count) >= (user_flashcard_progress.study_count + 1) * 0.9
-                             AND user_flashcard_progress.study_count + 1 >= 5 THEN 'mastered'
-                        WHEN (user_flashcard_progress.correct_count + EXCLUDED.correct_count) >= (user_flashcard_progress.study_count + 1) * 0.8
-                             AND user_flashcard_progress.study_count + 1 >= 3 THEN 'reviewing'
-                        ELSE user_flashcard_progress.mastery_level
-                    END,
-                    next_review = CASE
-                        WHEN EXCLUDED.correct_count > 0 THEN NOW() + INTERVAL '1 day' * LEAST(user_flashcard_progress.interval_days * 2, 30)
-                        ELSE NOW() + INTERVAL '1 day'
-                    END,
-                    interval_days = CASE
-                        WHEN EXCLUDED.correct_count > 0 THEN LEAST(user_flashcard_progress.interval_days * 2, 30)
-                        ELSE GREATEST(user_flashcard_progress.interval_days / 2, 1)
-                    END
-                """,
+            cursor.execute_statement(
+                CARD_PROGRESS_UPSERT_STATEMENT,
                 (user_id, word_id, correct_increment),
             )
 
+    def apply_study_results(self, user_id: int, results: List[StudyResult]) -> int:
+        """Apply a batch of queued study results; returns the number of words updated"""
+        if not results:
+            return 0
+        with self._cursor() as cursor:
+            return apply_study_results(cursor, CARD_PROGRESS_BATCH_UPSERT_STATEMENT, user_id, results)
+
     def get_random_cards(self, user_id: int, limit: int = 20) -> List[Flashcard]:
         with self._cursor() as cursor:
-            cursor.execute(
-                f"""
-                SELECT d.id, 0 as deck_id,
-                       d.id, d.term, d.definition, d.part_of_speech,
-                       COALESCE(d.final_rarity, wrm.final_rarity) AS final_rarity, wrm.num_sources,
-                       wd.primary_domain, {WordQueryBuilder.PRONUNCIATION_URL_EXPRESSION} AS wav_url,
-                       wp.ipa_transcription, wp.arpabet_transcription, wp.syllable_count, wp.stress_pattern,
-                       d.obsolete_or_archaic,
-                       COALESCE(ufp.mastery_level, 'learning') as mastery_level,
-                       ufp.last_studied, ufp.study_count,
-                       COALESCE(ufp.correct_count * 100.0 / NULLIF(ufp.study_count, 0), 0) as success_rate
-                FROM vocab.defined d
-                LEFT JOIN word_rarity_metrics wrm ON d.id = wrm.id
-                LEFT JOIN vocab.word_domains wd ON d.id = wd.word_id
-                LEFT JOIN vocab.word_phonetics wp ON d.id = wp.word_id
-                LEFT JOIN vocab.pronunciation_files pf ON d.id = pf.word_id
-                LEFT JOIN vocab.user_flashcard_progress ufp ON d.id = ufp.word_id AND ufp.user_id = %s
-                WHERE d.definition IS NOT NULL AND d.definition <> ''
-                  AND d.id NOT IN (
-                      SELECT word_id
-                      FROM vocab.user_excluded_words
-                      WHERE user_id = %s
-                  )
-                ORDER BY RANDOM()
-                LIMIT %s
-                """,
-                (user_id, user_id, limit),
-            )
+            cursor.execute_statement(RANDOM_CARDS_STATEMENT, (user_id, user_id, limit))
             cards = []
             for row in cursor.fetchall():
                 word = Word(
@@ -2856,6 +3098,38 @@ async def study_flashcard(request: Request,
         logger.error(f"Error updating flashcard progress: {e}")
         raise HTTPException(status_code=500, detail="Failed to update progress")
 
+@app.post("/api/flashcards/study/batch")
+async def sync_flashcard_study(request: Request,
+                               current_user: User = Depends(get_current_active_user)):
+    """Record a batch of queued flashcard study results.
+
+    The batch names the user it was recorded for; a batch queued by anyone
+    else is refused with 403 and stays queued for them. Malformed results
+    are skipped and their indexes returned as ``rejected``. A 400 with
+    ``detail.error == "invalid_batch"`` means the batch as a whole was
+    malformed and will not be accepted if sent again.
+    """
+    try:
+        data = await request.json()
+        if not isinstance(data, dict):
+            raise ValueError("batch must be an object")
+        owner = data.get("user_id")
+        if isinstance(owner, bool) or not isinstance(owner, int):
+            raise ValueError(f"invalid user_id {owner!r}")
+        results, rejected = parse_study_results(data.get("results"), sent_at=data.get("sent_at"))
+    except ValueError as e:
+        raise HTTPException(status_code=400,
+                            detail={"error": "invalid_batch", "message": f"Invalid study results: {e}"})
+    if owner != current_user.id:
+        raise HTTPException(status_code=403, detail="Study results belong to another user")
+
+    try:
+        applied = flashcard_db.apply_study_results(current_user.id, results)
+        return {"success": True, "received": len(results), "applied": applied, "rejected": rejected}
+    except Exception as e:
+        logger.error(f"Error syncing flashcard progress: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update progress")
+
 # ==========================================
 # WORD EXCLUSION API ENDPOINTS
 # ==========================================
@@ -3541,6 +3815,13 @@ async def vocab_candidate_batch_page(
             """, (str(random_seed), per_page, offset))
             candidates = cursor.fetchall()
 
+        # Flag candidates that are already defined or queued elsewhere
+        known_terms = get_known_terms()
+        for candidate in candidates:
+            candidate["already_known"] = bool(
+                known_terms is not None and candidate.get("term") and candidate["term"] in known_terms
+            )
+
         # Calculate pagination
         total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
 
@@ -3574,6 +3855,7 @@ async def process_vocab_candidates_batch(
         moved_count = 0
         deleted_count = 0
         skipped_count = 0
+        moved_terms = []
 
         with db_manager.get_cursor() as cursor:
             # Get all candidate IDs from form
@@ -3624,6 +3906,7 @@ async def process_vocab_candidates_batch(
                         """, (int(candidate_id),))
 
                         moved_count += 1
+                        moved_terms.append(term)
 
                 elif action == 'delete':
                     cursor.execute("""
@@ -3632,6 +3915,8 @@ async def process_vocab_candidates_batch(
                     """, (int(candidate_id),))
                     deleted_count += 1
 
+        record_known_terms(moved_terms)
+
         # Build success message
         success_parts = []
         if moved_count > 0:
@@ -3704,6 +3989,8 @@ async def move_vocab_candidate_to_defined(
                 WHERE id = %s
             """, (candidate_id,))
 
+        record_known_terms([term])
+
         return {"success": True, "message": "Candidate moved to defined", "word_id": new_word_id}
 
     except HTTPException:
@@ -3966,11 +4253,29 @@ async def get_analogy_stats(
         logger.error(f"Error fetching analogy stats: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch statistics")
 
-# Initialize flashcard tables on startup
-try:
-    flashcard_db.create_flashcard_tables()
-except Exception as e:
-    logger.warning(f"Could not create flashcard tables: {e}")
+# Initialize flashcard tables on startup. A snapshot replica may have no database
+# (anonymous traffic only); one serving signed-in users relies on the primary's tables.
+if db.snapshot is None:
+    try:
+        flashcard_db.create_flashcard_tables()
+    except Exception as e:
+        logger.warning(f"Could not create flashcard tables: {e}")
+
+# Load the in-memory word graph without blocking startup
+word_graph_service.load_in_background()
+
+
+@app.on_event("startup")
+def warm_database_pool():
+    # Open the minimum pool up front so the first requests skip connection setup.
+    # Snapshot replicas serve public pages from SQLite and connect on demand.
+    if db.snapshot is None:
+        db_manager.warm_pool()
+
+
+@app.on_event("shutdown")
+def stop_pronunciation_workers():
+    pronunciation_audio.close()
 
 if __name__ == "__main__":
     import uvicorn
@@ -16,10 +16,12 @@ import math
 from pathlib import Path
 from typing import Optional, Set, Dict, List, Tuple
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import xml.etree.ElementTree as ET
 from urllib.parse import urljoin
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -41,6 +43,8 @@ except ImportError:
 import psycopg
 from psycopg.rows import dict_row
 
+from core.candidate_sink import CandidateSink, VOCABULARY_CANDIDATES
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -69,6 +73,16 @@ class CrawlerConfig:
     stoplist_path: Path = Path("wiktionary_crawler/stoplist.txt")
     checkpoint_path: Path = Path("wiktionary_crawler/checkpoint.json")
 
+    # Multistream dump: the same pages packed into independent bz2 streams of
+    # ~100 pages, plus an index of stream byte offsets. Lets parsing fan out
+    # across worker processes; set use_multistream=False to use the single
+    # stream dump above.
+    use_multistream: bool = True
+    wiktionary_multistream_url: str = "https://dumps.wikimedia.org/enwiktionary/latest/enwiktionary-latest-pages-articles-multistream.xml.bz2"
+    wiktionary_index_url: str = "https://dumps.wikimedia.org/enwiktionary/latest/enwiktionary-latest-pages-articles-multistream-index.txt.bz2"
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    streams_per_checkpoint: int = 100
+
     # Processing settings
     batch_size: int = 500
     max_definition_length: int = 1000
@@ -94,10 +108,9 @@ class CrawlerConfig:
 # LOGGING SETUP
 # ============================================================================
 
-# Force unbuffered output for real-time feedback
-import sys
-sys.stdout = os.fdopen(sys.stdout.fileno(), 'w', buffering=1)
-sys.stderr = os.fdopen(sys.stderr.fileno(), 'w', buffering=1)
+# Force line-buffered output for real-time feedback
+sys.stdout.reconfigure(line_buffering=True)
+sys.stderr.reconfigure(line_buffering=True)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -249,24 +262,25 @@ class WiktionaryDumpDownloader:
     def __init__(self, config: CrawlerConfig):
         self.config = config
 
-    def get_dump_path(self) -> Path:
-        """Get local path for dump file"""
-        filename = self.config.wiktionary_dump_url.split('/')[-1]
+    def get_dump_path(self, url: Optional[str] = None) -> Path:
+        """Get local path for dump file (defaults to the single-stream dump)"""
+        filename = (url or self.config.wiktionary_dump_url).split('/')[-1]
         return self.config.dump_dir / filename
 
-    def download_if_missing(self) -> Path:
+    def download_if_missing(self, url: Optional[str] = None) -> Path:
         """Download dump file if not present"""
-        dump_path = self.get_dump_path()
+        url = url or self.config.wiktionary_dump_url
+        dump_path = self.get_dump_path(url)
 
         if dump_path.exists():
             size_mb = dump_path.stat().st_size / (1024 * 1024)
             logger.info(f"Wiktionary dump already exists: {dump_path} ({size_mb:.1f} MB)")
             return dump_path
 
-        logger.info(f"Downloading Wiktionary dump from {self.config.wiktionary_dump_url}")
+        logger.info(f"Downloading Wiktionary dump from {url}")
         logger.info("This may take 10-30 minutes depending on your connection...")
 
-        response = requests.get(self.config.wiktionary_dump_url, stream=True, timeout=120)
+        response = requests.get(url, stream=True, timeout=120)
         response.raise_for_status()
 
         total_size = int(response.headers.get('content-length', 0))
@@ -572,6 +586,138 @@ class WiktionaryParser:
                             sys.stdout.flush()
 
 
+# ============================================================================
+# MULTISTREAM DUMP PARSER
+# ============================================================================
+
+@dataclass
+class DumpStream:
+    """One independently compressed bz2 stream of a multistream dump"""
+    index: int
+    offset: int
+    length: int
+
+
+@dataclass
+class StreamResult:
+    """Pages of one stream after parsing and the stoplist/existing-term filters"""
+    stream: DumpStream
+    pages: int
+    entries_extracted: int
+    in_stoplist: int
+    already_exists: int
+    entries: List[WiktionaryEntry]
+
+
+def read_multistream_index(index_path: Path, dump_path: Path) -> List[DumpStream]:
+    """Read stream boundaries from a multistream index (offset:page_id:title lines)"""
+    offsets = []
+    with bz2.open(index_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            offset = int(line.split(':', 1)[0])
+            if not offsets or offset != offsets[-1]:
+                offsets.append(offset)
+
+    # Each stream runs to the next offset; the last one (which also holds
+    # </mediawiki>) runs to the end of the file
+    ends = offsets[1:] + [dump_path.stat().st_size]
+    return [DumpStream(i, start, end - start) for i, (start, end) in enumerate(zip(offsets, ends))]
+
+
+# Per-process state installed by the pool initializer
+_stream_worker: Dict = {}
+
+
+def _init_stream_worker(config: CrawlerConfig, stoplist: Set[str], existing_terms: Set[str]):
+    _stream_worker['parser'] = WiktionaryParser(config)
+    _stream_worker['stoplist'] = stoplist
+    _stream_worker['existing_terms'] = existing_terms
+
+
+def parse_stream(dump_path: Path, stream: DumpStream) -> StreamResult:
+    """Decompress, parse and filter one stream (runs in a worker process)"""
+    parser = _stream_worker['parser']
+    stoplist = _stream_worker['stoplist']
+    existing_terms = _stream_worker['existing_terms']
+    result = StreamResult(stream, 0, 0, 0, 0, [])
+
+    with open(dump_path, 'rb') as f:
+        f.seek(stream.offset)
+        data = bz2.decompress(f.read(stream.length))
+
+    # A stream is a bare run of <page> elements; wrap it so it parses as one
+    # document (the <mediawiki> header and trailer live outside the pages)
+    start = data.find(b'<page>')
+    if start < 0:
+        return result
+    data = data[start:].replace(b'</mediawiki>', b'')
+
+    try:
+        import lxml.etree as etree
+        root = etree.fromstring(b'<pages>' + data + b'</pages>', etree.XMLParser(huge_tree=True))
+    except ImportError:
+        root = ET.fromstring(b'<pages>' + data + b'</pages>')
+
+    for page in root.iter('page'):
+        result.pages += 1
+        title = page.findtext('title')
+        text = page.findtext('revision/text')
+        if not title or not text:
+            continue
+
+        for entry in parser.parse_page(title, text):
+            result.entries_extracted += 1
+            if entry.term in stoplist:
+                result.in_stoplist += 1
+            elif entry.term in existing_terms:
+                result.already_exists += 1
+            else:
+                result.entries.append(entry)
+
+    return result
+
+
+class MultistreamDumpParser:
+    """Parse a pages-articles-multistream dump with a pool of worker processes
+
+    Streams are submitted in index order and results are yielded in that same
+    order, with a bounded number in flight, so the caller sees the sequence a
+    single-process parse would produce and can checkpoint stream by stream.
+    """
+
+    def __init__(self, config: CrawlerConfig, workers: Optional[int] = None):
+        self.config = config
+        self.workers = max(1, workers or config.workers)
+        self.window = self.workers * 4
+
+    def iter_results(self, dump_path: Path, streams: List[DumpStream], stoplist: Set[str],
+                     existing_terms: Set[str], start_offset: int = 0):
+        """Yield a StreamResult per stream at or after ``start_offset``"""
+        pending_streams = iter([stream for stream in streams if stream.offset >= start_offset])
+        initargs = (self.config, stoplist, existing_terms)
+
+        if self.workers == 1:
+            _init_stream_worker(*initargs)
+            for stream in pending_streams:
+                yield parse_stream(dump_path, stream)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_stream_worker,
+                                 initargs=initargs) as pool:
+            in_flight = deque()
+            try:
+                for stream in pending_streams:
+                    in_flight.append(pool.submit(parse_stream, dump_path, stream))
+                    if len(in_flight) >= self.window:
+                        yield in_flight.popleft().result()
+                while in_flight:
+                    yield in_flight.popleft().result()
+            finally:
+                # Stopped early (interrupt or error): don't parse what is still queued
+                for future in in_flight:
+                    future.cancel()
+
+
 # ============================================================================
 # DATABASE MANAGER
 # ============================================================================
@@ -582,7 +728,13 @@ class CandidateDatabase:
     def __init__(self, config: CrawlerConfig):
         self.config = config
         self.existing_terms: Set[str] = set()
-        self.batch: List[Dict] = []
+        # Buffers rows and writes each batch with COPY + one merge statement
+        self.sink = CandidateSink(VOCABULARY_CANDIDATES, self.get_connection, batch_size=config.batch_size)
+
+    @property
+    def batch(self) -> List[tuple]:
+        """Rows waiting for the next flush"""
+        return self.sink.rows
 
     def get_connection(self):
         """Get database connection"""
@@ -616,7 +768,7 @@ class CandidateDatabase:
 
     def add_to_batch(self, entry: WiktionaryEntry, wordfreq_score: float, source_dump_date: str):
         """Add candidate to batch with wordfreq score as zipf_score"""
-        self.batch.append({
+        self.sink.add({
             'term': entry.term,
             'zipf_score': wordfreq_score,  # Store wordfreq score
             'definition': entry.definitions[0] if entry.definitions else '',
@@ -627,48 +779,17 @@ class CandidateDatabase:
         })
 
     def flush_batch(self) -> int:
-        """Insert batch to database"""
+        """COPY the batch into a staging table and merge it; returns rows inserted"""
         if not self.batch:
             return 0
 
-        conn = self.get_connection()
         try:
-            with conn.cursor() as cursor:
-                # Disable automatic prepared statements to avoid name conflicts
-                # Insert records one at a time (still reasonably fast for 500 record batches)
-                insert_sql = """
-                INSERT INTO vocab.vocabulary_candidates
-                    (term, zipf_score, definition, part_of_speech, etymology,
-                     obsolete_or_archaic, source_dump_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (term) DO NOTHING
-                """
-
-                for record in self.batch:
-                    try:
-                        cursor.execute(
-                            insert_sql,
-                            (record['term'], record['zipf_score'], record['definition'],
-                             record['part_of_speech'], record['etymology'],
-                             record['obsolete_or_archaic'], record['source_dump_date']),
-                            prepare=False  # Disable prepared statements
-                        )
-                    except Exception as e:
-                        logger.debug(f"Failed to insert {record['term']}: {e}")
-                        continue
-
-                conn.commit()
-
-                inserted = len(self.batch)
-                self.batch.clear()
-                return inserted
+            # ON CONFLICT (term) DO NOTHING, first row per term wins within the batch
+            return self.sink.flush()
         except Exception as e:
             logger.error(f"Failed to flush batch: {e}")
-            conn.rollback()
-            self.batch.clear()
+            self.sink.clear()
             return 0
-        finally:
-            conn.close()
 
 
 # ============================================================================
@@ -683,6 +804,8 @@ class CheckpointManager:
         self.checkpoint = {
             'pages_processed': 0,
             'candidates_added': 0,
+            'next_stream_offset': 0,  # Multistream dumps: first stream not yet committed
+            'streams_completed': 0,
             'last_updated': None
         }
 
@@ -695,10 +818,14 @@ class CheckpointManager:
                        f"{self.checkpoint['candidates_added']:,} candidates added")
         return self.checkpoint
 
-    def save(self, pages_processed: int, candidates_added: int):
+    def save(self, pages_processed: int, candidates_added: int,
+             next_stream_offset: Optional[int] = None, streams_completed: Optional[int] = None):
         """Save checkpoint to disk"""
         self.checkpoint['pages_processed'] = pages_processed
         self.checkpoint['candidates_added'] = candidates_added
+        if next_stream_offset is not None:
+            self.checkpoint['next_stream_offset'] = next_stream_offset
+            self.checkpoint['streams_completed'] = streams_completed or 0
         self.checkpoint['last_updated'] = datetime.now().isoformat()
 
         with open(self.config.checkpoint_path, 'w') as f:
@@ -755,7 +882,11 @@ class WiktionaryRareWordCrawler:
         logger.info("")
 
         # Step 2: Download Wiktionary dump
-        dump_path = self.downloader.download_if_missing()
+        if self.config.use_multistream:
+            dump_path = self.downloader.download_if_missing(self.config.wiktionary_multistream_url)
+            index_path = self.downloader.download_if_missing(self.config.wiktionary_index_url)
+        else:
+            dump_path = self.downloader.download_if_missing()
         logger.info("")
 
         # Extract dump date from filename
@@ -777,9 +908,71 @@ class WiktionaryRareWordCrawler:
 
         # Step 5: Parse dump
         logger.info("Starting Wiktionary dump parsing...")
-        logger.info("This will take 1-3 hours depending on your system...")
+        if self.config.use_multistream:
+            self.parse_multistream(dump_path, index_path, stoplist, checkpoint)
+        else:
+            logger.info("This will take 1-3 hours depending on your system...")
+            logger.info("")
+            self.parse_single_stream(dump_path, stoplist)
+
+        # Process remaining entries
+        if self.pending_entries:
+            self.process_pending_batch()
+
+        # Final batch flush
+        if self.database.batch:
+            inserted = self.database.flush_batch()
+            self.stats['candidates_added'] += inserted
+
+        # Clear checkpoint on successful completion
+        self.checkpoint_manager.clear()
+
+        # Print final summary
+        self.print_summary()
+
+    def parse_multistream(self, dump_path: Path, index_path: Path, stoplist: Set[str], checkpoint: Dict):
+        """Parse the multistream dump in parallel, checkpointing after whole streams"""
+        streams = read_multistream_index(index_path, dump_path)
+        start_offset = checkpoint.get('next_stream_offset') or 0
+        streams_completed = sum(1 for stream in streams if stream.offset < start_offset)
+        parser = MultistreamDumpParser(self.config)
+
+        logger.info(f"{len(streams):,} streams in dump, {len(streams) - streams_completed:,} to parse "
+                    f"with {parser.workers} worker process(es)")
         logger.info("")
 
+        started = time.time()
+        pages_at_start = self.stats['pages_processed']
+        for result in parser.iter_results(dump_path, streams, stoplist,
+                                          self.database.existing_terms, start_offset):
+            self.stats['pages_processed'] += result.pages
+            self.stats['entries_extracted'] += result.entries_extracted
+            self.stats['in_stoplist'] += result.in_stoplist
+            self.stats['already_exists'] += result.already_exists
+
+            self.pending_entries.extend(result.entries)
+            if len(self.pending_entries) >= self.config.batch_size:
+                self.process_pending_batch()
+
+            streams_completed += 1
+            if streams_completed % self.config.streams_per_checkpoint == 0:
+                self.commit_streams(result.stream.offset + result.stream.length, streams_completed)
+                pages_per_second = (self.stats['pages_processed'] - pages_at_start) / max(time.time() - started, 1e-9)
+                logger.info(f"Streams {streams_completed:,}/{len(streams):,} | {pages_per_second:,.0f} pages/s")
+                self.log_progress()
+
+    def commit_streams(self, next_stream_offset: int, streams_completed: int):
+        """Write out everything parsed so far, then record the stream position"""
+        if self.pending_entries:
+            self.process_pending_batch()
+        if self.database.batch:
+            self.stats['candidates_added'] += self.database.flush_batch()
+        self.checkpoint_manager.save(self.stats['pages_processed'], self.stats['candidates_added'],
+                                     next_stream_offset, streams_completed)
+
+    def parse_single_stream(self, dump_path: Path, stoplist: Set[str]):
+        """Parse the single-stream dump on one core"""
+
         def entry_callback(entry: WiktionaryEntry):
             """Process each extracted entry"""
             self.stats['entries_extracted'] += 1
@@ -813,21 +1006,6 @@ class WiktionaryRareWordCrawler:
         # Parse the dump
         self.parser.parse_dump(dump_path, entry_callback, checkpoint_callback)
 
-        # Process remaining entries
-        if self.pending_entries:
-            self.process_pending_batch()
-
-        # Final batch flush
-        if self.database.batch:
-            inserted = self.database.flush_batch()
-            self.stats['candidates_added'] += inserted
-
-        # Clear checkpoint on successful completion
-        self.checkpoint_manager.clear()
-
-        # Print final summary
-        self.print_summary()
-
     def process_pending_batch(self):
         """
         Process pending entries batch using simplified wordfreq approach:
@@ -874,7 +1052,7 @@ class WiktionaryRareWordCrawler:
             self.database.add_to_batch(entry, wordfreq_score, self.source_dump_date)
 
         # Flush candidates to database if batch is large enough
-        if len(self.database.batch) >= self.config.batch_size:
+        if self.database.sink.full:
             inserted = self.database.flush_batch()
             self.stats['candidates_added'] += inserted
 
@@ -907,6 +1085,10 @@ class WiktionaryRareWordCrawler:
         logger.info(f"  Derived form skipped:{self.stats['derived_form_skipped']:>10,}")
         logger.info("")
         logger.info(f"Candidates added:      {self.stats['candidates_added']:>10,}")
+        sink_stats = self.database.sink.stats
+        if sink_stats.flushes:
+            logger.info(f"Rows written:          {sink_stats.rows_staged:>10,} "
+                        f"({sink_stats.rows_per_second:,.0f} rows/s over {sink_stats.flushes:,} flushes)")
         logger.info("=" * 70)
         logger.info("")
         logger.info("Review candidates in vocabulary_candidates table:")
@@ -942,6 +1124,17 @@ def main():
         default=500,
         help='Batch size for database operations (default: 500)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Worker processes for parsing the multistream dump (default: CPU count)'
+    )
+    parser.add_argument(
+        '--single-stream',
+        action='store_true',
+        help='Parse the single-stream dump on one core instead of the multistream dump'
+    )
     parser.add_argument(
         '--reset',
         action='store_true',
@@ -958,7 +1151,9 @@ def main():
         db_config=db_config,
         wordfreq_threshold=args.threshold,
         stoplist_size=args.stoplist_size,
-        batch_size=args.batch_size
+        batch_size=args.batch_size,
+        use_multistream=not args.single_stream,
+        workers=args.workers
     )
 
     # Clear checkpoint if requested